@@ -0,0 +1,269 @@
+# notification/alert_dispatcher.py
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Iterable, List, Optional
+
+# outbox 항목 필드 인덱스 (mutable list로 보관해 같은 key의 알림을 제자리에서 합침)
+_TEXT, _KEY, _COUNT, _ATTEMPTS, _ENQUEUED_AT = range(5)
+
+
+class _ChannelOutbox:
+    """
+    채널 하나의 우선순위별 대기열 + 토큰 버킷 + 전송 스레드 상태
+    """
+
+    def __init__(self, channel, levels: int, max_pending: int):
+        self.channel = channel
+        self.name = getattr(channel, "name", channel.__class__.__name__)
+        self.max_length = getattr(channel, "max_length", 2000)
+        self.rate = float(getattr(channel, "rate_per_sec", 1.0))
+        self.burst = float(getattr(channel, "burst", 1))
+        self.max_pending = max_pending
+
+        self.levels = [deque() for _ in range(levels)]
+        self.keys = {}
+        self.pending = 0
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.cond = threading.Condition()
+        self.thread = None
+
+        self.sent_messages = 0
+        self.sent_alerts = 0
+        self.failed = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def put(self, priority: int, text: str, key) -> bool:
+        """
+        알림 추가 (락은 짧게만 잡고 I/O 없음)
+        - 같은 key가 대기 중이면 새로 넣지 않고 내용만 최신으로 바꾸고 횟수 증가
+        - 가득 차면 새 알림보다 우선순위가 낮은 것 중 가장 오래된 것을 버림 (없으면 새 알림을 버림)
+        """
+        with self.cond:
+            if key is not None:
+                entry = self.keys.get(key)
+                if entry is not None:
+                    entry[_TEXT] = text
+                    entry[_COUNT] += 1
+                    self.coalesced += 1
+                    return True
+
+            if self.pending >= self.max_pending:
+                victim = next((level for level in range(len(self.levels) - 1, priority, -1) if self.levels[level]),
+                              None)
+                if victim is None:
+                    self.dropped += 1
+                    return False
+                dropped = self.levels[victim].popleft()
+                if dropped[_KEY] is not None:
+                    self.keys.pop(dropped[_KEY], None)
+                self.pending -= 1
+                self.dropped += 1
+
+            entry = [text, key, 1, 0, time.monotonic()]
+            self.levels[priority].append(entry)
+            if key is not None:
+                self.keys[key] = entry
+            self.pending += 1
+            self.cond.notify()
+            return True
+
+    def take(self, max_items: int) -> List[list]:
+        """
+        우선순위 순서로 최대 max_items개를 꺼냄 (락을 잡은 상태에서 호출)
+        - 합친 메시지가 채널 최대 길이를 넘지 않도록 자름 (첫 항목은 항상 포함)
+        """
+        batch = []
+        length = 0
+        for level in self.levels:
+            while level and len(batch) < max_items:
+                entry = level[0]
+                line = len(entry[_TEXT]) + 8
+                if batch and length + line > self.max_length - 32:
+                    return batch
+                level.popleft()
+                if entry[_KEY] is not None:
+                    self.keys.pop(entry[_KEY], None)
+                self.pending -= 1
+                batch.append(entry)
+                length += line
+        return batch
+
+    def requeue(self, batch: List[list], levels: List[int], max_retries: int):
+        """
+        전송 실패한 알림을 원래 우선순위 대기열 앞에 되돌림 (재시도 횟수 초과 또는 공간 부족이면 버림)
+        """
+        with self.cond:
+            for entry, level in reversed(list(zip(batch, levels))):
+                entry[_ATTEMPTS] += 1
+                if entry[_ATTEMPTS] > max_retries or self.pending >= self.max_pending:
+                    self.failed += 1
+                    continue
+                self.levels[level].appendleft(entry)
+                if entry[_KEY] is not None and entry[_KEY] not in self.keys:
+                    self.keys[entry[_KEY]] = entry
+                self.pending += 1
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def oldest(self) -> Optional[float]:
+        return min((level[0][_ENQUEUED_AT] for level in self.levels if level), default=None)
+
+
+class AlertDispatcher:
+    """
+    디스코드 / 텔레그램 등 알림 채널로 보내는 비동기 배치 전송기
+    - submit()은 채널별 대기열에 넣고 바로 반환 (네트워크 I/O 없음 → 신호/주문 경로를 막지 않음)
+    - 채널마다 전송 스레드 하나 (느린 웹훅이 다른 채널을 막지 않음), 채널별 토큰 버킷으로 전송 한도 유지,
+      채널이 429로 알려준 대기 시간(blocked_until)도 반영
+    - 전송 가능해질 때까지 쌓인 알림은 메시지 하나(digest)로 합쳐 보냄 (coalesce_window 동안은 모아서 보냄)
+    - 대기열은 채널당 max_pending개로 제한, 가득 차면 우선순위가 낮은 알림부터 버림
+    """
+
+    # 알림 우선순위 (숫자가 작을수록 먼저 전송, 나중에 버려짐)
+    PRIORITY_CRITICAL = 0
+    PRIORITY_HIGH = 1
+    PRIORITY_NORMAL = 2
+    PRIORITY_LOW = 3
+
+    def __init__(self, channels: Iterable, max_pending: int = 500, coalesce_window: float = 1.0,
+                 max_digest_items: int = 20, max_retries: int = 2, logger=None):
+        """
+        :param channels: send_message(text) -> bool 을 가진 채널 객체들 (DiscordAlerts, TelegramAlerts 등)
+            (선택 속성: name, max_length, rate_per_sec, burst, blocked_until)
+        :param max_pending: 채널별 최대 대기 알림 수
+        :param coalesce_window: 첫 알림 후 이 시간(초) 동안은 모아서 보냄 (CRITICAL 알림은 기다리지 않음)
+        :param max_digest_items: digest 메시지 하나에 담을 최대 알림 수
+        :param max_retries: 전송 실패 시 재시도 횟수
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.coalesce_window = coalesce_window
+        self.max_digest_items = max(1, max_digest_items)
+        self.max_retries = max_retries
+        self._outboxes = [_ChannelOutbox(channel, self.PRIORITY_LOW + 1, max_pending) for channel in channels]
+        self.running = False
+
+    def start(self):
+        """
+        채널별 전송 스레드 시작
+        """
+        self.running = True
+        for outbox in self._outboxes:
+            outbox.thread = threading.Thread(target=self._send_loop, args=(outbox,),
+                                             name=f"AlertDispatcher-{outbox.name}", daemon=True)
+            outbox.thread.start()
+
+    def stop(self, flush_timeout: float = 5.0):
+        """
+        스레드 중지 (flush_timeout 동안 남은 알림 전송 시도)
+        """
+        self.running = False
+        deadline = time.monotonic() + flush_timeout
+        for outbox in self._outboxes:
+            with outbox.cond:
+                outbox.cond.notify_all()
+        for outbox in self._outboxes:
+            if outbox.thread is not None:
+                outbox.thread.join(max(0.0, deadline - time.monotonic()))
+                outbox.thread = None
+
+    def submit(self, text: str, priority: int = PRIORITY_NORMAL, key=None) -> bool:
+        """
+        알림 추가 (블로킹 없음)
+        :param key: 같은 key의 알림이 아직 대기 중이면 하나로 합침 (예: "signal:LTCUSDT:BUY")
+        :return: 한 채널이라도 받아들였으면 True
+        """
+        priority = min(max(int(priority), self.PRIORITY_CRITICAL), self.PRIORITY_LOW)
+        accepted = False
+        for outbox in self._outboxes:
+            accepted = outbox.put(priority, text, key) or accepted
+        return accepted
+
+    def pending(self) -> int:
+        return sum(outbox.pending for outbox in self._outboxes)
+
+    def stats(self) -> dict:
+        return {
+            outbox.name: {
+                "pending": outbox.pending,
+                "sent_messages": outbox.sent_messages,
+                "sent_alerts": outbox.sent_alerts,
+                "coalesced": outbox.coalesced,
+                "dropped": outbox.dropped,
+                "failed": outbox.failed,
+            }
+            for outbox in self._outboxes
+        }
+
+    # ------------------------------------------------------------
+    # 전송 스레드
+    # ------------------------------------------------------------
+    def _next_batch(self, outbox: _ChannelOutbox):
+        """
+        보낼 수 있을 때까지 대기한 뒤 digest로 묶을 알림을 꺼냄
+        :return: (batch, 원래 우선순위 목록), 종료 시 None
+        """
+        with outbox.cond:
+            while True:
+                if outbox.pending == 0:
+                    if not self.running:
+                        return None
+                    outbox.cond.wait()
+                    continue
+
+                now = time.monotonic()
+                outbox.refill(now)
+                waits = [getattr(outbox.channel, "blocked_until", 0.0) - now]
+                if outbox.tokens < 1.0:
+                    waits.append((1.0 - outbox.tokens) / outbox.rate if outbox.rate > 0 else 1.0)
+                # 중지 중이거나 CRITICAL 알림이 있으면 모으지 않고 바로 보냄
+                if self.running and not outbox.levels[self.PRIORITY_CRITICAL]:
+                    waits.append(outbox.oldest() + self.coalesce_window - now)
+                wait = max(waits)
+                if wait > 0:
+                    outbox.cond.wait(wait)
+                    continue
+
+                outbox.tokens -= 1.0
+                levels = []
+                for level, entries in enumerate(outbox.levels):
+                    levels.extend([level] * min(len(entries), self.max_digest_items - len(levels)))
+                batch = outbox.take(self.max_digest_items)
+                return batch, levels[:len(batch)]
+
+    @staticmethod
+    def _format(batch: List[list], remaining: int) -> str:
+        if len(batch) == 1 and batch[0][_COUNT] == 1 and remaining == 0:
+            return batch[0][_TEXT]
+        total = sum(entry[_COUNT] for entry in batch)
+        lines = [f"[Digest] {total} alerts"]
+        for entry in batch:
+            lines.append(entry[_TEXT] if entry[_COUNT] == 1 else f"{entry[_TEXT]} (x{entry[_COUNT]})")
+        if remaining:
+            lines.append(f"... {remaining} more pending")
+        return "\n".join(lines)
+
+    def _send_loop(self, outbox: _ChannelOutbox):
+        while True:
+            item = self._next_batch(outbox)
+            if item is None:
+                return
+            batch, levels = item
+            text = self._format(batch, outbox.pending)
+            try:
+                ok = outbox.channel.send_message(text)
+            except Exception as e:
+                self.logger.exception(f"Error sending alert via {outbox.name}: {e}")
+                ok = False
+
+            if ok is False:
+                outbox.requeue(batch, levels, self.max_retries)
+            else:
+                outbox.sent_messages += 1
+                outbox.sent_alerts += sum(entry[_COUNT] for entry in batch)
@@ -1,8 +1,10 @@
 # backtesting/backtest_runner.py
 
+import inspect
 import logging
+import numpy as np
 import pandas as pd
-from typing import Callable, Dict, Any
+from typing import Callable, Dict, Any, Iterable, Iterator
 
 class BacktestRunner:
     """
@@ -32,6 +34,86 @@ class BacktestRunner:
         result_df = self.strategy_func(price_data, params)
         return result_df
 
+    def run_stream(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        params: Dict[str, Any],
+        warmup: int = None,
+        cumulative_columns: Dict[str, str] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        스트리밍 백테스트: 시간순 chunk를 하나씩 전략에 넣고 결과 chunk를 차례로 반환 (generator)
+        메모리 사용량은 전체 데이터가 아니라 chunk 크기(+ warmup 행)에 비례
+        - warmup: 이전 chunk의 마지막 warmup 행을 앞에 붙여 실행하고 결과에서는 제외
+          (이동평균 등 롤링 지표와 shift로 계산하는 포지션이 chunk 경계에서도 이어지도록,
+           전략이 참조하는 가장 긴 lookback 이상으로 지정)
+          None이면 strategy_func.lookback (정수 또는 params -> 정수 함수) 사용, 둘 다 없으면 ValueError
+          lookback이 있는데 warmup이 그보다 작으면 결과가 run()과 달라지므로 ValueError
+        - cumulative_columns: {누적 곱 컬럼: 수익률 컬럼} - 직전 chunk의 마지막 누적값에서 이어서 다시 계산
+          (기본: {"cum_strategy_returns": "strategy_returns"})
+        - 전략 함수가 state 인자를 받으면 chunk 사이에 유지되는 dict를 넘김
+          (경로 의존적인 상태(진입가, 트레일링 스탑 등)는 전략이 state에 보관)
+        결과를 이어 붙이면 run(전체 데이터)과 같은 결과 (포지션/수익률/누적 수익률은 비트 단위로 동일,
+        pandas rolling 지표 값 자체는 누적 합 시작점이 달라 마지막 자리(~1e-14)까지 같지 않을 수 있음)
+        """
+        lookback = getattr(self.strategy_func, "lookback", None)
+        if callable(lookback):
+            lookback = lookback(params)
+        if warmup is None:
+            if lookback is None:
+                raise ValueError("run_stream needs warmup (or a strategy_func.lookback attribute) "
+                                 "to match run() across chunk boundaries.")
+            warmup = lookback
+        elif lookback is not None and warmup < lookback:
+            raise ValueError(f"warmup={warmup} is shorter than the strategy lookback ({lookback}); "
+                             f"results would differ from run() at chunk boundaries.")
+        if cumulative_columns is None:
+            cumulative_columns = {"cum_strategy_returns": "strategy_returns"}
+        # 인자 검사는 호출 시점에 바로 하고, 실제 실행은 generator로
+        return self._run_stream(chunks, params, warmup, cumulative_columns)
+
+    def _run_stream(self, chunks: Iterable[pd.DataFrame], params: Dict[str, Any], warmup: int,
+                    cumulative_columns: Dict[str, str]) -> Iterator[pd.DataFrame]:
+        accepts_state = "state" in inspect.signature(self.strategy_func).parameters
+        state: Dict[str, Any] = {}
+        carried = {}          # 누적 곱 컬럼 -> 직전 chunk까지의 마지막 누적값
+        tail = None
+
+        self.logger.info(f"Starting streaming backtest with params={params}, warmup={warmup}")
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            data = chunk if tail is None else pd.concat([tail, chunk])
+            n_warm = len(data) - len(chunk)
+            if accepts_state:
+                result_df = self.strategy_func(data, params, state=state)
+            else:
+                result_df = self.strategy_func(data, params)
+            result_df = result_df.iloc[n_warm:]
+
+            for cum_col, ret_col in cumulative_columns.items():
+                if cum_col not in result_df.columns or ret_col not in result_df.columns:
+                    continue
+                if cum_col in carried:
+                    # [직전 누적값, 1 + r1, 1 + r2, ...]의 누적 곱 → 전체 실행과 같은 순서의 곱셈
+                    growth = np.concatenate(([carried[cum_col]], 1 + result_df[ret_col].to_numpy(dtype=float)))
+                    result_df[cum_col] = pd.Series(growth).cumprod().to_numpy()[1:]
+                last = result_df[cum_col].dropna()
+                if len(last):
+                    carried[cum_col] = float(last.iloc[-1])
+
+            tail = data.iloc[-warmup:] if warmup > 0 else None
+            yield result_df
+
+    @staticmethod
+    def iter_chunks(price_data: pd.DataFrame, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """
+        메모리에 있는 DataFrame을 chunk_size 행 단위로 나눔 (run_stream 입력용)
+        디스크 데이터는 PartitionedStore.iter_read / HistoricalDataLoader.iter_load 사용
+        """
+        for start in range(0, len(price_data), chunk_size):
+            yield price_data.iloc[start:start + chunk_size]
+
 
 def example_strategy(price_data: pd.DataFrame, params: dict) -> pd.DataFrame:
     """
@@ -39,13 +121,14 @@ def example_strategy(price_data: pd.DataFrame, params: dict) -> pd.DataFrame:
     params: {"short_window": 5, "long_window": 20}
     - 짧은 이동평균이 긴 이동평균을 상향 돌파하면 매수, 하향 돌파하면 매도
     - 결과 DataFrame에 (signal, position, pnl 등) 칼럼을 추가
+    - price_data에 미리 계산된 ma_<window> 칼럼(example_features)이 있으면 다시 계산하지 않고 사용
     """
     short_window = params.get("short_window", 5)
     long_window = params.get("long_window", 20)
 
     df = price_data.copy()
-    df["ma_short"] = df["close"].rolling(window=short_window).mean()
-    df["ma_long"] = df["close"].rolling(window=long_window).mean()
+    df["ma_short"] = _moving_average(df, short_window)
+    df["ma_long"] = _moving_average(df, long_window)
 
     df["signal"] = 0
     df.loc[df["ma_short"] > df["ma_long"], "signal"] = 1
@@ -62,3 +145,24 @@ def example_strategy(price_data: pd.DataFrame, params: dict) -> pd.DataFrame:
     # 누적 수익률
     df["cum_strategy_returns"] = (1 + df["strategy_returns"]).cumprod()
     return df
+
+
+# run_stream warmup: 가장 긴 이동평균의 이전 window-1행 + 포지션 shift 1행
+example_strategy.lookback = lambda params: max(params.get("short_window", 5), params.get("long_window", 20))
+
+
+def _moving_average(df: pd.DataFrame, window: int) -> pd.Series:
+    column = f"ma_{window}"
+    if column in df.columns:
+        return df[column]
+    return df["close"].rolling(window=window).mean()
+
+
+def example_features(price_data: pd.DataFrame, param_grid: dict) -> pd.DataFrame:
+    """
+    example_strategy용 지표를 구간마다 한 번만 계산 (StrategyOptimizer.walk_forward의 feature_func)
+    - param_grid의 모든 short_window / long_window에 대한 이동평균을 ma_<window> 칼럼으로 반환
+    """
+    windows = sorted(set(param_grid.get("short_window", [5])) | set(param_grid.get("long_window", [20])))
+    close = price_data["close"]
+    return pd.DataFrame({f"ma_{w}": close.rolling(window=w).mean() for w in windows}, index=price_data.index)
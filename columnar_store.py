@@ -0,0 +1,392 @@
+# backtesting/columnar_store.py
+
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+INDEX_FILE = "__index__.npy"
+META_FILE = "_meta.json"
+
+class PartitionedStore:
+    """
+    심볼/기간(월 또는 일) 단위로 나눈 컬럼형 저장소 (컬럼별 .npy 파일을 memory-map으로 읽음)
+    디렉토리 구조:
+      root/BTCUSDT/_meta.json          # 컬럼 dtype, 파티션별 행 수/시작/끝 시각
+      root/BTCUSDT/2024-01/__index__.npy  # 타임스탬프 (int64 ns, 정렬됨)
+      root/BTCUSDT/2024-01/close.npy ...
+    - read(symbol, start, end, columns): 시간 범위에 걸친 파티션만 열고, 파티션 안에서는
+      정렬된 인덱스를 searchsorted로 잘라 필요한 컬럼의 해당 구간만 복사
+      → 읽는 비용이 전체 아카이브가 아니라 요청한 구간 크기에 비례
+    """
+
+    def __init__(self, root: str = "./data_store", partition: str = "month", logger=None):
+        """
+        :param root: 저장소 루트 디렉토리 (첫 기록 시 생성)
+        :param partition: "month" or "day" (파티션 단위)
+        """
+        if partition not in ("month", "day"):
+            raise ValueError(f"Unknown partition unit: {partition}")
+        self.root = root
+        self.partition = partition
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------
+    # 메타데이터
+    # ------------------------------------------------------------
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.root, symbol)
+
+    def load_meta(self, symbol: str) -> Optional[dict]:
+        path = os.path.join(self._symbol_dir(symbol), META_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_meta(self, symbol: str, meta: dict):
+        path = os.path.join(self._symbol_dir(symbol), META_FILE)
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def symbols(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, META_FILE))
+        )
+
+    def has(self, symbol: str) -> bool:
+        return self.load_meta(symbol) is not None
+
+    def partitions(self, symbol: str) -> Dict[str, dict]:
+        """
+        :return: {파티션 이름: {"rows", "start", "end"(int64 ns)}}
+        """
+        meta = self.load_meta(symbol)
+        return meta["partitions"] if meta else {}
+
+    def time_range(self, symbol: str):
+        """
+        저장된 데이터의 (첫 시각, 마지막 시각) (없으면 None)
+        """
+        parts = self.partitions(symbol)
+        if not parts:
+            return None
+        start = min(p["start"] for p in parts.values())
+        end = max(p["end"] for p in parts.values())
+        return pd.Timestamp(start), pd.Timestamp(end)
+
+    def _partition_keys(self, index_ns: np.ndarray) -> np.ndarray:
+        """
+        타임스탬프(ns) 배열 → 파티션 키 정수 (월: YYYYMM, 일: YYYYMMDD)
+        """
+        days = index_ns.astype("datetime64[ns]").astype("datetime64[D]")
+        months = days.astype("datetime64[M]")
+        years = months.astype("datetime64[Y]").astype(np.int64) + 1970
+        month_of_year = (months.astype(np.int64) % 12) + 1
+        keys = years * 100 + month_of_year
+        if self.partition == "day":
+            day_of_month = (days - months).astype(np.int64) + 1
+            keys = keys * 100 + day_of_month
+        return keys
+
+    def _partition_name(self, key: int) -> str:
+        if self.partition == "day":
+            return f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}"
+        return f"{key // 100:04d}-{key % 100:02d}"
+
+    def _partition_key_of(self, timestamp) -> int:
+        ns = np.array([pd.Timestamp(timestamp).value], dtype=np.int64)
+        return int(self._partition_keys(ns)[0])
+
+    # ------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------
+    @staticmethod
+    def _to_ns(index: pd.Index) -> np.ndarray:
+        index = pd.DatetimeIndex(index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        return index.as_unit("ns").asi8
+
+    @staticmethod
+    def _column_array(series: pd.Series) -> np.ndarray:
+        values = series.to_numpy()
+        if values.dtype == object or not isinstance(values.dtype, np.dtype):
+            # 문자열 등은 고정 길이 유니코드로 저장 (pickle 없이 memory-map 가능)
+            values = series.astype(str).to_numpy().astype(str)
+        return np.ascontiguousarray(values)
+
+    def write(self, symbol: str, df: pd.DataFrame, mode: str = "merge", key_column: str = None):
+        """
+        DatetimeIndex DataFrame을 파티션 단위로 기록
+        :param mode: "merge" (기존 파티션과 합치고 같은 시각은 새 값으로 덮어씀)
+                     or "replace" (심볼 전체를 df로 교체)
+        :param key_column: merge 시 중복 판단에 시각 대신 사용할 고유 키 컬럼
+                           (예: 체결 데이터처럼 같은 시각에 여러 행이 있는 경우 aggregate trade id)
+        """
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise ValueError("PartitionedStore.write requires a DatetimeIndex.")
+
+        with self._lock:
+            meta = None if mode == "replace" else self.load_meta(symbol)
+            symbol_dir = self._symbol_dir(symbol)
+            if mode == "replace" and os.path.isdir(symbol_dir):
+                shutil.rmtree(symbol_dir)
+            os.makedirs(symbol_dir, exist_ok=True)
+
+            if meta is None:
+                meta = {
+                    "index_name": df.index.name,
+                    "tz": str(df.index.tz) if df.index.tz is not None else None,
+                    "unit": df.index.unit,
+                    "columns": {},
+                    "partitions": {},
+                    "sources": {},
+                    "coverage": [],
+                    "key_column": key_column,
+                }
+
+            index_ns = self._to_ns(df.index)
+            columns = {str(c): self._column_array(df[c]) for c in df.columns}
+            for name, values in columns.items():
+                meta["columns"].setdefault(name, values.dtype.str)
+
+            if len(index_ns):
+                order = np.argsort(index_ns, kind="stable")
+                index_ns = index_ns[order]
+                columns = {name: values[order] for name, values in columns.items()}
+                keys = self._partition_keys(index_ns)
+                bounds = np.flatnonzero(np.diff(keys)) + 1
+                starts = np.concatenate(([0], bounds))
+                ends = np.concatenate((bounds, [len(keys)]))
+                for s, e in zip(starts, ends):
+                    name = self._partition_name(int(keys[s]))
+                    part_index = index_ns[s:e]
+                    part_columns = {c: v[s:e] for c, v in columns.items()}
+                    if mode == "merge" and name in meta["partitions"]:
+                        part_index, part_columns = self._merge(symbol, name, meta, part_index, part_columns)
+                    self._write_partition(symbol, name, meta, part_index, part_columns)
+
+            self._save_meta(symbol, meta)
+        self.logger.debug(f"Stored {len(df)} rows for {symbol} ({mode}).")
+
+    def _merge(self, symbol: str, name: str, meta: dict, new_index: np.ndarray, new_columns: dict):
+        """
+        기존 파티션 + 새 데이터 병합 (시각 기준 정렬, 중복 시각(또는 key_column 값)은 새 값 유지)
+        """
+        old_index, old_columns = self._read_partition(symbol, name, list(meta["columns"]))
+        index = np.concatenate((old_index, new_index))
+        merged = {}
+        for column, dtype in meta["columns"].items():
+            old = old_columns.get(column)
+            if old is None:
+                old = np.full(len(old_index), np.nan if np.dtype(dtype).kind == "f" else 0, dtype=dtype)
+            new = new_columns.get(column)
+            if new is None:
+                new = np.full(len(new_index), np.nan if np.dtype(dtype).kind == "f" else 0, dtype=dtype)
+            merged[column] = np.concatenate((old, new))
+        # 뒤집어서 unique → 같은 키 중 마지막(새 데이터)이 선택됨
+        key_column = meta.get("key_column")
+        keys = merged[key_column] if key_column else index
+        _, first = np.unique(keys[::-1], return_index=True)
+        keep = len(index) - 1 - first
+        if key_column:
+            keep = keep[np.argsort(index[keep], kind="stable")]
+        return index[keep], {c: v[keep] for c, v in merged.items()}
+
+    def _write_partition(self, symbol: str, name: str, meta: dict, index_ns: np.ndarray, columns: dict):
+        """
+        임시 디렉토리에 기록 후 교체 (읽는 쪽이 반쯤 쓰인 파티션을 보지 않도록)
+        """
+        symbol_dir = self._symbol_dir(symbol)
+        final_dir = os.path.join(symbol_dir, name)
+        tmp_dir = os.path.join(symbol_dir, f".{name}.{uuid.uuid4().hex[:8]}")
+        os.makedirs(tmp_dir)
+        np.save(os.path.join(tmp_dir, INDEX_FILE), np.ascontiguousarray(index_ns, dtype=np.int64))
+        for column, values in columns.items():
+            np.save(os.path.join(tmp_dir, f"{column}.npy"), np.ascontiguousarray(values))
+
+        if os.path.isdir(final_dir):
+            old_dir = f"{tmp_dir}.old"
+            os.replace(final_dir, old_dir)
+            os.replace(tmp_dir, final_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        else:
+            os.replace(tmp_dir, final_dir)
+
+        meta["partitions"][name] = {
+            "rows": int(len(index_ns)),
+            "start": int(index_ns[0]),
+            "end": int(index_ns[-1]),
+        }
+
+    # ------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------
+    def _read_partition(self, symbol: str, name: str, columns: List[str], lo: int = None, hi: int = None):
+        """
+        파티션에서 [lo, hi] (ns, 양 끝 포함) 구간의 인덱스와 컬럼 복사본 반환
+        """
+        part_dir = os.path.join(self._symbol_dir(symbol), name)
+        index = np.load(os.path.join(part_dir, INDEX_FILE), mmap_mode="r")
+        s = 0 if lo is None else int(np.searchsorted(index, lo, side="left"))
+        e = len(index) if hi is None else int(np.searchsorted(index, hi, side="right"))
+        out = {}
+        for column in columns:
+            path = os.path.join(part_dir, f"{column}.npy")
+            if os.path.exists(path):
+                out[column] = np.array(np.load(path, mmap_mode="r")[s:e])
+        return np.array(index[s:e]), out
+
+    def _resolve(self, symbol: str, start, end, columns: Optional[List[str]]):
+        meta = self.load_meta(symbol)
+        if meta is None:
+            raise KeyError(f"No stored data for {symbol}")
+
+        columns = list(meta["columns"]) if columns is None else [str(c) for c in columns]
+        unknown = [c for c in columns if c not in meta["columns"]]
+        if unknown:
+            raise KeyError(f"Unknown columns for {symbol}: {unknown}")
+        return meta, columns, self._bound_ns(start, meta), self._bound_ns(end, meta)
+
+    def _iter_parts(self, symbol: str, meta: dict, columns: List[str], lo: Optional[int], hi: Optional[int]):
+        """
+        시간 범위에 걸친 파티션만 순서대로 읽어 (인덱스, {컬럼: 값}) 반환
+        """
+        lo_key = self._partition_key_of(pd.Timestamp(lo)) if lo is not None else None
+        hi_key = self._partition_key_of(pd.Timestamp(hi)) if hi is not None else None
+        for name in sorted(meta["partitions"]):
+            key = int(name.replace("-", ""))
+            if (lo_key is not None and key < lo_key) or (hi_key is not None and key > hi_key):
+                continue
+            index_ns, values = self._read_partition(symbol, name, columns, lo, hi)
+            if not len(index_ns):
+                continue
+            yield index_ns, {c: values.get(c, np.full(len(index_ns), np.nan)) for c in columns}
+
+    @staticmethod
+    def _frame(meta: dict, index_ns: np.ndarray, data: dict, columns: List[str]) -> pd.DataFrame:
+        index = pd.DatetimeIndex(index_ns.view("datetime64[ns]"), name=meta["index_name"])
+        # 저장은 ns로 통일, 읽을 때 원래 해상도로 복원
+        index = index.as_unit(meta.get("unit", "ns"))
+        if meta["tz"]:
+            index = index.tz_localize("UTC").tz_convert(meta["tz"])
+        return pd.DataFrame(data, index=index, columns=columns, copy=False)
+
+    def read(self, symbol: str, start=None, end=None, columns: List[str] = None) -> pd.DataFrame:
+        """
+        :param start, end: 시간 범위 (양 끝 포함, None이면 제한 없음)
+        :param columns: 읽을 컬럼 (None이면 전체)
+        """
+        meta, columns, lo, hi = self._resolve(symbol, start, end, columns)
+        index_parts, column_parts = [], {c: [] for c in columns}
+        for index_ns, values in self._iter_parts(symbol, meta, columns, lo, hi):
+            index_parts.append(index_ns)
+            for c in columns:
+                column_parts[c].append(values[c])
+
+        if index_parts:
+            index_ns = np.concatenate(index_parts) if len(index_parts) > 1 else index_parts[0]
+            data = {c: (np.concatenate(v) if len(v) > 1 else v[0]) for c, v in column_parts.items()}
+        else:
+            index_ns = np.array([], dtype=np.int64)
+            data = {c: np.array([], dtype=meta["columns"][c]) for c in columns}
+        return self._frame(meta, index_ns, data, columns)
+
+    def iter_read(self, symbol: str, start=None, end=None, columns: List[str] = None,
+                  chunk_rows: int = None):
+        """
+        read와 같은 조건으로 파티션 단위(또는 chunk_rows 행 단위) DataFrame을 순서대로 반환
+        (전체 구간을 메모리에 올리지 않고 처리할 때 사용)
+        """
+        meta, columns, lo, hi = self._resolve(symbol, start, end, columns)
+        for index_ns, values in self._iter_parts(symbol, meta, columns, lo, hi):
+            step = chunk_rows or len(index_ns)
+            for s in range(0, len(index_ns), step):
+                yield self._frame(meta, index_ns[s:s + step], {c: v[s:s + step] for c, v in values.items()}, columns)
+
+    @staticmethod
+    def _bound_ns(value, meta: dict) -> Optional[int]:
+        if value is None:
+            return None
+        ts = pd.Timestamp(value)
+        if ts.tzinfo is not None:
+            ts = ts.tz_convert("UTC").tz_localize(None)
+        elif meta["tz"]:
+            # tz 정보가 없는 경계는 저장된 데이터의 tz 기준 시각으로 해석
+            ts = ts.tz_localize(meta["tz"]).tz_convert("UTC").tz_localize(None)
+        return ts.as_unit("ns").value
+
+    def delete(self, symbol: str):
+        with self._lock:
+            shutil.rmtree(self._symbol_dir(symbol), ignore_errors=True)
+
+    # ------------------------------------------------------------
+    # 원본 파일 변환 기록 (CSV 캐시 무효화용)
+    # ------------------------------------------------------------
+    def source_signature(self, symbol: str, source: str) -> Optional[list]:
+        meta = self.load_meta(symbol)
+        return (meta or {}).get("sources", {}).get(source)
+
+    def set_source_signature(self, symbol: str, source: str, signature: list):
+        with self._lock:
+            meta = self.load_meta(symbol)
+            meta.setdefault("sources", {})[source] = signature
+            self._save_meta(symbol, meta)
+
+    # ------------------------------------------------------------
+    # 수집 완료 구간 기록 (증분 다운로드용)
+    # ------------------------------------------------------------
+    def coverage(self, symbol: str) -> List[List[int]]:
+        """
+        데이터를 받아 둔 구간 목록 [[start_ns, end_ns), ...] (정렬, 겹침 없음)
+        """
+        meta = self.load_meta(symbol)
+        return (meta or {}).get("coverage", [])
+
+    def add_coverage(self, symbol: str, ranges: List[tuple]):
+        """
+        수집 완료 구간 추가 ([start_ns, end_ns) 반열린 구간, 맞닿거나 겹치는 구간은 합침)
+        """
+        with self._lock:
+            meta = self.load_meta(symbol)
+            if meta is None:
+                raise KeyError(f"No stored data for {symbol}")
+            merged = []
+            for start, end in sorted([tuple(r) for r in meta.get("coverage", [])] + [tuple(r) for r in ranges]):
+                if merged and start <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([int(start), int(end)])
+            meta["coverage"] = merged
+            self._save_meta(symbol, meta)
+
+    def missing_ranges(self, symbol: str, start_ns: int, end_ns: int) -> List[tuple]:
+        """
+        [start_ns, end_ns) 중 아직 수집하지 않은 구간 목록
+        """
+        missing = []
+        cursor = start_ns
+        for covered_start, covered_end in self.coverage(symbol):
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end_ns:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end_ns:
+            missing.append((cursor, end_ns))
+        return missing
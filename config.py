@@ -22,6 +22,11 @@ class Config:
         self.log_level = os.getenv("LOG_LEVEL", "DEBUG")  # 로깅 레벨
         self.data_dir = os.getenv("DATA_DIR", "./data")   # 데이터 저장 디렉토리 등
 
+        # 데이터 피드: 웹소켓 주소(쉼표로 여러 개, 예: 로컬 시뮬레이터 샤드 ws://127.0.0.1:9443/ws,...)와 구독 심볼/호가 스트림
+        self.feed_uris = os.getenv("FEED_URIS", "wss://fstream.binance.com/ws").split(",")
+        self.symbols = os.getenv("SYMBOLS", "LTCUSDT").split(",")
+        self.depth_streams = os.getenv("DEPTH_STREAMS", "depth5@100ms,depth20@100ms").split(",")
+
         # 필요하다면 더 많은 설정값을 추가
 
         # 설정 파일에서 값을 덮어쓸 수도 있음
@@ -0,0 +1,125 @@
+# benchmarks/consistency_checks.py
+
+import argparse
+import logging
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from backtesting.performance_metrics import PerformanceMetrics, StreamingMetrics
+from backtesting.robustness import METRICS, _combine, _run_summaries, _window_summaries
+
+# 이름 → 검사 함수 (실패 시 AssertionError)
+CHECKS: Dict[str, Callable[[int], None]] = {}
+
+
+def check(name: str):
+    def register(func):
+        CHECKS[name] = func
+        return func
+    return register
+
+
+def _sample_returns(rng: np.random.Generator, n: int = 2000, columns: int = 6) -> np.ndarray:
+    """
+    첫 봉부터 손실인 열, NaN 구간이 섞인 열 등을 포함한 수익률 행렬
+    """
+    returns = rng.normal(0.0002, 0.01, size=(n, columns))
+    returns[0, 0] = -0.05
+    returns[:3, 1] = np.nan
+    returns[rng.random((n, columns)) < 0.02] = np.nan
+    returns[:, 2] = 0.0
+    return returns
+
+
+def _sample_positions(rng: np.random.Generator, shape) -> np.ndarray:
+    positions = rng.choice([-1.0, 0.0, 1.0], size=shape)
+    positions[rng.random(shape) < 0.01] = np.nan
+    return positions
+
+
+@check("streaming_metrics")
+def check_streaming_metrics(seed: int = 0):
+    """
+    StreamingMetrics(update / update_many)와 PerformanceMetrics.calculate_batch의 지표가 같은지 확인
+    """
+    rng = np.random.default_rng(seed)
+    returns = _sample_returns(rng)
+    positions = _sample_positions(rng, returns.shape)
+    batch = PerformanceMetrics().calculate_batch(returns, positions, periods_per_year=252)
+
+    for column in range(returns.shape[1]):
+        expected = batch.iloc[column].to_dict()
+        per_bar = StreamingMetrics(periods_per_year=252)
+        for ret, position in zip(returns[:, column], positions[:, column]):
+            per_bar.update(ret, position)
+        chunked = StreamingMetrics(periods_per_year=252)
+        for start in range(0, len(returns), 137):
+            chunked.update_many(returns[start:start + 137, column], positions[start:start + 137, column])
+
+        for label, streaming in (("update", per_bar), ("update_many", chunked)):
+            actual = streaming.metrics()
+            for key, value in expected.items():
+                assert np.isclose(actual[key], value, rtol=1e-9, atol=1e-12, equal_nan=True), \
+                    f"column {column} {label} {key}: streaming {actual[key]} != batch {value}"
+
+
+@check("robustness_resample")
+def check_robustness_resample(seed: int = 0):
+    """
+    원래 순서 그대로 이어 붙인 구간(연속 구간 / 겹치지 않는 블록)의 리샘플 지표가 calculate_batch와 같은지 확인
+    """
+    rng = np.random.default_rng(seed)
+    returns = np.nan_to_num(_sample_returns(rng))
+    # 처음 몇 봉만 손실이고 이후 상승만 하는 열: 시작 자산을 고점으로 보면 낙폭이 달라짐
+    falling_start = np.abs(returns[:, 3])
+    falling_start[:5] = -0.02
+    for series, label in ((returns[:, 0], "first bar loss"), (returns[:, 3], "random"),
+                          (falling_start, "falling start")):
+        expected = PerformanceMetrics().calculate_batch(series[:, None], periods_per_year=252).iloc[0]
+        held = rng.choice([-1.0, 0.0, 1.0], size=len(series)).repeat(4)[:len(series)]
+        run_ids = np.cumsum(np.concatenate(([0], held[1:] != held[:-1])))
+        runs = _run_summaries(series, run_ids)
+        windows = _window_summaries(series, 50)
+        orders = {
+            "runs": (runs, np.arange(len(runs))[None, :]),
+            "windows": (windows, np.arange(0, len(series), 50)[None, :]),
+        }
+        for name, (summary, order) in orders.items():
+            actual = _combine({c: summary[c].to_numpy() for c in summary.columns}, order, 252)
+            for metric in METRICS:
+                assert np.isclose(actual[metric][0], expected[metric], rtol=1e-9, atol=1e-12), \
+                    f"{label} {name} {metric}: resample {actual[metric][0]} != batch {expected[metric]}"
+
+
+def run(names: List[str] = None, seed: int = 0, logger=None) -> bool:
+    logger = logger or logging.getLogger("consistency_checks")
+    ok = True
+    for name, func in CHECKS.items():
+        if names and name not in names:
+            continue
+        try:
+            func(seed)
+        except AssertionError as e:
+            ok = False
+            logger.error(f"FAIL {name}: {e}")
+        else:
+            logger.info(f"ok   {name}")
+    return ok
+
+
+def main():
+    """
+    동일한 결과를 내야 하는 두 경로(스트리밍/배치 등)를 비교하는 검사 모음
+    """
+    parser = argparse.ArgumentParser(description="ordre-book consistency checks")
+    parser.add_argument("names", nargs="*", help=f"실행할 검사 (기본: 전부) {sorted(CHECKS)}")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if not run(args.names, args.seed):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,80 +1,402 @@
 # notification/dashboard.py
 
+import json
 import logging
-from flask import Flask, jsonify, render_template_string
+import threading
+import time
+import uuid
+from collections import deque
+from flask import Flask, Response, jsonify, request
+from .timeseries_store import TimeSeriesStore
+
+# 대시보드 첫 화면 (Dashboard 생성 시 한 번만 컴파일)
+INDEX_TEMPLATE = """
+<html>
+<head>
+    <title>Real-time Dashboard</title>
+</head>
+<body>
+    <h1>My Trading Dashboard</h1>
+    <p>Last Price: <span id="last_price">{{ last_price }}</span></p>
+    <h2>Order Book</h2>
+    <ul id="order_book">
+    {% for bidask in order_book %}
+        <li>{{ bidask }}</li>
+    {% endfor %}
+    </ul>
+    <h2>Positions</h2>
+    <ul id="positions">
+    {% for pos in positions %}
+        <li>{{ pos }}</li>
+    {% endfor %}
+    </ul>
+    <script>
+    const state = {book: null, bids: new Map(), asks: new Map()};
+    function setList(id, items) {
+        const ul = document.getElementById(id);
+        ul.replaceChildren(...items.map(item => {
+            const li = document.createElement("li");
+            li.textContent = typeof item === "string" ? item : JSON.stringify(item);
+            return li;
+        }));
+    }
+    function applyLevels(side, levels) {
+        for (const [price, qty] of levels) {
+            // 60000.0 / "60000.0" / 60000 이 같은 단계가 되도록 숫자 기준 키 사용
+            const key = String(Number(price));
+            if (Number(qty) === 0) side.delete(key); else side.set(key, qty);
+        }
+    }
+    function renderBook() {
+        if (state.book !== null) { setList("order_book", state.book); return; }
+        const bids = [...state.bids].sort((a, b) => b[0] - a[0]).map(([p, q]) => "BID " + p + " x " + q);
+        const asks = [...state.asks].sort((a, b) => a[0] - b[0]).map(([p, q]) => "ASK " + p + " x " + q);
+        setList("order_book", asks.reverse().concat(bids));
+    }
+    function apply(msg) {
+        if ("last_price" in msg) document.getElementById("last_price").textContent = msg.last_price;
+        if ("positions" in msg) setList("positions", msg.positions);
+        if ("order_book" in msg) {
+            const book = msg.order_book;
+            if (Array.isArray(book)) { state.book = book; }
+            else {
+                state.book = null; state.bids.clear(); state.asks.clear();
+                applyLevels(state.bids, book.bids || []); applyLevels(state.asks, book.asks || []);
+            }
+        }
+        if ("bids" in msg) applyLevels(state.bids, msg.bids);
+        if ("asks" in msg) applyLevels(state.asks, msg.asks);
+        if ("order_book" in msg || "bids" in msg || "asks" in msg) renderBook();
+    }
+    const source = new EventSource("/stream");
+    source.addEventListener("snapshot", e => apply(JSON.parse(e.data)));
+    source.addEventListener("delta", e => apply(JSON.parse(e.data)));
+    </script>
+</body>
+</html>
+"""
+
+
+class DashboardSnapshot:
+    """
+    대시보드 상태의 불변 스냅샷 (버전 하나)
+    - update_data가 새 스냅샷을 만들어 참조를 통째로 교체 → 읽는 쪽은 락 없이 항상 일관된 버전을 봄
+    - JSON / HTML 직렬화는 버전당 처음 요청될 때 한 번만 수행하고 bytes를 캐시
+      (동시에 두 요청이 처음 접근하면 둘 다 만들 수 있지만 결과가 같으므로 무해)
+    """
+
+    __slots__ = ("version", "last_price", "order_book", "positions", "etag", "_json", "_html")
+
+    def __init__(self, version: int, last_price, order_book, positions, epoch: str):
+        self.version = version
+        self.last_price = last_price
+        self.order_book = order_book
+        self.positions = positions
+        self.etag = f"{epoch}-{version}"
+        self._json = None
+        self._html = None
+
+    @staticmethod
+    def freeze_book(order_book):
+        """
+        호출자가 넘긴 호가를 복사해 고정 ({"bids": ((price, qty), ...), ...} 또는 tuple)
+        """
+        if isinstance(order_book, dict):
+            return {side: tuple(tuple(level) for level in levels) if side in ("bids", "asks") else levels
+                    for side, levels in order_book.items()}
+        return tuple(order_book)
+
+    @staticmethod
+    def freeze_positions(positions):
+        """
+        포지션 목록을 항목까지 복사해 고정 (dict는 dict 복사, list는 tuple)
+        """
+        return tuple(dict(p) if isinstance(p, dict) else tuple(p) if isinstance(p, list) else p
+                     for p in positions)
+
+    def as_dict(self) -> dict:
+        return {"last_price": self.last_price, "order_book": self.order_book, "positions": self.positions}
+
+    def json_bytes(self) -> bytes:
+        if self._json is None:
+            self._json = json.dumps(self.as_dict(), separators=(",", ":"), default=str).encode()
+        return self._json
+
+    def html_bytes(self, template) -> bytes:
+        if self._html is None:
+            self._html = template.render(**self.as_dict()).encode()
+        return self._html
+
 
 class Dashboard:
     """
     간단한 Flask 웹 서버로 실시간 데이터 시각화 (스켈레톤)
+    - 상태는 DashboardSnapshot으로 버전 관리 (쓰는 쪽은 새 버전을 원자적으로 교체, 읽는 쪽은 락 없음)
+    - /, /data: 버전별로 캐시된 bytes + ETag (변경 없는 폴링은 304로 본문 없이 응답)
+    - /history/<metric>?start=&end=&points=: 지표 이력 (TimeSeriesStore, 요청 점 수로 다운샘플링)
+    - /stream: Server-Sent Events 스트림
+      - 접속 시 전체 스냅샷(event: snapshot), 이후 stream_interval마다 바뀐 부분만(event: delta)
+      - 호가는 바뀐 가격 단계만 [[price, qty], ...]로 전송 (qty 0 = 삭제된 단계)
+      - delta는 발행 스레드가 한 번만 직렬화하고 모든 클라이언트가 같은 bytes를 받음
+        (열린 탭 수와 무관하게 직렬화 비용 일정)
     """
 
-    def __init__(self, port=5000, logger=None):
+    def __init__(self, port=5000, stream_interval: float = 0.25, stream_history: int = 256,
+                 keepalive: float = 15.0, history: TimeSeriesStore = None, logger=None):
+        """
+        :param stream_interval: delta 발행 주기 (초) - 이보다 자주 들어온 갱신은 하나로 합쳐짐
+        :param stream_history: 보관할 최근 delta 수 (이보다 뒤처진 클라이언트는 스냅샷부터 다시 받음)
+        :param keepalive: 변경이 없을 때 연결 유지용 주석 전송 주기 (초)
+        :param history: 차트용 시계열 저장소 (기본: TimeSeriesStore 기본 설정)
+        """
         self.logger = logger or logging.getLogger(self.__class__.__name__)
         self.port = port
+        self.stream_interval = stream_interval
+        self.keepalive = keepalive
         self.app = Flask(__name__)
-        self._data_store = {
-            "last_price": None,
-            "order_book": [],
-            "positions": []
-        }
+        self.history = history if history is not None else TimeSeriesStore()
+        self._template = self.app.jinja_env.from_string(INDEX_TEMPLATE)
+
+        # 현재 버전 스냅샷 (참조 교체로만 갱신, 쓰는 쪽끼리만 _write_lock으로 직렬화)
+        self._epoch = uuid.uuid4().hex[:8]
+        self._snapshot = DashboardSnapshot(0, None, (), (), self._epoch)
+        self._write_lock = threading.Lock()
+
+        # 스트림 상태: 마지막으로 발행한 스냅샷과 최근 delta 프레임 [(seq, bytes), ...]
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._seq = 0
+        self._published = self._snapshot
+        self._frames = deque(maxlen=stream_history)
+        self._snapshot_frame = (-1, b"")
+        self._clients = 0
+        self._publisher = None
+        self._running = False
 
         # 라우트 설정
         @self.app.route("/")
         def index():
-            return self.render_index()
+            snapshot = self._snapshot
+            return self._cached_response(f"{snapshot.etag}-html", lambda: snapshot.html_bytes(self._template),
+                                         "text/html; charset=utf-8")
 
         @self.app.route("/data")
         def data():
-            return jsonify(self._data_store)
+            snapshot = self._snapshot
+            return self._cached_response(f"{snapshot.etag}-json", snapshot.json_bytes, "application/json")
+
+        @self.app.route("/history")
+        def history_metrics():
+            return jsonify(self.history.metrics())
+
+        @self.app.route("/history/<metric>")
+        def history(metric):
+            args = request.args
+            try:
+                result = self.history.query(
+                    metric,
+                    start=args.get("start", type=float),
+                    end=args.get("end", type=float),
+                    max_points=args.get("points", default=500, type=int),
+                    resolution=args.get("resolution"),
+                )
+            except KeyError:
+                return jsonify({"error": f"unknown metric: {metric}"}), 404
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            return Response(json.dumps(result, separators=(",", ":")), mimetype="application/json")
+
+        @self.app.route("/stream")
+        def stream():
+            self._ensure_publisher()
+            return Response(self._client_stream(), mimetype="text/event-stream",
+                            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
     def render_index(self):
         """
-        간단한 HTML 템플릿, 실무에서는 별도 .html 파일을 사용 가능
-        """
-        template = """
-        <html>
-        <head>
-            <title>Real-time Dashboard</title>
-        </head>
-        <body>
-            <h1>My Trading Dashboard</h1>
-            <p>Last Price: {{ last_price }}</p>
-            <h2>Order Book</h2>
-            <ul>
-            {% for bidask in order_book %}
-                <li>{{ bidask }}</li>
-            {% endfor %}
-            </ul>
-            <h2>Positions</h2>
-            <ul>
-            {% for pos in positions %}
-                <li>{{ pos }}</li>
-            {% endfor %}
-            </ul>
-        </body>
-        </html>
-        """
-        return render_template_string(
-            template,
-            last_price=self._data_store["last_price"],
-            order_book=self._data_store["order_book"],
-            positions=self._data_store["positions"],
-        )
+        현재 스냅샷으로 첫 화면 렌더링 (미리 컴파일한 템플릿 사용, 같은 버전은 캐시된 bytes 재사용)
+        - 이후 화면 갱신은 /stream의 snapshot/delta로 처리
+        """
+        return self._snapshot.html_bytes(self._template)
 
     def start(self):
         """
         Flask 앱 실행 (blocking)
         """
         self.logger.info(f"Starting dashboard on port {self.port}...")
-        self.app.run(host="0.0.0.0", port=self.port, debug=False)
+        self._ensure_publisher()
+        self.app.run(host="0.0.0.0", port=self.port, debug=False, threaded=True)
+
+    def stop(self):
+        """
+        delta 발행 스레드 중지 (열린 스트림도 종료됨)
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._publisher is not None:
+            self._publisher.join()
+            self._publisher = None
 
     def update_data(self, last_price=None, order_book=None, positions=None):
         """
-        외부에서 새로운 데이터를 받아서 _data_store를 업데이트
+        외부에서 새로운 데이터를 받아서 새 버전 스냅샷으로 교체 (last_price는 "price" 이력에도 기록)
+        - 넘긴 객체는 복사해 고정하므로 호출자가 이후에 제자리에서 고쳐도 발행된 버전은 바뀌지 않음
+        - 직렬화/전송은 하지 않음 (요청 시 버전당 한 번, 스트림은 발행 스레드가 stream_interval마다 처리)
         """
+        with self._write_lock:
+            current = self._snapshot
+            self._snapshot = DashboardSnapshot(
+                current.version + 1,
+                current.last_price if last_price is None else last_price,
+                current.order_book if order_book is None else DashboardSnapshot.freeze_book(order_book),
+                current.positions if positions is None else DashboardSnapshot.freeze_positions(positions),
+                self._epoch,
+            )
         if last_price is not None:
-            self._data_store["last_price"] = last_price
-        if order_book is not None:
-            self._data_store["order_book"] = order_book
-        if positions is not None:
-            self._data_store["positions"] = positions
+            self.record("price", last_price)
+
+    def record(self, metric: str, value: float, timestamp: float = None):
+        """
+        차트용 지표 값 기록 (예: "imbalance", "signal", "pnl") - /history/<metric>으로 조회
+        """
+        self.history.append(metric, value, timestamp)
+
+    def snapshot(self) -> DashboardSnapshot:
+        """
+        현재 버전 스냅샷 (불변, 락 없이 읽음)
+        """
+        return self._snapshot
+
+    @staticmethod
+    def _cached_response(etag: str, body, mimetype: str) -> Response:
+        """
+        If-None-Match가 현재 버전 ETag와 같으면 304, 아니면 캐시된 bytes로 응답
+        """
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            response = Response(body(), mimetype=mimetype)
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    # ------------------------------------------------------------
+    # 스트리밍
+    # ------------------------------------------------------------
+    @staticmethod
+    def _frame(event: str, seq: int, payload: dict) -> bytes:
+        data = json.dumps(payload, separators=(",", ":"), default=str)
+        return f"id: {seq}\nevent: {event}\ndata: {data}\n\n".encode()
+
+    @staticmethod
+    def _levels(side) -> dict:
+        """
+        가격 -> (원래 가격 값, 수량) (delta에도 스냅샷과 같은 JSON 값/타입의 가격을 보내기 위해 원래 값 보관)
+        """
+        return {float(price): (price, qty) for price, qty in side}
+
+    @classmethod
+    def _book_delta(cls, old, new) -> dict:
+        """
+        호가 변경분 ({"bids": [[price, qty], ...], "asks": [...]}, 사라진 단계는 qty 0)
+        - 호가가 bids/asks dict 형태가 아니면 전체를 "order_book"으로 보냄
+        """
+        if not (isinstance(old, dict) and isinstance(new, dict)):
+            return {"order_book": new}
+        delta = {}
+        for side in ("bids", "asks"):
+            before = cls._levels(old.get(side, []))
+            after = cls._levels(new.get(side, []))
+            changed = [[price, qty] for key, (price, qty) in after.items()
+                       if key not in before or before[key][1] != qty]
+            changed += [[price, 0] for key, (price, _) in before.items() if key not in after]
+            if changed:
+                delta[side] = changed
+        return delta
+
+    def _publish(self):
+        """
+        마지막 발행 이후 바뀐 부분을 delta 프레임 하나로 직렬화해 보관하고 대기 중인 클라이언트를 깨움 (락을 잡은 상태에서 호출)
+        """
+        current = self._snapshot
+        published = self._published
+        delta = {}
+        if current.last_price != published.last_price:
+            delta["last_price"] = current.last_price
+        if current.order_book is not published.order_book and current.order_book != published.order_book:
+            delta.update(self._book_delta(published.order_book, current.order_book))
+        if current.positions is not published.positions and current.positions != published.positions:
+            delta["positions"] = current.positions
+        self._published = current
+        if not delta:
+            return
+        self._seq += 1
+        delta["seq"] = self._seq
+        self._frames.append((self._seq, self._frame("delta", self._seq, delta)))
+        self._cond.notify_all()
+
+    def _publish_loop(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                if self._snapshot is not self._published:
+                    self._publish()
+            time.sleep(self.stream_interval)
+
+    def _ensure_publisher(self):
+        with self._lock:
+            if self._publisher is not None and self._publisher.is_alive():
+                return
+            self._running = True
+            self._publisher = threading.Thread(target=self._publish_loop, name="DashboardPublisher", daemon=True)
+            self._publisher.start()
+
+    def _stream_snapshot(self):
+        """
+        마지막으로 발행한 상태의 스냅샷 프레임 (seq가 바뀔 때만 다시 직렬화, 락을 잡은 상태에서 호출)
+        """
+        if self._snapshot_frame[0] != self._seq:
+            payload = dict(self._published.as_dict(), seq=self._seq)
+            self._snapshot_frame = (self._seq, self._frame("snapshot", self._seq, payload))
+        return self._snapshot_frame
+
+    def _client_stream(self):
+        """
+        클라이언트 하나의 SSE 제너레이터: 스냅샷 후 공유 delta 프레임을 순서대로 전달
+        """
+        with self._cond:
+            self._clients += 1
+            if self._snapshot is not self._published:
+                self._publish()
+            seq, frame = self._stream_snapshot()
+        try:
+            yield frame
+            while True:
+                with self._cond:
+                    if self._running and (not self._frames or self._frames[-1][0] <= seq):
+                        self._cond.wait(self.keepalive)
+                    if not self._running:
+                        return
+                    frames = self._frames
+                    if not frames or frames[-1][0] <= seq:
+                        pending = None
+                    elif frames[0][0] > seq + 1:
+                        # 보관 범위보다 뒤처짐 → 스냅샷부터 다시
+                        seq, frame = self._stream_snapshot()
+                        pending = [frame]
+                    else:
+                        pending = [f for s, f in frames if s > seq]
+                        seq = frames[-1][0]
+                if pending is None:
+                    yield b": keepalive\n\n"
+                else:
+                    yield b"".join(pending)
+        finally:
+            with self._lock:
+                self._clients -= 1
+
+    def stream_stats(self) -> dict:
+        with self._lock:
+            return {"clients": self._clients, "seq": self._seq, "buffered_frames": len(self._frames)}
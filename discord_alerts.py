@@ -1,34 +1,69 @@
 # notification/discord_alerts.py
 
 import logging
+import time
 import requests
+from requests.adapters import HTTPAdapter
 
 class DiscordAlerts:
     """
     디스코드 웹훅(Discord Webhook)으로 메시지를 보내는 클래스 예시
+    - keep-alive 세션 재사용, 요청 timeout 적용
+    - 429 응답 시 retry_after 동안 blocked_until을 설정 (AlertDispatcher가 참고)
     """
 
-    def __init__(self, webhook_url: str, logger=None):
+    # 디스코드 메시지 최대 길이 / 웹훅 전송 한도 (채널당 약 5회/2초, 분당 30회)
+    max_length = 2000
+    rate_per_sec = 0.5
+    burst = 5
+
+    def __init__(self, webhook_url: str, timeout: float = 5.0, logger=None):
         """
         :param webhook_url: 디스코드 웹훅 URL
+        :param timeout: 요청 timeout (초)
         """
         self.webhook_url = webhook_url
+        self.timeout = timeout
         self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.name = "discord"
+        self.blocked_until = 0.0
+        self._session = None
+
+    def _get_session(self) -> requests.Session:
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
 
-    def send_message(self, content: str):
+    def send_message(self, content: str) -> bool:
         """
         간단히 content 문자열을 디스코드 채널에 전송
+        :return: 전송 성공 여부
         """
         if not self.webhook_url:
             self.logger.warning("No Discord Webhook URL configured.")
-            return
+            return False
 
         payload = {
-            "content": content
+            "content": content[:self.max_length]
         }
         try:
-            resp = requests.post(self.webhook_url, json=payload)
+            resp = self._get_session().post(self.webhook_url, json=payload, timeout=self.timeout)
+            if resp.status_code == 429:
+                try:
+                    retry_after = float(resp.json().get("retry_after", 1.0))
+                except ValueError:
+                    retry_after = float(resp.headers.get("Retry-After", 1.0))
+                self.blocked_until = time.monotonic() + retry_after
+                self.logger.warning(f"Discord rate limited, retry after {retry_after:.1f}s.")
+                return False
             if resp.status_code != 204 and resp.status_code != 200:
                 self.logger.error(f"Discord message failed: {resp.text}")
+                return False
+            return True
         except Exception as e:
             self.logger.exception(f"Error sending Discord message: {e}")
+            return False
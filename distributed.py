@@ -0,0 +1,418 @@
+# backtesting/distributed.py
+
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import socket
+import threading
+import time
+import traceback
+from multiprocessing.connection import Client, Listener
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .backtest_runner import BacktestRunner
+from .result_cache import ResultCache
+from .shared_data import has_local, local_spec, register_local
+
+# 메시지 (multiprocessing.connection: 길이 접두 pickle 프레임 + authkey HMAC 인증)
+# 코디네이터 → 워커: ("task", task_id, data_key, pickle된 (func, args)) / ("data", data_key, DataFrame) / ("stop",)
+# 워커 → 코디네이터: ("hello", name, [data_key, ...], strategy_key) / ("heartbeat",)
+#                    / ("need_data", data_key) / ("result", task_id, ok, value)
+
+
+class RemoteTaskError(Exception):
+    """
+    원격 워커에서 작업 함수가 예외를 낸 경우 (워커 쪽 traceback 문자열 포함)
+    """
+
+
+class _Task:
+    __slots__ = ("task_id", "payload", "data_key", "on_done", "attempts")
+
+    def __init__(self, task_id, payload, data_key, on_done):
+        self.task_id = task_id
+        self.payload = payload
+        self.data_key = data_key
+        self.on_done = on_done
+        self.attempts = 0
+
+
+class DistributedPool:
+    """
+    TCP로 접속한 원격 워커(DistributedWorker)에 작업을 나눠 주는 코디네이터
+    - StrategyOptimizer가 쓰는 multiprocessing.Pool 메서드(imap / map / apply_async / close / join)와 같은 인터페이스
+      → StrategyOptimizer(runner, coordinator=pool)이면 grid_search / search / walk_forward가 그대로 원격 실행
+    - 워커는 접속 시 로컬에 가진 데이터셋 키(ResultCache.data_key)를 알리고, 없는 데이터만 한 번 전송받음
+    - 워커당 작업 하나씩 전달, 결과는 끝나는 대로 스트리밍 (imap은 입력 순서, callback은 완료 순서)
+    - 연결이 끊기거나 heartbeat_timeout 동안 응답이 없으면 작업을 다른 워커에 다시 배정 (최대 max_retries회)
+    - 작업 함수 자체의 예외는 재시도하지 않고 RemoteTaskError로 전달
+    pickle을 주고받으므로 신뢰할 수 있는 네트워크에서 authkey를 지정해 사용할 것
+    """
+
+    def __init__(self, address=("0.0.0.0", 50051), authkey: bytes = b"ordre-book",
+                 heartbeat_timeout: float = 30.0, max_retries: int = 3, logger=None):
+        """
+        :param address: 코디네이터가 listen할 (host, port) - port 0이면 임의 포트 (self.address로 확인)
+        :param heartbeat_timeout: 작업 중인 워커에게서 이 시간 동안 아무 메시지도 없으면 연결 끊김으로 간주
+        :param max_retries: 워커 유실 시 한 작업을 다시 배정하는 최대 횟수
+        """
+        self.authkey = authkey
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_retries = max_retries
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+        self._listener = Listener(address, authkey=authkey)
+        self.address = self._listener.address
+        self._tasks: "queue.Queue[_Task]" = queue.Queue()
+        self._task_ids = itertools.count()
+        self._datasets: Dict[str, pd.DataFrame] = {}
+        self._strategy_key: Optional[str] = None
+        self._workers: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+        self._accept_thread = threading.Thread(target=self._accept_loop, name="DistributedPool-accept", daemon=True)
+        self._accept_thread.start()
+        self.logger.info(f"Coordinator listening on {self.address[0]}:{self.address[1]}")
+
+    # ------------------------------------------------------------
+    # 데이터 / 워커 관리
+    # ------------------------------------------------------------
+    def set_data(self, price_data: pd.DataFrame, data_key: str = None, strategy_key: str = None) -> dict:
+        """
+        이후 제출하는 작업이 사용할 데이터셋 등록
+        :param strategy_key: 지정하면 같은 전략 코드(ResultCache.strategy_key)를 가진 워커에만 작업 전달
+        :return: 작업 인자에 넣을 data spec ({"kind": "local", "name": data_key})
+        """
+        data_key = data_key or ResultCache.data_key(price_data)
+        with self._lock:
+            self._datasets = {data_key: price_data}
+            self._strategy_key = strategy_key
+        return local_spec(data_key)
+
+    @property
+    def num_workers(self) -> int:
+        with self._lock:
+            return len(self._workers)
+
+    def workers(self) -> List[dict]:
+        with self._lock:
+            return [dict(info) for info in self._workers.values()]
+
+    def wait_for_workers(self, count: int, timeout: float = None) -> bool:
+        """
+        count개 이상의 워커가 접속할 때까지 대기
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.num_workers < count:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _accept_loop(self):
+        while not self._closed.is_set():
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, multiprocessing.AuthenticationError):
+                # close()로 listener가 닫혔거나 인증 실패
+                if self._closed.is_set():
+                    return
+                self.logger.warning("Rejected a worker connection (handshake failed).")
+                continue
+            thread = threading.Thread(target=self._serve, args=(conn,), name="DistributedPool-worker", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _serve(self, conn):
+        """
+        워커 연결 하나를 담당하는 스레드: 작업 하나 전달 → 결과 수신 반복
+        """
+        task = None
+        name = None
+        stop_worker = False
+        try:
+            if not conn.poll(self.heartbeat_timeout):
+                raise TimeoutError("no hello from worker")
+            hello = conn.recv()
+            _, name, data_keys, strategy_key = hello
+            with self._lock:
+                name = name if name not in self._workers else f"{name}#{id(conn)}"
+                self._workers[name] = {"name": name, "tasks_done": 0, "connected_at": time.time()}
+            self.logger.info(f"Worker {name} connected ({len(data_keys)} local datasets).")
+
+            while not self._closed.is_set():
+                try:
+                    task = self._tasks.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                with self._lock:
+                    expected = self._strategy_key
+                if expected is not None and strategy_key != expected:
+                    # 다른 전략 코드를 가진 워커에는 작업을 주지 않음 (작업은 다른 워커가 처리)
+                    self._tasks.put(task)
+                    task = None
+                    self.logger.error(f"Worker {name} runs different strategy code; stopping it.")
+                    stop_worker = True
+                    return
+                conn.send(("task", task.task_id, task.data_key, task.payload))
+                while True:
+                    if not conn.poll(self.heartbeat_timeout):
+                        raise TimeoutError(f"no heartbeat for {self.heartbeat_timeout}s")
+                    message = conn.recv()
+                    kind = message[0]
+                    if kind == "heartbeat":
+                        continue
+                    if kind == "need_data":
+                        with self._lock:
+                            price_data = self._datasets.get(message[1])
+                        conn.send(("data", message[1], price_data))
+                        continue
+                    if kind == "result":
+                        _, task_id, ok, value = message
+                        done, task = task, None
+                        with self._lock:
+                            self._workers[name]["tasks_done"] += 1
+                        done.on_done(ok, value if ok else RemoteTaskError(value))
+                        break
+        except (EOFError, OSError, TimeoutError, ValueError) as e:
+            if not self._closed.is_set():
+                self.logger.warning(f"Lost worker {name or '?'}: {type(e).__name__} {e}")
+        finally:
+            if task is not None:
+                self._retry(task, name)
+            with self._lock:
+                self._workers.pop(name, None)
+            try:
+                if stop_worker or self._closed.is_set():
+                    conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+            conn.close()
+
+    def _retry(self, task: _Task, worker_name: str):
+        task.attempts += 1
+        if task.attempts > self.max_retries:
+            task.on_done(False, RemoteTaskError(
+                f"Task {task.task_id} failed: worker lost {task.attempts} times (last: {worker_name})."
+            ))
+            return
+        self.logger.info(f"Re-queueing task {task.task_id} (attempt {task.attempts + 1}).")
+        self._tasks.put(task)
+
+    # ------------------------------------------------------------
+    # multiprocessing.Pool 호환 인터페이스
+    # ------------------------------------------------------------
+    def _submit(self, func: Callable, args: Any, on_done: Callable) -> int:
+        if self._closed.is_set():
+            raise ValueError("Pool not running")
+        with self._lock:
+            data_key = next(iter(self._datasets), None)
+        # 한 번만 pickle (재배정 시 재사용, pickle 불가능한 인자는 제출 시점에 바로 오류)
+        payload = pickle.dumps((func, args), protocol=pickle.HIGHEST_PROTOCOL)
+        task = _Task(next(self._task_ids), payload, data_key, on_done)
+        self._tasks.put(task)
+        return task.task_id
+
+    def apply_async(self, func: Callable, args: tuple = (), callback: Callable = None,
+                    error_callback: Callable = None) -> int:
+        """
+        func(*args)를 원격에서 실행하고 완료되면 callback(결과) 또는 error_callback(예외) 호출 (수신 스레드에서)
+        """
+        def on_done(ok, value):
+            if ok:
+                if callback is not None:
+                    callback(value)
+            elif error_callback is not None:
+                error_callback(value)
+            else:
+                self.logger.error(f"Remote task failed: {value}")
+
+        return self._submit(func, ("call", args), on_done)
+
+    def imap(self, func: Callable, iterable: Iterable) -> Iterable:
+        """
+        func(item)을 원격에서 실행하고 입력 순서대로 결과를 yield (앞 작업이 끝나는 즉시 반환)
+        """
+        items = list(iterable)
+        results: Dict[int, tuple] = {}
+        ready = threading.Condition()
+
+        def make_callback(position):
+            def on_done(ok, value):
+                with ready:
+                    results[position] = (ok, value)
+                    ready.notify_all()
+            return on_done
+
+        for position, item in enumerate(items):
+            self._submit(func, ("item", item), make_callback(position))
+        if items and self.num_workers == 0:
+            self.logger.warning("No workers connected yet; tasks are queued until a worker joins.")
+
+        for position in range(len(items)):
+            with ready:
+                while position not in results:
+                    ready.wait()
+                ok, value = results.pop(position)
+            if not ok:
+                raise value
+            yield value
+
+    def map(self, func: Callable, iterable: Iterable) -> list:
+        return list(self.imap(func, iterable))
+
+    def close(self):
+        """
+        새 작업을 받지 않고 워커에 종료 메시지 전송 (대기 중인 작업은 실패 처리)
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        # 다른 스레드의 accept()는 소켓을 닫아도 깨어나지 않으므로 직접 접속해서 깨움
+        host, port = self.address
+        try:
+            with socket.create_connection(("127.0.0.1" if host in ("0.0.0.0", "") else host, port), timeout=1):
+                pass
+        except OSError:
+            pass
+        self._accept_thread.join(timeout=5)
+        try:
+            self._listener.close()
+        except OSError:
+            pass
+        while True:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                break
+            task.on_done(False, RemoteTaskError("Coordinator closed before the task ran."))
+
+    def join(self):
+        for thread in list(self._threads):
+            thread.join(timeout=self.heartbeat_timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        self.join()
+
+
+class DistributedWorker:
+    """
+    코디네이터(DistributedPool)에 접속해 작업을 받아 실행하는 원격 워커 프로세스
+    - runner(전략 함수)와 데이터셋은 워커 쪽에 로컬로 준비 (데이터가 없으면 코디네이터에서 한 번 전송받아 보관)
+    - 작업 실행 중에는 별도 스레드가 heartbeat를 보내 코디네이터가 살아 있는지 판단할 수 있게 함
+    - 코디네이터 연결이 끊기면 reconnect_delay 간격으로 다시 접속 (stop 메시지를 받으면 종료)
+    사용 예 (연구용 서버마다 여러 프로세스 실행):
+        worker = DistributedWorker(BacktestRunner(example_strategy), ("coordinator-host", 50051),
+                                   authkey=b"secret", datasets=[HistoricalDataLoader().load("BTCUSDT_1m")])
+        worker.run()
+    """
+
+    def __init__(self, runner: BacktestRunner, address, authkey: bytes = b"ordre-book",
+                 datasets: Iterable[pd.DataFrame] = (), name: str = None, heartbeat_interval: float = 5.0,
+                 reconnect_delay: float = 1.0, max_reconnects: int = None, logger=None):
+        """
+        :param datasets: 로컬에 가진 가격 데이터 (내용 해시로 코디네이터 데이터와 매칭)
+        :param max_reconnects: 연속 접속 실패 허용 횟수 (None이면 무제한)
+        """
+        from .strategy_optimizer import _init_worker
+
+        self.runner = runner
+        self.address = tuple(address)
+        self.authkey = authkey
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.heartbeat_interval = heartbeat_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnects = max_reconnects
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.tasks_done = 0
+
+        # 최적화 워커 함수(_worker_chunk 등)가 쓰는 프로세스 전역 runner 설정
+        _init_worker(runner)
+        self.strategy_key = ResultCache.strategy_key(runner.strategy_func)
+        self.data_keys = []
+        for price_data in datasets:
+            key = ResultCache.data_key(price_data)
+            register_local(key, price_data)
+            self.data_keys.append(key)
+
+    def run(self):
+        failures = 0
+        while True:
+            try:
+                conn = Client(self.address, authkey=self.authkey)
+            except (OSError, EOFError) as e:
+                failures += 1
+                if self.max_reconnects is not None and failures > self.max_reconnects:
+                    self.logger.error(f"Could not reach coordinator {self.address}: {e}")
+                    return
+                time.sleep(self.reconnect_delay)
+                continue
+            failures = 0
+            try:
+                if self._session(conn):
+                    return
+            except (EOFError, OSError) as e:
+                self.logger.warning(f"Connection to coordinator lost: {e}")
+            finally:
+                conn.close()
+            time.sleep(self.reconnect_delay)
+
+    def _session(self, conn) -> bool:
+        """
+        연결 하나에서 작업 처리 (:return: 코디네이터가 stop을 보냈으면 True)
+        """
+        send_lock = threading.Lock()
+
+        def send(message):
+            with send_lock:
+                conn.send(message)
+
+        send(("hello", self.name, self.data_keys, self.strategy_key))
+        self.logger.info(f"Worker {self.name} connected to {self.address}.")
+        while True:
+            message = conn.recv()
+            if message[0] == "stop":
+                self.logger.info(f"Worker {self.name} stopped after {self.tasks_done} tasks.")
+                return True
+            _, task_id, data_key, payload = message
+
+            if data_key is not None and not has_local(data_key):
+                send(("need_data", data_key))
+                reply = conn.recv()
+                register_local(data_key, reply[2])
+                self.data_keys.append(data_key)
+
+            done = threading.Event()
+
+            def heartbeat():
+                while not done.wait(self.heartbeat_interval):
+                    try:
+                        send(("heartbeat",))
+                    except (OSError, ValueError):
+                        return
+
+            beat = threading.Thread(target=heartbeat, daemon=True)
+            beat.start()
+            try:
+                # 워커 쪽에서 함수를 찾지 못하는 경우(다른 코드 버전 등)도 작업 오류로 보고
+                func, (style, args) = pickle.loads(payload)
+                value = func(*args) if style == "call" else func(args)
+                result = ("result", task_id, True, value)
+            except Exception:
+                result = ("result", task_id, False, traceback.format_exc())
+            finally:
+                done.set()
+                beat.join()
+            send(result)
+            self.tasks_done += 1
@@ -0,0 +1,182 @@
+# benchmarks/distributed_harness.py
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from backtesting.backtest_runner import BacktestRunner, example_strategy
+from backtesting.distributed import DistributedPool, DistributedWorker
+from backtesting.strategy_optimizer import StrategyOptimizer, _evaluate
+
+_AUTHKEY = b"distributed-harness"
+_QUIET = logging.getLogger("distributed_harness.quiet")
+_QUIET.setLevel(logging.WARNING)
+
+# ProcessPoolExecutor 기준 실행용 워커 전역 상태
+_REFERENCE = None
+
+
+def slow_strategy(price_data: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """
+    example_strategy + 고정 지연 (스윕 도중에 워커를 죽일 시간 확보, 결과는 example_strategy와 동일)
+    """
+    time.sleep(params.get("delay", 0.0))
+    return example_strategy(price_data, params)
+
+
+def make_price_data(rows: int = 20000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.001, rows)))},
+        index=pd.date_range("2024-01-01", periods=rows, freq="1min"),
+    )
+
+
+def make_grid(delay: float) -> dict:
+    return {"short_window": [3, 5, 8, 10, 13, 15, 20, 25], "long_window": [40, 60, 90, 120, 160, 200],
+            "delay": [delay]}
+
+
+def _init_reference(runner, price_data):
+    global _REFERENCE
+    _REFERENCE = (runner, price_data)
+
+
+def _reference_task(params_dict):
+    runner, price_data = _REFERENCE
+    params_dict, metrics, _ = _evaluate(runner, price_data, params_dict)
+    return {**params_dict, **metrics}
+
+
+def reference_results(price_data: pd.DataFrame, grid: dict, max_workers: int) -> pd.DataFrame:
+    """
+    같은 조합을 ProcessPoolExecutor로 실행한 기준 결과
+    """
+    keys = list(grid)
+    combos = [dict(zip(keys, values)) for values in pd.MultiIndex.from_product(grid.values())]
+    runner = BacktestRunner(slow_strategy, logger=_QUIET)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_reference,
+                             initargs=(runner, price_data)) as executor:
+        return pd.DataFrame(list(executor.map(_reference_task, combos)))
+
+
+def _run_worker(address, name: str, heartbeat_interval: float):
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(name)s %(message)s")
+    worker = DistributedWorker(BacktestRunner(slow_strategy, logger=_QUIET), address, authkey=_AUTHKEY,
+                               name=name, heartbeat_interval=heartbeat_interval, max_reconnects=20,
+                               reconnect_delay=0.2)
+    worker.run()
+
+
+def distributed_results(price_data: pd.DataFrame, grid: dict, num_workers: int, failure: str,
+                        heartbeat_timeout: float, logger) -> tuple:
+    """
+    로컬 워커 num_workers개로 grid_search를 실행하고, 전체 작업의 약 1/3이 끝나면 워커 하나에 장애를 냄
+    - failure="kill": SIGKILL (연결이 바로 끊김 → 즉시 재배정)
+    - failure="hang": SIGSTOP (연결은 살아 있고 heartbeat만 끊김 → heartbeat_timeout 뒤 재배정)
+    :return: (결과 DataFrame, 장애 시점 정보)
+    """
+    pool = DistributedPool(("127.0.0.1", 0), authkey=_AUTHKEY, heartbeat_timeout=heartbeat_timeout,
+                           max_retries=2, logger=logger)
+    processes = [
+        multiprocessing.Process(target=_run_worker, args=(pool.address, f"worker-{i}", heartbeat_timeout / 5),
+                                daemon=True)
+        for i in range(num_workers)
+    ]
+    for process in processes:
+        process.start()
+    victim = processes[0]
+    injected = {}
+    done = threading.Event()
+
+    def inject():
+        total = len(StrategyOptimizer._chunks(list(range(np.prod([len(v) for v in grid.values()]))),
+                                              num_workers))
+        while not done.is_set():
+            finished = sum(w["tasks_done"] for w in pool.workers())
+            if finished >= total // 3:
+                os.kill(victim.pid, signal.SIGKILL if failure == "kill" else signal.SIGSTOP)
+                injected.update(failure=failure, after_tasks=finished)
+                logger.warning(f"Injected {failure} into worker-0 after {finished}/{total} tasks.")
+                return
+            time.sleep(0.01)
+
+    try:
+        if not pool.wait_for_workers(num_workers, timeout=30):
+            raise AssertionError(f"only {pool.num_workers}/{num_workers} workers connected")
+        injector = threading.Thread(target=inject, daemon=True)
+        injector.start()
+        with StrategyOptimizer(BacktestRunner(slow_strategy, logger=_QUIET), coordinator=pool,
+                               logger=_QUIET) as optimizer:
+            started = time.monotonic()
+            results = optimizer.grid_search(price_data, grid, max_workers=num_workers)
+            injected["elapsed"] = time.monotonic() - started
+        done.set()
+        injector.join()
+        injected["workers_left"] = pool.num_workers
+        return results, injected
+    finally:
+        done.set()
+        pool.close()
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGKILL)
+            process.join(timeout=5)
+
+
+def compare(actual: pd.DataFrame, expected: pd.DataFrame, keys: List[str]):
+    actual = actual.sort_values(keys).reset_index(drop=True)
+    expected = expected.sort_values(keys).reset_index(drop=True)
+    assert len(actual) == len(expected), f"{len(actual)} rows != reference {len(expected)}"
+    pd.testing.assert_frame_equal(actual[expected.columns], expected, check_dtype=False)
+
+
+def main():
+    """
+    로컬 워커 N개로 분산 grid_search를 돌리다 하나를 죽이고(또는 멈추고),
+    결과가 ProcessPoolExecutor 실행과 같은지 확인
+    """
+    parser = argparse.ArgumentParser(description="DistributedPool failure harness")
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--failure", choices=("kill", "hang", "both"), default="both")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--delay", type=float, default=0.05, help="백테스트 1회당 추가 지연(초)")
+    parser.add_argument("--heartbeat-timeout", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    logger = logging.getLogger("distributed_harness")
+
+    price_data = make_price_data(args.rows, args.seed)
+    grid = make_grid(args.delay)
+    expected = reference_results(price_data, grid, max(1, args.workers - 1))
+    logger.info(f"Reference (ProcessPoolExecutor): {len(expected)} combinations.")
+
+    ok = True
+    for failure in (("kill", "hang") if args.failure == "both" else (args.failure,)):
+        try:
+            actual, info = distributed_results(price_data, grid, args.workers, failure, args.heartbeat_timeout,
+                                               logger)
+            assert info.get("failure") == failure, "sweep finished before the failure was injected"
+            assert info["workers_left"] == args.workers - 1, f"{info['workers_left']} workers left connected"
+            compare(actual, expected, list(grid))
+        except AssertionError as e:
+            ok = False
+            logger.error(f"FAIL {failure}: {e}")
+        else:
+            logger.info(f"ok   {failure}: {len(actual)} rows match, {info}")
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 import time
 import hmac
+import json
 import hashlib
 import requests
 import logging
@@ -35,13 +36,63 @@ class BinanceFuturesAPI:
             "X-MBX-APIKEY": self.api_key
         }
 
-    def place_order(self, symbol: str, side: str, order_type: str, quantity: float, price: float = None) -> dict:
+    # /fapi/v1/batchOrders 한 번의 요청에 담을 수 있는 최대 주문 수
+    MAX_BATCH_ORDERS = 5
+
+    def place_order(self, symbol: str, side: str, order_type: str, quantity: float, price: float = None,
+                    time_in_force: str = "GTC") -> dict:
         """
         주문 발행 (예: MARKET or LIMIT)
+        - time_in_force: LIMIT 주문의 유효 조건 ("GTC", "IOC", "FOK", Post-only는 "GTX")
         """
         endpoint = "/fapi/v1/order"
         url = self.base_url + endpoint
 
+        params = self._order_params(symbol, side, order_type, quantity, price, time_in_force)
+
+        # 서명
+        params = self._sign(params)
+
+        self.logger.debug(f"Placing order: {params}")
+        response = requests.post(url, params=params, headers=self._headers())
+        return response.json()
+
+    def place_batch_orders(self, orders: list) -> list:
+        """
+        여러 주문을 묶어서 발행 (/fapi/v1/batchOrders, 요청당 최대 5건)
+        :param orders: [{"symbol":..., "side":..., "order_type":..., "quantity":..., "price":..., "time_in_force":...}, ...]
+        :return: 주문 순서와 동일한 순서의 응답 리스트 (개별 실패 시 {"code":..., "msg":...})
+        """
+        endpoint = "/fapi/v1/batchOrders"
+        url = self.base_url + endpoint
+
+        results = []
+        for i in range(0, len(orders), self.MAX_BATCH_ORDERS):
+            chunk = orders[i:i + self.MAX_BATCH_ORDERS]
+            batch = []
+            for o in chunk:
+                order_params = self._order_params(
+                    o["symbol"], o["side"], o.get("order_type", "LIMIT"), o["quantity"],
+                    o.get("price"), o.get("time_in_force", "GTC")
+                )
+                # batchOrders는 값이 모두 문자열이어야 함
+                batch.append({k: str(v) for k, v in order_params.items()})
+
+            params = {"batchOrders": json.dumps(batch, separators=(",", ":"))}
+            params = self._sign(params)
+
+            self.logger.debug(f"Placing batch orders: {batch}")
+            response = requests.post(url, params=params, headers=self._headers())
+            data = response.json()
+            if isinstance(data, list):
+                results.extend(data)
+            else:
+                # 요청 전체가 실패한 경우, 각 주문에 같은 에러를 매핑
+                results.extend([data] * len(chunk))
+        return results
+
+    def _order_params(self, symbol: str, side: str, order_type: str, quantity: float, price: float = None,
+                      time_in_force: str = "GTC") -> dict:
         params = {
             "symbol": symbol,
             "side": side,       # "BUY" or "SELL"
@@ -50,18 +101,28 @@ class BinanceFuturesAPI:
         }
         if order_type == "LIMIT" and price:
             params["price"] = price
-            params["timeInForce"] = "GTC"
+            params["timeInForce"] = time_in_force
+        return params
 
-        # 서명
+    def cancel_order(self, symbol: str, order_id: int) -> dict:
+        """
+        주문 취소
+        """
+        endpoint = "/fapi/v1/order"
+        url = self.base_url + endpoint
+
+        params = {
+            "symbol": symbol,
+            "orderId": order_id
+        }
         params = self._sign(params)
 
-        self.logger.debug(f"Placing order: {params}")
-        response = requests.post(url, params=params, headers=self._headers())
+        response = requests.delete(url, params=params, headers=self._headers())
         return response.json()
 
-    def cancel_order(self, symbol: str, order_id: int) -> dict:
+    def get_order(self, symbol: str, order_id: int) -> dict:
         """
-        주문 취소
+        단일 주문 상태 조회 (체결 수량 executedQty, 평균 체결가 avgPrice 등)
         """
         endpoint = "/fapi/v1/order"
         url = self.base_url + endpoint
@@ -72,7 +133,7 @@ class BinanceFuturesAPI:
         }
         params = self._sign(params)
 
-        response = requests.delete(url, params=params, headers=self._headers())
+        response = requests.get(url, params=params, headers=self._headers())
         return response.json()
 
     def get_open_orders(self, symbol: str) -> dict:
@@ -102,3 +163,13 @@ class BinanceFuturesAPI:
 
         response = requests.get(url, params=params, headers=self._headers())
         return response.json()
+
+    def get_exchange_info(self) -> dict:
+        """
+        거래 규칙/심볼 필터 조회 (tick size, step size, 최소 주문 금액 등, 서명 불필요)
+        """
+        endpoint = "/fapi/v1/exchangeInfo"
+        url = self.base_url + endpoint
+
+        response = requests.get(url)
+        return response.json()
@@ -0,0 +1,376 @@
+# order_execution/execution_algorithms.py
+
+import logging
+import math
+import time
+from typing import Callable, Optional
+
+class ExecutionAlgorithm:
+    """
+    부모 주문(parent order)을 여러 자식 주문(child order)으로 나누어 집행하는 알고리즘의 기반 클래스
+    - 실시간 호가(depth)를 보고 한 번에 내는 수량을 조절
+    - 집행 결과로 도착가격(arrival price) 대비 실현 슬리피지를 보고
+    """
+
+    name = "BASE"
+
+    def __init__(
+        self,
+        exchange_api,
+        order_manager,
+        depth_provider: Callable[[str], Optional[dict]],
+        max_book_fraction: float = 0.2,
+        depth_levels: int = 5,
+        child_timeout: float = 5.0,
+        symbol_filters=None,
+        logger=None
+    ):
+        """
+        :param exchange_api: 거래소 API 객체 (ex: BinanceFuturesAPI)
+        :param order_manager: 체결 대기/취소에 사용할 OrderManager
+        :param depth_provider: symbol -> 최신 오더북 {"bids": [[price, qty], ...], "asks": [...]} 반환 함수
+        :param max_book_fraction: 자식 주문 1건이 가져갈 수 있는 상대 호가 잔량 비율 (0.2 = 20%)
+        :param depth_levels: 가용 유동성 계산에 사용할 호가 레벨 수
+        :param child_timeout: 자식 주문 체결 대기 시간(초)
+        :param symbol_filters: 자식 주문 가격/수량 양자화에 사용할 SymbolFilterRegistry (선택)
+        """
+        self.exchange_api = exchange_api
+        self.order_manager = order_manager
+        self.depth_provider = depth_provider
+        self.max_book_fraction = max_book_fraction
+        self.depth_levels = depth_levels
+        self.child_timeout = child_timeout
+        self.symbol_filters = symbol_filters
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+    def execute(self, symbol: str, side: str, quantity: float, **params) -> dict:
+        """
+        부모 주문 집행. 자식 클래스에서 구현.
+        :return: 집행 리포트 (_report 참고)
+        """
+        raise NotImplementedError
+
+    # ------------------------------------------------------------
+    # 호가 관련 헬퍼
+    # ------------------------------------------------------------
+    def _book(self, symbol: str) -> dict:
+        return self.depth_provider(symbol) or {}
+
+    @staticmethod
+    def _best(levels: list) -> Optional[float]:
+        return float(levels[0][0]) if levels else None
+
+    def _mid_price(self, book: dict) -> Optional[float]:
+        best_bid = self._best(book.get("bids", []))
+        best_ask = self._best(book.get("asks", []))
+        if best_bid is None or best_ask is None:
+            return best_bid or best_ask
+        return (best_bid + best_ask) / 2
+
+    def _available_liquidity(self, book: dict, side: str) -> float:
+        """
+        BUY는 매도호가(asks), SELL은 매수호가(bids) 상위 depth_levels 레벨 잔량 합
+        """
+        levels = book.get("asks" if side == "BUY" else "bids", [])
+        return sum(float(q) for _, q in levels[:self.depth_levels])
+
+    def _child_cap(self, book: dict, side: str, quantity: float) -> float:
+        """
+        호가 잔량 기준으로 자식 주문 수량 상한 적용 (호가 정보가 없으면 그대로)
+        """
+        liquidity = self._available_liquidity(book, side)
+        if liquidity <= 0:
+            return quantity
+        return min(quantity, liquidity * self.max_book_fraction)
+
+    def _quantize_qty(self, symbol: str, quantity: float) -> float:
+        if self.symbol_filters is None:
+            return quantity
+        return self.symbol_filters.quantize_qty(symbol, quantity)
+
+    def _quantize_price(self, symbol: str, price: float, rounding: str) -> float:
+        if self.symbol_filters is None:
+            return price
+        return self.symbol_filters.quantize_price(symbol, price, rounding)
+
+    def _min_child_qty(self, symbol: str, price: Optional[float]) -> float:
+        """
+        minQty / minNotional을 만족하는 최소 자식 주문 수량 (step size 단위로 올림, 필터가 없으면 0)
+        """
+        symbol_filter = self.symbol_filters.get(symbol) if self.symbol_filters is not None else None
+        if symbol_filter is None:
+            return 0.0
+        minimum = symbol_filter.min_qty
+        if price:
+            minimum = max(minimum, symbol_filter.min_notional / price)
+        steps = math.ceil(minimum * symbol_filter.qty_scale / symbol_filter.step_units - 1e-9)
+        return steps * symbol_filter.step_units / symbol_filter.qty_scale
+
+    @staticmethod
+    def _fit_child(child_qty: float, remaining: float, minimum: float, last: bool) -> float:
+        """
+        순차 집행(TWAP/POV) 자식 주문 수량을 최소 주문 단위에 맞춤 (remaining은 양자화된 남은 수량)
+        - 이번 주문 후 남을 수량이 최소 단위 미만이면 이번 주문에 합침
+        - 이번 주문이 최소 단위 미만이면 0 (다음 자식 주문으로 이월), 마지막 기회면 최소 단위로 올림
+        """
+        if remaining - child_qty < minimum:
+            return remaining
+        if child_qty <= 0 or child_qty < minimum:
+            return min(remaining, minimum) if last and minimum > 0 else 0.0
+        return child_qty
+
+    def _merge_small(self, symbol: str, quantities: list, prices: list) -> list:
+        """
+        minQty / minNotional 미만인 자식 주문을 이웃 자식 주문에 합침 (동시에 내는 지정가 레이어용)
+        - 앞에서부터 최소 단위에 못 미치는 수량은 다음 레이어로 넘기고, 끝에 남으면 직전 레이어에 더함
+        :return: [(수량, 가격), ...] (전체가 최소 단위 미만이면 빈 리스트)
+        """
+        children, carry = [], 0.0
+        for qty, price in zip(quantities, prices):
+            qty = self._quantize_qty(symbol, qty + carry)
+            if qty <= 0 or qty < self._min_child_qty(symbol, price):
+                carry = qty
+                continue
+            carry = 0.0
+            children.append([qty, price])
+        if carry > 0 and children:
+            children[-1][0] = self._quantize_qty(symbol, children[-1][0] + carry)
+        return [tuple(child) for child in children]
+
+    # ------------------------------------------------------------
+    # 주문/체결 헬퍼
+    # ------------------------------------------------------------
+    def _fill_of(self, symbol: str, response: dict, wait: bool = True) -> tuple:
+        """
+        자식 주문 응답에서 (체결 수량, 평균 체결가) 추출
+        - 즉시 FILLED가 아니면 체결을 기다리고, 남은 수량은 취소
+        """
+        order_id = response.get("orderId")
+        if not order_id:
+            self.logger.error(f"Child order rejected: {response}")
+            return 0.0, 0.0
+
+        if response.get("status") != "FILLED" and wait:
+            filled = self.order_manager.wait_for_fill(symbol, order_id, timeout=self.child_timeout)
+            if not filled:
+                self.order_manager.cancel_order(symbol, order_id)
+            response = self.exchange_api.get_order(symbol, order_id)
+
+        executed_qty = float(response.get("executedQty", 0) or 0)
+        avg_price = float(response.get("avgPrice", 0) or 0)
+        return executed_qty, avg_price
+
+    def _report(self, symbol: str, side: str, quantity: float, arrival_price: Optional[float],
+                fills: list, child_orders: list, started_at: float) -> dict:
+        """
+        집행 리포트 생성
+        - slippage_bps: 도착가격 대비 불리한 방향이 양수 (BUY는 비싸게, SELL은 싸게 체결될수록 증가)
+        """
+        filled_qty = sum(q for q, _ in fills)
+        avg_price = sum(q * p for q, p in fills) / filled_qty if filled_qty else 0.0
+
+        slippage_bps = None
+        if arrival_price and filled_qty:
+            direction = 1 if side == "BUY" else -1
+            slippage_bps = direction * (avg_price - arrival_price) / arrival_price * 10000
+
+        report = {
+            "algo": self.name,
+            "symbol": symbol,
+            "side": side,
+            "quantity": quantity,
+            "filled_qty": filled_qty,
+            "avg_price": avg_price,
+            "arrival_price": arrival_price,
+            "slippage_bps": slippage_bps,
+            "child_orders": child_orders,
+            "elapsed": time.time() - started_at,
+        }
+        self.logger.info(
+            f"[{self.name}] {symbol} {side} filled {filled_qty}/{quantity} "
+            f"avg={avg_price} arrival={arrival_price} slippage_bps={slippage_bps}"
+        )
+        return report
+
+
+class TWAPAlgorithm(ExecutionAlgorithm):
+    """
+    TWAP: duration 동안 num_slices개의 시장가 자식 주문을 일정 간격으로 집행
+    각 자식 주문(마지막 슬라이스 포함)은 호가 잔량의 max_book_fraction을 넘지 않도록 줄이고,
+    남은 수량은 다음 슬라이스로 이월 (num_slices 이후에도 남으면 같은 간격으로 최대 max_extra_slices개 더 집행)
+    minQty / minNotional 미만인 자식 주문은 다음 슬라이스와 합침
+    """
+
+    name = "TWAP"
+
+    def execute(self, symbol: str, side: str, quantity: float, duration: float = 60.0,
+                num_slices: int = 10, max_extra_slices: Optional[int] = None, **params) -> dict:
+        """
+        :param max_extra_slices: 호가 잔량 상한 때문에 남은 수량을 이어서 집행할 최대 추가 슬라이스 수 (기본: num_slices)
+        """
+        started_at = time.time()
+        arrival_price = self._mid_price(self._book(symbol))
+        num_slices = max(1, num_slices)
+        interval = duration / num_slices
+        total_slices = num_slices + (num_slices if max_extra_slices is None else max(0, max_extra_slices))
+
+        fills, child_orders = [], []
+        remaining = quantity
+        for i in range(total_slices):
+            book = self._book(symbol)
+            minimum = self._min_child_qty(symbol, self._mid_price(book) or arrival_price)
+            whole = self._quantize_qty(symbol, remaining)
+            if whole <= 0 or whole < minimum:
+                break
+            # 남은 예정 슬라이스에 고르게 나눔 (예정 슬라이스가 끝나면 남은 수량 전부), 호가 잔량 상한은 항상 적용
+            target = remaining / max(1, num_slices - i)
+            child_qty = self._quantize_qty(symbol, self._child_cap(book, side, target))
+            child_qty = self._fit_child(child_qty, whole, minimum, last=i == total_slices - 1)
+
+            if child_qty > 0:
+                response = self.exchange_api.place_order(
+                    symbol=symbol, side=side, order_type="MARKET", quantity=child_qty
+                )
+                child_orders.append(response)
+                qty, price = self._fill_of(symbol, response)
+                if qty > 0:
+                    fills.append((qty, price))
+                    remaining -= qty
+
+            if i < total_slices - 1 and remaining > 0:
+                time.sleep(interval)
+
+        if self._quantize_qty(symbol, remaining) > 0:
+            self.logger.warning(f"[TWAP] {symbol} {remaining} left unfilled after {total_slices} slices")
+        return self._report(symbol, side, quantity, arrival_price, fills, child_orders, started_at)
+
+
+class ParticipationRateAlgorithm(ExecutionAlgorithm):
+    """
+    참여율(POV) 알고리즘: 시장 체결량의 participation_rate 비율만큼만 따라서 집행
+    - volume_provider(symbol)는 누적 체결량을 반환해야 함
+    - minQty / minNotional 미만이라 내지 못한 참여 수량은 다음 확인 시점으로 이월해 합침
+    """
+
+    name = "POV"
+
+    def __init__(self, *args, volume_provider: Callable[[str], float] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.volume_provider = volume_provider
+
+    def execute(self, symbol: str, side: str, quantity: float, participation_rate: float = 0.1,
+                check_interval: float = 1.0, max_duration: float = 300.0, **params) -> dict:
+        started_at = time.time()
+        arrival_price = self._mid_price(self._book(symbol))
+        if self.volume_provider is None:
+            self.logger.error("POV requires a volume_provider. Nothing executed.")
+            return self._report(symbol, side, quantity, arrival_price, [], [], started_at)
+
+        fills, child_orders = [], []
+        remaining = quantity
+        last_volume = self.volume_provider(symbol)
+        owed = 0.0
+        while remaining > 0 and time.time() - started_at < max_duration:
+            time.sleep(check_interval)
+            volume = self.volume_provider(symbol)
+            market_volume = max(0.0, volume - last_volume)
+            last_volume = volume
+            owed += market_volume * participation_rate
+
+            book = self._book(symbol)
+            minimum = self._min_child_qty(symbol, self._mid_price(book) or arrival_price)
+            whole = self._quantize_qty(symbol, remaining)
+            if whole <= 0 or whole < minimum:
+                break
+            child_qty = self._child_cap(book, side, min(remaining, owed))
+            child_qty = self._fit_child(self._quantize_qty(symbol, child_qty), whole, minimum, last=False)
+            if child_qty <= 0:
+                continue
+            owed = 0.0
+
+            response = self.exchange_api.place_order(
+                symbol=symbol, side=side, order_type="MARKET", quantity=child_qty
+            )
+            child_orders.append(response)
+            qty, price = self._fill_of(symbol, response)
+            if qty > 0:
+                fills.append((qty, price))
+                remaining -= qty
+
+        if remaining > 0:
+            self.logger.warning(f"[POV] {symbol} {remaining} left unfilled after {max_duration}s")
+        return self._report(symbol, side, quantity, arrival_price, fills, child_orders, started_at)
+
+
+class LayeredLimitAlgorithm(ExecutionAlgorithm):
+    """
+    Post-only(GTX) 지정가 주문을 여러 호가 레벨에 나눠 깔고(batch 주문),
+    timeout까지 체결되지 않은 잔량은 취소
+    - BUY는 최우선 매수호가부터 아래로, SELL은 최우선 매도호가부터 위로 tick_size 간격
+    - 수량 양자화로 남는 잔여분은 마지막 레이어에 더하고, minQty / minNotional 미만 레이어는 이웃 레이어와 합침
+    """
+
+    name = "LAYERED"
+
+    def execute(self, symbol: str, side: str, quantity: float, num_layers: int = 5,
+                tick_size: float = 0.01, layer_spacing: int = 1, timeout: float = 30.0, **params) -> dict:
+        started_at = time.time()
+        book = self._book(symbol)
+        arrival_price = self._mid_price(book)
+        best = self._best(book.get("bids" if side == "BUY" else "asks", []))
+        if best is None:
+            self.logger.error(f"[LAYERED] No order book for {symbol}. Nothing executed.")
+            return self._report(symbol, side, quantity, arrival_price, [], [], started_at)
+
+        direction = -1 if side == "BUY" else 1
+        num_layers = max(1, num_layers)
+        # 거래소 필터가 있으면 tick_size는 거래소 값 사용
+        symbol_filter = self.symbol_filters.get(symbol) if self.symbol_filters is not None else None
+        if symbol_filter is not None:
+            tick_size = symbol_filter.tick_size
+        rounding = "down" if side == "BUY" else "up"
+        prices = [self._quantize_price(symbol, best + direction * i * layer_spacing * tick_size, rounding)
+                  for i in range(num_layers)]
+
+        layer_qty = self._quantize_qty(symbol, quantity / num_layers)
+        quantities = [layer_qty] * (num_layers - 1)
+        quantities.append(self._quantize_qty(symbol, quantity - layer_qty * (num_layers - 1)))
+        layers = self._merge_small(symbol, quantities, prices)
+        if not layers:
+            self.logger.error(f"[LAYERED] Quantity below minimum order size for {symbol}. Nothing executed.")
+            return self._report(symbol, side, quantity, arrival_price, [], [], started_at)
+
+        orders = [{
+            "symbol": symbol,
+            "side": side,
+            "order_type": "LIMIT",
+            "quantity": qty,
+            "price": price,
+            "time_in_force": "GTX",
+        } for qty, price in layers]
+
+        child_orders = self.exchange_api.place_batch_orders(orders)
+        order_ids = [r.get("orderId") for r in child_orders if r.get("orderId")]
+
+        # 전체 레벨이 체결되거나 timeout까지 대기 후, 남은 주문 취소
+        deadline = started_at + timeout
+        while order_ids and time.time() < deadline:
+            open_orders = self.exchange_api.get_open_orders(symbol)
+            if not isinstance(open_orders, list):
+                break
+            open_ids = {o.get("orderId") for o in open_orders}
+            if not any(oid in open_ids for oid in order_ids):
+                break
+            time.sleep(min(1.0, max(0.0, deadline - time.time())))
+
+        fills = []
+        for oid in order_ids:
+            status = self.exchange_api.get_order(symbol, oid)
+            if status.get("status") not in ("FILLED", "CANCELED", "EXPIRED", "REJECTED"):
+                self.order_manager.cancel_order(symbol, oid)
+                status = self.exchange_api.get_order(symbol, oid)
+            qty, price = self._fill_of(symbol, status, wait=False)
+            if qty > 0:
+                fills.append((qty, price))
+
+        return self._report(symbol, side, quantity, arrival_price, fills, child_orders, started_at)
@@ -0,0 +1,365 @@
+# benchmarks/historical_api_server.py
+
+import argparse
+import json
+import logging
+import math
+import tempfile
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from backtesting.columnar_store import PartitionedStore
+from backtesting.historical_downloader import INTERVAL_MS, HistoricalDownloader
+
+
+class HistoricalAPIServer:
+    """
+    바이낸스 선물 REST API의 klines / aggTrades를 흉내 내는 로컬 HTTP 서버 (HistoricalDownloader 검증용)
+    - 데이터는 시각/ID만으로 결정되는 합성 값이라 어떤 페이지를 어떤 순서로 받아도 같은 결과
+    - /fapi/v1/klines: startTime/endTime/limit (startTime 이후 open time 순서로 최대 limit개)
+    - /fapi/v1/aggTrades: startTime/endTime 또는 fromId + limit (최대 1000건)
+    - weight_limit: window_seconds 동안의 요청 weight 한도, 넘으면 429 + Retry-After (금지 시간 중 요청은 따로 집계)
+    - fail_ranges: startTime이 이 구간 [start_ms, end_ms)에 들어가는 요청은 500 (재시도/이어받기 확인용, 실행 중 변경 가능)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, trade_origin_ms: int = 1_704_067_200_000,
+                 trade_spacing_ms: int = 2000, weight_limit: int = None, window_seconds: float = 60.0,
+                 retry_after: float = 1.0, logger=None):
+        self.host = host
+        self.port = port
+        self.trade_origin_ms = trade_origin_ms
+        self.trade_spacing_ms = trade_spacing_ms
+        self.weight_limit = weight_limit
+        self.window_seconds = window_seconds
+        self.retry_after = retry_after
+        self.fail_ranges: List[Tuple[int, int]] = []
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._weights = deque()              # (시각, weight)
+        self._banned_until = 0.0
+        self._server = None
+        self._thread = None
+        self.requests = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.during_ban = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # ------------------------------------------------------------
+    # 합성 데이터
+    # ------------------------------------------------------------
+    @staticmethod
+    def kline_row(open_ms: int, interval: str) -> list:
+        step = INTERVAL_MS[interval]
+        i = open_ms // step
+        open_price = 100.0 + 10.0 * math.sin(i / 50.0)
+        close = 100.0 + 10.0 * math.sin((i + 1) / 50.0)
+        volume = 1.0 + i % 7
+        return [
+            open_ms, f"{open_price:.4f}", f"{max(open_price, close) + 0.05:.4f}",
+            f"{min(open_price, close) - 0.05:.4f}", f"{close:.4f}", f"{volume:.3f}", open_ms + step - 1,
+            f"{volume * close:.4f}", int(10 + i % 13), f"{volume / 2:.3f}", f"{volume * close / 2:.4f}", "0",
+        ]
+
+    def klines(self, symbol: str, interval: str, start_ms: int, end_ms: int, limit: int) -> list:
+        """
+        open time이 [start_ms, end_ms]인 봉 중 앞에서부터 limit개
+        """
+        step = INTERVAL_MS[interval]
+        first = -(-start_ms // step) * step
+        return [self.kline_row(t, interval) for t in range(first, end_ms + 1, step)[:limit]]
+
+    def agg_trade(self, agg_id: int) -> dict:
+        price = 100.0 + 5.0 * math.sin(agg_id / 300.0)
+        return {
+            "a": agg_id, "p": f"{price:.4f}", "q": f"{0.001 * (1 + agg_id % 17):.3f}",
+            "f": agg_id * 2, "l": agg_id * 2 + 1, "T": self.trade_origin_ms + agg_id * self.trade_spacing_ms,
+            "m": agg_id % 3 == 0,
+        }
+
+    def agg_trades(self, start_ms: int = None, end_ms: int = None, from_id: int = None, limit: int = 500) -> list:
+        limit = min(limit, 1000)
+        if from_id is not None:
+            first = max(0, from_id)
+            return [self.agg_trade(a) for a in range(first, first + limit)]
+        first = max(0, -(-(start_ms - self.trade_origin_ms) // self.trade_spacing_ms))
+        last = (end_ms - self.trade_origin_ms) // self.trade_spacing_ms
+        return [self.agg_trade(a) for a in range(first, min(last + 1, first + limit))]
+
+    # ------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------
+    def _admit(self, weight: int) -> Tuple[int, dict]:
+        """
+        weight 한도 확인 → (상태 코드, 추가 헤더)
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            while self._weights and self._weights[0][0] <= now - self.window_seconds:
+                self._weights.popleft()
+            used = sum(w for _, w in self._weights)
+            if now < self._banned_until:
+                self.during_ban += 1
+                self.rate_limited += 1
+                return 429, {"Retry-After": f"{max(1, math.ceil(self._banned_until - now))}"}
+            if self.weight_limit is not None and used + weight > self.weight_limit:
+                self._banned_until = now + self.retry_after
+                self.rate_limited += 1
+                return 429, {"Retry-After": f"{math.ceil(self.retry_after)}"}
+            self._weights.append((now, weight))
+            return 200, {"X-MBX-USED-WEIGHT-1M": str(used + weight)}
+
+    def _respond(self, path: str, query: Dict[str, str]) -> Tuple[int, dict, object]:
+        if path == "/fapi/v1/klines":
+            limit = int(query.get("limit", 500))
+            weight = 1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10
+        elif path == "/fapi/v1/aggTrades":
+            weight = 20
+        else:
+            return 404, {}, {"code": -1, "msg": f"unknown endpoint {path}"}
+
+        status, headers = self._admit(weight)
+        if status != 200:
+            return status, headers, {"code": -1003, "msg": "Too many requests"}
+        start_ms = int(query["startTime"]) if "startTime" in query else None
+        if start_ms is not None and any(lo <= start_ms < hi for lo, hi in self.fail_ranges):
+            with self._lock:
+                self.failed += 1
+            return 500, headers, {"code": -1000, "msg": "injected failure"}
+
+        if path == "/fapi/v1/klines":
+            body = self.klines(query["symbol"], query["interval"], start_ms, int(query["endTime"]), limit)
+        elif "fromId" in query:
+            body = self.agg_trades(from_id=int(query["fromId"]), limit=int(query.get("limit", 500)))
+        else:
+            body = self.agg_trades(start_ms, int(query["endTime"]), limit=int(query.get("limit", 500)))
+        return 200, headers, body
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"       # keep-alive (다운로더의 세션 재사용 경로 확인)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                status, headers, body = server._respond(url.path, query)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "HistoricalAPIServer":
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="HistoricalAPIServer", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Historical API server listening on {self.url}")
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "failed": self.failed,
+            "rate_limited": self.rate_limited,
+            "during_ban": self.during_ban,
+        }
+
+
+# ------------------------------------------------------------
+# HistoricalDownloader 시나리오
+# ------------------------------------------------------------
+SCENARIOS: Dict[str, Callable[[str], None]] = {}
+
+_START = "2024-01-01"
+_SYMBOL = "TESTUSDT"
+
+
+def scenario(name: str):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+def _downloader(server: HistoricalAPIServer, root: str, **kwargs) -> HistoricalDownloader:
+    options = dict(max_workers=4, kline_limit=500, flush_pages=3, max_retries=1, backoff=0.01)
+    options.update(kwargs)
+    return HistoricalDownloader(PartitionedStore(root), base_url=server.url, **options)
+
+
+def _expected_klines(server: HistoricalAPIServer, interval: str, start, end) -> pd.DataFrame:
+    step = INTERVAL_MS[interval]
+    start_ms, end_ms = HistoricalDownloader.to_ms(start), HistoricalDownloader.to_ms(end)
+    rows = [server.kline_row(t, interval) for t in range(start_ms, end_ms, step)]
+    return HistoricalDownloader._klines_frame(rows)
+
+
+def _expected_agg_trades(server: HistoricalAPIServer, start, end) -> pd.DataFrame:
+    start_ms, end_ms = HistoricalDownloader.to_ms(start), HistoricalDownloader.to_ms(end)
+    last_id = (end_ms - 1 - server.trade_origin_ms) // server.trade_spacing_ms
+    trades = [server.agg_trade(a) for a in range(last_id + 1)]
+    return HistoricalDownloader._agg_trades_frame([t for t in trades if t["T"] >= start_ms])
+
+
+def _assert_same(actual: pd.DataFrame, expected: pd.DataFrame, label: str):
+    assert len(actual) == len(expected), f"{label}: {len(actual)} rows != expected {len(expected)}"
+    pd.testing.assert_frame_equal(actual[expected.columns], expected, check_freq=False, check_names=False,
+                                  check_index_type=False)
+
+
+@scenario("pagination")
+def check_pagination(root: str):
+    """
+    여러 페이지로 나눈 klines, fromId로 이어받는 aggTrades(1시간 1800건)가 빠짐/중복 없이 저장되는지
+    """
+    server = HistoricalAPIServer().start()
+    try:
+        downloader = _downloader(server, root)
+        end = "2024-01-03 12:00"
+        summary = downloader.download_klines(_SYMBOL, "1m", _START, end)
+        assert summary["pages"] == 8 and summary["failed"] == 0, f"klines summary {summary}"
+        key = downloader.kline_key(_SYMBOL, "1m")
+        stored = downloader.store.read(key)
+        _assert_same(stored[stored.index < pd.Timestamp(end)], _expected_klines(server, "1m", _START, end), "klines")
+
+        trades_end = "2024-01-01 03:00"
+        summary = downloader.download_agg_trades(_SYMBOL, _START, trades_end)
+        assert summary["pages"] == 3 and summary["failed"] == 0, f"aggTrades summary {summary}"
+        stored = downloader.store.read(downloader.agg_trades_key(_SYMBOL))
+        _assert_same(stored, _expected_agg_trades(server, _START, trades_end), "aggTrades")
+    finally:
+        server.stop()
+
+
+@scenario("resume")
+def check_resume(root: str):
+    """
+    일부 페이지가 재시도 후에도 실패하면 그 구간만 coverage에서 빠지고, 다음 호출은 빠진 페이지만 다시 받는지
+    """
+    server = HistoricalAPIServer().start()
+    try:
+        downloader = _downloader(server, root)
+        end = "2024-01-03 12:00"
+        start_ms = HistoricalDownloader.to_ms(_START)
+        page_ms = INTERVAL_MS["1m"] * downloader.kline_limit
+        server.fail_ranges = [(start_ms + 2 * page_ms, start_ms + 4 * page_ms)]
+        first = downloader.download_klines(_SYMBOL, "1m", _START, end)
+        assert first["failed"] == 2 and first["fetched"] == first["pages"] - 2, f"first run {first}"
+
+        server.fail_ranges = []
+        before = server.requests
+        second = downloader.download_klines(_SYMBOL, "1m", _START, end)
+        assert second["pages"] == 2 and second["failed"] == 0, f"resume run {second}"
+        assert server.requests - before == 2, f"resume sent {server.requests - before} requests"
+        key = downloader.kline_key(_SYMBOL, "1m")
+        stored = downloader.store.read(key)
+        _assert_same(stored[stored.index < pd.Timestamp(end)], _expected_klines(server, "1m", _START, end), "klines")
+
+        third = downloader.download_klines(_SYMBOL, "1m", _START, end)
+        assert third["pages"] == 0, f"up-to-date run {third}"
+    finally:
+        server.stop()
+
+
+@scenario("rate_limit")
+def check_rate_limit(root: str):
+    """
+    서버 weight 한도를 넘으면 429 + Retry-After를 받고, 전체 요청을 멈췄다가 이어서 모두 받는지
+    (금지 시간 중 도착한 요청은 이미 보내던 요청 정도만 허용)
+    """
+    server = HistoricalAPIServer(weight_limit=40, window_seconds=1.0, retry_after=1.0).start()
+    try:
+        downloader = _downloader(server, root, max_retries=5)
+        end = "2024-01-04"
+        started = time.monotonic()
+        summary = downloader.download_klines(_SYMBOL, "1m", _START, end)
+        elapsed = time.monotonic() - started
+        stats = server.stats()
+        assert summary["failed"] == 0, f"summary {summary}"
+        assert stats["rate_limited"] > 0, f"server never rate limited: {stats}"
+        assert stats["during_ban"] <= downloader.max_workers, f"requests ignored Retry-After: {stats}"
+        assert elapsed >= server.retry_after, f"finished in {elapsed:.2f}s despite Retry-After"
+        key = downloader.kline_key(_SYMBOL, "1m")
+        stored = downloader.store.read(key)
+        _assert_same(stored[stored.index < pd.Timestamp(end)], _expected_klines(server, "1m", _START, end), "klines")
+    finally:
+        server.stop()
+
+
+def run(names: List[str] = None, logger=None) -> bool:
+    logger = logger or logging.getLogger("historical_api_server")
+    ok = True
+    for name, func in SCENARIOS.items():
+        if names and name not in names:
+            continue
+        with tempfile.TemporaryDirectory() as root:
+            try:
+                func(root)
+            except AssertionError as e:
+                ok = False
+                logger.error(f"FAIL {name}: {e}")
+            else:
+                logger.info(f"ok   {name}")
+    return ok
+
+
+def main():
+    """
+    로컬 서버를 띄워 HistoricalDownloader의 페이지 분할, 이어받기, rate limit 처리를 확인
+    (--serve: 시나리오 대신 서버만 실행 → HistoricalDataLoader(api_base_url=...)로 직접 사용)
+    """
+    parser = argparse.ArgumentParser(description="Local Binance-compatible historical REST server")
+    parser.add_argument("names", nargs="*", help=f"실행할 시나리오 (기본: 전부) {sorted(SCENARIOS)}")
+    parser.add_argument("--serve", action="store_true", help="서버만 실행")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--weight-limit", type=int, default=None, help="분당 weight 한도 (기본: 무제한)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.serve:
+        server = HistoricalAPIServer(host=args.host, port=args.port, weight_limit=args.weight_limit).start()
+        try:
+            while True:
+                time.sleep(1.0)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
+        return
+    if not run(args.names):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,97 @@
 # backtesting/historical_data_loader.py
 
+import hashlib
 import logging
+import os
+from typing import List
 import pandas as pd
 
+from .columnar_store import PartitionedStore
+from .historical_downloader import HistoricalDownloader
+
 class HistoricalDataLoader:
     """
     과거 시세 데이터를 로드하는 클래스
     - 예: CSV 파일, DB, 바이낸스 API 등
+    - 로드한 데이터는 심볼/기간별 컬럼형 저장소(PartitionedStore)에 캐시되어
+      이후에는 필요한 파티션/컬럼/시간 구간만 읽음
     """
 
-    def __init__(self, logger=None):
+    def __init__(self, store_dir: str = "./data_store", partition: str = "month",
+                 api_base_url: str = "https://fapi.binance.com", downloader: HistoricalDownloader = None,
+                 logger=None):
+        """
+        :param store_dir: 컬럼형 저장소 디렉토리
+        :param partition: 파티션 단위 ("month" or "day")
+        :param api_base_url: load_api가 사용할 REST API 주소
+        :param downloader: 동시 요청 수/rate limit 등을 직접 설정한 다운로더 (없으면 기본 설정으로 생성)
+        """
         self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.store = PartitionedStore(store_dir, partition=partition, logger=self.logger)
+        self.downloader = downloader or HistoricalDownloader(self.store, base_url=api_base_url, logger=self.logger)
 
-    def load_csv(self, file_path: str) -> pd.DataFrame:
+    def load_csv(self, file_path: str, symbol: str = None, start=None, end=None,
+                 columns: List[str] = None) -> pd.DataFrame:
         """
         CSV 파일에서 OHLCV 등 히스토리컬 데이터 로드
         예: columns = [timestamp, open, high, low, close, volume, ...]
+        - 처음 한 번만 CSV를 파싱해 저장소로 변환하고, 파일이 바뀌지 않았으면 이후에는 저장소에서 읽음
+        :param symbol: 저장소에 기록할 이름 (기본: 파일 이름 + 절대 경로 해시 → 이름이 같은 다른 폴더의 CSV와 겹치지 않음)
+        :param start, end: 시간 범위 필터 (양 끝 포함)
+        :param columns: 읽을 컬럼 (None이면 전체)
+        """
+        source = os.path.abspath(file_path)
+        if not symbol:
+            digest = hashlib.sha1(source.encode()).hexdigest()[:12]
+            symbol = f"{os.path.splitext(os.path.basename(file_path))[0]}_{digest}"
+        stat = os.stat(file_path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+
+        if self.store.source_signature(symbol, source) != signature:
+            self.logger.info(f"Loading CSV data from {file_path}...")
+            df = pd.read_csv(file_path)
+            # 필요한 전처리 (timestamp 변환, 결측치 처리 등)
+            df["timestamp"] = pd.to_datetime(df["timestamp"])
+            df.set_index("timestamp", inplace=True)
+            # 예: sort by timestamp
+            df.sort_index(inplace=True)
+            self.store.write(symbol, df, mode="replace")
+            self.store.set_source_signature(symbol, source, signature)
+            self.logger.info(f"Cached {len(df)} rows of {file_path} as '{symbol}' in {self.store.root}.")
+
+        return self.store.read(symbol, start=start, end=end, columns=columns)
+
+    def load(self, symbol: str, start=None, end=None, columns: List[str] = None) -> pd.DataFrame:
+        """
+        저장소에서 바로 로드 (필요한 파티션과 컬럼만 읽음)
+        """
+        return self.store.read(symbol, start=start, end=end, columns=columns)
+
+    def iter_load(self, symbol: str, start=None, end=None, columns: List[str] = None, chunk_rows: int = None):
+        """
+        저장소 데이터를 파티션(또는 chunk_rows 행) 단위로 순서대로 로드 (BacktestRunner.run_stream 입력용)
         """
-        self.logger.info(f"Loading CSV data from {file_path}...")
-        df = pd.read_csv(file_path)
-        # 필요한 전처리 (timestamp 변환, 결측치 처리 등)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df.set_index("timestamp", inplace=True)
-        # 예: sort by timestamp
-        df.sort_index(inplace=True)
-        return df
+        return self.store.iter_read(symbol, start=start, end=end, columns=columns, chunk_rows=chunk_rows)
 
-    def load_api(self, symbol: str, start: str, end: str) -> pd.DataFrame:
+    def load_api(self, symbol: str, start: str, end: str, interval: str = "1m", data: str = "klines",
+                 columns: List[str] = None) -> pd.DataFrame:
         """
         거래소 API(예: 바이낸스)로부터 특정 기간의 히스토리컬 데이터 로드
-        실제 구현은 라이브러리 or REST API 호출
+        - 저장소에 없는 구간만 페이지 단위로 동시에 받아 저장한 뒤, 저장소에서 [start, end) 구간을 읽음
+        :param interval: klines 봉 단위 (예: "1m", "1h")
+        :param data: "klines" or "aggTrades"
         """
         self.logger.info(f"Fetching historical data for {symbol} from {start} to {end}")
-        # TODO: 구현 (requests, python-binance, etc.)
-        df = pd.DataFrame()  # placeholder
-        return df
+        if data == "klines":
+            self.downloader.download_klines(symbol, interval, start, end)
+            key = self.downloader.kline_key(symbol, interval)
+        elif data == "aggTrades":
+            self.downloader.download_agg_trades(symbol, start, end)
+            key = self.downloader.agg_trades_key(symbol)
+        else:
+            raise ValueError(f"Unknown data type: {data}")
+
+        df = self.store.read(key, start=start, end=end, columns=columns)
+        # 저장소 read는 양 끝 포함, API 구간은 end 미포함 (다운로드 데이터는 UTC 기준 naive 시각)
+        end_ts = pd.Timestamp(self.downloader.to_ms(end), unit="ms")
+        return df[df.index < end_ts]
@@ -0,0 +1,351 @@
+# backtesting/historical_downloader.py
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from .columnar_store import PartitionedStore
+
+INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "6h": 21_600_000,
+    "8h": 28_800_000, "12h": 43_200_000, "1d": 86_400_000,
+}
+
+class RateLimiter:
+    """
+    요청 weight 기준 토큰 버킷 (여러 스레드가 공유)
+    - 분당 weight_per_minute만큼 채워지고, acquire(weight)는 토큰이 생길 때까지 대기
+    - 거래소가 알려준 사용량(X-MBX-USED-WEIGHT-1M)이나 429 Retry-After로 보정
+    """
+
+    def __init__(self, weight_per_minute: int = 2400):
+        self.capacity = float(weight_per_minute)
+        self.rate = weight_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, weight: int = 1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._blocked_until and self._tokens >= weight:
+                    self._tokens -= weight
+                    return
+                wait = max(self._blocked_until - now, (weight - self._tokens) / self.rate)
+            time.sleep(min(wait, 1.0))
+
+    def sync(self, used_weight: int):
+        """
+        서버가 집계한 최근 1분 사용량으로 남은 토큰을 줄임 (다른 프로세스와 한도를 공유하는 경우 대비)
+        """
+        with self._lock:
+            self._tokens = min(self._tokens, self.capacity - used_weight)
+
+    def block(self, seconds: float):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+class HistoricalDownloader:
+    """
+    바이낸스 선물 REST API에서 klines / aggTrades를 받아 PartitionedStore에 저장하는 다운로더
+    - 요청 기간을 페이지(요청 1회 분량)로 나눠 스레드 풀에서 동시에 받음 (RateLimiter로 weight 한도 유지)
+    - 페이지마다 독립적으로 재시도 (5xx/연결 오류는 지수 백오프, 429/418은 Retry-After만큼 전체 대기)
+    - 받은 페이지는 묶어서 저장소에 기록하고 수집 완료 구간(coverage)을 남김
+      → 다음 호출은 비어 있는 구간만 받음 (중간에 실패한 페이지도 다음 호출에서 다시 받음)
+    """
+
+    def __init__(
+        self,
+        store: PartitionedStore,
+        base_url: str = "https://fapi.binance.com",
+        max_workers: int = 8,
+        weight_per_minute: int = 2400,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        timeout: float = 10.0,
+        kline_limit: int = 1500,
+        flush_pages: int = 20,
+        logger=None
+    ):
+        """
+        :param max_workers: 동시 요청 스레드 수
+        :param weight_per_minute: 분당 요청 weight 한도 (바이낸스 선물 기본 2400)
+        :param kline_limit: klines 요청당 최대 봉 수 (최대 1500)
+        :param flush_pages: 몇 페이지마다 저장소에 기록할지
+        """
+        self.store = store
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(weight_per_minute)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.kline_limit = kline_limit
+        self.flush_pages = flush_pages
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self._local = threading.local()
+
+    # ------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------
+    def _session(self) -> requests.Session:
+        """
+        스레드별 keep-alive 세션 (연결 재사용)
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def _get(self, endpoint: str, params: dict, weight: int):
+        """
+        GET 요청 1회 (재시도 포함)
+        """
+        url = self.base_url + endpoint
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(weight)
+            try:
+                response = self._session().get(url, params=params, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = e
+            else:
+                used = response.headers.get("X-MBX-USED-WEIGHT-1M")
+                if used is not None and used.isdigit():
+                    self.limiter.sync(int(used))
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code in (418, 429):
+                    retry_after = float(response.headers.get("Retry-After", 1))
+                    self.logger.warning(f"Rate limited on {endpoint} ({response.status_code}), waiting {retry_after}s.")
+                    self.limiter.block(retry_after)
+                    error = RuntimeError(f"HTTP {response.status_code}")
+                    continue
+                if response.status_code < 500:
+                    raise RuntimeError(f"HTTP {response.status_code} for {endpoint} {params}: {response.text[:200]}")
+                error = RuntimeError(f"HTTP {response.status_code}")
+            if attempt < self.max_retries:
+                time.sleep(self.backoff * (2 ** attempt))
+        raise RuntimeError(f"Request failed after {self.max_retries + 1} attempts: {endpoint} {params} ({error})")
+
+    @staticmethod
+    def _kline_weight(limit: int) -> int:
+        if limit < 100:
+            return 1
+        if limit < 500:
+            return 2
+        if limit <= 1000:
+            return 5
+        return 10
+
+    # ------------------------------------------------------------
+    # 페이지 단위 요청
+    # ------------------------------------------------------------
+    def _fetch_klines(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> pd.DataFrame:
+        """
+        [start_ms, end_ms) 구간 klines 한 페이지
+        """
+        limit = self.kline_limit
+        rows = self._get("/fapi/v1/klines", {
+            "symbol": symbol, "interval": interval,
+            "startTime": start_ms, "endTime": end_ms - 1, "limit": limit,
+        }, self._kline_weight(limit))
+        return self._klines_frame(rows)
+
+    @staticmethod
+    def _klines_frame(rows: list) -> pd.DataFrame:
+        data = np.array([r[:11] for r in rows], dtype=object).reshape(-1, 11)
+        df = pd.DataFrame({
+            "open": data[:, 1].astype(float),
+            "high": data[:, 2].astype(float),
+            "low": data[:, 3].astype(float),
+            "close": data[:, 4].astype(float),
+            "volume": data[:, 5].astype(float),
+            "quote_volume": data[:, 7].astype(float),
+            "trades": data[:, 8].astype(np.int64),
+            "taker_buy_volume": data[:, 9].astype(float),
+            "taker_buy_quote_volume": data[:, 10].astype(float),
+        }, index=pd.DatetimeIndex(pd.to_datetime(data[:, 0].astype(np.int64), unit="ms"), name="timestamp"))
+        return df
+
+    def _fetch_agg_trades(self, symbol: str, start_ms: int, end_ms: int) -> pd.DataFrame:
+        """
+        [start_ms, end_ms) 구간 aggTrades (1시간 이하 구간, 1000건 초과 시 fromId로 이어받음)
+        """
+        trades = self._get("/fapi/v1/aggTrades", {
+            "symbol": symbol, "startTime": start_ms, "endTime": end_ms - 1, "limit": 1000,
+        }, 20)
+        batch = trades
+        while len(batch) == 1000:
+            batch = self._get("/fapi/v1/aggTrades", {
+                "symbol": symbol, "fromId": batch[-1]["a"] + 1, "limit": 1000,
+            }, 20)
+            batch = [t for t in batch if t["T"] < end_ms]
+            trades.extend(batch)
+        return self._agg_trades_frame(trades)
+
+    @staticmethod
+    def _agg_trades_frame(trades: list) -> pd.DataFrame:
+        return pd.DataFrame({
+            "agg_id": np.array([t["a"] for t in trades], dtype=np.int64),
+            "price": np.array([t["p"] for t in trades], dtype=float),
+            "quantity": np.array([t["q"] for t in trades], dtype=float),
+            "first_id": np.array([t["f"] for t in trades], dtype=np.int64),
+            "last_id": np.array([t["l"] for t in trades], dtype=np.int64),
+            "is_buyer_maker": np.array([t["m"] for t in trades], dtype=bool),
+        }, index=pd.DatetimeIndex(
+            pd.to_datetime(np.array([t["T"] for t in trades], dtype=np.int64), unit="ms"), name="timestamp"
+        ))
+
+    # ------------------------------------------------------------
+    # 다운로드
+    # ------------------------------------------------------------
+    @staticmethod
+    def to_ms(value) -> int:
+        """
+        시각(문자열, datetime, Timestamp)을 epoch ms로 변환 (tz가 없으면 UTC로 간주)
+        """
+        ts = pd.Timestamp(value)
+        if ts.tzinfo is not None:
+            ts = ts.tz_convert("UTC").tz_localize(None)
+        return ts.value // 1_000_000
+
+    @staticmethod
+    def kline_key(symbol: str, interval: str) -> str:
+        return f"{symbol}_{interval}"
+
+    @staticmethod
+    def agg_trades_key(symbol: str) -> str:
+        return f"{symbol}_aggTrades"
+
+    def download_klines(self, symbol: str, interval: str, start, end) -> dict:
+        """
+        [start, end) 구간 klines 중 저장소에 없는 구간만 받아 저장
+        """
+        step = INTERVAL_MS[interval]
+        start_ms = self.to_ms(start) // step * step
+        # 아직 닫히지 않은 현재 봉은 완료 구간으로 기록하지 않음 (다음 호출에서 다시 받음)
+        closed_ms = int(time.time() * 1000) // step * step
+        end_ms = self.to_ms(end)
+        page_ms = step * self.kline_limit
+
+        pages = self._pages(self._missing(self.kline_key(symbol, interval), start_ms, end_ms), page_ms)
+        return self._download(
+            self.kline_key(symbol, interval), pages,
+            lambda s, e: self._fetch_klines(symbol, interval, s, e),
+            covered_until=closed_ms, empty=self._klines_frame([]), key_column=None
+        )
+
+    def download_agg_trades(self, symbol: str, start, end) -> dict:
+        """
+        [start, end) 구간 aggTrades 중 저장소에 없는 구간만 받아 저장 (1시간 단위 페이지)
+        """
+        start_ms = self.to_ms(start)
+        end_ms = self.to_ms(end)
+        # 최근 1초는 체결이 더 들어올 수 있으므로 완료 구간에서 제외
+        settled_ms = int(time.time() * 1000) - 1000
+        page_ms = 3_600_000
+
+        pages = self._pages(self._missing(self.agg_trades_key(symbol), start_ms, end_ms), page_ms)
+        return self._download(
+            self.agg_trades_key(symbol), pages,
+            lambda s, e: self._fetch_agg_trades(symbol, s, e),
+            covered_until=settled_ms, empty=self._agg_trades_frame([]), key_column="agg_id"
+        )
+
+    def _missing(self, key: str, start_ms: int, end_ms: int) -> List[Tuple[int, int]]:
+        if end_ms <= start_ms:
+            return []
+        if not self.store.has(key):
+            return [(start_ms, end_ms)]
+        missing = self.store.missing_ranges(key, start_ms * 1_000_000, end_ms * 1_000_000)
+        return [(s // 1_000_000, e // 1_000_000) for s, e in missing]
+
+    @staticmethod
+    def _pages(ranges: List[Tuple[int, int]], page_ms: int) -> List[Tuple[int, int]]:
+        pages = []
+        for start_ms, end_ms in ranges:
+            for page_start in range(start_ms, end_ms, page_ms):
+                pages.append((page_start, min(page_start + page_ms, end_ms)))
+        return pages
+
+    def _download(self, key: str, pages: List[Tuple[int, int]], fetch, covered_until: int,
+                  empty: pd.DataFrame, key_column: Optional[str]) -> dict:
+        summary = {"key": key, "pages": len(pages), "fetched": 0, "failed": 0, "rows": 0}
+        if not pages:
+            self.logger.info(f"{key}: already up to date.")
+            return summary
+        self.logger.info(f"{key}: downloading {len(pages)} pages with {self.max_workers} workers...")
+
+        if not self.store.has(key):
+            # 빈 결과만 나와도 coverage를 기록할 수 있도록 스키마 먼저 생성
+            self.store.write(key, empty, key_column=key_column)
+
+        buffer: List[pd.DataFrame] = []
+        buffer_ranges: List[Tuple[int, int]] = []
+
+        def flush():
+            frames = [f for f in buffer if len(f)]
+            if frames:
+                self.store.write(key, pd.concat(frames) if len(frames) > 1 else frames[0], key_column=key_column)
+            ranges = [
+                (s * 1_000_000, min(e, covered_until) * 1_000_000)
+                for s, e in buffer_ranges if min(e, covered_until) > s
+            ]
+            if ranges:
+                self.store.add_coverage(key, ranges)
+            buffer.clear()
+            buffer_ranges.clear()
+
+        # 진행 중인 페이지는 max_workers * 2개까지만 유지 (끝난 Future를 바로 버려 메모리가 flush_pages 단위로 제한됨)
+        remaining = iter(pages)
+        futures = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                for s, e in remaining:
+                    futures[executor.submit(fetch, s, e)] = (s, e)
+                    if len(futures) >= self.max_workers * 2:
+                        break
+                if not futures:
+                    break
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    s, e = futures.pop(future)
+                    try:
+                        df = future.result()
+                    except Exception as ex:
+                        summary["failed"] += 1
+                        self.logger.error(
+                            f"{key}: page {pd.Timestamp(s, unit='ms')} ~ {pd.Timestamp(e, unit='ms')} failed: {ex}"
+                        )
+                        continue
+                    summary["fetched"] += 1
+                    summary["rows"] += len(df)
+                    buffer.append(df)
+                    buffer_ranges.append((s, e))
+                    if len(buffer) >= self.flush_pages:
+                        flush()
+        flush()
+
+        self.logger.info(
+            f"{key}: {summary['fetched']}/{summary['pages']} pages, {summary['rows']} rows "
+            f"({summary['failed']} failed)."
+        )
+        return summary
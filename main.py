@@ -25,6 +25,7 @@ from order_execution.trade_executor import TradeExecutor
 # notification
 from notification.discord_alerts import DiscordAlerts
 from notification.telegram_alerts import TelegramAlerts
+from notification.alert_dispatcher import AlertDispatcher
 from notification.dashboard import Dashboard
 
 ################################################################
@@ -36,20 +37,27 @@ def data_feed_process(order_book_queue, trade_queue, config):
     """
     logger = get_logger(name="DataFeedProcess", log_level=config.log_level, log_file="data_feed.log")
 
-    # 오더북 WS
-    ob_ws = BinanceOrderBookWS(
-        uri="wss://fstream.binance.com/ws",
-        max_retries=5,
-        base_retry_delay=1.0,
-        logger=logger
-    )
-    # trade WS
-    td_ws = BinanceTradeWS(
-        uri="wss://fstream.binance.com/ws",
-        max_retries=5,
-        base_retry_delay=1.0,
-        logger=logger
-    )
+    # 주소마다 오더북 / trade WS 한 쌍 (로컬 시뮬레이터를 여러 포트로 샤딩한 경우 모든 샤드를 구독,
+    # 각 샤드는 자기가 담당하는 심볼만 보냄)
+    sockets = []
+    for uri in config.feed_uris:
+        # 오더북 WS
+        sockets.append(BinanceOrderBookWS(
+            uri=uri,
+            max_retries=5,
+            base_retry_delay=1.0,
+            logger=logger,
+            symbols=config.symbols,
+            depth_streams=config.depth_streams,
+        ))
+        # trade WS
+        sockets.append(BinanceTradeWS(
+            uri=uri,
+            max_retries=5,
+            base_retry_delay=1.0,
+            logger=logger,
+            symbols=config.symbols,
+        ))
 
     # 큐에 전달하기 위해 on_message 콜백을 살짝 수정하거나,
     # 혹은 handle_depth/handle_trade에서 queue.put()를 호출하도록 커스터마이징해야 함.
@@ -57,11 +65,9 @@ def data_feed_process(order_book_queue, trade_queue, config):
 
     async def run_all():
         """
-        두 개의 WebSocket을 동시에 실행 (asyncio.gather)
+        모든 WebSocket을 동시에 실행 (asyncio.gather)
         """
-        task1 = asyncio.create_task(ob_ws.listen())
-        task2 = asyncio.create_task(td_ws.listen())
-        await asyncio.gather(task1, task2)
+        await asyncio.gather(*(asyncio.create_task(ws.listen()) for ws in sockets))
 
     # 예시로 handle_depth/handle_trade 내부에서 queue.put(data)를 한다고 가정.
     try:
@@ -114,6 +120,9 @@ def main():
     # - Discord / Telegram 알림 객체 생성
     discord_alert = DiscordAlerts(config.discord_webhook_url)
     telegram_alert = TelegramAlerts(config.telegram_bot_token, config.telegram_chat_id)
+    # - 채널별 전송 스레드에서 rate limit / digest 처리 (submit은 바로 반환)
+    alert_dispatcher = AlertDispatcher([discord_alert, telegram_alert], logger=logger)
+    alert_dispatcher.start()
 
     # - 대시보드 (Flask) 인스턴스
     dashboard = Dashboard(port=5000, logger=logger)
@@ -132,15 +141,13 @@ def main():
                 signal_data = signal_queue.get(timeout=1)
                 # 간단히 "BUY 신호 발생" 시 알림
                 msg = f"[Signal] {signal_data}"
-                discord_alert.send_message(msg)
-                telegram_alert.send_message(msg)
+                alert_dispatcher.submit(msg)
 
                 # 대시보드 업데이트도 가능
                 # dashboard.update_data(...)  # 시세/포지션 등
 
             except Exception:
                 pass
-            time.sleep(1)
 
     notify_thread = threading.Thread(target=notification_loop, daemon=True)
     notify_thread.start()
@@ -191,6 +198,7 @@ def main():
         feed_proc.terminate()
         signal_proc.terminate()
         trade_executor.stop()  # 내부 스레드 join
+        alert_dispatcher.stop()
         logger.info("Terminated all child processes/threads.")
 
 
@@ -6,7 +6,7 @@ from .websocket_manager import WebSocketManager
 
 class BinanceOrderBookWS(WebSocketManager):
     """
-    바이낸스 선물 LTCUSDT의 오더북(호가) 실시간 수집 클래스
+    바이낸스 선물 오더북(호가) 실시간 수집 클래스 (기본: LTCUSDT)
     """
 
     def __init__(
@@ -15,22 +15,30 @@ class BinanceOrderBookWS(WebSocketManager):
         max_retries=5,
         base_retry_delay=1.0,
         logger: logging.Logger = None,
+        symbols=("LTCUSDT",),
+        depth_streams=("depth5@100ms", "depth20@100ms"),
     ):
+        """
+        :param symbols: 구독할 심볼 목록
+        :param depth_streams: 심볼마다 구독할 호가 스트림 (예: "depth@100ms"는 변경분(diff) 스트림)
+        """
         super().__init__(uri, max_retries, base_retry_delay, logger)
+        self.symbols = [s.upper() for s in symbols]
+        self.depth_streams = list(depth_streams)
 
     async def on_connect(self):
         """
         웹소켓 연결된 후, 오더북 구독 요청
         """
-        self.logger.info("Connected. Subscribing to LTCUSDT OrderBook streams.")
+        self.logger.info(f"Connected. Subscribing to {', '.join(self.symbols)} OrderBook streams.")
 
-        # 여러 스트림 구독 (Top5, Top20, 100ms)
+        # 여러 스트림 구독 (기본: Top5, Top20, 100ms)
         subscribe_payload = {
             "method": "SUBSCRIBE",
             "params": [
-                "ltcusdt@depth5@100ms",
-                "ltcusdt@depth20@100ms",
-                # 필요에 따라 전체 depth, 10, 20, 50 레벨 등 추가 가능
+                f"{symbol.lower()}@{stream}"
+                for symbol in self.symbols
+                for stream in self.depth_streams
             ],
             "id": 101
         }
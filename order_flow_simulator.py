@@ -0,0 +1,562 @@
+# benchmarks/order_flow_simulator.py
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import multiprocessing
+import queue
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from websockets.asyncio.server import broadcast, serve
+
+# 이벤트 종류 (Hawkes 도착 하나에 붙는 mark)
+ADD, CANCEL, MARKET = 0, 1, 2
+
+
+class _SymbolBook:
+    """
+    한 심볼의 가격 단계별 호가 (가격/수량은 정수 tick / lot으로 보관해 부동소수점 누적 오차 없음)
+    """
+
+    def __init__(self, symbol: str, start_price: float, tick_size: float, lot_size: float,
+                 depth_levels: int, rng: random.Random):
+        self.symbol = symbol
+        self.stream = symbol.lower()
+        self.tick_size = tick_size
+        self.lot_size = lot_size
+        self.depth_levels = depth_levels
+        self.rng = rng
+        self.price_decimals = max(0, -int(math.floor(math.log10(tick_size))))
+        self.qty_decimals = max(0, -int(math.floor(math.log10(lot_size))))
+        mid = int(round(start_price / tick_size))
+        self.bids: Dict[int, int] = {}
+        self.asks: Dict[int, int] = {}
+        self.best_bid = mid - 1
+        self.best_ask = mid
+        for i in range(depth_levels * 2):
+            self.bids[mid - 1 - i] = self._lots()
+            self.asks[mid + i] = self._lots()
+        self.update_id = 1
+        self.trade_id = 1
+        self.changed = True
+
+    def _lots(self) -> int:
+        return max(1, int(self.rng.lognormvariate(7.0, 1.0)))
+
+    def price(self, tick: int) -> str:
+        return f"{tick * self.tick_size:.{self.price_decimals}f}"
+
+    def qty(self, lots: int) -> str:
+        return f"{lots * self.lot_size:.{self.qty_decimals}f}"
+
+    def _refill(self, side: Dict[int, int], best: int, direction: int):
+        """
+        호가가 줄어들면 먼 쪽에 수동 유동성을 보충하고, 너무 먼 단계는 정리 (단계 수를 일정 범위로 유지)
+        """
+        changed = []
+        if len(side) < self.depth_levels * 2:
+            far = best + direction * len(side)
+            while len(side) < self.depth_levels * 2:
+                far += direction
+                if far not in side:
+                    side[far] = self._lots()
+                    changed.append(far)
+        if len(side) > self.depth_levels * 4:
+            for tick in sorted(side, key=lambda t: -direction * t)[:len(side) - self.depth_levels * 3]:
+                del side[tick]
+                changed.append(tick)
+        return changed
+
+    def apply(self, kind: int):
+        """
+        이벤트 하나를 호가에 반영
+        :return: (변경된 bid tick 목록, 변경된 ask tick 목록, [(가격 tick, 체결 lots, 매수자가 maker 여부), ...])
+        """
+        rng = self.rng
+        buy_side = rng.random() < 0.5
+        side = self.bids if buy_side else self.asks
+        changed_bids, changed_asks, trades = [], [], []
+        changed = changed_bids if buy_side else changed_asks
+
+        if kind == ADD:
+            spread = self.best_ask - self.best_bid
+            if spread > 1 and rng.random() < 0.3:
+                # 스프레드 안쪽 개선 주문
+                tick = self.best_bid + 1 if buy_side else self.best_ask - 1
+            else:
+                distance = min(int(rng.expovariate(0.35)), self.depth_levels * 2)
+                tick = self.best_bid - distance if buy_side else self.best_ask + distance
+            side[tick] = side.get(tick, 0) + self._lots()
+            changed.append(tick)
+            if buy_side and tick > self.best_bid:
+                self.best_bid = tick
+            elif not buy_side and tick < self.best_ask:
+                self.best_ask = tick
+
+        elif kind == CANCEL:
+            best = self.best_bid if buy_side else self.best_ask
+            distance = min(int(rng.expovariate(0.25)), self.depth_levels * 2)
+            tick = best - distance if buy_side else best + distance
+            if tick in side:
+                remaining = side[tick] - max(1, int(side[tick] * rng.uniform(0.2, 1.0)))
+                if remaining > 0 and len(side) > 1:
+                    side[tick] = remaining
+                else:
+                    del side[tick]
+                changed.append(tick)
+                if tick == best:
+                    self._reset_best()
+
+        else:
+            # 시장가 주문: buy_side면 매수 주문이 매도 호가를 소진 (매수자가 taker → m = False)
+            book = self.asks if buy_side else self.bids
+            changed = changed_asks if buy_side else changed_bids
+            remaining = int(rng.lognormvariate(7.5, 1.2))
+            while remaining > 0 and book:
+                tick = self.best_ask if buy_side else self.best_bid
+                available = book.get(tick, 0)
+                if available == 0:
+                    self._reset_best()
+                    continue
+                filled = min(available, remaining)
+                remaining -= filled
+                trades.append((tick, filled, not buy_side))
+                if filled == available:
+                    del book[tick]
+                    self._reset_best()
+                else:
+                    book[tick] = available - filled
+                changed.append(tick)
+
+        changed_bids += self._refill(self.bids, self.best_bid, -1)
+        changed_asks += self._refill(self.asks, self.best_ask, 1)
+        self.changed = True
+        return changed_bids, changed_asks, trades
+
+    def _reset_best(self):
+        self.best_bid = max(self.bids) if self.bids else self.best_ask - 1
+        self.best_ask = min(self.asks) if self.asks else self.best_bid + 1
+
+    def top(self, levels: int) -> Tuple[list, list]:
+        bids = sorted(self.bids, reverse=True)[:levels]
+        asks = sorted(self.asks)[:levels]
+        return ([[self.price(t), self.qty(self.bids[t])] for t in bids],
+                [[self.price(t), self.qty(self.asks[t])] for t in asks])
+
+
+class OrderFlowSimulator:
+    """
+    심볼별 자기 여기(self-exciting, Hawkes) 주문 흐름 시뮬레이터
+    - 도착 강도: λ(t) = μ(t) + Σ α·exp(-β(t - t_i)), 분기비(branching) = α/β < 1
+      (이벤트가 이벤트를 부르는 군집 → 변동성 급등 구간 재현, spikes로 μ를 구간별로 배수 조정)
+    - 도착마다 지정가 추가 / 취소 / 시장가 주문 중 하나(mix 비율)를 호가에 반영
+    - 출력 메시지는 바이낸스 선물 웹소켓 형식 (BinanceOrderBookWS / BinanceTradeWS가 그대로 파싱)
+      - "<symbol>@depth": 변경된 단계만 담은 diff depthUpdate (이벤트마다)
+      - "<symbol>@depth5/10/20": 상위 N단계 depthUpdate (snapshot_interval_ms마다, 변경 있을 때만)
+      - "<symbol>@trade": 체결된 가격 단계마다 trade
+    같은 seed면 같은 메시지 시퀀스
+    """
+
+    def __init__(self, symbols: Sequence[str] = ("LTCUSDT",), base_rate: float = 50.0, branching: float = 0.7,
+                 decay: float = 20.0, mix: Tuple[float, float, float] = (0.5, 0.35, 0.15),
+                 spikes: Iterable[Tuple[float, float, float]] = (), start_price: float = 90.0,
+                 tick_size: float = 0.01, lot_size: float = 0.001, depth_levels: int = 20,
+                 snapshot_levels: Sequence[int] = (5, 10, 20), snapshot_interval_ms: int = 100,
+                 start_time_ms: int = None, seed: int = 0):
+        """
+        :param base_rate: 심볼당 기본 도착률 μ (이벤트/초) - 평균 도착률은 μ / (1 - branching)
+        :param branching: 이벤트 하나가 유발하는 평균 후속 이벤트 수 (0 ≤ branching < 1)
+        :param decay: 여기 효과 감쇠율 β (1/초)
+        :param mix: (지정가 추가, 취소, 시장가) 비율
+        :param spikes: [(시작 초, 길이 초, μ 배수), ...] 변동성 급등 구간
+        """
+        if not 0 <= branching < 1:
+            raise ValueError("branching must be in [0, 1).")
+        self.base_rate = base_rate
+        self.alpha = branching * decay
+        self.beta = decay
+        total = float(sum(mix))
+        self.cum_mix = (mix[0] / total, (mix[0] + mix[1]) / total)
+        self.spikes = sorted(spikes)
+        self.snapshot_levels = tuple(sorted(snapshot_levels))
+        self.snapshot_interval = snapshot_interval_ms / 1000.0
+        self.start_time_ms = start_time_ms if start_time_ms is not None else int(time.time() * 1000)
+
+        root = random.Random(seed)
+        self.books = [
+            _SymbolBook(symbol, start_price, tick_size, lot_size, max(depth_levels, *self.snapshot_levels),
+                        random.Random(root.getrandbits(64)))
+            for symbol in symbols
+        ]
+        self._rngs = [random.Random(root.getrandbits(64)) for _ in symbols]
+        self._excite = [0.0] * len(symbols)
+        self._next_snapshot = [self.snapshot_interval] * len(symbols)
+        self.now = 0.0
+        self.events = 0
+
+    @classmethod
+    def base_rate_for(cls, messages_per_sec: float, symbols: Sequence[str] = ("LTCUSDT",),
+                      calibration_seconds: float = 20.0, **kwargs) -> float:
+        """
+        초당 메시지 수 목표(모든 심볼 합계, depth/depthN/trade 전부)를 맞추는 심볼당 기본 도착률 μ
+        - 상위 N단계 스냅샷은 심볼당 len(snapshot_levels) / snapshot_interval 개/초로 고정, 나머지를 이벤트 메시지로 채움
+        - 이벤트 하나가 만드는 메시지 수(diff depth 1개 + 시장가가 소진한 단계 수만큼의 trade)는
+          같은 설정으로 짧게 돌려 측정 (평균 도착률 = μ / (1 - branching))
+        """
+        kwargs = {key: value for key, value in kwargs.items() if key not in ("base_rate", "spikes")}
+        probe = cls(symbols=("CALIBRATION",), base_rate=200.0, **kwargs)
+        messages = probe.advance(calibration_seconds)
+        snapshot_keys = tuple(f"@depth{levels}" for levels in probe.snapshot_levels)
+        event_messages = sum(1 for _, key, _ in messages if not key.endswith(snapshot_keys))
+        per_event = event_messages / max(probe.events, 1)
+
+        snapshot_rate = len(probe.snapshot_levels) / probe.snapshot_interval
+        per_symbol = messages_per_sec / max(len(symbols), 1) - snapshot_rate
+        branching = probe.alpha / probe.beta
+        return max(per_symbol, 0.0) * (1.0 - branching) / per_event
+
+    def mu(self, t: float) -> Tuple[float, float]:
+        """
+        시각 t의 기본 도착률과, 그 값이 유지되는 다음 경계 시각
+        """
+        rate = self.base_rate
+        boundary = math.inf
+        for start, length, multiplier in self.spikes:
+            if t < start:
+                boundary = min(boundary, start)
+            elif t < start + length:
+                rate *= multiplier
+                boundary = min(boundary, start + length)
+        return rate, boundary
+
+    def _arrivals(self, index: int, t0: float, t1: float) -> List[float]:
+        """
+        [t0, t1) 구간의 Hawkes 도착 시각 (Ogata thinning, 강도는 다음 이벤트/경계 전까지 감소만 하므로 현재 값이 상한)
+        """
+        rng = self._rngs[index]
+        excite = self._excite[index]
+        beta, alpha = self.beta, self.alpha
+        times = []
+        t = t0
+        while True:
+            mu, boundary = self.mu(t)
+            upper = mu + excite
+            wait = rng.expovariate(upper) if upper > 0 else math.inf
+            limit = min(boundary, t1)
+            if t + wait >= limit:
+                excite *= math.exp(-beta * (limit - t))
+                t = limit
+                if t >= t1:
+                    break
+                continue
+            t += wait
+            excite *= math.exp(-beta * wait)
+            if rng.random() * upper <= mu + excite:
+                times.append(t)
+                excite += alpha
+        self._excite[index] = excite
+        return times
+
+    def _time_ms(self, t: float) -> int:
+        return self.start_time_ms + int(t * 1000)
+
+    def _diff_message(self, book: _SymbolBook, t: float, bids: list, asks: list) -> str:
+        first = book.update_id
+        book.update_id += 1
+        event_ms = self._time_ms(t)
+        return json.dumps({
+            "e": "depthUpdate", "E": event_ms, "T": event_ms, "s": book.symbol,
+            "U": first, "u": first, "pu": first - 1,
+            "b": [[book.price(tick), book.qty(book.bids.get(tick, 0))] for tick in dict.fromkeys(bids)],
+            "a": [[book.price(tick), book.qty(book.asks.get(tick, 0))] for tick in dict.fromkeys(asks)],
+        }, separators=(",", ":"))
+
+    def _trade_message(self, book: _SymbolBook, t: float, tick: int, lots: int, buyer_maker: bool) -> str:
+        book.trade_id += 1
+        event_ms = self._time_ms(t)
+        return json.dumps({
+            "e": "trade", "E": event_ms, "T": event_ms, "s": book.symbol, "t": book.trade_id,
+            "p": book.price(tick), "q": book.qty(lots), "b": book.trade_id * 2, "a": book.trade_id * 2 + 1,
+            "m": buyer_maker, "R": True,
+        }, separators=(",", ":"))
+
+    def _snapshots(self, book: _SymbolBook, t: float, out: list):
+        event_ms = self._time_ms(t)
+        bids, asks = book.top(self.snapshot_levels[-1])
+        for levels in self.snapshot_levels:
+            out.append((t, f"{book.stream}@depth{levels}", json.dumps({
+                "e": "depthUpdate", "E": event_ms, "T": event_ms, "s": book.symbol,
+                "U": book.update_id, "u": book.update_id, "pu": book.update_id - 1,
+                "b": bids[:levels], "a": asks[:levels],
+            }, separators=(",", ":"))))
+        book.changed = False
+
+    def advance(self, seconds: float) -> List[Tuple[float, str, str]]:
+        """
+        시뮬레이션 시간을 seconds만큼 진행
+        :return: 시간순 [(시뮬레이션 시각(초), 스트림 키, JSON 메시지), ...] - 스트림 키는 "<symbol 소문자>@<depth|depthN|trade>"
+        """
+        t0, t1 = self.now, self.now + seconds
+        arrivals = []
+        for index in range(len(self.books)):
+            arrivals.extend((t, index) for t in self._arrivals(index, t0, t1))
+        arrivals.sort()
+
+        out = []
+        add_p, cancel_p = self.cum_mix
+        for t, index in arrivals:
+            book = self.books[index]
+            self._flush_snapshots(index, t, out)
+            draw = self._rngs[index].random()
+            kind = ADD if draw < add_p else CANCEL if draw < cancel_p else MARKET
+            changed_bids, changed_asks, trades = book.apply(kind)
+            for tick, lots, buyer_maker in trades:
+                out.append((t, f"{book.stream}@trade", self._trade_message(book, t, tick, lots, buyer_maker)))
+            if changed_bids or changed_asks:
+                out.append((t, f"{book.stream}@depth", self._diff_message(book, t, changed_bids, changed_asks)))
+        for index in range(len(self.books)):
+            self._flush_snapshots(index, t1, out)
+        out.sort(key=lambda item: item[0])
+        self.now = t1
+        self.events += len(arrivals)
+        return out
+
+    def _flush_snapshots(self, index: int, t: float, out: list):
+        while self._next_snapshot[index] <= t:
+            book = self.books[index]
+            if book.changed:
+                self._snapshots(book, self._next_snapshot[index], out)
+            self._next_snapshot[index] += self.snapshot_interval
+
+
+def _generator_main(simulator: OrderFlowSimulator, batch_seconds: float, out_queue, stop_event):
+    """
+    별도 프로세스에서 메시지 배치를 미리 생성 (서버 이벤트 루프는 전송만 담당)
+    """
+    # 종료 시 소비자 없는 파이프 flush를 기다리지 않음
+    out_queue.cancel_join_thread()
+    while not stop_event.is_set():
+        start = simulator.now
+        batch = simulator.advance(batch_seconds)
+        while not stop_event.is_set():
+            try:
+                out_queue.put((start, batch), timeout=0.2)
+                break
+            except queue.Full:
+                continue
+
+
+class MarketSimulatorServer:
+    """
+    OrderFlowSimulator 메시지를 바이낸스 선물 웹소켓처럼 내보내는 로컬 서버 (부하 테스트용)
+    - ws://host:port/ws 에 접속 후 {"method": "SUBSCRIBE", "params": ["ltcusdt@depth20@100ms", ...], "id": 1}
+      (BinanceOrderBookWS / BinanceTradeWS의 on_connect 그대로), 또는 ws://host:port/ws/<stream>으로 바로 구독
+    - 스트림 이름 뒤의 업데이트 속도(@100ms 등)는 무시 (상위 N단계는 simulator.snapshot_interval_ms 주기)
+    - 생성은 별도 프로세스, 전송은 websockets.broadcast (느린 클라이언트를 기다리지 않음)
+    - speed: 시뮬레이션 시간 / 실제 시간 배율 (2.0이면 같은 흐름을 두 배 속도로 재생 → 메시지율 2배)
+    - stats()의 lag_ms가 계속 커지면 서버(또는 생성기)가 목표 속도를 따라가지 못하는 포화 상태
+    """
+
+    def __init__(self, simulator: OrderFlowSimulator, host: str = "127.0.0.1", port: int = 9443,
+                 speed: float = 1.0, batch_ms: int = 20, max_batches: int = 100, logger=None):
+        self.simulator = simulator
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.batch_seconds = batch_ms / 1000.0
+        self.max_batches = max_batches
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+        self._subscribers: Dict[str, Set] = {}
+        self._stopped = None
+        self.sent = 0
+        self.delivered = 0
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._started_at = None
+        self._stopped_at = None
+
+    # ------------------------------------------------------------
+    # 구독 관리
+    # ------------------------------------------------------------
+    @staticmethod
+    def _stream_key(name: str) -> str:
+        """
+        "LTCUSDT@depth20@100ms" → "ltcusdt@depth20" (업데이트 속도 접미사 제거)
+        """
+        parts = name.lower().split("@")
+        return "@".join(parts[:2])
+
+    def _subscribe(self, connection, streams: Iterable[str]):
+        for stream in streams:
+            self._subscribers.setdefault(self._stream_key(stream), set()).add(connection)
+
+    def _unsubscribe(self, connection, streams: Iterable[str] = None):
+        keys = [self._stream_key(s) for s in streams] if streams is not None else list(self._subscribers)
+        for key in keys:
+            self._subscribers.get(key, set()).discard(connection)
+
+    async def _handler(self, connection):
+        path = connection.request.path if connection.request is not None else "/ws"
+        if path.startswith("/ws/") and len(path) > 4:
+            self._subscribe(connection, path[4:].split("/"))
+        try:
+            async for raw in connection:
+                try:
+                    request = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                method = request.get("method")
+                params = request.get("params") or []
+                result = None
+                if method == "SUBSCRIBE":
+                    self._subscribe(connection, params)
+                elif method == "UNSUBSCRIBE":
+                    self._unsubscribe(connection, params)
+                elif method == "LIST_SUBSCRIPTIONS":
+                    result = sorted(k for k, conns in self._subscribers.items() if connection in conns)
+                await connection.send(json.dumps({"result": result, "id": request.get("id")}))
+        finally:
+            self._unsubscribe(connection)
+
+    # ------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------
+    def stats(self) -> dict:
+        if self._started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._stopped_at or time.monotonic()) - self._started_at
+        return {
+            "messages": self.sent,
+            "deliveries": self.delivered,
+            "elapsed": elapsed,
+            "messages_per_sec": self.sent / elapsed if elapsed else 0.0,
+            "lag_ms": self.lag * 1000,
+            "max_lag_ms": self.max_lag * 1000,
+            "subscribers": sum(len(c) for c in self._subscribers.values()),
+        }
+
+    def stop(self):
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def serve(self, duration: float = None, ready: Optional[asyncio.Event] = None):
+        """
+        서버 실행 (duration초 후 또는 stop() 호출 시 종료)
+        """
+        self._stopped = asyncio.Event()
+        ctx = multiprocessing.get_context("fork") if hasattr(multiprocessing, "get_context") else multiprocessing
+        batches = ctx.Queue(maxsize=self.max_batches)
+        stop_generator = ctx.Event()
+        generator = ctx.Process(target=_generator_main,
+                                args=(self.simulator, self.batch_seconds, batches, stop_generator), daemon=True)
+        generator.start()
+        loop = asyncio.get_running_loop()
+
+        async with serve(self._handler, self.host, self.port, compression=None, max_queue=None) as server:
+            self.logger.info(f"Market simulator listening on ws://{self.host}:{self.port}/ws "
+                             f"({len(self.simulator.books)} symbols, speed x{self.speed})")
+            if ready is not None:
+                ready.set()
+            self._started_at = time.monotonic()
+            deadline = None if duration is None else self._started_at + duration
+            sim_origin = None
+            try:
+                while not self._stopped.is_set() and (deadline is None or time.monotonic() < deadline):
+                    try:
+                        start, batch = await loop.run_in_executor(None, batches.get, True, 0.5)
+                    except queue.Empty:
+                        continue
+                    if sim_origin is None:
+                        sim_origin = start
+                    subscribers = self._subscribers
+                    for t, key, message in batch:
+                        due = self._started_at + (t - sim_origin) / self.speed
+                        wait = due - time.monotonic()
+                        if wait > 0.001:
+                            await asyncio.sleep(wait)
+                        else:
+                            self.lag = -wait if wait < 0 else 0.0
+                            if self.lag > self.max_lag:
+                                self.max_lag = self.lag
+                        connections = subscribers.get(key)
+                        self.sent += 1
+                        if connections:
+                            broadcast(connections, message)
+                            self.delivered += len(connections)
+                    await asyncio.sleep(0)
+            finally:
+                self._stopped_at = time.monotonic()
+                stop_generator.set()
+                generator.join(timeout=2)
+                if generator.is_alive():
+                    generator.terminate()
+                self.logger.info(f"Market simulator stopped: {self.stats()}")
+
+
+def _run_shard(symbols: List[str], port: int, messages_per_sec: float, args):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    options = dict(branching=args.branching, decay=args.decay, snapshot_interval_ms=args.snapshot_interval_ms)
+    base_rate = args.base_rate
+    if base_rate is None:
+        base_rate = OrderFlowSimulator.base_rate_for(messages_per_sec, symbols, seed=args.seed, **options)
+    logging.getLogger("OrderFlowSimulator").info(
+        f"{','.join(symbols)} on port {port}: target {messages_per_sec:,.0f} msgs/s (mu={base_rate:.1f}/s per symbol)")
+    simulator = OrderFlowSimulator(symbols=symbols, base_rate=base_rate, seed=args.seed + port, **options)
+    server = MarketSimulatorServer(simulator, host=args.host, port=port, speed=args.speed)
+    asyncio.run(server.serve(duration=args.duration))
+
+
+def main():
+    """
+    심볼을 shards개 서버 프로세스(port, port+1, ...)에 나눠 실행
+    - 서버 하나는 CPU 코어 하나로 전송량이 제한되므로, 10만 msgs/s 수준은 여러 포트로 샤딩해 만든다
+    - main.py는 FEED_URIS에 모든 샤드 주소를 주면 전부 구독함 (시작 시 출력되는 값 사용)
+    - 호가 diff 스트림(<symbol>@depth)은 주문 흐름 강도만큼 나오므로, 신호 단계까지 부하를 주려면
+      DEPTH_STREAMS=depth@100ms 처럼 diff 스트림을 구독
+    """
+    parser = argparse.ArgumentParser(description="Binance-compatible order flow simulator")
+    parser.add_argument("--symbols", default="LTCUSDT", help="쉼표로 구분한 심볼 목록")
+    parser.add_argument("--rate", type=float, default=1000.0,
+                        help="목표 초당 메시지 수 (모든 샤드/심볼 합계, 심볼 수에 비례해 샤드에 분배)")
+    parser.add_argument("--base-rate", type=float, default=None,
+                        help="심볼당 기본 도착률 μ (이벤트/초)를 직접 지정 (지정 시 --rate 무시)")
+    parser.add_argument("--snapshot-interval-ms", type=int, default=100, help="상위 N단계 스냅샷 주기 (ms)")
+    parser.add_argument("--branching", type=float, default=0.7)
+    parser.add_argument("--decay", type=float, default=20.0)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9443)
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=None, help="실행 시간(초), 미지정 시 무한")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    shards = max(1, min(args.shards, len(symbols)))
+    processes = [
+        multiprocessing.Process(
+            target=_run_shard,
+            args=(symbols[i::shards], args.port + i, args.rate * len(symbols[i::shards]) / len(symbols), args),
+        )
+        for i in range(shards)
+    ]
+    uris = ",".join(f"ws://{args.host}:{args.port + i}/ws" for i in range(shards))
+    print(f"FEED_URIS={uris} SYMBOLS={','.join(symbols)}")
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,18 @@
 import numpy as np
 import pandas as pd
 import logging
+from typing import Optional, Union
+
+SECONDS_PER_YEAR = 365 * 24 * 3600  # 암호화폐 시장은 24시간/365일 거래
 
 class PerformanceMetrics:
     def __init__(self, logger=None):
         self.logger = logger or logging.getLogger(self.__class__.__name__)
 
-    def calculate_metrics(self, result_df: pd.DataFrame) -> dict:
+    def calculate_metrics(self, result_df: pd.DataFrame, periods_per_year: Optional[float] = 252) -> dict:
         """
         result_df에는 최소한 'strategy_returns' 혹은 'cum_strategy_returns'가 있어야 함
+        :param periods_per_year: 샤프 비율 연율화 기간 (None이면 인덱스의 봉 간격으로 추정)
         """
         if "strategy_returns" not in result_df.columns:
             self.logger.warning("No 'strategy_returns' column found in result DataFrame.")
@@ -26,8 +30,10 @@ class PerformanceMetrics:
         total_trades = daily_returns[daily_returns != 0].count()
         win_rate = win_trades / total_trades if total_trades else 0
 
-        # 샤프 비율 (연율화 가정, 일봉 기준)
-        sharpe_ratio = self._sharpe_ratio(daily_returns, periods_per_year=252)
+        # 샤프 비율 (기본은 일봉 기준 252로 연율화)
+        if periods_per_year is None:
+            periods_per_year = self.infer_periods_per_year(result_df.index)
+        sharpe_ratio = self._sharpe_ratio(daily_returns, periods_per_year=periods_per_year)
 
         # 최대 낙폭 (MDD)
         cum_returns = (1 + daily_returns).cumprod()
@@ -53,3 +59,208 @@ class PerformanceMetrics:
             return 0
         sharpe = (mean_return - risk_free_rate) / std_return * np.sqrt(periods_per_year)
         return sharpe
+
+    @staticmethod
+    def infer_periods_per_year(index, default: float = 252) -> float:
+        """
+        DatetimeIndex의 봉 간격(중앙값)으로 연간 봉 개수 추정 (1분봉 → 525600, 1시간봉 → 8760)
+        - 시간 인덱스가 아니거나 간격을 알 수 없으면 default
+        """
+        if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+            return default
+        nanos = index.values.astype("datetime64[ns]").astype(np.int64)
+        step = np.median(np.diff(nanos))
+        if not np.isfinite(step) or step <= 0:
+            return default
+        return SECONDS_PER_YEAR / (step / 1e9)
+
+    def calculate_batch(self, returns: Union[pd.DataFrame, np.ndarray], positions=None,
+                        periods_per_year: Optional[float] = None) -> pd.DataFrame:
+        """
+        여러 전략(파라미터 조합)의 수익률 행렬을 한 번에 계산
+        :param returns: (봉 수 × 전략 수) 수익률 행렬, 전략마다 한 컬럼. NaN인 봉은 해당 전략에서 제외
+        :param positions: returns와 같은 모양의 포지션 행렬 (turnover 계산용, 없으면 NaN)
+        :param periods_per_year: None이면 DataFrame 인덱스의 봉 간격으로 추정 (ndarray면 252)
+        :return: 전략별 한 행 DataFrame
+                 (win_rate, sharpe_ratio, sortino_ratio, max_drawdown, max_drawdown_duration, turnover)
+                 max_drawdown_duration은 고점 회복까지 걸린 최대 봉 수, turnover는 연율화한 포지션 변화량 합
+        """
+        names = None
+        index = None
+        if isinstance(returns, pd.DataFrame):
+            names = returns.columns
+            index = returns.index
+            returns = returns.to_numpy(dtype=np.float64)
+        returns = np.asarray(returns, dtype=np.float64)
+        if returns.ndim == 1:
+            returns = returns[:, None]
+        if periods_per_year is None:
+            periods_per_year = self.infer_periods_per_year(index)
+
+        valid = ~np.isnan(returns)
+        r = np.where(valid, returns, 0.0)
+        count = valid.sum(axis=0)
+        if count.max(initial=0) < 2:
+            self.logger.warning("Insufficient data for performance metrics.")
+
+        # 승률 (calculate_metrics와 같이 수익 양/음 비율)
+        win_trades = (r > 0).sum(axis=0)
+        total_trades = ((r != 0) & valid).sum(axis=0)
+        win_rate = np.divide(win_trades, total_trades, out=np.zeros(r.shape[1]), where=total_trades > 0)
+
+        # 샤프 / 소르티노 (NaN 봉은 0으로 채웠으므로 유효 봉 수로 나눔)
+        n = np.maximum(count, 1)
+        mean = r.sum(axis=0) / n
+        centered = np.where(valid, r - mean, 0.0)
+        var = np.divide((centered ** 2).sum(axis=0), count - 1, out=np.zeros(r.shape[1]), where=count > 1)
+        std = np.sqrt(var)
+        downside = np.sqrt((np.minimum(r, 0.0) ** 2).sum(axis=0) / n)
+        scale = np.sqrt(periods_per_year)
+        sharpe = np.divide(mean, std, out=np.zeros_like(mean), where=std != 0) * scale
+        sortino = np.divide(mean, downside, out=np.zeros_like(mean), where=downside != 0) * scale
+
+        # 최대 낙폭 / 낙폭 지속 기간 (NaN 봉은 수익률 0 → 누적수익률 변화 없음)
+        equity = np.cumprod(r + 1, axis=0)
+        peak = np.maximum.accumulate(equity, axis=0)
+        max_drawdown = ((equity - peak) / peak).min(axis=0, initial=0.0)
+        steps = np.arange(r.shape[0])[:, None]
+        last_peak = np.maximum.accumulate(np.where(equity >= peak, steps, -1), axis=0)
+        # 처음부터 고점 아래인 경우는 없음 (첫 봉의 누적수익률이 곧 고점)
+        max_duration = (steps - last_peak).max(axis=0, initial=0)
+
+        turnover = np.full(r.shape[1], np.nan)
+        if positions is not None:
+            positions = np.asarray(positions, dtype=np.float64)
+            if positions.ndim == 1:
+                positions = positions[:, None]
+            changes = np.abs(np.diff(np.nan_to_num(positions), axis=0, prepend=0.0))
+            turnover = changes.sum(axis=0) / np.maximum(positions.shape[0], 1) * periods_per_year
+
+        return pd.DataFrame({
+            "win_rate": win_rate,
+            "sharpe_ratio": sharpe,
+            "sortino_ratio": sortino,
+            "max_drawdown": max_drawdown,
+            "max_drawdown_duration": max_duration,
+            "turnover": turnover,
+        }, index=names)
+
+
+class StreamingMetrics:
+    """
+    봉이 들어올 때마다 지표를 갱신하는 누적기 (실시간/청크 실행용)
+    - 평균/분산은 Welford 방식으로 갱신하므로 전체 수익률 기록을 보관하지 않음
+    - update는 봉 하나, update_many는 청크 단위 (청크 안은 벡터화, 청크 간 상태는 Chan 병합식으로 결합)
+    - metrics()는 PerformanceMetrics.calculate_batch와 같은 키/정의
+      (낙폭 기준 고점은 첫 봉의 누적수익률부터, NaN 수익률 봉은 수익률 0인 봉, NaN 포지션은 0으로 취급)
+    """
+
+    def __init__(self, periods_per_year: float = 252):
+        self.periods_per_year = periods_per_year
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.downside_sq = 0.0
+        self.wins = 0
+        self.nonzero = 0
+        self.equity = 1.0
+        self.peak = None
+        self.max_drawdown = 0.0
+        self.underwater = 0
+        self.max_drawdown_duration = 0
+        self.turnover_sum = 0.0
+        self.position_count = 0
+        self.last_position = 0.0
+
+    def update(self, ret: float, position: Optional[float] = None):
+        if position is not None:
+            position = 0.0 if position != position else position
+            self.turnover_sum += abs(position - self.last_position)
+            self.last_position = position
+            self.position_count += 1
+        if ret != ret:  # NaN: 통계에서는 제외, 누적수익률/낙폭 기간에서는 수익률 0인 봉
+            ret = 0.0
+        else:
+            self.count += 1
+            delta = ret - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (ret - self.mean)
+            if ret < 0:
+                self.downside_sq += ret * ret
+            if ret > 0:
+                self.wins += 1
+            if ret != 0:
+                self.nonzero += 1
+
+        self.equity *= 1 + ret
+        if self.peak is None or self.equity >= self.peak:
+            self.peak = self.equity
+            self.underwater = 0
+        else:
+            self.underwater += 1
+            self.max_drawdown = min(self.max_drawdown, (self.equity - self.peak) / self.peak)
+            self.max_drawdown_duration = max(self.max_drawdown_duration, self.underwater)
+
+    def update_many(self, returns, positions=None):
+        """
+        청크 단위 갱신 (update를 봉마다 호출한 것과 같은 결과)
+        """
+        if positions is not None:
+            positions = np.nan_to_num(np.asarray(positions, dtype=np.float64))
+            if len(positions):
+                steps = np.diff(positions, prepend=self.last_position)
+                self.turnover_sum += float(np.abs(steps).sum())
+                self.last_position = float(positions[-1])
+                self.position_count += len(positions)
+
+        returns = np.asarray(returns, dtype=np.float64)
+        if len(returns) == 0:
+            return
+        r = returns[~np.isnan(returns)]
+        n = len(r)
+
+        # Welford 상태와 청크 통계를 병합 (Chan et al.)
+        if n:
+            self._merge_stats(r)
+
+        # 이전 청크의 누적수익률/고점/낙폭 지속 봉 수를 이어받음 (NaN 봉은 수익률 0)
+        flat = np.nan_to_num(returns)
+        equity = self.equity * np.cumprod(1 + flat)
+        running = np.maximum.accumulate(equity)
+        peak = running if self.peak is None else np.maximum(self.peak, running)
+        self.max_drawdown = min(self.max_drawdown, float(((equity - peak) / peak).min()))
+        steps = np.arange(1, len(flat) + 1)
+        last_peak = np.maximum.accumulate(np.where(equity >= peak, steps, 0))
+        underwater = steps - last_peak
+        underwater[last_peak == 0] += self.underwater
+        self.max_drawdown_duration = max(self.max_drawdown_duration, int(underwater.max()))
+        self.underwater = int(underwater[-1])
+        self.equity = float(equity[-1])
+        self.peak = float(peak[-1])
+
+    def _merge_stats(self, r: np.ndarray):
+        n = len(r)
+        chunk_mean = r.mean()
+        chunk_m2 = float(((r - chunk_mean) ** 2).sum())
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.downside_sq += float((np.minimum(r, 0.0) ** 2).sum())
+        self.wins += int((r > 0).sum())
+        self.nonzero += int((r != 0).sum())
+
+    def metrics(self) -> dict:
+        scale = np.sqrt(self.periods_per_year)
+        std = np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+        downside = np.sqrt(self.downside_sq / self.count) if self.count else 0.0
+        return {
+            "win_rate": self.wins / self.nonzero if self.nonzero else 0,
+            "sharpe_ratio": self.mean / std * scale if std != 0 else 0,
+            "sortino_ratio": self.mean / downside * scale if downside != 0 else 0,
+            "max_drawdown": self.max_drawdown,
+            "max_drawdown_duration": self.max_drawdown_duration,
+            "turnover": (self.turnover_sum / self.position_count * self.periods_per_year
+                         if self.position_count else float("nan")),
+        }
@@ -0,0 +1,249 @@
+# order_execution/portfolio_risk.py
+
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+class PortfolioRiskEngine:
+    """
+    포트폴리오 전체를 체결(trade) 틱마다 시가평가(mark-to-market)하는 스트리밍 리스크 엔진
+    - 포지션은 심볼 인덱스 기반 NumPy 배열(수량/진입가/현재가)로 관리
+    - 틱마다 해당 심볼의 변화분만 반영해 자산(equity), 총 익스포저를 O(1)로 갱신
+    - 최고 자산(peak equity) 대비 낙폭(drawdown)을 추적하고, 한도 초과 시 즉시 킬스위치 발동
+    - place_order 직전 O(1) 사전 점검 (주문 금액, 심볼별 익스포저, 레버리지)
+    """
+
+    def __init__(
+        self,
+        initial_balance: float,
+        max_drawdown: float = 0.2,
+        max_order_notional: float = float("inf"),
+        max_symbol_exposure: float = float("inf"),
+        max_leverage: float = float("inf"),
+        capacity: int = 16,
+        logger=None
+    ):
+        """
+        :param initial_balance: 초기 계좌 잔고 (현금)
+        :param max_drawdown: 최고 자산 대비 최대 허용 낙폭 (0.2 = 20%)
+        :param max_order_notional: 주문 1건의 최대 금액 (수량 * 가격)
+        :param max_symbol_exposure: 심볼별 최대 포지션 금액
+        :param max_leverage: 총 익스포저 / 자산 최대 비율
+        :param capacity: 초기 심볼 배열 크기 (부족하면 2배씩 확장)
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.max_drawdown = max_drawdown
+        self.max_order_notional = max_order_notional
+        self.max_symbol_exposure = max_symbol_exposure
+        self.max_leverage = max_leverage
+
+        self._index: Dict[str, int] = {}
+        self.qty = np.zeros(capacity)            # 부호 있는 포지션 수량 (+롱 / -숏)
+        self.entry_price = np.zeros(capacity)    # 평균 진입가
+        self.mark_price = np.zeros(capacity)     # 최근 체결가
+
+        self.cash = float(initial_balance)       # 실현손익/수수료가 반영된 현금
+        self._unrealized = 0.0                   # Σ qty * (mark - entry)
+        self._gross_exposure = 0.0               # Σ |qty| * mark
+        self.equity = self.cash
+        self.peak_equity = self.cash
+        self.drawdown = 0.0
+
+        self.kill_switch = threading.Event()
+        self.kill_reason = None
+        self._kill_callbacks = []
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------
+    # 심볼 인덱스
+    # ------------------------------------------------------------
+    def _slot(self, symbol: str) -> int:
+        idx = self._index.get(symbol)
+        if idx is None:
+            idx = len(self._index)
+            if idx >= len(self.qty):
+                new_size = len(self.qty) * 2
+                self.qty = np.resize(self.qty, new_size)
+                self.entry_price = np.resize(self.entry_price, new_size)
+                self.mark_price = np.resize(self.mark_price, new_size)
+                self.qty[idx:] = 0.0
+                self.entry_price[idx:] = 0.0
+                self.mark_price[idx:] = 0.0
+            self._index[symbol] = idx
+        return idx
+
+    # ------------------------------------------------------------
+    # 스트리밍 갱신
+    # ------------------------------------------------------------
+    def on_trade(self, symbol: str, price: float):
+        """
+        체결 틱 수신: 해당 심볼 현재가 갱신 → 자산/낙폭 갱신 → 한도 초과 시 킬스위치
+        """
+        with self._lock:
+            idx = self._index.get(symbol)
+            if idx is None:
+                idx = self._slot(symbol)
+            price = float(price)
+            old_mark = float(self.mark_price[idx])
+            self.mark_price[idx] = price
+
+            qty = float(self.qty[idx])
+            if qty != 0.0:
+                if old_mark == 0.0:
+                    old_mark = float(self.entry_price[idx])
+                self._unrealized += qty * (price - old_mark)
+                self._gross_exposure += abs(qty) * (price - old_mark)
+            self._update_equity()
+
+    def on_fill(self, symbol: str, side: str, quantity: float, price: float, fee: float = 0.0):
+        """
+        체결된 주문 반영: 포지션/평균 진입가/실현손익 갱신
+        """
+        with self._lock:
+            idx = self._slot(symbol)
+            price = float(price)
+            signed = float(quantity) if side.upper() == "BUY" else -float(quantity)
+            old_qty = float(self.qty[idx])
+            entry = float(self.entry_price[idx])
+            mark = float(self.mark_price[idx]) or price
+
+            # 기존 기여분 제거
+            self._unrealized -= old_qty * (mark - entry)
+            self._gross_exposure -= abs(old_qty) * mark
+
+            new_qty = old_qty + signed
+            if old_qty == 0.0 or (old_qty > 0) == (signed > 0):
+                entry = (entry * abs(old_qty) + price * abs(signed)) / abs(new_qty)
+            else:
+                closed = min(abs(old_qty), abs(signed))
+                self.cash += (price - entry) * closed * (1.0 if old_qty > 0 else -1.0)
+                if abs(signed) > abs(old_qty):
+                    entry = price
+                elif abs(new_qty) < 1e-12:
+                    new_qty, entry = 0.0, 0.0
+            self.cash -= fee
+
+            self.qty[idx] = new_qty
+            self.entry_price[idx] = entry
+            self.mark_price[idx] = mark
+            self._unrealized += new_qty * (mark - entry)
+            self._gross_exposure += abs(new_qty) * mark
+            self._update_equity()
+
+    def mark_to_market(self, prices: Optional[Dict[str, float]] = None) -> float:
+        """
+        전체 포트폴리오를 벡터 연산으로 재평가 (누적 오차 보정 및 일괄 시세 반영용)
+        :param prices: {symbol: price} (없으면 현재 mark_price 사용)
+        :return: 갱신된 equity
+        """
+        with self._lock:
+            if prices:
+                for symbol, price in prices.items():
+                    self.mark_price[self._slot(symbol)] = float(price)
+            n = len(self._index)
+            mark = self.mark_price[:n]
+            qty = self.qty[:n]
+            mark = np.where(mark == 0.0, self.entry_price[:n], mark)
+            self._unrealized = float(np.dot(qty, mark - self.entry_price[:n]))
+            self._gross_exposure = float(np.dot(np.abs(qty), mark))
+            self._update_equity()
+            return self.equity
+
+    def unrealized_pnl(self) -> Dict[str, float]:
+        """
+        심볼별 미실현 손익 (벡터 연산)
+        """
+        with self._lock:
+            n = len(self._index)
+            pnl = self.qty[:n] * (self.mark_price[:n] - self.entry_price[:n])
+            return {symbol: float(pnl[idx]) for symbol, idx in self._index.items()}
+
+    def _update_equity(self):
+        self.equity = self.cash + self._unrealized
+        if self.equity > self.peak_equity:
+            self.peak_equity = self.equity
+        self.drawdown = (self.peak_equity - self.equity) / self.peak_equity if self.peak_equity > 0 else 0.0
+        if self.drawdown > self.max_drawdown and not self.kill_switch.is_set():
+            self._trigger_kill(f"Drawdown {self.drawdown*100:.2f}% exceeds {self.max_drawdown*100:.2f}%")
+
+    # ------------------------------------------------------------
+    # 사전 점검 / 킬스위치
+    # ------------------------------------------------------------
+    def check_order(self, symbol: str, side: str, quantity: float, price: float) -> Tuple[bool, str]:
+        """
+        place_order 직전 O(1) 사전 점검
+        :return: (허용 여부, 거부 사유)
+        """
+        if self.kill_switch.is_set():
+            return False, f"Kill switch active: {self.kill_reason}"
+
+        notional = float(quantity) * float(price)
+        if notional > self.max_order_notional:
+            return False, f"Order notional {notional:.2f} exceeds {self.max_order_notional}"
+
+        with self._lock:
+            idx = self._index.get(symbol)
+            cur_qty = float(self.qty[idx]) if idx is not None else 0.0
+            signed = float(quantity) if side.upper() == "BUY" else -float(quantity)
+            new_qty = cur_qty + signed
+
+            exposure = abs(new_qty) * float(price)
+            if exposure > self.max_symbol_exposure:
+                return False, f"{symbol} exposure {exposure:.2f} exceeds {self.max_symbol_exposure}"
+
+            gross = self._gross_exposure + (abs(new_qty) - abs(cur_qty)) * float(price)
+            if self.equity <= 0:
+                return False, "Non-positive equity"
+            leverage = gross / self.equity
+            if leverage > self.max_leverage:
+                return False, f"Leverage {leverage:.2f}x exceeds {self.max_leverage}x"
+
+        return True, ""
+
+    def add_kill_callback(self, callback: Callable[[str], None]):
+        """
+        킬스위치 발동 시 호출될 콜백 등록 (틱을 처리한 스레드에서 즉시 호출됨)
+        """
+        self._kill_callbacks.append(callback)
+
+    def trigger_kill_switch(self, reason: str):
+        with self._lock:
+            if not self.kill_switch.is_set():
+                self._trigger_kill(reason)
+
+    def reset_kill_switch(self):
+        """
+        수동 확인 후 킬스위치 해제 (peak는 현재 자산으로 재설정)
+        """
+        with self._lock:
+            self.kill_switch.clear()
+            self.kill_reason = None
+            self.peak_equity = self.equity
+            self.drawdown = 0.0
+
+    def _trigger_kill(self, reason: str):
+        self.kill_reason = reason
+        self.kill_switch.set()
+        self.logger.critical(f"KILL SWITCH: {reason}")
+        for callback in self._kill_callbacks:
+            try:
+                callback(reason)
+            except Exception as e:
+                self.logger.exception(f"Kill switch callback failed: {e}")
+
+    def snapshot(self) -> dict:
+        """
+        대시보드/로그용 현재 상태
+        """
+        with self._lock:
+            return {
+                "equity": self.equity,
+                "cash": self.cash,
+                "unrealized_pnl": self._unrealized,
+                "gross_exposure": self._gross_exposure,
+                "peak_equity": self.peak_equity,
+                "drawdown": self.drawdown,
+                "kill_switch": self.kill_switch.is_set(),
+            }
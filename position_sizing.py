@@ -2,6 +2,8 @@
 
 import logging
 
+import numpy as np
+
 class PositionSizing:
     """
     포지션 크기 결정 로직.
@@ -15,12 +17,14 @@ class PositionSizing:
         self.risk_per_trade = risk_per_trade
         self.logger = logger or logging.getLogger(self.__class__.__name__)
 
-    def calculate_position_size(self, account_balance: float, entry_price: float, stop_loss_price: float) -> float:
+    def calculate_position_size(self, account_balance: float, entry_price: float, stop_loss_price: float,
+                                symbol_filter=None) -> float:
         """
         단순 예시:
         - Risk = (entry_price - stop_loss_price) * position_size
         - Risk <= account_balance * risk_per_trade
         => position_size <= (account_balance * risk_per_trade) / (entry_price - stop_loss_price)
+        - symbol_filter(SymbolFilter)가 있으면 step size로 내림하고, 최소 수량/금액 미달이면 0
         """
         if stop_loss_price == 0 or entry_price == stop_loss_price:
             self.logger.warning("Invalid stop_loss_price. Using default position size = 0.")
@@ -34,5 +38,35 @@ class PositionSizing:
 
         position_size = risk_amount / distance
         # 여기서는 단순히 양수만
+        if symbol_filter is not None:
+            position_size = symbol_filter.quantize_qty(position_size)
+            valid, reason = symbol_filter.validate(position_size, entry_price, order_type="MARKET")
+            if not valid:
+                self.logger.warning(f"Position size rejected by exchange filter: {reason}")
+                return 0
         self.logger.debug(f"Calculated position size: {position_size}")
         return position_size
+
+    def calculate_position_sizes(self, account_balance: float, entry_prices, stop_loss_prices,
+                                 symbols: list = None, filter_registry=None) -> np.ndarray:
+        """
+        여러 주문의 포지션 크기를 한 번에 계산 (벡터 연산)
+        - 잘못된 손절가(0 또는 진입가와 같음)는 0
+        - symbols와 filter_registry(SymbolFilterRegistry)가 있으면 심볼별 step size 내림 및
+          최소 수량/금액, 시장가 최대 수량 확인 (calculate_position_size와 같은 기준, 미달/초과는 0)
+        """
+        entry_prices = np.asarray(entry_prices, dtype=float)
+        stop_loss_prices = np.asarray(stop_loss_prices, dtype=float)
+        distance = np.abs(entry_prices - stop_loss_prices)
+
+        valid = (stop_loss_prices != 0) & (distance > 0)
+        risk_amount = account_balance * self.risk_per_trade
+        sizes = np.where(valid, risk_amount / np.where(valid, distance, 1.0), 0.0)
+
+        if symbols is not None and filter_registry is not None:
+            sizes = filter_registry.quantize_qty_array(symbols, sizes)
+            filters = [filter_registry.get(s) for s in symbols]
+            min_notional = np.array([f.min_notional if f is not None else 0.0 for f in filters])
+            max_qty = np.array([f.market_max_qty if f is not None else np.inf for f in filters])
+            sizes = np.where((sizes * entry_prices < min_notional) | (sizes > max_qty), 0.0, sizes)
+        return sizes
@@ -0,0 +1,286 @@
+# backtesting/result_cache.py
+
+import hashlib
+import inspect
+import json
+import logging
+import marshal
+import os
+import sqlite3
+import sys
+import sysconfig
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 표준 라이브러리 / 설치된 패키지 경로 (전략 코드 해시에서 제외)
+_LIBRARY_PATHS = tuple(
+    os.path.abspath(path) for path in
+    {sysconfig.get_paths().get(name) for name in ("stdlib", "platstdlib", "purelib", "platlib")} if path
+)
+
+
+def _code_names(code) -> set:
+    """
+    코드 객체(중첩 함수/람다/컴프리헨션 포함)가 전역으로 참조하는 이름
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _code_names(const)
+    return names
+
+
+def _is_project_object(obj) -> bool:
+    module = sys.modules.get(getattr(obj, "__module__", None))
+    path = getattr(module, "__file__", None)
+    return path is not None and not os.path.abspath(path).startswith(_LIBRARY_PATHS)
+
+
+def _referenced_callables(func: Callable) -> List[Any]:
+    """
+    func가 전역 이름/클로저로 참조하는 프로젝트 함수·클래스 (함수는 재귀적으로 따라감)
+    """
+    found, stack, seen = [], [func], {id(func)}
+    while stack:
+        current = stack.pop()
+        code = getattr(current, "__code__", None)
+        if code is None:
+            continue
+        namespace = getattr(current, "__globals__", {})
+        candidates = [namespace.get(name) for name in sorted(_code_names(code))]
+        for cell in getattr(current, "__closure__", None) or ():
+            try:
+                candidates.append(cell.cell_contents)
+            except ValueError:
+                pass
+        for obj in candidates:
+            if not (inspect.isfunction(obj) or inspect.isclass(obj)) or id(obj) in seen:
+                continue
+            if not _is_project_object(obj):
+                continue
+            seen.add(id(obj))
+            found.append(obj)
+            if inspect.isfunction(obj):
+                stack.append(obj)
+    return found
+
+
+def _normalize(value):
+    """
+    캐시 키용 파라미터 정규화
+    - numpy 스칼라/배열 → 파이썬 값, 정수인 float(5.0) → int (5와 같은 키)
+    - JSON으로 표현할 수 없는 값은 타입 이름과 repr로 (문자열 "5"와 겹치지 않도록 dict로 감쌈)
+    """
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    elif isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool) or value is None or isinstance(value, (str, int)):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return {"__type__": f"{type(value).__module__}.{type(value).__qualname__}", "repr": repr(value)}
+
+
+class ResultCache:
+    """
+    백테스트 결과를 디스크(SQLite 파일)에 저장하는 내용 기반(content-addressed) 캐시
+    - 키 = hash(가격 데이터 내용, 전략 함수 코드(참조하는 프로젝트 함수/클래스 포함), 파라미터 dict, budget)
+      → 같은 데이터/코드/파라미터면 언제 실행해도 같은 키, 코드나 데이터가 바뀌면 자동으로 미스
+    - 결과가 나올 때마다 바로 기록하므로 중단된 최적화를 다시 돌리면 남은 조합만 계산
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 삭제
+    """
+
+    def __init__(self, path: str = "./backtest_cache.sqlite", max_bytes: int = 512 * 1024 * 1024,
+                 store_returns: bool = False, logger=None):
+        """
+        :param path: 캐시 SQLite 파일 경로
+        :param max_bytes: 캐시 최대 크기 (metrics + 수익률 시계열 바이트 합)
+        :param store_returns: True면 전략 수익률 시계열(float32)도 함께 저장
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.store_returns = store_returns
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " metrics TEXT NOT NULL,"
+            " returns BLOB,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON results(last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    # ------------------------------------------------------------
+    # 키 생성
+    # ------------------------------------------------------------
+    @staticmethod
+    def data_key(price_data: pd.DataFrame) -> str:
+        """
+        가격 데이터 내용 해시 (인덱스, 컬럼명, dtype, 값)
+        """
+        h = hashlib.sha256()
+        h.update(repr((list(map(str, price_data.columns)), str(price_data.index.dtype), len(price_data))).encode())
+        # tz-aware DatetimeIndex도 .values는 UTC 기준 datetime64 배열
+        for values in [np.asarray(price_data.index.values)] + [np.asarray(price_data[c].values) for c in price_data.columns]:
+            if values.dtype == object:
+                h.update(repr(values.tolist()).encode())
+            else:
+                h.update(np.ascontiguousarray(values).view(np.uint8))
+        return h.hexdigest()
+
+    @staticmethod
+    def strategy_key(strategy_func: Callable, version: str = None) -> str:
+        """
+        전략 함수 코드 해시 (소스를 구할 수 없으면 바이트코드 사용)
+        - 전략 함수가 참조하는 모듈 수준 함수/클래스(지표 계산 헬퍼 등)의 코드도 포함
+          (표준 라이브러리와 설치된 패키지는 제외)
+        - 코드 밖에서 결과가 바뀌는 경우(동적 import, 설정 파일 등)는 version 또는
+          strategy_func.cache_version 태그를 바꿔 캐시를 무효화
+        """
+        h = hashlib.sha256()
+        version = version if version is not None else getattr(strategy_func, "cache_version", None)
+        if version is not None:
+            h.update(f"version:{version}".encode())
+        for obj in [strategy_func] + sorted(_referenced_callables(strategy_func),
+                                            key=lambda o: f"{o.__module__}.{o.__qualname__}"):
+            h.update(f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', '')}".encode())
+            try:
+                h.update(inspect.getsource(obj).encode())
+            except (OSError, TypeError):
+                code = getattr(obj, "__code__", None)
+                h.update(marshal.dumps(code) if code is not None else repr(obj).encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def make_key(data_key: str, strategy_key: str, params: Dict[str, Any], budget: float = 1.0) -> str:
+        """
+        파라미터는 _normalize로 정규화 (np.int64(5), 5, 5.0은 같은 키, 문자열 "5"와는 다른 키)
+        """
+        material = json.dumps(
+            {"data": data_key, "strategy": strategy_key, "params": _normalize(params), "budget": _normalize(budget)},
+            sort_keys=True
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    # ------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------
+    def get(self, key: str) -> Optional[dict]:
+        """
+        :return: {"metrics": dict, "returns": np.ndarray or None} 또는 None
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, dict]:
+        keys = list(keys)
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, metrics, returns FROM results WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, metrics, returns in rows:
+                    found[key] = {
+                        "metrics": json.loads(metrics),
+                        "returns": np.frombuffer(returns, dtype=np.float32) if returns is not None else None,
+                    }
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE results SET last_access = ? WHERE key = ?", [(now, k) for k in found]
+                )
+                self._conn.commit()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, key: str, metrics: dict, returns=None):
+        self.put_many([(key, metrics, returns)])
+
+    def put_many(self, items: Iterable[tuple]):
+        """
+        :param items: [(key, metrics, returns or None), ...] - 한 트랜잭션으로 기록
+        """
+        rows = []
+        for key, metrics, returns in items:
+            metrics_json = json.dumps(metrics, default=float)
+            blob = None
+            if self.store_returns and returns is not None:
+                blob = np.asarray(returns, dtype=np.float32).tobytes()
+            size = len(metrics_json) + (len(blob) if blob is not None else 0)
+            rows.append((key, metrics_json, blob, size, time.time()))
+        if not rows:
+            return
+
+        with self._lock:
+            keys = [r[0] for r in rows]
+            placeholders = ",".join("?" * len(keys))
+            replaced = self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM results WHERE key IN ({placeholders})", keys
+            ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (key, metrics, returns, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            self._total_bytes += sum(r[3] for r in rows) - replaced
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """
+        max_bytes의 90%가 될 때까지 마지막 사용 시각이 오래된 항목부터 삭제 (락을 잡은 상태에서 호출)
+        """
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        cursor = self._conn.execute("SELECT key, size FROM results ORDER BY last_access ASC")
+        victims = []
+        for key, size in cursor:
+            if self._total_bytes - removed <= target:
+                break
+            victims.append((key,))
+            removed += size
+        self._conn.executemany("DELETE FROM results WHERE key = ?", victims)
+        self._conn.commit()
+        self._total_bytes -= removed
+        self.logger.info(f"Evicted {len(victims)} cached results ({removed} bytes).")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,364 @@
+# backtesting/robustness.py
+
+import logging
+import multiprocessing
+import os
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .performance_metrics import PerformanceMetrics
+from .shared_data import SharedPriceData, attach
+
+METRICS = ("win_rate", "sharpe_ratio", "sortino_ratio", "max_drawdown")
+
+# 한 번에 만드는 (리샘플 수 × 구간 수) 행렬 원소 수 상한 (메모리 사용량 제한)
+_MAX_ELEMENTS = 4_000_000
+
+# 구간 요약 컬럼
+# - sum_r / sum_r2 / sum_down2 / wins / nonzero / count: 더해서 합칠 수 있는 통계
+# - log_total: 구간 전체 로그 수익률, peak / trough: 구간 시작 대비 최고/최저 누적 로그 수익률 (구간 끝 포함)
+# - drawdown: 구간 시작점을 고점 후보로 포함한 구간 내부 최대 낙폭 (로그)
+# - first_peak / first_drawdown: 구간 시작점을 고점 후보에서 뺀 peak / drawdown
+#   (리샘플의 첫 구간용, calculate_batch처럼 첫 봉 이후 자산이 첫 고점)
+_SUMMARY_COLUMNS = ("sum_r", "sum_r2", "sum_down2", "wins", "nonzero", "count",
+                    "log_total", "peak", "trough", "drawdown", "first_peak", "first_drawdown")
+
+
+def _prefix(values: np.ndarray) -> np.ndarray:
+    out = np.empty(len(values) + 1)
+    out[0] = 0.0
+    np.cumsum(values, out=out[1:])
+    return out
+
+
+def _additive(returns: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    [start, end) 구간별 합계 통계 (누적합 차분)
+    """
+    stats = {
+        "sum_r": returns,
+        "sum_r2": returns * returns,
+        "sum_down2": np.minimum(returns, 0.0) ** 2,
+        "wins": (returns > 0).astype(np.float64),
+        "nonzero": (returns != 0).astype(np.float64),
+    }
+    out = {}
+    for name, values in stats.items():
+        prefix = _prefix(values)
+        out[name] = prefix[ends] - prefix[starts]
+    out["count"] = (ends - starts).astype(np.float64)
+    return out
+
+
+def _window_summaries(returns: np.ndarray, length: int) -> pd.DataFrame:
+    """
+    길이 length인 모든 이동 블록(시작 위치 0 ~ n - length)의 요약 (블록 부트스트랩용)
+    """
+    n = len(returns)
+    starts = np.arange(n - length + 1)
+    summary = _additive(returns, starts, starts + length)
+    levels = _prefix(np.log1p(returns))
+
+    peak = np.empty(len(starts))
+    trough = np.empty(len(starts))
+    drawdown = np.empty(len(starts))
+    first_peak = np.empty(len(starts))
+    first_drawdown = np.empty(len(starts))
+    offsets = np.arange(length + 1)
+    step = max(1, _MAX_ELEMENTS // (length + 1))
+    for i in range(0, len(starts), step):
+        block = starts[i:i + step]
+        path = levels[block[:, None] + offsets] - levels[block][:, None]   # 첫 열 = 0 (블록 시작)
+        running_max = np.maximum.accumulate(path, axis=1)
+        peak[i:i + step] = running_max[:, -1]
+        trough[i:i + step] = path[:, 1:].min(axis=1)
+        drawdown[i:i + step] = (path - running_max).min(axis=1)
+        first_max = np.maximum.accumulate(path[:, 1:], axis=1)
+        first_peak[i:i + step] = first_max[:, -1]
+        first_drawdown[i:i + step] = (path[:, 1:] - first_max).min(axis=1)
+
+    summary.update(log_total=levels[starts + length] - levels[starts], peak=peak, trough=trough,
+                   drawdown=drawdown, first_peak=first_peak, first_drawdown=first_drawdown)
+    return pd.DataFrame(summary, columns=list(_SUMMARY_COLUMNS))
+
+
+def _run_summaries(returns: np.ndarray, run_ids: np.ndarray) -> pd.DataFrame:
+    """
+    연속 구간(run_ids가 같은 연속 봉 = 한 트레이드 또는 무포지션 구간)별 요약 (트레이드 순서 셔플용)
+    """
+    n = len(returns)
+    boundaries = np.flatnonzero(np.diff(run_ids)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [n]))
+    summary = _additive(returns, starts, ends)
+
+    levels = _prefix(np.log1p(returns))
+    segment = np.repeat(np.arange(len(starts)), ends - starts)
+    rel = levels[1:] - levels[starts][segment]
+    grouped = pd.Series(rel).groupby(segment)
+    first_max = grouped.cummax().to_numpy()
+    first_peak = grouped.max().to_numpy()
+    first_drawdown = pd.Series(rel - first_max).groupby(segment).min().to_numpy()
+    summary.update(
+        log_total=levels[ends] - levels[starts],
+        peak=np.maximum(first_peak, 0.0),
+        trough=grouped.min().to_numpy(),
+        drawdown=np.minimum(pd.Series(rel - np.maximum(first_max, 0.0)).groupby(segment).min().to_numpy(), 0.0),
+        first_peak=first_peak,
+        first_drawdown=first_drawdown,
+    )
+    return pd.DataFrame(summary, columns=list(_SUMMARY_COLUMNS))
+
+
+def _combine(summary: Dict[str, np.ndarray], order: np.ndarray, periods_per_year: float) -> Dict[str, np.ndarray]:
+    """
+    리샘플마다 구간을 order 순서로 이어 붙인 수익률 시계열의 지표 (리샘플 수 × 구간 수 행렬에서 벡터화)
+    최대 낙폭: 구간 k 진입 시점의 누적 수준(base)과 그 전까지의 최고점(peak_before)으로
+              min(구간 내부 낙폭, base + 구간 최저점 - peak_before)의 최소값
+              calculate_batch와 같게 시작 자산(0)은 고점이 아님 → 첫 구간은 first_peak / first_drawdown 사용
+    """
+    def gather(name):
+        return summary[name][order]
+
+    count = gather("count").sum(axis=1)
+    sum_r = gather("sum_r").sum(axis=1)
+    sum_r2 = gather("sum_r2").sum(axis=1)
+    sum_down2 = gather("sum_down2").sum(axis=1)
+    wins = gather("wins").sum(axis=1)
+    nonzero = gather("nonzero").sum(axis=1)
+
+    n = np.maximum(count, 1)
+    mean = sum_r / n
+    var = np.divide(sum_r2 - n * mean * mean, count - 1, out=np.zeros_like(mean), where=count > 1)
+    std = np.sqrt(np.maximum(var, 0.0))
+    downside = np.sqrt(sum_down2 / n)
+    scale = np.sqrt(periods_per_year)
+
+    log_total = gather("log_total")
+    base = np.cumsum(log_total, axis=1)
+    base -= log_total
+    peak = gather("peak")
+    peak[:, 0] = summary["first_peak"][order[:, 0]]
+    inner = gather("drawdown")
+    inner[:, 0] = summary["first_drawdown"][order[:, 0]]
+    peak_after = np.maximum.accumulate(base + peak, axis=1)
+    peak_before = np.full_like(peak_after, -np.inf)
+    peak_before[:, 1:] = peak_after[:, :-1]
+    drawdown = np.minimum(inner, base + gather("trough") - peak_before).min(axis=1)
+
+    return {
+        "win_rate": np.divide(wins, nonzero, out=np.zeros_like(wins), where=nonzero > 0),
+        "sharpe_ratio": np.divide(mean, std, out=np.zeros_like(mean), where=std != 0) * scale,
+        "sortino_ratio": np.divide(mean, downside, out=np.zeros_like(mean), where=downside != 0) * scale,
+        "max_drawdown": np.expm1(np.minimum(drawdown, 0.0)),
+    }
+
+
+def _resample(summary: Dict[str, np.ndarray], n_samples: int, width: int, rng, make_order,
+              periods_per_year: float) -> Dict[str, np.ndarray]:
+    out = {m: np.empty(n_samples) for m in METRICS}
+    rows = max(1, _MAX_ELEMENTS // max(width, 1))
+    for i in range(0, n_samples, rows):
+        size = min(rows, n_samples - i)
+        metrics = _combine(summary, make_order(rng, size), periods_per_year)
+        for m in METRICS:
+            out[m][i:i + size] = metrics[m]
+    return out
+
+
+def _columns(spec: dict) -> Dict[str, np.ndarray]:
+    df = attach(spec)
+    return {c: df[c].to_numpy() for c in df.columns}
+
+
+def _worker_bootstrap(args):
+    spec, n_blocks, n_samples, seed, periods_per_year = args
+    summary = _columns(spec)
+    n_starts = len(summary["count"])
+    return _resample(summary, n_samples, n_blocks, np.random.default_rng(seed),
+                     lambda rng, size: rng.integers(0, n_starts, size=(size, n_blocks)), periods_per_year)
+
+
+def _worker_shuffle(args):
+    spec, n_samples, seed, periods_per_year = args
+    summary = _columns(spec)
+    n_runs = len(summary["count"])
+    return _resample(summary, n_samples, n_runs, np.random.default_rng(seed),
+                     lambda rng, size: rng.permuted(np.broadcast_to(np.arange(n_runs), (size, n_runs)), axis=1),
+                     periods_per_year)
+
+
+def _worker_noise(args):
+    spec, n_samples, seed, scale, periods_per_year = args
+    data = attach(spec)
+    returns = data["returns"].to_numpy()
+    active = np.flatnonzero(data["active"].to_numpy())
+    rng = np.random.default_rng(seed)
+    metrics_calculator = PerformanceMetrics(logger=logging.getLogger("RobustnessAnalyzer"))
+
+    out = {m: np.empty(n_samples) for m in METRICS}
+    cols = max(1, _MAX_ELEMENTS // max(len(returns), 1))
+    for i in range(0, n_samples, cols):
+        size = min(cols, n_samples - i)
+        noisy = np.repeat(returns[:, None], size, axis=1)
+        noisy[active] += rng.normal(0.0, scale, size=(len(active), size))
+        batch = metrics_calculator.calculate_batch(noisy, periods_per_year=periods_per_year)
+        for m in METRICS:
+            out[m][i:i + size] = batch[m].to_numpy()
+    return out
+
+
+class RobustnessAnalyzer:
+    """
+    백테스트 전략 수익률의 견고성 분석 (최적 파라미터의 성과가 운인지 확인)
+    - block bootstrap: 길이 block_size인 이동 블록을 복원 추출해 이어 붙인 시계열 (자기상관 보존)
+    - trade shuffle: 트레이드(같은 포지션이 이어진 구간) 순서를 섞은 시계열 (낙폭의 경로 의존성 확인)
+    - noise: 포지션 보유 봉의 수익률에 가우시안 노이즈를 더한 시계열
+    블록/트레이드는 구간 요약(합계 통계 + 누적 로그 수익률 최고/최저/내부 낙폭)을 한 번만 계산하고,
+    리샘플은 요약을 이어 붙이는 방식으로 벡터화 (봉 단위 경로를 다시 만들지 않음)
+    요약 데이터는 shared memory로 워커에 공유하고 리샘플을 묶음 단위로 워커 풀에 분배
+    """
+
+    def __init__(self, max_workers: int = None, periods_per_year: Optional[float] = None,
+                 shared_data_kind: str = "shm", shared_data_dir: str = None, logger=None):
+        """
+        :param periods_per_year: 연율화 기간 (None이면 수익률 인덱스의 봉 간격으로 추정)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.periods_per_year = periods_per_year
+        self.shared_data_kind = shared_data_kind
+        self.shared_data_dir = shared_data_dir
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+    def analyze(
+        self,
+        strategy_returns: pd.Series,
+        positions: pd.Series = None,
+        n_bootstrap: int = 10000,
+        block_size: int = None,
+        n_shuffle: int = 1000,
+        n_noise: int = 100,
+        noise_scale: float = 0.5,
+        confidence: float = 0.95,
+        samples_per_task: int = 250,
+        seed: int = None
+    ) -> dict:
+        """
+        :param strategy_returns: BacktestRunner 결과의 strategy_returns (NaN 봉은 제외)
+        :param positions: 포지션 시계열 (트레이드 구분용, 없으면 수익률이 0이 아닌 연속 구간을 트레이드로 간주)
+        :param block_size: 블록 길이 (기본: 봉 수의 세제곱근)
+        :param noise_scale: 노이즈 표준편차 (보유 봉 수익률 표준편차 대비 배수)
+        :param samples_per_task: 워커 작업 하나가 처리하는 리샘플 수 (결과는 워커 수와 무관하게 seed로 재현)
+        :return: {"observed": 원래 시계열 지표, "intervals": (방법, 지표)별 신뢰구간 DataFrame,
+                  "samples": {방법: 리샘플 지표 DataFrame}, "elapsed": 초}
+        """
+        start_time = time.perf_counter()
+        valid = strategy_returns.notna().to_numpy()
+        returns = strategy_returns.to_numpy(dtype=np.float64)[valid]
+        n = len(returns)
+        if n < 2:
+            raise ValueError("Insufficient data for robustness analysis.")
+        periods_per_year = self.periods_per_year
+        if periods_per_year is None:
+            periods_per_year = PerformanceMetrics.infer_periods_per_year(strategy_returns.index)
+
+        if positions is not None:
+            held = positions.to_numpy(dtype=np.float64)[valid]
+        else:
+            held = (returns != 0).astype(np.float64)
+        held = np.nan_to_num(held)
+        run_ids = np.cumsum(np.concatenate(([0], held[1:] != held[:-1])))
+        active = held != 0
+
+        block_size = block_size or max(1, int(round(n ** (1 / 3))))
+        block_size = min(block_size, n)
+        n_blocks = max(1, n // block_size)
+        sigma = returns[active].std() * noise_scale if active.any() else 0.0
+
+        observed = PerformanceMetrics(logger=self.logger).calculate_batch(
+            returns[:, None], periods_per_year=periods_per_year
+        ).iloc[0]
+        observed = {m: float(observed[m]) for m in METRICS}
+
+        seeds = np.random.SeedSequence(seed)
+        method_seeds = dict(zip(("bootstrap", "shuffle", "noise"), seeds.spawn(3)))
+        shared = []
+        try:
+            def share(frame):
+                handle = SharedPriceData(frame, kind=self.shared_data_kind, directory=self.shared_data_dir,
+                                         logger=self.logger)
+                shared.append(handle)
+                return handle.spec
+
+            tasks = []
+            if n_bootstrap:
+                spec = share(_window_summaries(returns, block_size))
+                tasks += [("bootstrap", _worker_bootstrap, (spec, n_blocks, size, s, periods_per_year))
+                          for size, s in self._split(n_bootstrap, samples_per_task, method_seeds["bootstrap"])]
+            if n_shuffle:
+                spec = share(_run_summaries(returns, run_ids))
+                tasks += [("shuffle", _worker_shuffle, (spec, size, s, periods_per_year))
+                          for size, s in self._split(n_shuffle, samples_per_task, method_seeds["shuffle"])]
+            if n_noise:
+                spec = share(pd.DataFrame({"returns": returns, "active": active}))
+                tasks += [("noise", _worker_noise, (spec, size, s, sigma, periods_per_year))
+                          for size, s in self._split(n_noise, samples_per_task, method_seeds["noise"])]
+
+            self.logger.info(
+                f"Robustness analysis: {n} bars, block={block_size}, "
+                f"{n_bootstrap}/{n_shuffle}/{n_noise} resamples, {len(tasks)} tasks."
+            )
+            if self.max_workers > 1 and len(tasks) > 1:
+                with multiprocessing.Pool(processes=min(self.max_workers, len(tasks))) as pool:
+                    pending = [pool.apply_async(func, (args,)) for _, func, args in tasks]
+                    outputs = [p.get() for p in pending]
+            else:
+                outputs = [func(args) for _, func, args in tasks]
+        finally:
+            for handle in shared:
+                handle.close()
+
+        samples = {}
+        for method in ("bootstrap", "shuffle", "noise"):
+            parts = [out for (name, _, _), out in zip(tasks, outputs) if name == method]
+            if parts:
+                samples[method] = pd.DataFrame({m: np.concatenate([p[m] for p in parts]) for m in METRICS})
+
+        return {
+            "observed": observed,
+            "intervals": self.confidence_intervals(samples, observed, confidence),
+            "samples": samples,
+            "elapsed": time.perf_counter() - start_time,
+        }
+
+    @staticmethod
+    def _split(total: int, per_task: int, seed_sequence: np.random.SeedSequence) -> list:
+        sizes = [min(per_task, total - i) for i in range(0, total, per_task)]
+        return list(zip(sizes, seed_sequence.spawn(len(sizes))))
+
+    @staticmethod
+    def confidence_intervals(samples: Dict[str, pd.DataFrame], observed: dict, confidence: float = 0.95) -> pd.DataFrame:
+        """
+        리샘플 분포의 백분위 신뢰구간
+        - prob_below_zero: 리샘플 지표가 0 이하인 비율 (샤프 비율이면 "운일 확률"의 대략적인 척도)
+        """
+        tail = (1 - confidence) / 2
+        rows = []
+        for method, df in samples.items():
+            for metric in METRICS:
+                values = df[metric].to_numpy()
+                lower, median, upper = np.quantile(values, [tail, 0.5, 1 - tail])
+                rows.append({
+                    "method": method,
+                    "metric": metric,
+                    "observed": observed[metric],
+                    "mean": values.mean(),
+                    "lower": lower,
+                    "median": median,
+                    "upper": upper,
+                    "prob_below_zero": float((values <= 0).mean()),
+                })
+        return pd.DataFrame(rows).set_index(["method", "metric"])
@@ -0,0 +1,382 @@
+# benchmarks/run_benchmarks.py
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import queue
+import statistics
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtesting.backtest_runner import BacktestRunner, example_strategy
+from backtesting.strategy_optimizer import StrategyOptimizer
+from backtesting.tick_backtester import TickData
+from data_feed.order_book_ws import BinanceOrderBookWS
+from data_feed.trade_data_ws import BinanceTradeWS
+from order_execution.exchange_api import BinanceFuturesAPI
+from order_execution.trade_executor import TradeExecutor
+from signal_generator.signal_manager import SignalManager, run_signal_manager
+
+from .synthetic_market import SyntheticMarket
+
+# 벤치마크 대상 코드의 로그는 끔 (디버그 f-string 생성 비용은 그대로 측정됨)
+_QUIET = logging.getLogger("benchmark")
+_QUIET.setLevel(logging.WARNING)
+
+
+# ------------------------------------------------------------
+# 측정 유틸
+# ------------------------------------------------------------
+def _summary(samples_ns: List[int], best_total_ns: int, calls_per_repeat: int) -> dict:
+    samples_ns = sorted(samples_ns)
+    count = len(samples_ns)
+    return {
+        "calls": count,
+        "ops_per_sec": calls_per_repeat / (best_total_ns / 1e9) if best_total_ns else float("inf"),
+        "mean_us": statistics.fmean(samples_ns) / 1e3,
+        "p50_us": samples_ns[count // 2] / 1e3,
+        "p99_us": samples_ns[min(count - 1, int(count * 0.99))] / 1e3,
+        "max_us": samples_ns[-1] / 1e3,
+    }
+
+
+def measure(func: Callable, inputs: list, calls: int = 10000, repeat: int = 3, warmup: int = 100) -> dict:
+    """
+    func(input)을 calls회 호출하며 호출마다 시간 측정 (inputs를 순환)
+    ops_per_sec는 repeat 중 가장 빠른 회차 기준 (다른 프로세스 간섭 영향 최소화)
+    """
+    size = len(inputs)
+    for i in range(min(warmup, calls)):
+        func(inputs[i % size])
+    clock = time.perf_counter_ns
+    samples = []
+    best = None
+    for _ in range(repeat):
+        total = 0
+        for i in range(calls):
+            item = inputs[i % size]
+            start = clock()
+            func(item)
+            elapsed = clock() - start
+            total += elapsed
+            samples.append(elapsed)
+        best = total if best is None else min(best, total)
+    return _summary(samples, best, calls)
+
+
+def measure_async(coro_func: Callable, inputs: list, calls: int = 10000, repeat: int = 3, warmup: int = 100) -> dict:
+    """
+    async 함수용 measure (하나의 이벤트 루프 안에서 await 시간 측정)
+    """
+    async def run():
+        size = len(inputs)
+        for i in range(min(warmup, calls)):
+            await coro_func(inputs[i % size])
+        clock = time.perf_counter_ns
+        samples = []
+        best = None
+        for _ in range(repeat):
+            total = 0
+            for i in range(calls):
+                item = inputs[i % size]
+                start = clock()
+                await coro_func(item)
+                elapsed = clock() - start
+                total += elapsed
+                samples.append(elapsed)
+            best = total if best is None else min(best, total)
+        return _summary(samples, best, calls)
+
+    return asyncio.run(run())
+
+
+class _NullExchange:
+    """
+    네트워크 없이 TradeExecutor를 만들기 위한 빈 거래소 객체 (큐/스탑 경로만 측정)
+    """
+
+    def get_exchange_info(self):
+        return {"symbols": []}
+
+
+# ------------------------------------------------------------
+# 컴포넌트별 마이크로벤치마크
+# ------------------------------------------------------------
+def micro_benchmarks(seed: int = 0, calls: int = 10000, repeat: int = 3) -> Dict[str, dict]:
+    market = SyntheticMarket(seed=seed)
+    events = market.events(duration_s=60, depth_rate=10, trade_rate=100)
+    depth_events = [e for _, kind, e in events if kind == "depth"]
+    trade_events = [e for _, kind, e in events if kind == "trade"]
+    depth_json = [json.dumps(e, separators=(",", ":")) for e in depth_events]
+    trade_json = [json.dumps(e, separators=(",", ":")) for e in trade_events]
+    books = []
+    for event in depth_events[:200]:
+        books.append({"symbol": event["s"],
+                      "bids": [[float(p), float(q)] for p, q in event["b"]],
+                      "asks": [[float(p), float(q)] for p, q in event["a"]]})
+    trade_windows = [market.trade_window(100) for _ in range(20)]
+    pairs = [(books[i % len(books)], trade_windows[i % len(trade_windows)]) for i in range(200)]
+
+    results = {}
+    run = lambda name, func, inputs: results.__setitem__(name, measure(func, inputs, calls, repeat))
+
+    # 디코드
+    run("decode.depth_json", json.loads, depth_json)
+    run("decode.trade_json", json.loads, trade_json)
+
+    # 웹소켓 메시지 처리 (디코드 + 이벤트 분기 + 핸들러)
+    ob_ws = BinanceOrderBookWS(logger=_QUIET)
+    results["feed.order_book_on_message"] = measure_async(ob_ws.on_message, depth_json, calls, repeat)
+    executor = TradeExecutor(_NullExchange(), initial_balance=10000.0, num_workers=1, logger=_QUIET)
+    td_ws = BinanceTradeWS(logger=_QUIET, trade_handlers=[executor.on_trade])
+    results["feed.trade_on_message"] = measure_async(td_ws.on_message, trade_json, calls, repeat)
+
+    # 호가 갱신 (문자열 호가 → 숫자 변환 후 executor 캐시 / 틱 백테스트용 배열 변환)
+    def book_update(event):
+        executor.update_order_book(event["s"], {
+            "bids": [[float(p), float(q)] for p, q in event["b"]],
+            "asks": [[float(p), float(q)] for p, q in event["a"]],
+        })
+    run("book.update", book_update, depth_events)
+    batch = [e for _, _, e in events[:1100]]
+    results["book.tickdata_from_events_1100"] = measure(TickData.from_events, [batch], max(1, calls // 100), repeat,
+                                                         warmup=1)
+
+    # 분석기 / 신호 종합
+    manager = SignalManager(logger=_QUIET)
+    run("analyzer.bid_ask_imbalance", lambda p: manager.bid_ask_analyzer.analyze(p[0]), pairs)
+    run("analyzer.iceberg", lambda p: manager.iceberg_detector.detect(p[0]), pairs)
+    run("analyzer.vwap_obv", lambda p: manager.vwap_obv_analyzer.analyze(p[1]), pairs)
+    run("analyzer.market_depth", lambda p: manager.market_depth_analyzer.analyze(p[0]), pairs)
+    run("analyzer.order_flow", lambda p: manager.order_flow_analyzer.analyze(p[0], p[1]), pairs)
+    signal_sets = [manager.generate_signals(*p)["signals"] for p in pairs]
+    run("signal.combine", manager._combine_signals, signal_sets)
+    run("signal.generate", lambda p: manager.generate_signals(*p), pairs)
+
+    # 큐
+    local_queue = queue.Queue()
+    run("queue.thread_queue_put_get", lambda x: (local_queue.put(x), local_queue.get()), [1])
+    signals = [{"symbol": "LTCUSDT", "action": "BUY", "price": 90.0, "signal_type": t}
+               for t in ("ENTRY", "EXIT", "STOP_LOSS")]
+
+    def executor_queue(signal):
+        executor.add_signal(signal)
+        with executor._lock:
+            item = executor._next_signal()
+            executor._release_symbol(item[0])
+    run("queue.executor_add_next", executor_queue, signals)
+    results["queue.mp_queue_roundtrip"] = _mp_roundtrip(multiprocessing.Queue(), multiprocessing.Queue(),
+                                                         books[0], max(1, calls // 10), repeat)
+    with multiprocessing.Manager() as mp_manager:
+        results["queue.manager_queue_roundtrip"] = _mp_roundtrip(mp_manager.Queue(), mp_manager.Queue(),
+                                                                 books[0], max(1, calls // 10), repeat)
+
+    # 주문 서명
+    api = BinanceFuturesAPI("benchmark-key", "benchmark-secret", logger=_QUIET)
+    run("sign.order", lambda q: api._sign(api._order_params("LTCUSDT", "BUY", "LIMIT", q, 90.12, "GTC")),
+        [0.1, 0.25, 1.0])
+    return results
+
+
+def _echo(in_queue, out_queue):
+    while True:
+        item = in_queue.get()
+        if item is None:
+            break
+        out_queue.put(item)
+
+
+def _mp_roundtrip(in_queue, out_queue, payload, calls: int, repeat: int) -> dict:
+    """
+    다른 프로세스를 거쳐 돌아오는 왕복 시간 (호가 스냅샷 하나 크기의 payload)
+    """
+    proc = multiprocessing.Process(target=_echo, args=(in_queue, out_queue), daemon=True)
+    proc.start()
+    try:
+        return measure(lambda x: (in_queue.put(x), out_queue.get()), [payload], calls, repeat, warmup=10)
+    finally:
+        in_queue.put(None)
+        proc.join(timeout=5)
+
+
+# ------------------------------------------------------------
+# 파이프라인 / 최적화 벤치마크
+# ------------------------------------------------------------
+def pipeline_benchmark(seed: int = 0, messages: int = 20000, rate: Optional[float] = None,
+                       trade_window: int = 100) -> dict:
+    """
+    main.py와 같은 구조의 파이프라인 처리량 / 지연 측정
+    피드(현재 프로세스: JSON 디코드 + 최근 체결 유지) → multiprocessing 큐
+    → run_signal_manager 프로세스(분석기 + 신호 종합) → 결과 큐
+    :param rate: 초당 입력 메시지 수 (None이면 최대 속도 = 처리량 측정, 지정하면 그 속도에서의 지연 측정)
+    :return: 메시지 처리량과 depth 메시지 하나의 종단 간 지연(피드 수신 → 신호 출력) 분포
+    """
+    market = SyntheticMarket(seed=seed)
+    stream = []
+    while len(stream) < messages:
+        stream.extend(market.messages(duration_s=10, depth_rate=10, trade_rate=100))
+    stream = stream[:messages]
+
+    in_queue = multiprocessing.Queue()
+    out_queue = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=run_signal_manager, args=(in_queue, out_queue), daemon=True)
+    proc.start()
+    in_queue.put({"order_book": market.order_book(), "trade": []})
+    out_queue.get()  # 워커 준비 완료 (임포트/초기화 시간 제외)
+
+    sent_at = []
+    received_at = []
+    expected = sum(1 for _, kind, _ in stream if kind == "depth")
+
+    def collect():
+        for _ in range(expected):
+            out_queue.get()
+            received_at.append(time.perf_counter_ns())
+
+    collector = threading.Thread(target=collect, daemon=True)
+    collector.start()
+
+    trades = deque(maxlen=trade_window)
+    interval = 1e9 / rate if rate else 0
+    start = time.perf_counter_ns()
+    for i, (_, kind, message) in enumerate(stream):
+        if interval:
+            target = start + int(i * interval)
+            while time.perf_counter_ns() < target:
+                pass
+        now = time.perf_counter_ns()
+        data = json.loads(message)
+        if kind == "trade":
+            trades.append({"price": float(data["p"]), "quantity": float(data["q"]), "is_buyer_maker": data["m"]})
+            continue
+        book = {"bids": [[float(p), float(q)] for p, q in data["b"]],
+                "asks": [[float(p), float(q)] for p, q in data["a"]]}
+        sent_at.append(now)
+        in_queue.put({"order_book": book, "trade": list(trades)})
+    collector.join()
+    end = time.perf_counter_ns()
+    in_queue.put(None)
+    proc.join(timeout=5)
+
+    latencies = [r - s for s, r in zip(sent_at, received_at)]
+    summary = _summary(latencies, end - start, messages)
+    summary.update(messages=messages, signals=expected, rate=rate)
+    return summary
+
+
+def optimizer_benchmark(seed: int = 0, rows: int = 50000, max_workers: int = 1) -> dict:
+    rng = np.random.default_rng(seed)
+    price_data = pd.DataFrame(
+        {"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.001, rows)))},
+        index=pd.date_range("2024-01-01", periods=rows, freq="1min"),
+    )
+    grid = {"short_window": [5, 10, 15, 20], "long_window": [50, 100, 150, 200]}
+    with StrategyOptimizer(BacktestRunner(example_strategy, logger=_QUIET), logger=_QUIET) as optimizer:
+        optimizer.grid_search(price_data, grid, max_workers=max_workers)  # 워커 풀 준비
+        start = time.perf_counter_ns()
+        optimizer.grid_search(price_data, grid, max_workers=max_workers)
+        elapsed = time.perf_counter_ns() - start
+    combos = len(grid["short_window"]) * len(grid["long_window"])
+    return {"calls": combos, "ops_per_sec": combos / (elapsed / 1e9), "mean_us": elapsed / combos / 1e3,
+            "rows": rows, "max_workers": max_workers}
+
+
+# ------------------------------------------------------------
+# 실행 / 결과 저장 / 비교
+# ------------------------------------------------------------
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_all(seed: int = 0, quick: bool = False, name_filter: str = None, latency_rate: float = 1000.0) -> dict:
+    calls = 2000 if quick else 10000
+    repeat = 2 if quick else 3
+    results = micro_benchmarks(seed, calls, repeat)
+    results["e2e.pipeline_throughput"] = pipeline_benchmark(seed, messages=5000 if quick else 20000)
+    results["e2e.pipeline_latency"] = pipeline_benchmark(seed, messages=2000 if quick else 10000, rate=latency_rate)
+    results["optimizer.grid_search"] = optimizer_benchmark(seed, rows=10000 if quick else 50000)
+    if name_filter:
+        results = {k: v for k, v in results.items() if name_filter in k}
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": seed,
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10) -> pd.DataFrame:
+    """
+    두 결과의 ops_per_sec 비교 (change < -threshold이면 regression)
+    """
+    rows = []
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        change = result["ops_per_sec"] / old["ops_per_sec"] - 1 if old["ops_per_sec"] else float("nan")
+        rows.append({
+            "benchmark": name,
+            "baseline_ops": old["ops_per_sec"],
+            "current_ops": result["ops_per_sec"],
+            "change": change,
+            "baseline_p99_us": old.get("p99_us"),
+            "current_p99_us": result.get("p99_us"),
+            "regression": change < -threshold,
+        })
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ordre-book benchmarks")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmark_results/<commit>_<시각>.json)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="regression 판정 기준 (처리량 감소 비율)")
+    parser.add_argument("--filter", help="이름에 이 문자열이 포함된 벤치마크만 저장")
+    parser.add_argument("--rate", type=float, default=1000.0, help="지연 측정 시 초당 입력 메시지 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="반복 횟수를 줄여 빠르게 실행")
+    args = parser.parse_args()
+
+    report = run_all(seed=args.seed, quick=args.quick, name_filter=args.filter, latency_rate=args.rate)
+    output = args.output or os.path.join(
+        "benchmark_results", f"{report['meta']['commit'] or 'nocommit'}_{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    table = pd.DataFrame(report["results"]).T[["ops_per_sec", "mean_us", "p50_us", "p99_us"]]
+    print(table.to_string(float_format=lambda v: f"{v:,.1f}"))
+    print(f"\nSaved to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            diff = compare(json.load(f), report, args.threshold)
+        print(diff.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+        if diff["regression"].any():
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
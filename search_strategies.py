@@ -0,0 +1,309 @@
+# backtesting/search_strategies.py
+
+import itertools
+import logging
+import math
+import random
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+class SearchStrategy:
+    """
+    StrategyOptimizer.search에서 사용하는 탐색 전략 기반 클래스 (ask/tell 인터페이스)
+    - ask(): 다음에 평가할 (params, budget) 또는 지금 제안할 것이 없으면 None
+    - tell(params, budget, score): 평가 결과 전달 (score가 클수록 좋음, 실패 시 None)
+    budget은 사용할 데이터 비율 (1.0 = 전체 price_data)
+
+    param_space 예시: {
+      "short_window": [5, 10, 20],     # 리스트: 이산 후보
+      "long_window": (20, 200),        # 튜플: 구간 (양 끝이 정수면 정수 샘플)
+      "threshold": (0.5, 2.0)
+    }
+    """
+
+    def __init__(self, param_space: Dict[str, Any], seed: Optional[int] = None, logger=None):
+        self.param_space = param_space
+        self.keys = list(param_space.keys())
+        self.rng = random.Random(seed)
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+    def ask(self) -> Optional[Tuple[Dict[str, Any], float]]:
+        raise NotImplementedError
+
+    def tell(self, params: Dict[str, Any], budget: float, score: Optional[float]):
+        pass
+
+    # ------------------------------------------------------------
+    # 파라미터 공간 헬퍼
+    # ------------------------------------------------------------
+    def sample(self) -> Dict[str, Any]:
+        params = {}
+        for key, space in self.param_space.items():
+            if isinstance(space, tuple):
+                low, high = space
+                if isinstance(low, int) and isinstance(high, int):
+                    params[key] = self.rng.randint(low, high)
+                else:
+                    params[key] = self.rng.uniform(low, high)
+            else:
+                params[key] = self.rng.choice(list(space))
+        return params
+
+    def encode(self, params: Dict[str, Any]) -> np.ndarray:
+        """
+        파라미터를 [0, 1]^d 벡터로 변환 (이산 후보는 후보 순서 기준)
+        """
+        x = np.empty(len(self.keys))
+        for i, key in enumerate(self.keys):
+            space = self.param_space[key]
+            if isinstance(space, tuple):
+                low, high = space
+                x[i] = (params[key] - low) / (high - low) if high != low else 0.0
+            else:
+                choices = list(space)
+                x[i] = choices.index(params[key]) / max(1, len(choices) - 1)
+        return x
+
+    @staticmethod
+    def key_of(params: Dict[str, Any]) -> tuple:
+        return tuple(sorted(params.items()))
+
+    @staticmethod
+    def _score(score: Optional[float]) -> float:
+        if score is None or (isinstance(score, float) and math.isnan(score)):
+            return float("-inf")
+        return float(score)
+
+
+class RandomSearch(SearchStrategy):
+    """
+    파라미터 공간에서 n_iter개 조합을 무작위로 평가 (중복 조합은 건너뜀)
+    """
+
+    def __init__(self, param_space: Dict[str, Any], n_iter: int = 50, seed: Optional[int] = None, logger=None):
+        super().__init__(param_space, seed, logger)
+        self.n_iter = n_iter
+        self._proposed = set()
+        self._attempts = 0
+
+    def ask(self):
+        while len(self._proposed) < self.n_iter and self._attempts < self.n_iter * 20:
+            self._attempts += 1
+            params = self.sample()
+            key = self.key_of(params)
+            if key not in self._proposed:
+                self._proposed.add(key)
+                return params, 1.0
+        return None
+
+
+class SuccessiveHalving(SearchStrategy):
+    """
+    비동기 Successive Halving (ASHA)
+    - 모든 후보를 작은 데이터 구간(min_budget)에서 먼저 평가
+    - 각 단계(rung)에서 상위 1/eta 후보만 eta배 큰 구간으로 승격, 나머지는 조기 탈락
+    - 워커가 비면 승격 가능한 후보를 먼저, 없으면 새 후보를 최하위 단계에 투입 (단계 동기화 대기 없음)
+    """
+
+    def __init__(self, param_space: Dict[str, Any], n_configs: int = 81, min_budget: float = 1 / 9,
+                 eta: int = 3, seed: Optional[int] = None, logger=None):
+        super().__init__(param_space, seed, logger)
+        self.n_configs = n_configs
+        self.eta = eta
+        # min_budget * eta^k 가 1.0에 도달하는 단계까지
+        self.budgets = []
+        budget = min_budget
+        while budget < 1.0 - 1e-9:
+            self.budgets.append(budget)
+            budget *= eta
+        self.budgets.append(1.0)
+
+        self._sampled = 0
+        self._proposed = set()
+        self._attempts = 0
+        self._params = {}                                        # key -> params
+        self._results = [dict() for _ in self.budgets]           # rung -> {key: score}
+        self._promoted = [set() for _ in self.budgets]           # rung -> {key} (다음 단계로 보낸 후보)
+
+    def _rung_of(self, budget: float) -> int:
+        return min(range(len(self.budgets)), key=lambda k: abs(self.budgets[k] - budget))
+
+    def ask(self):
+        # 1) 높은 단계부터 승격 가능한 후보 확인
+        for rung in range(len(self.budgets) - 2, -1, -1):
+            results = self._results[rung]
+            top_n = len(results) // self.eta
+            if top_n == 0:
+                continue
+            ranked = sorted(results.items(), key=lambda kv: kv[1], reverse=True)[:top_n]
+            for key, _ in ranked:
+                if key not in self._promoted[rung]:
+                    self._promoted[rung].add(key)
+                    return self._params[key], self.budgets[rung + 1]
+
+        # 2) 새 후보를 최하위 단계에 투입
+        while self._sampled < self.n_configs and self._attempts < self.n_configs * 20:
+            self._attempts += 1
+            params = self.sample()
+            key = self.key_of(params)
+            if key in self._proposed:
+                continue
+            self._proposed.add(key)
+            self._params[key] = params
+            self._sampled += 1
+            return params, self.budgets[0]
+        return None
+
+    def tell(self, params, budget, score):
+        key = self.key_of(params)
+        self._params.setdefault(key, params)
+        self._results[self._rung_of(budget)][key] = self._score(score)
+
+
+class Hyperband(SearchStrategy):
+    """
+    Hyperband: 최소 구간 크기가 서로 다른 여러 SuccessiveHalving bracket을 번갈아 실행
+    (공격적인 조기 탈락과 보수적인 탐색을 함께 사용해 min_budget 선택에 덜 민감)
+    - bracket 최소 구간: min_budget, min_budget * eta, ..., 1.0 (마지막은 조기 탈락 없이 전체 구간만 평가)
+    - 최소 구간이 작은 bracket일수록 후보 수가 많음 (bracket별 총 평가량이 비슷하도록)
+    """
+
+    def __init__(self, param_space: Dict[str, Any], max_configs: int = 81, min_budget: float = 1 / 27,
+                 eta: int = 3, seed: Optional[int] = None, logger=None):
+        super().__init__(param_space, seed, logger)
+        num_brackets = 1
+        budget = min_budget
+        while budget < 1.0 - 1e-9:
+            budget *= eta
+            num_brackets += 1
+
+        self.brackets = []
+        for s in range(num_brackets):
+            bracket_min = min(1.0, min_budget * eta ** s)
+            n_configs = max(1, int(math.ceil(max_configs * num_brackets / (num_brackets - s) / eta ** s)))
+            self.brackets.append(SuccessiveHalving(
+                param_space, n_configs=n_configs, min_budget=bracket_min, eta=eta,
+                seed=self.rng.randrange(2 ** 31), logger=self.logger
+            ))
+        # (key, budget) -> 제안한 bracket 목록 (여러 bracket이 같은 조합/구간을 제안할 수 있음, 제안 순서대로 전달)
+        self._owners = defaultdict(deque)
+        self._cycle = itertools.cycle(range(len(self.brackets)))
+
+    def ask(self):
+        for _ in range(len(self.brackets)):
+            i = next(self._cycle)
+            proposal = self.brackets[i].ask()
+            if proposal is not None:
+                params, budget = proposal
+                self._owners[(self.key_of(params), budget)].append(i)
+                return proposal
+        return None
+
+    def tell(self, params, budget, score):
+        slot = (self.key_of(params), budget)
+        owners = self._owners.get(slot)
+        i = owners.popleft() if owners else 0
+        if owners is not None and not owners:
+            del self._owners[slot]
+        self.brackets[i].tell(params, budget, score)
+
+
+class BayesianOptimization(SearchStrategy):
+    """
+    가우시안 프로세스(RBF 커널) + Expected Improvement 기반 모델 탐색 (NumPy만 사용)
+    - 처음 n_initial개는 무작위 탐색 (n_initial=0이어도 관측값이 하나 생길 때까지는 무작위)
+    - 평가 중인 후보는 현재 최저 점수로 가정(constant liar)해 비동기 제안이 한 곳에 몰리지 않게 함
+    """
+
+    def __init__(self, param_space: Dict[str, Any], n_iter: int = 50, n_initial: int = 10,
+                 n_candidates: int = 500, length_scale: float = 0.2, noise: float = 1e-6,
+                 seed: Optional[int] = None, logger=None):
+        super().__init__(param_space, seed, logger)
+        self.n_iter = n_iter
+        self.n_initial = n_initial
+        self.n_candidates = n_candidates
+        self.length_scale = length_scale
+        self.noise = noise
+
+        self._proposed = set()
+        self._pending = {}         # key -> x
+        self._X: List[np.ndarray] = []
+        self._y: List[float] = []
+
+    def ask(self):
+        if len(self._proposed) >= self.n_iter:
+            return None
+        if len(self._y) < max(1, self.n_initial):
+            params = self._sample_new()
+        else:
+            params = self._suggest()
+        if params is None:
+            return None
+        key = self.key_of(params)
+        self._proposed.add(key)
+        self._pending[key] = self.encode(params)
+        return params, 1.0
+
+    def tell(self, params, budget, score):
+        key = self.key_of(params)
+        x = self._pending.pop(key, None)
+        if x is None:
+            x = self.encode(params)
+        y = self._score(score)
+        if math.isinf(y):
+            # 실패한 평가는 관측값 대신 현재 최저값으로 기록
+            y = min(self._y) if self._y else 0.0
+        self._X.append(x)
+        self._y.append(y)
+
+    def _sample_new(self, attempts: int = 100):
+        for _ in range(attempts):
+            params = self.sample()
+            if self.key_of(params) not in self._proposed:
+                return params
+        return None
+
+    def _kernel(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        d2 = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+        return np.exp(-0.5 * d2 / self.length_scale ** 2)
+
+    def _suggest(self):
+        X = np.array(self._X + list(self._pending.values()))
+        y = np.array(self._y + [min(self._y)] * len(self._pending))
+        y_mean, y_std = y.mean(), y.std() or 1.0
+        y_norm = (y - y_mean) / y_std
+
+        K = self._kernel(X, X) + self.noise * np.eye(len(X))
+        try:
+            L = np.linalg.cholesky(K)
+        except np.linalg.LinAlgError:
+            L = np.linalg.cholesky(K + 1e-4 * np.eye(len(X)))
+        alpha = np.linalg.solve(L.T, np.linalg.solve(L, y_norm))
+
+        candidates = []
+        for _ in range(self.n_candidates):
+            params = self.sample()
+            if self.key_of(params) not in self._proposed:
+                candidates.append(params)
+        if not candidates:
+            return None
+        Xc = np.array([self.encode(p) for p in candidates])
+
+        Ks = self._kernel(Xc, X)
+        mu = Ks @ alpha
+        v = np.linalg.solve(L, Ks.T)
+        sigma = np.sqrt(np.clip(1.0 - (v ** 2).sum(axis=0), 1e-12, None))
+
+        best = y_norm[:len(self._y)].max()
+        z = (mu - best) / sigma
+        ei = (mu - best) * _norm_cdf(z) + sigma * _norm_pdf(z)
+        return candidates[int(np.argmax(ei))]
+
+
+def _norm_pdf(z: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * z ** 2) / math.sqrt(2 * math.pi)
+
+def _norm_cdf(z: np.ndarray) -> np.ndarray:
+    return 0.5 * (1 + np.vectorize(math.erf)(z / math.sqrt(2)))
@@ -0,0 +1,184 @@
+# backtesting/shared_data.py
+
+import logging
+import os
+import uuid
+from multiprocessing import shared_memory
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# 워커 프로세스에서 attach한 데이터 캐시 (spec 이름 -> (DataFrame, 핸들))
+_ATTACHED: Dict[str, tuple] = {}
+_MAX_ATTACHED = 2
+
+# 프로세스 안에 이미 올려 둔 데이터 (원격 워커가 로컬에 캐시한 데이터셋, spec kind = "local")
+_LOCAL: Dict[str, pd.DataFrame] = {}
+
+class SharedPriceData:
+    """
+    가격 DataFrame을 프로세스 간 복사 없이 공유하기 위한 컨테이너
+    - "shm": 인덱스와 각 컬럼을 하나의 shared memory 블록에 연속 배치
+    - "mmap": 컬럼별 .npy 파일로 저장 후 워커에서 memory-map으로 열기 (대용량/재사용용)
+    워커에는 작은 spec(dict)만 전달하고, attach(spec)로 NumPy 뷰 기반 DataFrame을 얻음
+    """
+
+    def __init__(self, price_data: pd.DataFrame, kind: str = "shm", directory: str = None, logger=None):
+        """
+        :param price_data: 공유할 가격 데이터 (숫자형 컬럼, DatetimeIndex 또는 숫자 인덱스)
+        :param kind: "shm" (shared memory) or "mmap" (memory-mapped 파일)
+        :param directory: kind="mmap"일 때 .npy 파일을 저장할 디렉토리
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.kind = kind
+        self._shm = None
+
+        name = f"pd_{uuid.uuid4().hex[:16]}"
+        index = price_data.index
+        arrays = {"__index__": self._index_values(index)}
+        for col in price_data.columns:
+            arrays[str(col)] = np.ascontiguousarray(price_data[col].to_numpy())
+
+        self.spec = {
+            "name": name,
+            "kind": kind,
+            "length": len(price_data),
+            "columns": [str(c) for c in price_data.columns],
+            "index_name": index.name,
+            "index_tz": str(index.tz) if getattr(index, "tz", None) is not None else None,
+            "index_is_datetime": isinstance(index, pd.DatetimeIndex),
+            "arrays": {},
+        }
+
+        if kind == "shm":
+            total = sum(a.nbytes for a in arrays.values())
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=max(1, total))
+            offset = 0
+            for key, arr in arrays.items():
+                view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=self._shm.buf, offset=offset)
+                view[:] = arr
+                self.spec["arrays"][key] = {"dtype": arr.dtype.str, "offset": offset}
+                offset += arr.nbytes
+        elif kind == "mmap":
+            directory = directory or os.path.join(".", "shared_data")
+            path = os.path.join(directory, name)
+            os.makedirs(path, exist_ok=True)
+            for i, (key, arr) in enumerate(arrays.items()):
+                file_path = os.path.join(path, f"{i}.npy")
+                np.save(file_path, arr)
+                self.spec["arrays"][key] = {"dtype": arr.dtype.str, "path": file_path}
+            self.spec["path"] = path
+        else:
+            raise ValueError(f"Unknown shared data kind: {kind}")
+
+        self.logger.debug(f"Shared price data {name} ({kind}, {len(price_data)} rows) created.")
+
+    @staticmethod
+    def _index_values(index: pd.Index) -> np.ndarray:
+        if isinstance(index, pd.DatetimeIndex):
+            # tz-aware면 UTC 기준 datetime64 값
+            return np.ascontiguousarray(index.values)
+        return np.ascontiguousarray(index.to_numpy())
+
+    def close(self):
+        """
+        생성한 쪽에서 공유 자원 해제 (shared memory unlink / mmap 파일 삭제)
+        """
+        if self._shm is not None:
+            self._shm.close()
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+            self._shm = None
+        elif self.kind == "mmap" and os.path.isdir(self.spec.get("path", "")):
+            for file_name in os.listdir(self.spec["path"]):
+                os.remove(os.path.join(self.spec["path"], file_name))
+            os.rmdir(self.spec["path"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def attach(spec: dict) -> pd.DataFrame:
+    """
+    워커 프로세스에서 spec으로 공유 데이터를 열어 DataFrame 반환 (복사 없이 NumPy 뷰 사용)
+    같은 spec은 프로세스 안에서 캐시되어 재사용됨
+    """
+    if spec["kind"] == "local":
+        return _LOCAL[spec["name"]]
+    cached = _ATTACHED.get(spec["name"])
+    if cached is not None:
+        return cached[0]
+
+    length = spec["length"]
+    handle = None
+    arrays = {}
+    if spec["kind"] == "shm":
+        handle = _open_shared_memory(spec["name"])
+        for key, meta in spec["arrays"].items():
+            arrays[key] = np.ndarray((length,), dtype=np.dtype(meta["dtype"]), buffer=handle.buf, offset=meta["offset"])
+    else:
+        for key, meta in spec["arrays"].items():
+            arrays[key] = np.load(meta["path"], mmap_mode="r")
+
+    index_values = arrays.pop("__index__")
+    if spec["index_is_datetime"]:
+        index = pd.DatetimeIndex(index_values, name=spec["index_name"])
+        if spec["index_tz"]:
+            index = index.tz_localize("UTC").tz_convert(spec["index_tz"])
+    else:
+        index = pd.Index(index_values, name=spec["index_name"])
+
+    df = pd.DataFrame({col: arrays[col] for col in spec["columns"]}, index=index, copy=False)
+
+    # 오래된 attach부터 해제 (워커가 여러 데이터셋을 오가며 메모리를 계속 잡지 않도록)
+    while len(_ATTACHED) >= _MAX_ATTACHED:
+        old_df, old_handle = _ATTACHED.pop(next(iter(_ATTACHED)))
+        del old_df
+        if old_handle is not None:
+            try:
+                old_handle.close()
+            except BufferError:
+                # 아직 참조 중인 뷰가 있으면 GC 시 해제되도록 둠
+                pass
+    _ATTACHED[spec["name"]] = (df, handle)
+    return df
+
+
+def register_local(name: str, price_data: pd.DataFrame) -> dict:
+    """
+    현재 프로세스에 데이터를 등록하고 attach용 spec 반환 ({"kind": "local", "name": name})
+    """
+    _LOCAL[name] = price_data
+    return local_spec(name)
+
+
+def local_spec(name: str) -> dict:
+    return {"kind": "local", "name": name}
+
+
+def has_local(name: str) -> bool:
+    return name in _LOCAL
+
+
+def _open_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    attach만 하는 쪽은 resource tracker에 등록하지 않음 (생성한 프로세스만 unlink 담당)
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: track 인자 없음 → attach 동안만 등록을 건너뜀
+        # (fork 시 tracker를 부모와 공유하므로 unregister하면 부모의 등록까지 지워짐)
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
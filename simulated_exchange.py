@@ -0,0 +1,662 @@
+# order_execution/simulated_exchange.py
+
+import heapq
+import itertools
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional, Union
+
+from .symbol_filters import SymbolFilter
+
+# 상위 N단계(partial book) depth 스트림 이름 ("ltcusdt@depth20@100ms", "depth5") - 그 외 depth 스트림은 diff
+_PARTIAL_DEPTH = re.compile(r"@?depth\d+")
+
+class _SimOrder:
+    """
+    매칭 엔진 내부 주문 (메모리/속도를 위해 __slots__ 사용)
+    """
+    __slots__ = ("order_id", "symbol", "side", "type", "time_in_force", "price",
+                 "orig_qty", "executed_qty", "cum_quote", "status", "update_time")
+
+    def __init__(self, order_id, symbol, side, order_type, time_in_force, price, quantity):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side
+        self.type = order_type
+        self.time_in_force = time_in_force
+        self.price = price
+        self.orig_qty = quantity
+        self.executed_qty = 0.0
+        self.cum_quote = 0.0
+        self.status = "NEW"
+        self.update_time = int(time.time() * 1000)
+
+    @property
+    def remaining(self) -> float:
+        return self.orig_qty - self.executed_qty
+
+    def to_response(self) -> dict:
+        """
+        바이낸스 선물 주문 응답과 같은 형태로 변환
+        """
+        avg_price = self.cum_quote / self.executed_qty if self.executed_qty else 0.0
+        return {
+            "orderId": self.order_id,
+            "symbol": self.symbol,
+            "status": self.status,
+            "price": str(self.price or 0),
+            "avgPrice": str(avg_price),
+            "origQty": str(self.orig_qty),
+            "executedQty": str(self.executed_qty),
+            "cumQuote": str(self.cum_quote),
+            "timeInForce": self.time_in_force,
+            "type": self.type,
+            "side": self.side,
+            "updateTime": self.update_time,
+        }
+
+
+class MatchingEngine:
+    """
+    심볼 1개에 대한 가격-시간 우선(price-time priority) 매칭 엔진
+    - 내부 주문: 가격별 deque(FIFO) + 최우선 가격 힙 (빈 레벨은 꺼낼 때 정리)
+    - 외부 유동성: 실시간/리플레이 오더북(depth) 스냅샷 또는 diff 누적. 공격 주문이 소진한 잔량은
+      그 단계의 다음 depth 갱신 전까지 차감된 상태로 유지
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = {}          # price -> deque[_SimOrder]
+        self.asks = {}
+        self._bid_heap = []     # -price
+        self._ask_heap = []     # price
+        self.ext_bids = []      # [[price, qty], ...] 가격 내림차순
+        self.ext_asks = []      # [[price, qty], ...] 가격 오름차순
+        self.ext_update_id = None   # 마지막으로 반영한 depth 이벤트의 u (diff 연속성 확인용)
+
+    # ------------------------------------------------------------
+    # 최우선 호가
+    # ------------------------------------------------------------
+    def _best_internal(self, side: str) -> Optional[float]:
+        """
+        side 쪽 내부 최우선 가격 (BUY=최고 매수가, SELL=최저 매도가)
+        """
+        if side == "BUY":
+            heap, levels, sign = self._bid_heap, self.bids, -1
+        else:
+            heap, levels, sign = self._ask_heap, self.asks, 1
+        while heap:
+            price = heap[0] * sign
+            if levels.get(price):
+                return price
+            heapq.heappop(heap)
+            levels.pop(price, None)
+        return None
+
+    def best_bid(self) -> Optional[float]:
+        internal = self._best_internal("BUY")
+        external = self.ext_bids[0][0] if self.ext_bids else None
+        if internal is None or external is None:
+            return internal if external is None else external
+        return max(internal, external)
+
+    def best_ask(self) -> Optional[float]:
+        internal = self._best_internal("SELL")
+        external = self.ext_asks[0][0] if self.ext_asks else None
+        if internal is None or external is None:
+            return internal if external is None else external
+        return min(internal, external)
+
+    # ------------------------------------------------------------
+    # 주문 처리
+    # ------------------------------------------------------------
+    def would_cross(self, side: str, price: float) -> bool:
+        if side == "BUY":
+            best = self.best_ask()
+            return best is not None and best <= price
+        best = self.best_bid()
+        return best is not None and best >= price
+
+    def available(self, side: str, limit_price: Optional[float]) -> float:
+        """
+        side 방향 공격 주문이 limit_price 이내에서 가져갈 수 있는 총 수량 (FOK 판단용)
+        """
+        total = 0.0
+        if side == "BUY":
+            levels, ext = self.asks, self.ext_asks
+            ok = (lambda p: limit_price is None or p <= limit_price)
+        else:
+            levels, ext = self.bids, self.ext_bids
+            ok = (lambda p: limit_price is None or p >= limit_price)
+        for price, queue in levels.items():
+            if ok(price):
+                total += sum(o.remaining for o in queue)
+        for price, qty in ext:
+            if not ok(price):
+                break
+            total += qty
+        return total
+
+    def match(self, taker: _SimOrder, on_fill: Callable) -> None:
+        """
+        공격 주문을 반대편 호가(내부 주문 + 외부 유동성)와 가격 우선으로 체결
+        동일 가격이면 내부(먼저 대기한) 주문이 우선
+        on_fill(order, qty, price, is_maker) 콜백으로 체결 통지
+        """
+        side = taker.side
+        opposite = "SELL" if side == "BUY" else "BUY"
+        levels = self.asks if side == "BUY" else self.bids
+        ext = self.ext_asks if side == "BUY" else self.ext_bids
+        limit = taker.price if taker.type == "LIMIT" else None
+
+        while taker.remaining > 1e-12:
+            internal = self._best_internal(opposite)
+            external = ext[0][0] if ext else None
+            if internal is None and external is None:
+                break
+
+            if side == "BUY":
+                use_internal = external is None or (internal is not None and internal <= external)
+                price = internal if use_internal else external
+                if limit is not None and price > limit:
+                    break
+            else:
+                use_internal = external is None or (internal is not None and internal >= external)
+                price = internal if use_internal else external
+                if limit is not None and price < limit:
+                    break
+
+            if use_internal:
+                queue = levels[price]
+                maker = queue[0]
+                qty = min(taker.remaining, maker.remaining)
+                on_fill(maker, qty, price, True)
+                if maker.remaining <= 1e-12:
+                    queue.popleft()
+                    if not queue:
+                        del levels[price]
+            else:
+                level = ext[0]
+                qty = min(taker.remaining, level[1])
+                level[1] -= qty
+                if level[1] <= 1e-12:
+                    ext.pop(0)
+            on_fill(taker, qty, price, False)
+
+    def rest(self, order: _SimOrder) -> None:
+        """
+        미체결 잔량을 호가에 등록 (같은 가격 내에서는 도착 순서대로)
+        """
+        if order.side == "BUY":
+            levels, heap, key = self.bids, self._bid_heap, -order.price
+        else:
+            levels, heap, key = self.asks, self._ask_heap, order.price
+        queue = levels.get(order.price)
+        if queue is None:
+            queue = levels[order.price] = deque()
+            heapq.heappush(heap, key)
+        queue.append(order)
+
+    def remove(self, order: _SimOrder) -> bool:
+        levels = self.bids if order.side == "BUY" else self.asks
+        queue = levels.get(order.price)
+        if not queue:
+            return False
+        try:
+            queue.remove(order)
+        except ValueError:
+            return False
+        if not queue:
+            del levels[order.price]
+        return True
+
+    # ------------------------------------------------------------
+    # 시장 데이터 반영
+    # ------------------------------------------------------------
+    def set_external_book(self, bids: list, asks: list, on_fill: Callable) -> None:
+        """
+        외부 오더북 스냅샷 반영. 새 호가가 내부 대기 주문을 가로지르면(가격이 관통하면)
+        해당 주문을 지정가로 체결 처리
+        """
+        self.ext_bids = sorted(([float(p), float(q)] for p, q in bids if float(q) > 0), key=lambda l: -l[0])
+        self.ext_asks = sorted(([float(p), float(q)] for p, q in asks if float(q) > 0), key=lambda l: l[0])
+        self._fill_external_crossed(on_fill)
+
+    def apply_external_diff(self, bids: list, asks: list, on_fill: Callable) -> None:
+        """
+        외부 오더북 변경분(diff) 반영: 언급된 단계만 새 수량으로 교체, 수량 0이면 단계 삭제 (나머지 단계는 유지)
+        """
+        self.ext_bids = self._merge_levels(self.ext_bids, bids, descending=True)
+        self.ext_asks = self._merge_levels(self.ext_asks, asks, descending=False)
+        self._fill_external_crossed(on_fill)
+
+    @staticmethod
+    def _merge_levels(levels: list, updates: list, descending: bool) -> list:
+        book = {price: qty for price, qty in levels}
+        for price, qty in updates:
+            price, qty = float(price), float(qty)
+            if qty > 0:
+                book[price] = qty
+            else:
+                book.pop(price, None)
+        return [[price, book[price]] for price in sorted(book, reverse=descending)]
+
+    def _fill_external_crossed(self, on_fill: Callable) -> None:
+        if self.ext_asks:
+            self._fill_crossed("BUY", lambda p: p >= self.ext_asks[0][0], float("inf"), on_fill)
+        if self.ext_bids:
+            self._fill_crossed("SELL", lambda p: p <= self.ext_bids[0][0], float("inf"), on_fill)
+
+    def on_trade(self, price: float, quantity: float, buyer_is_maker: Optional[bool], on_fill: Callable) -> None:
+        """
+        외부 체결 발생 시, 그 가격에 닿은 내부 대기 주문을 체결 수량만큼 가격-시간 순으로 체결
+        - buyer_is_maker=True: 매도 공격 → 매수 대기 주문 체결 후보
+        - buyer_is_maker=False: 매수 공격 → 매도 대기 주문 체결 후보
+        - None: 양쪽 모두 확인
+        """
+        if buyer_is_maker in (True, None):
+            self._fill_crossed("BUY", lambda p: p >= price, quantity, on_fill)
+        if buyer_is_maker in (False, None):
+            self._fill_crossed("SELL", lambda p: p <= price, quantity, on_fill)
+
+    def _fill_crossed(self, side: str, crossed: Callable, quantity: float, on_fill: Callable) -> None:
+        levels = self.bids if side == "BUY" else self.asks
+        while quantity > 1e-12:
+            best = self._best_internal(side)
+            if best is None or not crossed(best):
+                break
+            queue = levels[best]
+            maker = queue[0]
+            qty = min(quantity, maker.remaining)
+            on_fill(maker, qty, best, True)
+            quantity -= qty
+            if maker.remaining <= 1e-12:
+                queue.popleft()
+                if not queue:
+                    del levels[best]
+
+
+class SimulatedExchange:
+    """
+    BinanceFuturesAPI와 동일한 메서드/응답 형태를 제공하는 로컬 모의 거래소
+    - 심볼별 MatchingEngine(가격-시간 우선)으로 체결
+    - 외부 시세는 update_order_book / on_trade 또는 replay()로 주입 (실시간 WS 연결 or 기록 데이터)
+    - 지연(latency_model)과 거부(rejection_model)를 설정해 실거래 환경을 흉내냄
+    실제 거래소 없이 TradeExecutor / OrderManager / RiskManager를 부하 테스트하는 용도
+    """
+
+    def __init__(
+        self,
+        initial_balance: float = 10000.0,
+        taker_fee: float = 0.0004,
+        maker_fee: float = 0.0002,
+        latency_model: Union[float, Callable[[], float]] = 0.0,
+        reject_rate: float = 0.0,
+        rejection_model: Optional[Callable[[dict], Optional[dict]]] = None,
+        max_order_history: int = 100000,
+        symbol_filters: Optional[dict] = None,
+        depth_stream: str = "depth20",
+        seed: Optional[int] = None,
+        logger=None
+    ):
+        """
+        :param initial_balance: 초기 USDT 잔고
+        :param taker_fee: 테이커 수수료율
+        :param maker_fee: 메이커 수수료율
+        :param latency_model: 요청당 지연(초) 상수 또는 지연값을 반환하는 함수
+        :param reject_rate: 무작위 거부 확률 (rejection_model이 없을 때 사용)
+        :param rejection_model: 주문 파라미터 dict를 받아 거부 시 에러 응답 dict, 통과 시 None 반환
+        :param max_order_history: get_order로 조회 가능한 종료 주문 최대 보관 개수
+        :param symbol_filters: {symbol: {"tick_size": "0.01", "step_size": "0.001", "min_qty": ..., "min_notional": ...}}
+               지정한 심볼은 실거래소처럼 필터 위반 주문을 거부하고 get_exchange_info로 노출
+        :param depth_stream: 스트림 이름 없이 들어온 depthUpdate 이벤트의 구독 스트림 (config.depth_streams 형식)
+               "depth5"/"depth20@100ms" 등 상위 N단계 스트림이면 전체 교체, "depth"/"depth@100ms"면 diff로 누적
+        :param seed: 거부 모델 난수 시드
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.latency_model = latency_model
+        self.reject_rate = reject_rate
+        self.rejection_model = rejection_model
+        self.max_order_history = max_order_history
+        self.depth_stream = depth_stream
+        self._rng = random.Random(seed)
+        self.symbol_filters = {
+            symbol: SymbolFilter(symbol, **{k: str(v) for k, v in spec.items()})
+            for symbol, spec in (symbol_filters or {}).items()
+        }
+
+        self._engines = {}
+        self._orders = {}               # orderId -> _SimOrder
+        self._open_orders = {}          # symbol -> {orderId: _SimOrder}
+        self._closed_ids = deque()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+        # 계좌 상태
+        self.wallet_balance = initial_balance
+        self.positions = {}             # symbol -> {"qty": 부호 있는 수량, "entry_price": 평균 진입가}
+        self.stats = {"orders": 0, "fills": 0, "rejects": 0, "cancels": 0}
+
+    # ------------------------------------------------------------
+    # BinanceFuturesAPI 호환 메서드
+    # ------------------------------------------------------------
+    def place_order(self, symbol: str, side: str, order_type: str, quantity: float, price: float = None,
+                    time_in_force: str = "GTC") -> dict:
+        """
+        주문 발행 (MARKET / LIMIT, LIMIT은 GTC/IOC/FOK/GTX 지원)
+        """
+        self._simulate_latency()
+        with self._lock:
+            return self._place(symbol, side, order_type, quantity, price, time_in_force)
+
+    def place_batch_orders(self, orders: list) -> list:
+        """
+        여러 주문을 한 번의 요청으로 발행 (지연은 요청당 1회)
+        """
+        self._simulate_latency()
+        with self._lock:
+            return [
+                self._place(o["symbol"], o["side"], o.get("order_type", "LIMIT"), o["quantity"],
+                            o.get("price"), o.get("time_in_force", "GTC"))
+                for o in orders
+            ]
+
+    def cancel_order(self, symbol: str, order_id: int) -> dict:
+        """
+        주문 취소
+        """
+        self._simulate_latency()
+        with self._lock:
+            order = self._open_orders.get(symbol, {}).pop(order_id, None)
+            if order is None:
+                return {"code": -2011, "msg": "Unknown order sent."}
+            self._engine(symbol).remove(order)
+            order.status = "CANCELED"
+            order.update_time = int(time.time() * 1000)
+            self._archive(order)
+            self.stats["cancels"] += 1
+            return order.to_response()
+
+    def get_order(self, symbol: str, order_id: int) -> dict:
+        """
+        단일 주문 상태 조회
+        """
+        self._simulate_latency()
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None or order.symbol != symbol:
+                return {"code": -2013, "msg": "Order does not exist."}
+            return order.to_response()
+
+    def get_open_orders(self, symbol: str) -> list:
+        """
+        미체결 주문 조회
+        """
+        self._simulate_latency()
+        with self._lock:
+            return [o.to_response() for o in self._open_orders.get(symbol, {}).values()]
+
+    def get_account_balance(self) -> list:
+        """
+        계좌 잔고(자산) 조회. 미실현 손익은 현재 호가 중간값 기준
+        """
+        self._simulate_latency()
+        with self._lock:
+            unrealized = 0.0
+            for symbol, pos in self.positions.items():
+                mid = self._mid_price(symbol)
+                if pos["qty"] and mid:
+                    unrealized += (mid - pos["entry_price"]) * pos["qty"]
+            return [{
+                "asset": "USDT",
+                "balance": str(self.wallet_balance),
+                "crossUnPnl": str(unrealized),
+                "availableBalance": str(self.wallet_balance + unrealized),
+            }]
+
+    def get_exchange_info(self) -> dict:
+        """
+        /fapi/v1/exchangeInfo 형태의 심볼 필터 정보
+        """
+        symbols = []
+        for symbol, f in self.symbol_filters.items():
+            symbols.append({
+                "symbol": symbol,
+                "filters": [
+                    {"filterType": "PRICE_FILTER", "tickSize": f.format_price(f.tick_size)},
+                    {"filterType": "LOT_SIZE", "stepSize": f.format_qty(f.step_size),
+                     "minQty": f.format_qty(f.min_qty), "maxQty": str(f.max_qty)},
+                    {"filterType": "MIN_NOTIONAL", "notional": str(f.min_notional)},
+                ],
+            })
+        return {"symbols": symbols}
+
+    # ------------------------------------------------------------
+    # 시장 데이터 주입 (실시간 or 리플레이)
+    # ------------------------------------------------------------
+    def update_order_book(self, symbol: str, bids: list, asks: list):
+        """
+        외부 오더북 갱신 ([[price, qty], ...], 문자열/숫자 모두 허용)
+        """
+        with self._lock:
+            self._engine(symbol).set_external_book(bids, asks, self._on_fill)
+
+    def on_trade(self, symbol: str, price: float, quantity: float, buyer_is_maker: Optional[bool] = None):
+        """
+        외부 체결 반영 (대기 중인 지정가 주문 체결)
+        """
+        with self._lock:
+            self._engine(symbol).on_trade(float(price), float(quantity), buyer_is_maker, self._on_fill)
+
+    def on_market_event(self, data: dict, stream: str = None):
+        """
+        바이낸스 WS 이벤트(depthUpdate / trade) dict를 그대로 반영
+        - combined stream 형식({"stream": ..., "data": {...}})이면 스트림 이름을 보고 풀어서 반영
+        - depthUpdate: 상위 N단계 스트림(<symbol>@depthN)은 전체 교체,
+          diff 스트림(<symbol>@depth)은 U/u/pu로 순서를 확인하며 변경 단계만 누적 (수량 0은 단계 삭제)
+          스트림 이름을 모르면 depth_stream 기준
+        """
+        if "data" in data and "stream" in data:
+            stream, data = data["stream"], data["data"]
+        event_type = data.get("e")
+        if event_type == "depthUpdate":
+            partial = _PARTIAL_DEPTH.search((stream or self.depth_stream).lower()) is not None
+            with self._lock:
+                self._apply_depth(data, partial)
+        elif event_type == "trade":
+            self.on_trade(data.get("s", ""), data.get("p", 0), data.get("q", 0), data.get("m"))
+
+    def replay(self, events, callback: Callable[[dict], None] = None):
+        """
+        기록된 이벤트를 순서대로 재생. callback이 있으면 각 이벤트 반영 후 호출
+        (예: 전략/TradeExecutor에 같은 이벤트를 전달)
+        """
+        count = 0
+        for data in events:
+            self.on_market_event(data)
+            if callback:
+                callback(data)
+            count += 1
+        return count
+
+    # ------------------------------------------------------------
+    # 내부 로직 (락을 잡은 상태에서 호출)
+    # ------------------------------------------------------------
+    def _apply_depth(self, data: dict, partial: bool):
+        engine = self._engine(data.get("s", ""))
+        first, last, prev = data.get("U"), data.get("u"), data.get("pu")
+        bids, asks = data.get("b", []), data.get("a", [])
+        if partial:
+            engine.set_external_book(bids, asks, self._on_fill)
+            engine.ext_update_id = last
+            return
+
+        known = engine.ext_update_id
+        if last is not None and known is not None:
+            if last <= known:
+                # 이미 반영한 구간 (중복/지연 도착)
+                return
+            contiguous = prev == known or (first is not None and first <= known + 1)
+            if not contiguous:
+                self.logger.warning(
+                    f"{engine.symbol}: depth diff gap (last u={known}, got U={first} pu={prev}); "
+                    f"external book may be stale until the next snapshot."
+                )
+        engine.apply_external_diff(bids, asks, self._on_fill)
+        if last is not None:
+            engine.ext_update_id = last
+
+    def _engine(self, symbol: str) -> MatchingEngine:
+        engine = self._engines.get(symbol)
+        if engine is None:
+            engine = self._engines[symbol] = MatchingEngine(symbol)
+        return engine
+
+    def _simulate_latency(self):
+        delay = self.latency_model() if callable(self.latency_model) else self.latency_model
+        if delay and delay > 0:
+            time.sleep(delay)
+
+    def _reject(self, params: dict) -> Optional[dict]:
+        if self.rejection_model is not None:
+            return self.rejection_model(params)
+        if self.reject_rate and self._rng.random() < self.reject_rate:
+            return {"code": -1008, "msg": "Server is currently overloaded with other requests. Please try again in a few minutes."}
+        return None
+
+    def _place(self, symbol, side, order_type, quantity, price, time_in_force) -> dict:
+        self.stats["orders"] += 1
+        quantity = float(quantity)
+        if quantity <= 0:
+            self.stats["rejects"] += 1
+            return {"code": -4003, "msg": "Quantity less than or equal to zero."}
+        if order_type == "LIMIT" and not price:
+            self.stats["rejects"] += 1
+            return {"code": -1102, "msg": "Mandatory parameter 'price' was not sent, was empty/null, or malformed."}
+        if order_type not in ("MARKET", "LIMIT"):
+            self.stats["rejects"] += 1
+            return {"code": -1116, "msg": "Invalid orderType."}
+
+        error = self._check_filters(symbol, order_type, quantity, price)
+        if error:
+            self.stats["rejects"] += 1
+            return error
+
+        error = self._reject({"symbol": symbol, "side": side, "type": order_type,
+                              "quantity": quantity, "price": price, "timeInForce": time_in_force})
+        if error:
+            self.stats["rejects"] += 1
+            return error
+
+        engine = self._engine(symbol)
+        price = float(price) if order_type == "LIMIT" else None
+        order = _SimOrder(next(self._ids), symbol, side, order_type,
+                          time_in_force if order_type == "LIMIT" else "GTC", price, quantity)
+        self._orders[order.order_id] = order
+
+        if order_type == "LIMIT":
+            # Post-only: 즉시 체결될 가격이면 거부(EXPIRED)
+            if time_in_force == "GTX" and engine.would_cross(side, price):
+                order.status = "EXPIRED"
+                self._archive(order)
+                return order.to_response()
+            # FOK: 전량 체결 불가하면 체결 없이 만료
+            if time_in_force == "FOK" and engine.available(side, price) < quantity - 1e-12:
+                order.status = "EXPIRED"
+                self._archive(order)
+                return order.to_response()
+
+        engine.match(order, self._on_fill)
+
+        if order.remaining > 1e-12:
+            if order_type == "LIMIT" and time_in_force in ("GTC", "GTX"):
+                engine.rest(order)
+                self._open_orders.setdefault(symbol, {})[order.order_id] = order
+            else:
+                # MARKET 유동성 부족, IOC 잔량 → 만료
+                order.status = "EXPIRED"
+                self._archive(order)
+        return order.to_response()
+
+    def _check_filters(self, symbol, order_type, quantity, price) -> Optional[dict]:
+        """
+        심볼 필터(tick size, step size, 최소 수량/금액) 위반 시 바이낸스와 같은 에러 응답
+        """
+        f = self.symbol_filters.get(symbol)
+        if f is None:
+            return None
+        if abs(f.quantize_qty(quantity) - quantity) > 1e-12 * max(1.0, quantity):
+            return {"code": -1111, "msg": "Precision is over the maximum defined for this asset."}
+        if order_type == "LIMIT" and abs(f.quantize_price(float(price)) - float(price)) > 1e-9 * float(price):
+            return {"code": -4014, "msg": "Price not increased by tick size."}
+        if quantity < f.min_qty:
+            return {"code": -4003, "msg": "Quantity less than minimum quantity."}
+        reference = float(price) if order_type == "LIMIT" else self._mid_price(symbol)
+        if reference and quantity * reference < f.min_notional:
+            return {"code": -4164, "msg": f"Order's notional must be no smaller than {f.min_notional}"}
+        return None
+
+    def _on_fill(self, order: _SimOrder, qty: float, price: float, is_maker: bool):
+        """
+        체결 처리: 주문 상태, 포지션, 잔고(실현손익/수수료) 갱신
+        """
+        order.executed_qty += qty
+        order.cum_quote += qty * price
+        order.update_time = int(time.time() * 1000)
+        if order.remaining <= 1e-12:
+            order.status = "FILLED"
+            # 대기 주문이면 미체결 목록에서 제거 (공격 주문은 아직 등록 전)
+            open_orders = self._open_orders.get(order.symbol)
+            if open_orders is not None:
+                open_orders.pop(order.order_id, None)
+            self._archive(order)
+        else:
+            order.status = "PARTIALLY_FILLED"
+
+        self.stats["fills"] += 1
+        fee = qty * price * (self.maker_fee if is_maker else self.taker_fee)
+        self.wallet_balance -= fee
+        self._update_position(order.symbol, qty if order.side == "BUY" else -qty, price)
+
+    def _update_position(self, symbol: str, signed_qty: float, price: float):
+        pos = self.positions.setdefault(symbol, {"qty": 0.0, "entry_price": 0.0})
+        old_qty = pos["qty"]
+        new_qty = old_qty + signed_qty
+
+        if old_qty == 0 or (old_qty > 0) == (signed_qty > 0):
+            # 신규 진입 또는 추가 진입: 평균 진입가 갱신
+            pos["entry_price"] = (pos["entry_price"] * abs(old_qty) + price * abs(signed_qty)) / abs(new_qty)
+        else:
+            # 청산(일부/전체/반전): 청산 수량만큼 실현손익
+            closed = min(abs(old_qty), abs(signed_qty))
+            direction = 1 if old_qty > 0 else -1
+            self.wallet_balance += (price - pos["entry_price"]) * closed * direction
+            if abs(signed_qty) > abs(old_qty):
+                pos["entry_price"] = price
+            elif abs(new_qty) <= 1e-12:
+                pos["entry_price"] = 0.0
+                new_qty = 0.0
+        pos["qty"] = new_qty
+
+    def _archive(self, order: _SimOrder):
+        """
+        종료된 주문을 보관 목록에 추가하고, 한도를 넘으면 가장 오래된 주문부터 삭제
+        """
+        self._closed_ids.append(order.order_id)
+        while len(self._closed_ids) > self.max_order_history:
+            self._orders.pop(self._closed_ids.popleft(), None)
+
+    def _mid_price(self, symbol: str) -> Optional[float]:
+        engine = self._engines.get(symbol)
+        if engine is None:
+            return None
+        bid, ask = engine.best_bid(), engine.best_ask()
+        if bid is None or ask is None:
+            return bid or ask
+        return (bid + ask) / 2
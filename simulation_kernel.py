@@ -0,0 +1,299 @@
+# backtesting/simulation_kernel.py
+
+import logging
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba가 없으면 같은 코드를 순수 파이썬으로 실행
+    njit = None
+    NUMBA_AVAILABLE = False
+
+# 체결 사유 코드
+REASON_SIGNAL = 0
+REASON_STOP_LOSS = 1
+REASON_TAKE_PROFIT = 2
+REASON_TRAILING_STOP = 3
+REASON_NAMES = {
+    REASON_SIGNAL: "signal",
+    REASON_STOP_LOSS: "stop_loss",
+    REASON_TAKE_PROFIT: "take_profit",
+    REASON_TRAILING_STOP: "trailing_stop",
+}
+
+DEFAULT_CONFIG = {
+    "initial_equity": 1.0,   # 시작 자산
+    "fee_rate": 0.0004,      # 체결 금액 대비 수수료율
+    "slippage": 0.0,         # 체결가에 불리하게 적용되는 비율 (0.0005 = 5bp)
+    "stop_loss": 0.0,        # 진입가 대비 손절 비율 (0이면 사용 안 함)
+    "take_profit": 0.0,      # 진입가 대비 익절 비율 (0이면 사용 안 함)
+    "trailing_stop": 0.0,    # 진입 후 최고가(숏은 최저가) 대비 추적 손절 비율 (0이면 사용 안 함)
+    "max_position": 1.0,     # 목표 포지션 절대값 상한 (자산 대비 배수)
+}
+
+
+def _simulate(open_, high, low, close, target, funding,
+              initial_equity, fee_rate, slippage, stop_loss, take_profit, trailing_stop, max_position,
+              out_equity, out_position, out_returns,
+              fill_bar, fill_qty, fill_price, fill_fee, fill_reason):
+    """
+    봉 단위 경로 의존 시뮬레이션 커널 (numba로 컴파일하거나 그대로 파이썬으로 실행)
+    - target[t]: t봉 종가에 결정한 목표 포지션 (자산 대비 배수, 양수 롱/음수 숏)
+      목표가 바뀐 봉의 종가(+슬리피지)에 수량을 맞추고, 그 수량을 다음 봉들 동안 보유
+    - 보유 중에는 t봉의 고가/저가로 손절 → 추적 손절 → 익절 순서로 확인
+      (같은 봉에서 둘 다 닿으면 보수적으로 손절 우선, 시가가 이미 넘어선 갭은 시가에 체결)
+    - 스탑으로 청산하면 목표 포지션이 바뀔 때까지 재진입하지 않음 (current_target은 그대로 두고 수량만 0)
+    - funding[t]: t봉에 보유 포지션 명목가치에 부과되는 펀딩비율 (롱은 양수일 때 지불)
+    - 두 실행 경로가 같은 결과를 내도록 부동소수점 연산 순서를 고정 (numpy 함수/fastmath 사용 안 함)
+    :return: 체결 건수 (fill_* 버퍼의 앞부분만 유효)
+    """
+    n = len(close)
+    cash = initial_equity
+    qty = 0.0
+    prev_equity = initial_equity
+    current_target = 0.0
+    entry_price = 0.0
+    extreme = 0.0
+    bankrupt = False
+    n_fills = 0
+
+    for t in range(n):
+        price = close[t]
+
+        # 1) 보유 포지션의 스탑 확인 (진입 봉 이후부터)
+        if qty != 0.0:
+            level = 0.0
+            reason = -1
+            if qty > 0.0:
+                if stop_loss > 0.0 and low[t] <= entry_price * (1.0 - stop_loss):
+                    level = entry_price * (1.0 - stop_loss)
+                    reason = REASON_STOP_LOSS
+                elif trailing_stop > 0.0 and low[t] <= extreme * (1.0 - trailing_stop):
+                    level = extreme * (1.0 - trailing_stop)
+                    reason = REASON_TRAILING_STOP
+                elif take_profit > 0.0 and high[t] >= entry_price * (1.0 + take_profit):
+                    level = entry_price * (1.0 + take_profit)
+                    reason = REASON_TAKE_PROFIT
+            else:
+                if stop_loss > 0.0 and high[t] >= entry_price * (1.0 + stop_loss):
+                    level = entry_price * (1.0 + stop_loss)
+                    reason = REASON_STOP_LOSS
+                elif trailing_stop > 0.0 and high[t] >= extreme * (1.0 + trailing_stop):
+                    level = extreme * (1.0 + trailing_stop)
+                    reason = REASON_TRAILING_STOP
+                elif take_profit > 0.0 and low[t] <= entry_price * (1.0 - take_profit):
+                    level = entry_price * (1.0 - take_profit)
+                    reason = REASON_TAKE_PROFIT
+
+            if reason >= 0:
+                # 시가가 이미 스탑/익절 가격을 넘어 열렸으면(갭) 시가에 체결 (시가가 NaN이면 비교가 거짓 → 스탑 가격)
+                exit_price = level
+                falling = (qty > 0.0) == (reason != REASON_TAKE_PROFIT)  # 롱 손절/숏 익절은 아래로 돌파
+                if falling and open_[t] < level:
+                    exit_price = open_[t]
+                elif not falling and open_[t] > level:
+                    exit_price = open_[t]
+
+                delta = -qty
+                if delta > 0.0:
+                    exec_price = exit_price * (1.0 + slippage)
+                else:
+                    exec_price = exit_price * (1.0 - slippage)
+                fee = abs(delta) * exec_price * fee_rate
+                cash = cash - delta * exec_price - fee
+                qty = 0.0
+                fill_bar[n_fills] = t
+                fill_qty[n_fills] = delta
+                fill_price[n_fills] = exec_price
+                fill_fee[n_fills] = fee
+                fill_reason[n_fills] = reason
+                n_fills += 1
+            elif qty > 0.0:
+                if high[t] > extreme:
+                    extreme = high[t]
+            else:
+                if low[t] < extreme:
+                    extreme = low[t]
+
+        # 2) 펀딩비 (t봉 종가 기준 명목가치)
+        if qty != 0.0 and funding[t] != 0.0:
+            cash = cash - qty * price * funding[t]
+
+        # 3) 목표 포지션 변경 시 종가에 수량 조정
+        desired = target[t]
+        if desired != desired:  # NaN이면 직전 목표 유지
+            desired = current_target
+        if desired > max_position:
+            desired = max_position
+        elif desired < -max_position:
+            desired = -max_position
+
+        if desired != current_target and not bankrupt:
+            equity = cash + qty * price
+            new_qty = desired * equity / price
+            delta = new_qty - qty
+            if delta != 0.0:
+                if delta > 0.0:
+                    exec_price = price * (1.0 + slippage)
+                else:
+                    exec_price = price * (1.0 - slippage)
+                fee = abs(delta) * exec_price * fee_rate
+                cash = cash - delta * exec_price - fee
+                # 신규 진입/방향 전환이면 진입가와 추적 기준가를 새로 설정 (같은 방향 증감은 유지)
+                if qty == 0.0 or (qty > 0.0) != (new_qty > 0.0):
+                    entry_price = exec_price
+                    extreme = exec_price
+                qty = new_qty
+                fill_bar[n_fills] = t
+                fill_qty[n_fills] = delta
+                fill_price[n_fills] = exec_price
+                fill_fee[n_fills] = fee
+                fill_reason[n_fills] = REASON_SIGNAL
+                n_fills += 1
+            current_target = desired
+
+        # 4) 종가 기준 자산 / 포지션 / 수익률
+        equity = cash + qty * price
+        if equity <= 0.0 and not bankrupt:
+            # 자산 소진: 이후 거래 중단
+            bankrupt = True
+            qty = 0.0
+            cash = 0.0
+            equity = 0.0
+        out_equity[t] = equity
+        out_position[t] = qty * price / equity if equity > 0.0 else 0.0
+        out_returns[t] = equity / prev_equity - 1.0 if prev_equity > 0.0 else 0.0
+        prev_equity = equity
+
+    return n_fills
+
+
+_simulate_jit = njit(cache=True)(_simulate) if NUMBA_AVAILABLE else None
+
+
+class SimulationKernel:
+    """
+    수수료/슬리피지/펀딩/스탑/포지션 한도를 반영하는 봉 단위 시뮬레이터
+    - numba가 설치되어 있으면 컴파일된 커널, 없으면 같은 커널을 순수 파이썬으로 실행 (결과 동일)
+    - 결과 DataFrame은 PerformanceMetrics가 쓰는 strategy_returns / cum_strategy_returns 컬럼 포함
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, use_jit: Optional[bool] = None, logger=None):
+        """
+        :param config: DEFAULT_CONFIG 중 바꿀 항목
+        :param use_jit: None이면 numba가 있을 때 사용, False면 항상 파이썬 경로
+        """
+        unknown = set(config or {}) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise ValueError(f"Unknown simulation config keys: {sorted(unknown)}")
+        self.config = {**DEFAULT_CONFIG, **(config or {})}
+        if use_jit and not NUMBA_AVAILABLE:
+            raise ImportError("numba is required for use_jit=True.")
+        self.use_jit = NUMBA_AVAILABLE if use_jit is None else use_jit
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+    def simulate(self, close, target, high=None, low=None, open_=None, funding=None) -> Dict[str, np.ndarray]:
+        """
+        NumPy 배열 입력으로 커널 실행
+        - high/low가 없으면 close, open_이 없으면 스탑 가격 그대로 체결 (갭 반영 안 함)
+        :return: {"equity", "position", "strategy_returns", "fill_bar", "fill_qty", "fill_price",
+                  "fill_fee", "fill_reason"}
+        """
+        close = np.ascontiguousarray(close, dtype=np.float64)
+        n = len(close)
+        target = np.ascontiguousarray(target, dtype=np.float64)
+        if len(target) != n:
+            raise ValueError("target must have the same length as close.")
+        high = close if high is None else np.ascontiguousarray(high, dtype=np.float64)
+        low = close if low is None else np.ascontiguousarray(low, dtype=np.float64)
+        open_ = np.full(n, np.nan) if open_ is None else np.ascontiguousarray(open_, dtype=np.float64)
+        funding = np.zeros(n) if funding is None else np.ascontiguousarray(funding, dtype=np.float64)
+
+        cfg = self.config
+        scalars = (float(cfg["initial_equity"]), float(cfg["fee_rate"]), float(cfg["slippage"]),
+                   float(cfg["stop_loss"]), float(cfg["take_profit"]), float(cfg["trailing_stop"]),
+                   float(cfg["max_position"]))
+        max_fills = 2 * n  # 봉마다 최대 스탑 청산 1건 + 목표 변경 1건
+
+        if self.use_jit:
+            equity = np.empty(n)
+            position = np.empty(n)
+            returns = np.empty(n)
+            fill_bar = np.empty(max_fills, dtype=np.int64)
+            fill_qty = np.empty(max_fills)
+            fill_price = np.empty(max_fills)
+            fill_fee = np.empty(max_fills)
+            fill_reason = np.empty(max_fills, dtype=np.int64)
+            n_fills = _simulate_jit(open_, high, low, close, target, funding, *scalars,
+                                    equity, position, returns,
+                                    fill_bar, fill_qty, fill_price, fill_fee, fill_reason)
+        else:
+            # 파이썬 경로는 리스트 원소 접근이 NumPy 스칼라보다 훨씬 빠름 (값은 같은 float64)
+            equity = [0.0] * n
+            position = [0.0] * n
+            returns = [0.0] * n
+            fill_bar = [0] * max_fills
+            fill_qty = [0.0] * max_fills
+            fill_price = [0.0] * max_fills
+            fill_fee = [0.0] * max_fills
+            fill_reason = [0] * max_fills
+            n_fills = _simulate(open_.tolist(), high.tolist(), low.tolist(), close.tolist(), target.tolist(),
+                                funding.tolist(), *scalars, equity, position, returns,
+                                fill_bar, fill_qty, fill_price, fill_fee, fill_reason)
+
+        return {
+            "equity": np.asarray(equity, dtype=np.float64),
+            "position": np.asarray(position, dtype=np.float64),
+            "strategy_returns": np.asarray(returns, dtype=np.float64),
+            "fill_bar": np.asarray(fill_bar[:n_fills], dtype=np.int64),
+            "fill_qty": np.asarray(fill_qty[:n_fills], dtype=np.float64),
+            "fill_price": np.asarray(fill_price[:n_fills], dtype=np.float64),
+            "fill_fee": np.asarray(fill_fee[:n_fills], dtype=np.float64),
+            "fill_reason": np.asarray(fill_reason[:n_fills], dtype=np.int64),
+        }
+
+    def run(self, price_data: pd.DataFrame, target: Union[str, pd.Series, np.ndarray],
+            funding: Union[str, pd.Series, np.ndarray, None] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        DataFrame 입력 (close 필수, open/high/low 있으면 스탑 판정에 사용)
+        :param target: 목표 포지션 컬럼명 또는 같은 길이의 배열
+        :param funding: 펀딩비율 컬럼명 또는 배열 (없으면 0)
+        :return: (result_df, fills_df)
+                 result_df = price_data + [target_position, position, equity, strategy_returns, cum_strategy_returns]
+        """
+        def column(value):
+            if value is None:
+                return None
+            if isinstance(value, str):
+                return price_data[value].to_numpy(dtype=np.float64)
+            return np.asarray(value, dtype=np.float64)
+
+        optional = {c: price_data[c].to_numpy(dtype=np.float64) if c in price_data.columns else None
+                    for c in ("open", "high", "low")}
+        target_values = column(target)
+        out = self.simulate(price_data["close"].to_numpy(dtype=np.float64), target_values,
+                            high=optional["high"], low=optional["low"], open_=optional["open"],
+                            funding=column(funding))
+
+        df = price_data.copy()
+        df["target_position"] = target_values
+        df["position"] = out["position"]
+        df["equity"] = out["equity"]
+        df["strategy_returns"] = out["strategy_returns"]
+        df["cum_strategy_returns"] = out["equity"] / self.config["initial_equity"]
+
+        fills = pd.DataFrame({
+            "time": price_data.index[out["fill_bar"]],
+            "bar": out["fill_bar"],
+            "side": np.where(out["fill_qty"] > 0, "BUY", "SELL"),
+            "quantity": np.abs(out["fill_qty"]),
+            "price": out["fill_price"],
+            "fee": out["fill_fee"],
+            "reason": [REASON_NAMES[r] for r in out["fill_reason"].tolist()],
+        })
+        self.logger.debug(f"Simulated {len(df)} bars, {len(fills)} fills (jit={self.use_jit}).")
+        return df, fills
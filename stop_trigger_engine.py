@@ -0,0 +1,298 @@
+# order_execution/stop_trigger_engine.py
+
+import heapq
+import itertools
+import logging
+import threading
+from typing import Callable, Optional
+
+class _TrailingBook:
+    """
+    한 심볼/방향의 트레일링 스탑 묶음
+    - 가격은 q 공간으로 변환해 다룸 (롱 청산: q = price, 숏 청산: q = -price)
+      → 두 방향 모두 "고점(peak) 대비 q가 level 이하로 내려오면 발동" 형태가 됨
+    - 같은 시점 이후의 고점을 공유하는 스탑들을 cohort로 묶어 스택에 보관
+      (나중에 등록된 cohort일수록 고점이 낮거나 같음)
+    - 새 고점이 나오면 스택 위쪽의 낮은 cohort들만 병합 → 개별 스탑을 갱신하지 않음
+    - cohort 안에서는 trail 값이 가장 작은 스탑이 먼저 발동하므로 trail 기준 힙 사용
+    - cohort별 발동 가격(level)을 다시 최대 힙에 넣어, 틱마다 top만 확인
+    """
+
+    def __init__(self, level_func: Callable[[float, float], float]):
+        """
+        :param level_func: (peak, trail) -> 발동 가격(q 공간). trail이 클수록 작아져야 함
+        """
+        self.level = level_func
+        self.cohorts = []       # 스택: [peak, heap[(trail, seq, stop_id)], cohort_id]
+        self.triggers = []      # 힙: (-level, cohort_id)
+        self._alive = {}        # cohort_id -> cohort
+        self._cohort_ids = itertools.count()
+
+    def add(self, q: float, trail: float, seq: int, stop_id: int):
+        self.update_peak(q)
+        top = self.cohorts[-1] if self.cohorts else None
+        if top is not None and top[0] == q:
+            heapq.heappush(top[1], (trail, seq, stop_id))
+            if top[1][0][2] == stop_id:
+                self._push_trigger(top)
+        else:
+            cohort = [q, [(trail, seq, stop_id)], next(self._cohort_ids)]
+            self.cohorts.append(cohort)
+            self._alive[cohort[2]] = cohort
+            self._push_trigger(cohort)
+
+    def update_peak(self, q: float):
+        """
+        q가 스택 위쪽 cohort들의 고점을 넘으면, 그 cohort들을 고점 q인 하나의 cohort로 병합
+        (작은 힙을 큰 힙에 합쳐 병합 비용을 분할상환 O(log n)으로 유지)
+        """
+        if not self.cohorts or self.cohorts[-1][0] >= q:
+            return
+        merged = None
+        while self.cohorts and self.cohorts[-1][0] < q:
+            cohort = self.cohorts.pop()
+            self._alive.pop(cohort[2], None)
+            if merged is None:
+                merged = cohort[1]
+                continue
+            small, merged = sorted((cohort[1], merged), key=len)
+            for entry in small:
+                heapq.heappush(merged, entry)
+        cohort = [q, merged, next(self._cohort_ids)]
+        self.cohorts.append(cohort)
+        self._alive[cohort[2]] = cohort
+        if merged:
+            self._push_trigger(cohort)
+
+    def pop_triggered(self, q: float, is_active: Callable[[int], bool]) -> list:
+        """
+        현재 가격 q에서 발동한 stop_id 목록 (발동 가격이 높은 cohort부터 top만 확인)
+        """
+        fired = []
+        while self.triggers:
+            neg_level, cohort_id = self.triggers[0]
+            cohort = self._alive.get(cohort_id)
+            if cohort is None:
+                heapq.heappop(self.triggers)
+                continue
+
+            entries = cohort[1]
+            while entries and not is_active(entries[0][2]):
+                heapq.heappop(entries)
+            if not entries:
+                heapq.heappop(self.triggers)
+                continue
+
+            current = self.level(cohort[0], entries[0][0])
+            if -neg_level != current:
+                # 최소 trail 스탑이 취소/발동되어 level이 바뀐 항목 → 최신 level로 교체
+                heapq.heappop(self.triggers)
+                if -neg_level > current:
+                    heapq.heappush(self.triggers, (-current, cohort_id))
+                continue
+
+            if q > current:
+                break
+            heapq.heappop(self.triggers)
+            _, _, stop_id = heapq.heappop(entries)
+            fired.append(stop_id)
+            if entries:
+                self._push_trigger(cohort)
+        return fired
+
+    def _push_trigger(self, cohort: list):
+        heapq.heappush(self.triggers, (-self.level(cohort[0], cohort[1][0][0]), cohort[2]))
+
+
+class StopTriggerEngine:
+    """
+    체결(trade) 스트림으로 구동되는 손절/트레일링 스탑 발동 엔진
+    - 심볼 × 방향별 가격 정렬 힙에 스탑을 보관하고, 틱마다 해당 힙의 top만 확인
+      (스탑 개수 n에 대해 틱당 O(log n), 전체 포지션 순회 없음)
+    - 발동된 스탑은 청산 신호로 변환해 on_trigger(예: TradeExecutor.add_signal)로 즉시 전달
+    - 같은 group의 스탑은 하나가 발동하면 나머지가 자동 취소 (손절 + 트레일링 동시 등록 시)
+    """
+
+    def __init__(self, on_trigger: Callable[[dict], None] = None, logger=None):
+        """
+        :param on_trigger: 발동된 청산 신호 dict를 받는 콜백
+        """
+        self.on_trigger = on_trigger
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+        # 고정 손절: 롱 청산(SELL)은 가격 <= stop 시 발동 → 최고 stop이 top (최대 힙)
+        #            숏 청산(BUY)은 가격 >= stop 시 발동 → 최저 stop이 top (최소 힙)
+        self._sell_stops = {}   # symbol -> [(-stop_price, seq, stop_id)]
+        self._buy_stops = {}    # symbol -> [(stop_price, seq, stop_id)]
+        self._trailing = {}     # (symbol, side, kind) -> _TrailingBook
+
+        self._stops = {}        # stop_id -> 스탑 정보 (활성 스탑만)
+        self._groups = {}       # group -> {stop_id, ...}
+        self._last_price = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------
+    # 등록 / 취소
+    # ------------------------------------------------------------
+    def add_stop(self, symbol: str, side: str, quantity: float, stop_price: float, group=None) -> int:
+        """
+        고정 손절 등록
+        :param side: 발동 시 낼 청산 주문 방향 (롱 포지션이면 "SELL", 숏 포지션이면 "BUY")
+        :return: stop_id
+        """
+        side = side.upper()
+        stop_price = float(stop_price)
+        with self._lock:
+            stop_id = self._register(symbol, side, quantity, "STOP_LOSS", group, stop_price=stop_price)
+            if side == "SELL":
+                heapq.heappush(self._sell_stops.setdefault(symbol, []), (-stop_price, stop_id, stop_id))
+            else:
+                heapq.heappush(self._buy_stops.setdefault(symbol, []), (stop_price, stop_id, stop_id))
+        return stop_id
+
+    def add_trailing_stop(self, symbol: str, side: str, quantity: float, trail_amount: float = None,
+                          trail_pct: float = None, anchor_price: float = None, group=None) -> Optional[int]:
+        """
+        트레일링 스탑 등록 (trail_amount: 고점 대비 가격 폭, trail_pct: 고점 대비 비율 0.01 = 1%)
+        기준 고점은 마지막 체결가(체결이 아직 없으면 anchor_price)에서 시작
+        :param side: 발동 시 낼 청산 주문 방향 (롱 포지션이면 "SELL", 숏 포지션이면 "BUY")
+        :return: stop_id (기준 가격이 없으면 None)
+        """
+        if (trail_amount is None) == (trail_pct is None):
+            raise ValueError("Exactly one of trail_amount or trail_pct must be given.")
+        side = side.upper()
+        kind = "AMOUNT" if trail_amount is not None else "PCT"
+        trail = float(trail_amount if trail_amount is not None else trail_pct)
+
+        with self._lock:
+            price = self._last_price.get(symbol)
+            if price is None:
+                if anchor_price is None:
+                    self.logger.error(f"No price for {symbol} to anchor trailing stop.")
+                    return None
+                price = self._last_price[symbol] = float(anchor_price)
+
+            stop_id = self._register(symbol, side, quantity, "TRAILING_STOP", group, trail=trail, trail_kind=kind)
+            book = self._trailing_book(symbol, side, kind)
+            book.add(price if side == "SELL" else -price, trail, stop_id, stop_id)
+        return stop_id
+
+    def cancel(self, stop_id: int) -> bool:
+        """
+        스탑 취소 (힙에서는 꺼낼 때 제거)
+        """
+        with self._lock:
+            return self._deactivate(stop_id) is not None
+
+    def cancel_group(self, group) -> int:
+        with self._lock:
+            ids = self._groups.pop(group, set())
+            for stop_id in ids:
+                self._stops.pop(stop_id, None)
+            return len(ids)
+
+    def active_stops(self, symbol: str = None) -> list:
+        with self._lock:
+            return [dict(s) for s in self._stops.values() if symbol is None or s["symbol"] == symbol]
+
+    # ------------------------------------------------------------
+    # 체결 스트림 처리
+    # ------------------------------------------------------------
+    def on_trade(self, symbol: str, price: float, quantity: float = 0.0) -> list:
+        """
+        체결 틱 수신: 해당 심볼 힙들의 top만 확인해 발동된 스탑을 청산 신호로 전달
+        :return: 발동된 청산 신호 리스트
+        """
+        price = float(price)
+        with self._lock:
+            self._last_price[symbol] = price
+            fired = []
+
+            heap = self._sell_stops.get(symbol)
+            while heap and -heap[0][0] >= price:
+                _, _, stop_id = heapq.heappop(heap)
+                if stop_id in self._stops:
+                    fired.append(stop_id)
+
+            heap = self._buy_stops.get(symbol)
+            while heap and heap[0][0] <= price:
+                _, _, stop_id = heapq.heappop(heap)
+                if stop_id in self._stops:
+                    fired.append(stop_id)
+
+            for side in ("SELL", "BUY"):
+                q = price if side == "SELL" else -price
+                for kind in ("AMOUNT", "PCT"):
+                    book = self._trailing.get((symbol, side, kind))
+                    if book is None:
+                        continue
+                    book.update_peak(q)
+                    fired.extend(book.pop_triggered(q, self._stops.__contains__))
+
+            signals = []
+            for stop_id in fired:
+                stop = self._deactivate(stop_id)
+                if stop is None:
+                    # 같은 틱에서 먼저 발동한 같은 group 스탑에 의해 이미 취소됨
+                    continue
+                if stop["group"] is not None:
+                    for sibling in self._groups.pop(stop["group"], set()):
+                        self._stops.pop(sibling, None)
+                signals.append({
+                    "action": stop["side"],
+                    "symbol": symbol,
+                    "price": price,
+                    "quantity": stop["quantity"],
+                    "signal_type": stop["type"],
+                    "stop_id": stop_id,
+                })
+
+        for signal in signals:
+            self.logger.info(f"Stop triggered: {signal}")
+            if self.on_trigger:
+                self.on_trigger(signal)
+        return signals
+
+    # ------------------------------------------------------------
+    # 내부 헬퍼 (락을 잡은 상태에서 호출)
+    # ------------------------------------------------------------
+    def _register(self, symbol, side, quantity, stop_type, group, **extra) -> int:
+        stop_id = next(self._ids)
+        self._stops[stop_id] = {
+            "stop_id": stop_id,
+            "symbol": symbol,
+            "side": side,
+            "quantity": float(quantity),
+            "type": stop_type,
+            "group": group,
+            **extra,
+        }
+        if group is not None:
+            self._groups.setdefault(group, set()).add(stop_id)
+        return stop_id
+
+    def _deactivate(self, stop_id: int):
+        stop = self._stops.pop(stop_id, None)
+        if stop is not None and stop["group"] is not None:
+            members = self._groups.get(stop["group"])
+            if members is not None:
+                members.discard(stop_id)
+                if not members:
+                    del self._groups[stop["group"]]
+        return stop
+
+    def _trailing_book(self, symbol: str, side: str, kind: str) -> _TrailingBook:
+        key = (symbol, side, kind)
+        book = self._trailing.get(key)
+        if book is None:
+            if kind == "AMOUNT":
+                level = lambda peak, trail: peak - trail
+            elif side == "SELL":
+                # 롱: price <= 고점 * (1 - pct)
+                level = lambda peak, trail: peak * (1 - trail)
+            else:
+                # 숏: price >= 저점 * (1 + pct) → q <= (-저점) * (1 + pct)
+                level = lambda peak, trail: peak * (1 + trail)
+            book = self._trailing[key] = _TrailingBook(level)
+        return book
@@ -3,69 +3,272 @@
 import logging
 import itertools
 import multiprocessing
+import queue
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable
+import numpy as np
 import pandas as pd
 
 from .backtest_runner import BacktestRunner
 from .performance_metrics import PerformanceMetrics
+from .shared_data import SharedPriceData, attach
+from .search_strategies import SearchStrategy
+from .result_cache import ResultCache
 
-def _worker_task(args):
+# 워커 프로세스 전역 상태 (Pool initializer에서 한 번만 설정)
+_WORKER_RUNNER = None
+
+def _init_worker(runner):
+    """
+    워커 프로세스 시작 시 runner를 한 번만 받아 보관 (작업마다 pickle하지 않음)
+    """
+    global _WORKER_RUNNER
+    _WORKER_RUNNER = runner
+
+def _evaluate(runner, price_data, params_dict, with_returns=False):
     """
-    멀티프로세싱에서 사용할 Worker 함수
-    :param args: (runner, price_data, params)
+    백테스트 1회 실행 후 (params, metrics, 전략 수익률 or None) 반환
     """
-    runner, price_data, params_dict = args
     result_df = runner.run(price_data, params_dict)
     metrics_calculator = PerformanceMetrics(logger=runner.logger)
     metrics = metrics_calculator.calculate_metrics(result_df)
-    return (params_dict, metrics)
+    returns = None
+    if with_returns and "strategy_returns" in result_df.columns:
+        returns = result_df["strategy_returns"].to_numpy(dtype="float32")
+    return (params_dict, metrics, returns)
+
+def _worker_chunk(args):
+    """
+    파라미터 묶음(chunk) 단위 Worker 함수
+    :param args: (data_spec, [params, ...], with_returns) - 가격 데이터는 spec으로 공유 메모리에서 attach
+    """
+    data_spec, params_chunk, with_returns = args
+    price_data = attach(data_spec)
+    return [_evaluate(_WORKER_RUNNER, price_data, params_dict, with_returns) for params_dict in params_chunk]
+
+def _worker_eval(args):
+    """
+    탐색 전략용 Worker 함수: budget(데이터 비율)만큼 앞부분 구간으로 백테스트
+    :param args: (data_spec, params, budget, with_returns)
+    """
+    data_spec, params_dict, budget, with_returns = args
+    price_data = attach(data_spec)
+    if budget < 1.0:
+        price_data = price_data.iloc[:max(2, int(len(price_data) * budget))]
+    params_dict, metrics, returns = _evaluate(_WORKER_RUNNER, price_data, params_dict, with_returns)
+    return (params_dict, budget, metrics, returns)
+
+def _fold_rows(ranges) -> np.ndarray:
+    """
+    [(start, end), ...] 구간들을 행 번호 배열로 변환
+    """
+    return np.concatenate([np.arange(start, end) for start, end in ranges]) if ranges else np.arange(0)
+
+def _fold_window(price_data: pd.DataFrame, fold: dict) -> pd.DataFrame:
+    """
+    공유 데이터에서 fold 윈도우 뷰 (iloc 슬라이스 → 복사 없음)
+    fold["offset"]: 공유 데이터 행 번호 - 원래 price_data 행 번호 (지표를 붙여 fold별로 이어 붙인 경우)
+    """
+    window_start, window_end = fold["window"]
+    offset = fold.get("offset", 0)
+    return price_data.iloc[window_start + offset:window_end + offset]
+
+def _worker_fold_chunk(args):
+    """
+    교차검증용 Worker 함수: (윈도우, 조합) 작업마다 윈도우를 한 번만 백테스트하고
+    같은 결과에서 그 윈도우를 쓰는 모든 fold의 학습 구간(in-sample)과 검증 구간(out-of-sample) 지표를 계산
+    :param args: (data_spec, {윈도우 번호: [(fold 번호, fold), ...]}, [(윈도우 번호, params), ...])
+    """
+    data_spec, groups, pairs = args
+    price_data = attach(data_spec)
+    metrics_calculator = PerformanceMetrics(logger=_WORKER_RUNNER.logger)
+    windows = {}
+    results = []
+    for group_id, params_dict in pairs:
+        if group_id not in windows:
+            group = groups[group_id]
+            window_start = group[0][1]["window"][0]
+            windows[group_id] = (_fold_window(price_data, group[0][1]), [
+                (fold_id,
+                 _fold_rows([(s - window_start, e - window_start) for s, e in fold["train"]]),
+                 np.arange(fold["test"][0] - window_start, fold["test"][1] - window_start))
+                for fold_id, fold in group
+            ])
+        window, group_rows = windows[group_id]
+        result_df = _WORKER_RUNNER.run(window, params_dict)
+        for fold_id, train_rows, test_rows in group_rows:
+            train_metrics = metrics_calculator.calculate_metrics(result_df.iloc[train_rows])
+            test_metrics = metrics_calculator.calculate_metrics(result_df.iloc[test_rows])
+            results.append((fold_id, params_dict, train_metrics, test_metrics))
+    return results
+
+def _worker_fold_returns(args):
+    """
+    fold에서 선택된 파라미터의 검증 구간 전략 수익률 반환 (out-of-sample 자산 곡선 연결용)
+    :param args: (data_spec, fold, params)
+    """
+    data_spec, fold, params_dict = args
+    price_data = attach(data_spec)
+    window_start = fold["window"][0]
+    result_df = _WORKER_RUNNER.run(_fold_window(price_data, fold), params_dict)
+    test_start, test_end = fold["test"]
+    return result_df["strategy_returns"].to_numpy(dtype=float)[test_start - window_start:test_end - window_start]
 
 class StrategyOptimizer:
     """
     다양한 파라미터 조합으로 백테스트를 수행하고,
     성능 지표가 가장 우수한 파라미터를 찾는 클래스
+    - 워커 풀은 한 번 만들어 여러 grid_search에서 재사용 (close()로 종료)
+    - 가격 데이터는 shared memory(또는 memory-map 파일)에 한 번만 올리고 워커는 복사 없이 attach
     """
 
     def __init__(
         self,
         runner: BacktestRunner,
+        shared_data_kind: str = "shm",
+        shared_data_dir: str = None,
+        result_cache: ResultCache = None,
+        coordinator=None,
         logger=None
     ):
         """
         :param runner: 이미 설정된 BacktestRunner (strategy_func 포함)
+        :param shared_data_kind: "shm" (shared memory) or "mmap" (memory-mapped 파일)
+        :param shared_data_dir: shared_data_kind="mmap"일 때 파일 저장 위치
+        :param result_cache: 백테스트 결과 디스크 캐시 (있으면 캐시된 조합은 다시 계산하지 않음)
+        :param coordinator: DistributedPool - 지정하면 로컬 워커 풀 대신 TCP로 접속한 원격 워커에서 실행
+               (max_workers는 동시에 보내는 작업 수로 사용, 접속한 워커 수 이상으로 지정)
         """
         self.runner = runner
+        self.shared_data_kind = shared_data_kind
+        self.shared_data_dir = shared_data_dir
+        self.result_cache = result_cache
+        self.coordinator = coordinator
         self.logger = logger or logging.getLogger(self.__class__.__name__)
 
+        self._pool = None
+        self._pool_size = 0
+        self._shared = None
+        self._shared_source = None
+        self._cache_data_key = None
+
+    # ------------------------------------------------------------
+    # 풀 / 공유 데이터 관리
+    # ------------------------------------------------------------
+    def _get_pool(self, max_workers: int):
+        """
+        워커 풀을 재사용 (워커 수가 바뀐 경우에만 다시 생성)
+        """
+        if self.coordinator is not None:
+            return self.coordinator
+        if self._pool is not None and self._pool_size != max_workers:
+            self._close_pool()
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(
+                processes=max_workers,
+                initializer=_init_worker,
+                initargs=(self.runner,)
+            )
+            self._pool_size = max_workers
+            self.logger.info(f"Started persistent worker pool with {max_workers} processes.")
+        return self._pool
+
+    def _share(self, price_data: pd.DataFrame) -> dict:
+        """
+        같은 DataFrame 객체면 기존 공유 데이터를 재사용, 아니면 새로 공유
+        """
+        if self.coordinator is not None:
+            # 원격 워커는 내용 해시로 로컬 데이터를 찾음 (없으면 코디네이터가 한 번 전송)
+            if self._shared_source is not price_data:
+                self._shared_source = price_data
+                self._cache_data_key = None
+            data_key, strategy_key = self._data_keys()
+            return self.coordinator.set_data(price_data, data_key=data_key, strategy_key=strategy_key)
+        if self._shared is not None and self._shared_source is price_data:
+            return self._shared.spec
+        self._release_shared()
+        self._shared = SharedPriceData(
+            price_data, kind=self.shared_data_kind, directory=self.shared_data_dir, logger=self.logger
+        )
+        self._shared_source = price_data
+        self._cache_data_key = None
+        return self._shared.spec
+
+    def _cache_key(self, params_dict: dict, budget: float = 1.0) -> str:
+        """
+        현재 공유 중인 데이터 + 전략 함수 + 파라미터의 캐시 키 (데이터 해시는 데이터셋당 한 번만 계산)
+        """
+        data_key, strategy_key = self._data_keys()
+        return ResultCache.make_key(data_key, strategy_key, params_dict, budget)
+
+    def _data_keys(self) -> tuple:
+        if self._cache_data_key is None:
+            self._cache_data_key = (
+                ResultCache.data_key(self._shared_source),
+                ResultCache.strategy_key(self.runner.strategy_func),
+            )
+        return self._cache_data_key
+
+    def _release_shared(self):
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+            self._shared_source = None
+
+    def _close_pool(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._pool_size = 0
+
+    def close(self):
+        """
+        워커 풀 종료 및 공유 데이터 해제
+        """
+        self._close_pool()
+        self._release_shared()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @staticmethod
+    def _chunks(items: list, max_workers: int, chunk_size: int = None) -> list:
+        """
+        IPC 비용을 줄이도록 조합을 묶음 단위로 분할 (기본: 워커당 약 4개 묶음)
+        """
+        if not chunk_size:
+            chunk_size = max(1, len(items) // (max_workers * 4))
+        return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+    # ------------------------------------------------------------
+    # 최적화
+    # ------------------------------------------------------------
     def grid_search(
         self,
         price_data: pd.DataFrame,
         param_grid: Dict[str, List[Any]],
-        max_workers: int = 4
+        max_workers: int = 4,
+        chunk_size: int = None
     ) -> pd.DataFrame:
         """
         param_grid 예시: {
           "short_window": [5, 10, 20],
           "long_window": [20, 50]
         }
+        :param chunk_size: 워커에 한 번에 보내는 조합 수 (None이면 자동)
         """
         # 1) 모든 파라미터 조합 생성
         keys = list(param_grid.keys())
         all_combinations = list(itertools.product(*[param_grid[k] for k in keys]))
+        all_params = [{k: combo[i] for i, k in enumerate(keys)} for combo in all_combinations]
 
-        # 2) 멀티프로세싱으로 병렬 백테스트
+        # 2) 멀티프로세싱으로 병렬 백테스트 (데이터는 공유 메모리, 작업은 chunk 단위)
         self.logger.info(f"Starting grid search with {len(all_combinations)} combinations...")
-        pool = multiprocessing.Pool(processes=max_workers)
-
-        tasks = []
-        for combo in all_combinations:
-            params_dict = {k: combo[i] for i, k in enumerate(keys)}
-            tasks.append((self.runner, price_data, params_dict))
-
-        results = pool.map(_worker_task, tasks)
-        pool.close()
-        pool.join()
+        results = self._run_batch(price_data, all_params, max_workers, chunk_size)
 
         # 3) 결과 정리 (DataFrame 형태)
         rows = []
@@ -76,6 +279,284 @@ class StrategyOptimizer:
         df_results = pd.DataFrame(rows)
         return df_results
 
+    def _run_batch(self, price_data: pd.DataFrame, all_params: list, max_workers: int,
+                   chunk_size: int = None) -> list:
+        """
+        파라미터 목록을 워커 풀에서 실행하고 입력 순서대로 (params, metrics) 반환
+        - result_cache가 있으면 캐시된 조합은 건너뛰고, 새 결과는 chunk가 끝날 때마다 바로 저장
+          (중간에 중단되어도 다음 실행에서 이어서 계산)
+        """
+        if not all_params:
+            return []
+        data_spec = self._share(price_data)
+
+        cache = self.result_cache
+        metrics_by_index = {}
+        pending = list(range(len(all_params)))
+        keys = None
+        if cache is not None:
+            keys = [self._cache_key(p) for p in all_params]
+            cached = cache.get_many(keys)
+            metrics_by_index = {i: cached[k]["metrics"] for i, k in enumerate(keys) if k in cached}
+            pending = [i for i in range(len(all_params)) if i not in metrics_by_index]
+            self.logger.info(f"Result cache: {len(metrics_by_index)} hits, {len(pending)} to compute.")
+
+        if pending:
+            pool = self._get_pool(max_workers)
+            with_returns = cache is not None and cache.store_returns
+            index_chunks = self._chunks(pending, max_workers, chunk_size)
+            tasks = [(data_spec, [all_params[i] for i in chunk], with_returns) for chunk in index_chunks]
+
+            for index_chunk, chunk_result in zip(index_chunks, pool.imap(_worker_chunk, tasks)):
+                for i, (_, metrics, _) in zip(index_chunk, chunk_result):
+                    metrics_by_index[i] = metrics
+                if cache is not None:
+                    cache.put_many([
+                        (keys[i], metrics, returns)
+                        for i, (_, metrics, returns) in zip(index_chunk, chunk_result)
+                    ])
+
+        return [(all_params[i], metrics_by_index[i]) for i in range(len(all_params))]
+
+    def search(
+        self,
+        price_data: pd.DataFrame,
+        strategy: SearchStrategy,
+        metric: str = "sharpe_ratio",
+        max_workers: int = 4,
+        max_evals: int = None
+    ) -> pd.DataFrame:
+        """
+        탐색 전략(RandomSearch, SuccessiveHalving, Hyperband, BayesianOptimization 등)으로 비동기 최적화
+        - 워커가 하나라도 비면 strategy.ask()로 바로 다음 후보를 제안 (배치 단위 대기 없음)
+        - 결과 DataFrame에는 "budget" 칼럼(사용한 데이터 비율)이 포함됨.
+          부분 구간 결과끼리는 비교 기준이 다르므로 최종 선택은 budget == 1.0 행에서 할 것
+        """
+        data_spec = self._share(price_data)
+        pool = self._get_pool(max_workers)
+        results = queue.Queue()
+        cache = self.result_cache
+        with_returns = cache is not None and cache.store_returns
+
+        def submit(params_dict, budget):
+            pool.apply_async(
+                _worker_eval,
+                ((data_spec, params_dict, budget, with_returns),),
+                callback=lambda r: results.put(("ok", r)),
+                error_callback=lambda e, p=params_dict, b=budget: results.put(("error", (p, b, e)))
+            )
+
+        self.logger.info(f"Starting {strategy.__class__.__name__} search...")
+        rows = []
+        in_flight = 0
+        submitted = 0
+        while True:
+            while in_flight < max_workers and (max_evals is None or submitted < max_evals):
+                proposal = strategy.ask()
+                if proposal is None:
+                    break
+                if cache is not None:
+                    hit = cache.get(self._cache_key(*proposal))
+                    if hit is not None:
+                        # 캐시 적중: 워커를 쓰지 않고 바로 결과 전달
+                        results.put(("cached", (*proposal, hit["metrics"], None)))
+                        in_flight += 1
+                        continue
+                submit(*proposal)
+                in_flight += 1
+                submitted += 1
+            if in_flight == 0:
+                break
+
+            status, payload = results.get()
+            in_flight -= 1
+            if status in ("ok", "cached"):
+                params_dict, budget, metrics, returns = payload
+                if cache is not None and status == "ok":
+                    cache.put(self._cache_key(params_dict, budget), metrics, returns)
+                strategy.tell(params_dict, budget, metrics.get(metric))
+                rows.append({**params_dict, "budget": budget, **metrics})
+            else:
+                params_dict, budget, error = payload
+                self.logger.error(f"Backtest failed for {params_dict} (budget={budget}): {error}")
+                strategy.tell(params_dict, budget, None)
+
+        self.logger.info(f"Search finished after {submitted} backtests.")
+        return pd.DataFrame(rows)
+
+    # ------------------------------------------------------------
+    # Walk-forward / Purged K-Fold
+    # ------------------------------------------------------------
+    @staticmethod
+    def make_folds(
+        n_rows: int,
+        method: str = "walk_forward",
+        n_splits: int = 5,
+        train_size: int = None,
+        test_size: int = None,
+        purge: int = 0,
+        embargo: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        행 번호 기준 fold 목록 생성 (각 fold: {"train": [(start, end), ...], "test": (start, end), "window": (start, end)})
+        - "walk_forward": 데이터 끝에서부터 test_size 구간 n_splits개를 검증 구간으로 사용,
+          학습 구간은 그 이전 (train_size=None이면 처음부터 확장, 아니면 최근 train_size 행)
+        - "purged_kfold": 데이터를 n_splits개 연속 구간으로 나눠 하나씩 검증, 나머지로 학습
+          (검증 구간 직전 purge 행, 직후 embargo 행은 학습에서 제외해 정보 누수 방지)
+        window는 백테스트를 실행할 구간 (학습+검증을 모두 포함하므로 지표는 fold당 한 번만 계산)
+        """
+        folds = []
+        if method == "walk_forward":
+            test_size = test_size or n_rows // (n_splits + 1)
+            for k in range(n_splits):
+                test_start = n_rows - (n_splits - k) * test_size
+                test_end = test_start + test_size if k < n_splits - 1 else n_rows
+                train_end = test_start - purge
+                train_start = 0 if train_size is None else max(0, train_end - train_size)
+                if train_end - train_start < 2 or test_end - test_start < 2:
+                    continue
+                folds.append({
+                    "train": [(train_start, train_end)],
+                    "test": (test_start, test_end),
+                    "window": (train_start, test_end),
+                })
+        elif method == "purged_kfold":
+            bounds = np.linspace(0, n_rows, n_splits + 1).astype(int)
+            for k in range(n_splits):
+                test_start, test_end = int(bounds[k]), int(bounds[k + 1])
+                train = [(s, e) for s, e in ((0, test_start - purge), (test_end + embargo, n_rows)) if e - s > 0]
+                if sum(e - s for s, e in train) < 2 or test_end - test_start < 2:
+                    continue
+                folds.append({"train": train, "test": (test_start, test_end), "window": (0, n_rows)})
+        else:
+            raise ValueError(f"Unknown cross-validation method: {method}")
+        return folds
+
+    def walk_forward(
+        self,
+        price_data: pd.DataFrame,
+        param_grid: Dict[str, List[Any]],
+        method: str = "walk_forward",
+        n_splits: int = 5,
+        train_size: int = None,
+        test_size: int = None,
+        purge: int = 0,
+        embargo: int = 0,
+        metric: str = "sharpe_ratio",
+        max_workers: int = 4,
+        chunk_size: int = None,
+        feature_func: Callable[[pd.DataFrame, Dict[str, List[Any]]], pd.DataFrame] = None
+    ) -> Dict[str, Any]:
+        """
+        Walk-forward / Purged K-Fold 최적화
+        1) 모든 (윈도우 × 파라미터) 백테스트를 한 번에 워커 풀에 배분
+           (가격 데이터는 한 번만 공유, 워커는 fold 윈도우를 뷰로 잘라 사용,
+            같은 윈도우를 쓰는 fold들(예: purged_kfold)은 백테스트 한 번의 결과를 함께 사용)
+           feature_func(window, param_grid)가 있으면 서로 다른 윈도우마다 지표를 한 번만 계산해 윈도우 칼럼으로 붙여 공유
+           (예: example_features → example_strategy는 ma_<window> 칼럼을 다시 계산하지 않음)
+        2) fold마다 학습 구간 metric이 가장 좋은 파라미터 선택
+        3) 선택된 파라미터의 검증 구간 성과를 out-of-sample 지표로 보고하고,
+           검증 구간 수익률을 이어 붙여 out-of-sample 자산 곡선 생성
+        strategy_func는 미래 데이터를 보지 않는(causal) 전략이어야 함 (윈도우에 검증 구간이 포함되므로)
+
+        :return: {
+          "folds": fold별 구간/선택 파라미터/학습 metric/검증 지표 DataFrame,
+          "results": 모든 (fold, 파라미터)의 학습(is_*)/검증(oos_*) 지표 DataFrame,
+          "equity_curve": 검증 구간을 이어 붙인 누적 수익률 Series,
+          "oos_metrics": 이어 붙인 검증 구간 전체 지표
+        }
+        """
+        keys = list(param_grid.keys())
+        all_params = [dict(zip(keys, combo)) for combo in itertools.product(*[param_grid[k] for k in keys])]
+        folds = self.make_folds(len(price_data), method, n_splits, train_size, test_size, purge, embargo)
+        if not folds or not all_params:
+            self.logger.warning("No folds or parameter combinations to evaluate.")
+            return {"folds": pd.DataFrame(), "results": pd.DataFrame(),
+                    "equity_curve": pd.Series(dtype=float), "oos_metrics": {}}
+
+        # 같은 윈도우를 쓰는 fold끼리 묶음 (윈도우 번호 -> [(fold 번호, fold), ...])
+        groups = {}
+        for fold_id, fold in enumerate(folds):
+            groups.setdefault(fold["window"], []).append((fold_id, fold))
+        groups = list(groups.values())
+        self.logger.info(f"Starting {method} with {len(folds)} folds ({len(groups)} windows) "
+                         f"x {len(all_params)} combinations...")
+        if feature_func is not None:
+            # 서로 다른 윈도우(+지표)만 이어 붙여 한 번에 공유, 워커는 offset으로 자기 윈도우를 뷰로 잘라 사용
+            frames = []
+            row = 0
+            for group in groups:
+                window_start, window_end = group[0][1]["window"]
+                window = price_data.iloc[window_start:window_end]
+                frames.append(pd.concat([window, feature_func(window, param_grid)], axis=1))
+                for _, fold in group:
+                    fold["offset"] = row - window_start
+                row += window_end - window_start
+            data_spec = self._share(pd.concat(frames) if len(frames) > 1 else frames[0])
+        else:
+            data_spec = self._share(price_data)
+        pool = self._get_pool(max_workers)
+
+        # 1) (윈도우, 파라미터) 작업 전체를 한 목록으로 묶어 한 번에 스케줄링
+        pairs = [(group_id, params_dict) for group_id in range(len(groups)) for params_dict in all_params]
+        tasks = []
+        for chunk in self._chunks(pairs, max_workers, chunk_size):
+            chunk_groups = {group_id: groups[group_id] for group_id in sorted({group_id for group_id, _ in chunk})}
+            tasks.append((data_spec, chunk_groups, chunk))
+
+        rows = []
+        best = {}                 # fold 번호 -> (학습 metric, params, 검증 지표)
+        for chunk_result in pool.imap(_worker_fold_chunk, tasks):
+            for fold_id, params_dict, train_metrics, test_metrics in chunk_result:
+                rows.append({
+                    "fold": fold_id,
+                    **params_dict,
+                    **{f"is_{k}": v for k, v in train_metrics.items()},
+                    **{f"oos_{k}": v for k, v in test_metrics.items()},
+                })
+                score = train_metrics.get(metric)
+                if score is None or np.isnan(score):
+                    continue
+                if fold_id not in best or score > best[fold_id][0]:
+                    best[fold_id] = (score, params_dict, test_metrics)
+
+        # 2) 선택된 파라미터로 검증 구간 수익률 계산 (fold 수만큼만 추가 실행)
+        selected = sorted(best.items())
+        returns_list = pool.map(_worker_fold_returns, [(data_spec, folds[i], params) for i, (_, params, _) in selected])
+
+        fold_rows = []
+        segments = []
+        index = price_data.index
+        for (fold_id, (score, params_dict, test_metrics)), returns in zip(selected, returns_list):
+            fold = folds[fold_id]
+            test_start, test_end = fold["test"]
+            fold_rows.append({
+                "fold": fold_id,
+                "train_start": index[fold["train"][0][0]],
+                "train_end": index[fold["train"][-1][1] - 1],
+                "test_start": index[test_start],
+                "test_end": index[test_end - 1],
+                **params_dict,
+                f"is_{metric}": score,
+                **{f"oos_{k}": v for k, v in test_metrics.items()},
+            })
+            segments.append(pd.Series(returns, index=index[test_start:test_end]))
+
+        # 3) out-of-sample 자산 곡선 (검증 구간이 겹치지 않으므로 그대로 연결)
+        oos_returns = pd.concat(segments).sort_index() if segments else pd.Series(dtype=float)
+        equity_curve = (1 + oos_returns.fillna(0)).cumprod()
+        oos_metrics = PerformanceMetrics(logger=self.logger).calculate_metrics(
+            pd.DataFrame({"strategy_returns": oos_returns})
+        )
+        self.logger.info(f"Out-of-sample metrics over {len(fold_rows)} folds: {oos_metrics}")
+
+        return {
+            "folds": pd.DataFrame(fold_rows),
+            "results": pd.DataFrame(rows).sort_values("fold", kind="stable", ignore_index=True),
+            "equity_curve": equity_curve.rename("equity"),
+            "oos_metrics": oos_metrics,
+        }
+
     def find_best_params(self, df_results: pd.DataFrame, metric: str = "sharpe_ratio") -> Dict[str, Any]:
         """
         metric 기준으로 가장 좋은 파라미터 찾기
@@ -0,0 +1,226 @@
+# order_execution/symbol_filters.py
+
+import logging
+import math
+import threading
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+def _decimals(step: str) -> int:
+    """
+    "0.0010" → 3 처럼 호가/수량 단위의 소수 자릿수
+    """
+    exponent = Decimal(str(step)).normalize().as_tuple().exponent
+    return max(0, -exponent)
+
+class SymbolFilter:
+    """
+    심볼 1개의 거래소 필터(tick size, step size, 최소 수량/금액)와
+    미리 계산된 정수 스케일로 가격/수량을 빠르게 양자화
+    - 가격/수량을 10^decimals 배 한 정수 단위로 내림/올림 → 부동소수점 찌꺼기 없음
+    """
+
+    # 부동소수 곱셈 오차(예: 0.3 * 10 = 2.9999999999999996) 보정용
+    _EPS = 1e-9
+
+    def __init__(self, symbol: str, tick_size: str, step_size: str, min_qty: str = "0",
+                 max_qty: str = "inf", min_notional: str = "0", market_step_size: str = None,
+                 market_max_qty: str = None):
+        self.symbol = symbol
+        self.tick_size = float(tick_size)
+        self.step_size = float(step_size)
+        self.min_qty = float(min_qty)
+        self.max_qty = float(max_qty)
+        self.min_notional = float(min_notional)
+        self.market_max_qty = float(market_max_qty) if market_max_qty else self.max_qty
+
+        self.price_decimals = _decimals(tick_size)
+        self.price_scale = 10 ** self.price_decimals
+        self.tick_units = int(round(self.tick_size * self.price_scale)) or 1
+
+        market_step = market_step_size or step_size
+        self.qty_decimals = max(_decimals(step_size), _decimals(market_step))
+        self.qty_scale = 10 ** self.qty_decimals
+        self.step_units = int(round(self.step_size * self.qty_scale)) or 1
+
+    @classmethod
+    def from_exchange_info(cls, info: dict) -> "SymbolFilter":
+        """
+        /fapi/v1/exchangeInfo 의 symbols[] 항목에서 생성
+        """
+        filters = {f.get("filterType"): f for f in info.get("filters", [])}
+        price_filter = filters.get("PRICE_FILTER", {})
+        lot_size = filters.get("LOT_SIZE", {})
+        market_lot = filters.get("MARKET_LOT_SIZE", {})
+        min_notional = filters.get("MIN_NOTIONAL", {})
+        return cls(
+            symbol=info.get("symbol"),
+            tick_size=price_filter.get("tickSize", "0.01"),
+            step_size=lot_size.get("stepSize", "0.001"),
+            min_qty=lot_size.get("minQty", "0"),
+            max_qty=lot_size.get("maxQty", "inf"),
+            min_notional=min_notional.get("notional", min_notional.get("minNotional", "0")),
+            market_step_size=market_lot.get("stepSize"),
+            market_max_qty=market_lot.get("maxQty"),
+        )
+
+    # ------------------------------------------------------------
+    # 스칼라 양자화
+    # ------------------------------------------------------------
+    def quantize_price(self, price: float, rounding: str = "nearest") -> float:
+        """
+        tick size 단위로 가격 양자화
+        :param rounding: "down"(매수 지정가), "up"(매도 지정가), "nearest"
+        """
+        units = price * self.price_scale / self.tick_units
+        if rounding == "down":
+            n = math.floor(units + self._EPS)
+        elif rounding == "up":
+            n = math.ceil(units - self._EPS)
+        else:
+            n = math.floor(units + 0.5)
+        return n * self.tick_units / self.price_scale
+
+    def quantize_qty(self, quantity: float) -> float:
+        """
+        step size 단위로 수량 내림 (리스크를 늘리지 않도록 항상 내림)
+        """
+        n = math.floor(quantity * self.qty_scale / self.step_units + self._EPS)
+        return n * self.step_units / self.qty_scale
+
+    def validate(self, quantity: float, price: float, order_type: str = "LIMIT") -> Tuple[bool, str]:
+        """
+        양자화된 주문이 최소/최대 수량, 최소 주문 금액을 만족하는지 확인
+        """
+        max_qty = self.market_max_qty if order_type == "MARKET" else self.max_qty
+        if quantity < self.min_qty:
+            return False, f"Quantity {quantity} below minQty {self.min_qty}"
+        if quantity > max_qty:
+            return False, f"Quantity {quantity} above maxQty {max_qty}"
+        if price and quantity * price < self.min_notional:
+            return False, f"Notional {quantity * price:.4f} below minNotional {self.min_notional}"
+        return True, ""
+
+    def format_price(self, price: float) -> str:
+        return f"{price:.{self.price_decimals}f}"
+
+    def format_qty(self, quantity: float) -> str:
+        return f"{quantity:.{self.qty_decimals}f}"
+
+    # ------------------------------------------------------------
+    # 벡터 양자화
+    # ------------------------------------------------------------
+    def quantize_qty_array(self, quantities: np.ndarray) -> np.ndarray:
+        n = np.floor(np.asarray(quantities, dtype=float) * self.qty_scale / self.step_units + self._EPS)
+        return n * self.step_units / self.qty_scale
+
+    def quantize_price_array(self, prices: np.ndarray, rounding: str = "nearest") -> np.ndarray:
+        units = np.asarray(prices, dtype=float) * self.price_scale / self.tick_units
+        if rounding == "down":
+            n = np.floor(units + self._EPS)
+        elif rounding == "up":
+            n = np.ceil(units - self._EPS)
+        else:
+            n = np.floor(units + 0.5)
+        return n * self.tick_units / self.price_scale
+
+
+class SymbolFilterRegistry:
+    """
+    거래소 exchangeInfo에서 심볼 필터를 한 번 읽어 캐시하고, 백그라운드 스레드에서 주기적으로 갱신
+    PositionSizing / TradeExecutor / 집행 알고리즘이 같은 인스턴스를 공유
+    """
+
+    def __init__(self, exchange_api, refresh_interval: float = 3600.0, logger=None):
+        """
+        :param exchange_api: get_exchange_info()를 제공하는 거래소 API 객체
+        :param refresh_interval: 백그라운드 갱신 주기(초)
+        """
+        self.exchange_api = exchange_api
+        self.refresh_interval = refresh_interval
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self._filters: Dict[str, SymbolFilter] = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def load(self) -> int:
+        """
+        exchangeInfo 조회 후 캐시 교체 (dict 참조 교체라 읽는 쪽은 락 불필요)
+        :return: 로드된 심볼 수
+        """
+        get_info = getattr(self.exchange_api, "get_exchange_info", None)
+        if get_info is None:
+            self.logger.warning("Exchange API has no get_exchange_info. Symbol filters disabled.")
+            return 0
+        try:
+            info = get_info()
+            filters = {}
+            for symbol_info in info.get("symbols", []):
+                f = SymbolFilter.from_exchange_info(symbol_info)
+                filters[f.symbol] = f
+        except Exception as e:
+            self.logger.exception(f"Failed to load exchange info: {e}")
+            return 0
+        self._filters = filters
+        self.logger.info(f"Loaded symbol filters for {len(filters)} symbols.")
+        return len(filters)
+
+    def start(self):
+        """
+        최초 로드 후 백그라운드 갱신 스레드 시작
+        """
+        self.load()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="SymbolFilterRefresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _refresh_loop(self):
+        while not self._stop_event.wait(self.refresh_interval):
+            self.load()
+
+    def get(self, symbol: str) -> Optional[SymbolFilter]:
+        return self._filters.get(symbol)
+
+    def set(self, symbol_filter: SymbolFilter):
+        """
+        수동 등록 (테스트/백테스트 등 exchangeInfo 없이 사용할 때)
+        """
+        filters = dict(self._filters)
+        filters[symbol_filter.symbol] = symbol_filter
+        self._filters = filters
+
+    def quantize_qty(self, symbol: str, quantity: float) -> float:
+        f = self._filters.get(symbol)
+        return f.quantize_qty(quantity) if f else quantity
+
+    def quantize_price(self, symbol: str, price: float, rounding: str = "nearest") -> float:
+        f = self._filters.get(symbol)
+        return f.quantize_price(price, rounding) if f else price
+
+    def quantize_qty_array(self, symbols: list, quantities: np.ndarray) -> np.ndarray:
+        """
+        여러 심볼의 주문 수량을 한 번에 양자화 (step 미만/최소 수량 미만은 0)
+        필터가 없는 심볼은 값 그대로
+        """
+        quantities = np.asarray(quantities, dtype=float)
+        scale = np.ones(len(quantities))
+        step = np.zeros(len(quantities))
+        min_qty = np.zeros(len(quantities))
+        for i, symbol in enumerate(symbols):
+            f = self._filters.get(symbol)
+            if f is not None:
+                scale[i], step[i], min_qty[i] = f.qty_scale, f.step_units, f.min_qty
+
+        has_filter = step > 0
+        step = np.where(has_filter, step, 1.0)
+        n = np.floor(quantities * scale / step + SymbolFilter._EPS)
+        out = np.where(has_filter, n * step / scale, quantities)
+        return np.where(out < min_qty, 0.0, out)
@@ -0,0 +1,149 @@
+# benchmarks/synthetic_market.py
+
+import json
+import random
+from typing import List, Tuple
+
+
+class SyntheticMarket:
+    """
+    벤치마크용 재현 가능한 합성 시장 데이터 생성기 (바이낸스 선물 웹소켓 메시지 형식)
+    - depthUpdate: order_book_ws.handle_depth가 받는 형태 ("b"/"a" 각 levels개 호가, 가격/수량은 문자열)
+    - trade: trade_data_ws.handle_trade가 받는 형태
+    - 중간가는 로그 랜덤워크, 체결은 최우선 호가 근처에서 발생
+    - 같은 seed면 항상 같은 메시지 시퀀스 (커밋 간 벤치마크 결과 비교용)
+    """
+
+    def __init__(self, symbol: str = "LTCUSDT", seed: int = 0, start_price: float = 90.0,
+                 tick_size: float = 0.01, levels: int = 20, volatility: float = 0.0002,
+                 start_time_ms: int = 1_700_000_000_000):
+        """
+        :param levels: depthUpdate 한 메시지의 호가 단계 수 (depth5 / depth20 등)
+        :param volatility: depth 메시지 간 중간가 로그 수익률 표준편차
+        """
+        self.symbol = symbol
+        self.rng = random.Random(seed)
+        self.tick_size = tick_size
+        self.levels = levels
+        self.volatility = volatility
+        self.time_ms = start_time_ms
+        self.mid = start_price
+        self.update_id = 1
+        self.trade_id = 1
+        self.decimals = max(0, len(f"{tick_size:.10f}".rstrip("0").split(".")[1]))
+        self._book = self._make_book()
+
+    # ------------------------------------------------------------
+    # 이벤트 생성
+    # ------------------------------------------------------------
+    def _make_book(self) -> dict:
+        rng = self.rng
+        best_bid = round(self.mid - self.tick_size / 2, self.decimals)
+        best_ask = round(best_bid + self.tick_size, self.decimals)
+        bids = [[round(best_bid - i * self.tick_size, self.decimals), round(rng.lognormvariate(1.0, 1.0), 3)]
+                for i in range(self.levels)]
+        asks = [[round(best_ask + i * self.tick_size, self.decimals), round(rng.lognormvariate(1.0, 1.0), 3)]
+                for i in range(self.levels)]
+        return {"bids": bids, "asks": asks}
+
+    def order_book(self) -> dict:
+        """
+        현재 호가 (분석기 입력용, 숫자형 [[price, qty], ...])
+        """
+        return {"symbol": self.symbol, "bids": [list(level) for level in self._book["bids"]],
+                "asks": [list(level) for level in self._book["asks"]]}
+
+    def depth_update(self, event_time: int = None) -> dict:
+        """
+        중간가를 한 스텝 움직이고 새 호가 스냅샷으로 depthUpdate 이벤트 생성
+        """
+        self.time_ms = event_time if event_time is not None else self.time_ms + 100
+        self.mid *= 1.0 + self.rng.gauss(0.0, self.volatility)
+        self._book = self._make_book()
+        first_id = self.update_id
+        self.update_id += self.rng.randint(1, 20)
+        fmt = f"{{:.{self.decimals}f}}"
+        return {
+            "e": "depthUpdate",
+            "E": self.time_ms,
+            "T": self.time_ms - 1,
+            "s": self.symbol,
+            "U": first_id,
+            "u": self.update_id - 1,
+            "pu": first_id - 1,
+            "b": [[fmt.format(p), f"{q:.3f}"] for p, q in self._book["bids"]],
+            "a": [[fmt.format(p), f"{q:.3f}"] for p, q in self._book["asks"]],
+        }
+
+    def trade(self, event_time: int = None) -> dict:
+        """
+        최우선 호가에서 체결되는 trade 이벤트 생성 (매수/매도 주도 50:50)
+        """
+        self.time_ms = event_time if event_time is not None else self.time_ms + 10
+        buyer_maker = self.rng.random() < 0.5
+        price = self._book["bids"][0][0] if buyer_maker else self._book["asks"][0][0]
+        quantity = round(self.rng.expovariate(1.0), 3) or 0.001
+        self.trade_id += 1
+        return {
+            "e": "trade",
+            "E": self.time_ms,
+            "T": self.time_ms - 1,
+            "s": self.symbol,
+            "t": self.trade_id,
+            "p": f"{price:.{self.decimals}f}",
+            "q": f"{quantity:.3f}",
+            "b": self.trade_id * 2,
+            "a": self.trade_id * 2 + 1,
+            "m": buyer_maker,
+            "R": True,
+        }
+
+    def trade_window(self, size: int = 100) -> List[dict]:
+        """
+        분석기 입력용 최근 체결 목록 (숫자형 price/quantity)
+        """
+        trades = []
+        for _ in range(size):
+            t = self.trade()
+            trades.append({"price": float(t["p"]), "quantity": float(t["q"]), "is_buyer_maker": t["m"],
+                           "time": t["T"]})
+        return trades
+
+    def events(self, duration_s: float = 60.0, depth_rate: float = 10.0,
+               trade_rate: float = 100.0) -> List[Tuple[int, str, dict]]:
+        """
+        duration_s 동안의 이벤트를 시간순으로 생성
+        - depth는 일정 간격(depth_rate회/초, 바이낸스 @100ms = 10), trade는 포아송 도착(평균 trade_rate회/초)
+        :return: [(event_time_ms, "depth" | "trade", event), ...]
+        """
+        start = self.time_ms
+        end = start + int(duration_s * 1000)
+        times = []
+        if depth_rate > 0:
+            step = 1000.0 / depth_rate
+            t = start + step
+            while t <= end:
+                times.append((int(t), 0))
+                t += step
+        if trade_rate > 0:
+            t = start + self.rng.expovariate(trade_rate / 1000.0)
+            while t <= end:
+                times.append((int(t), 1))
+                t += self.rng.expovariate(trade_rate / 1000.0)
+        times.sort()
+
+        out = []
+        for ts, kind in times:
+            if kind == 0:
+                out.append((ts, "depth", self.depth_update(ts)))
+            else:
+                out.append((ts, "trade", self.trade(ts)))
+        return out
+
+    def messages(self, duration_s: float = 60.0, depth_rate: float = 10.0,
+                 trade_rate: float = 100.0) -> List[Tuple[int, str, str]]:
+        """
+        events()와 같지만 웹소켓으로 받는 JSON 문자열 형태
+        """
+        return [(ts, kind, json.dumps(event, separators=(",", ":")))
+                for ts, kind, event in self.events(duration_s, depth_rate, trade_rate)]
@@ -1,39 +1,74 @@
 # notification/telegram_alerts.py
 
 import logging
+import time
 import requests
+from requests.adapters import HTTPAdapter
 
 class TelegramAlerts:
     """
     텔레그램 봇(채팅방)에 메시지를 전송하는 클래스 예시
+    - keep-alive 세션 재사용, 요청 timeout 적용
+    - 429 응답 시 retry_after 동안 blocked_until을 설정 (AlertDispatcher가 참고)
     """
 
-    def __init__(self, bot_token: str, chat_id: str, logger=None):
+    # 텔레그램 메시지 최대 길이 / 전송 한도 (채팅방당 초당 1회, 그룹은 분당 20회)
+    max_length = 4096
+    rate_per_sec = 1.0 / 3
+    burst = 3
+
+    def __init__(self, bot_token: str, chat_id: str, timeout: float = 5.0, logger=None):
         """
         :param bot_token: 텔레그램 봇 API 토큰
         :param chat_id: 전송할 채팅방/채널 ID
+        :param timeout: 요청 timeout (초)
         """
         self.bot_token = bot_token
         self.chat_id = chat_id
+        self.timeout = timeout
         self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.name = "telegram"
+        self.blocked_until = 0.0
+        self._session = None
+
+    def _get_session(self) -> requests.Session:
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
 
-    def send_message(self, text: str):
+    def send_message(self, text: str) -> bool:
         """
         텔레그램 채팅방에 메시지 전송
+        :return: 전송 성공 여부
         """
         if not self.bot_token or not self.chat_id:
             self.logger.warning("No Telegram bot token or chat_id configured.")
-            return
+            return False
 
         url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
         data = {
             "chat_id": self.chat_id,
-            "text": text
+            "text": text[:self.max_length]
         }
 
         try:
-            resp = requests.post(url, data=data)
+            resp = self._get_session().post(url, data=data, timeout=self.timeout)
+            if resp.status_code == 429:
+                try:
+                    retry_after = float(resp.json().get("parameters", {}).get("retry_after", 1.0))
+                except ValueError:
+                    retry_after = 1.0
+                self.blocked_until = time.monotonic() + retry_after
+                self.logger.warning(f"Telegram rate limited, retry after {retry_after:.1f}s.")
+                return False
             if resp.status_code != 200:
                 self.logger.error(f"Telegram message failed: {resp.text}")
+                return False
+            return True
         except Exception as e:
             self.logger.exception(f"Error sending Telegram message: {e}")
+            return False
@@ -0,0 +1,569 @@
+# backtesting/tick_backtester.py
+
+import itertools
+import logging
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from signal_generator.signal_manager import SignalManager
+from order_execution.trade_executor import TradeExecutor
+
+# 이벤트 종류 (같은 시각이면 호가 → 체결 순서로 처리)
+EVENT_DEPTH = 0
+EVENT_TRADE = 1
+
+class TickData:
+    """
+    기록된 호가(depth)/체결(trade) 이벤트를 컬럼형 NumPy 배열로 보관
+    - 호가: 시각별 상위 N레벨 스냅샷 (bid_px/bid_qty/ask_px/ask_qty: (스냅샷 수 × N), 빈 레벨은 NaN/0)
+    - 체결: 시각, 가격, 수량, buyer_is_maker
+    - kinds/rows: 두 스트림을 시각 순으로 합친 처리 순서 (이벤트 종류, 해당 배열의 행 번호)
+    """
+
+    def __init__(self, depth_ts, bid_px, bid_qty, ask_px, ask_qty,
+                 trade_ts, trade_px, trade_qty, trade_buyer_maker):
+        self.depth_ts = np.ascontiguousarray(depth_ts, dtype=np.int64)
+        self.bid_px = np.ascontiguousarray(bid_px, dtype=float)
+        self.bid_qty = np.ascontiguousarray(bid_qty, dtype=float)
+        self.ask_px = np.ascontiguousarray(ask_px, dtype=float)
+        self.ask_qty = np.ascontiguousarray(ask_qty, dtype=float)
+        self.trade_ts = np.ascontiguousarray(trade_ts, dtype=np.int64)
+        self.trade_px = np.ascontiguousarray(trade_px, dtype=float)
+        self.trade_qty = np.ascontiguousarray(trade_qty, dtype=float)
+        self.trade_buyer_maker = np.ascontiguousarray(trade_buyer_maker, dtype=bool)
+
+        # 호가 → 체결 순서로 이어 붙인 뒤 시각 기준 안정 정렬
+        ts = np.concatenate((self.depth_ts, self.trade_ts))
+        kinds = np.concatenate((
+            np.full(len(self.depth_ts), EVENT_DEPTH, dtype=np.int8),
+            np.full(len(self.trade_ts), EVENT_TRADE, dtype=np.int8),
+        ))
+        rows = np.concatenate((np.arange(len(self.depth_ts)), np.arange(len(self.trade_ts))))
+        order = np.argsort(ts, kind="stable")
+        self.ts = ts[order]
+        self.kinds = kinds[order]
+        self.rows = rows[order]
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @classmethod
+    def from_events(cls, events, depth_levels: int = 20) -> "TickData":
+        """
+        바이낸스 웹소켓 메시지 형식 이벤트 목록에서 생성
+        - 호가: {"e": "depthUpdate", "E": ms, "b": [[price, qty], ...], "a": [...]} (부분 호가 스냅샷)
+        - 체결: {"e": "aggTrade" or "trade", "T": ms, "p": price, "q": qty, "m": buyer_is_maker}
+        """
+        depth_ts, bids, asks = [], [], []
+        trade_ts, trade_px, trade_qty, trade_m = [], [], [], []
+        for event in events:
+            event_type = event.get("e")
+            if event_type == "depthUpdate":
+                depth_ts.append(int(event.get("E") or event.get("T")))
+                bids.append(event.get("b", []))
+                asks.append(event.get("a", []))
+            elif event_type in ("aggTrade", "trade"):
+                trade_ts.append(int(event["T"]))
+                trade_px.append(float(event["p"]))
+                trade_qty.append(float(event["q"]))
+                trade_m.append(bool(event.get("m", False)))
+
+        def levels(books):
+            px = np.full((len(books), depth_levels), np.nan)
+            qty = np.zeros((len(books), depth_levels))
+            for i, book in enumerate(books):
+                for j, (p, q) in enumerate(book[:depth_levels]):
+                    px[i, j] = float(p)
+                    qty[i, j] = float(q)
+            return px, qty
+
+        bid_px, bid_qty = levels(bids)
+        ask_px, ask_qty = levels(asks)
+        return cls(depth_ts, bid_px, bid_qty, ask_px, ask_qty, trade_ts, trade_px, trade_qty, trade_m)
+
+
+class BacktestExchange:
+    """
+    이벤트 시각 기준으로 동작하는 시뮬레이션 거래소 (TradeExecutor가 쓰는 바이낸스 API 부분 호환)
+    - 지연: 주문은 now + latency_ms 시각의 호가 스냅샷에 도달 (시장가는 그 스냅샷의 호가를 따라 체결)
+    - 대기열 위치: 지정가 주문은 도달 시점에 같은 가격의 기존 잔량 뒤에 줄을 섬
+      (그 가격의 체결량만큼 앞 대기량이 줄고, 호가 잔량이 줄면 앞 대기량도 그 이하로 줄어듦,
+       가격을 관통하는 체결이 나오면 전량 체결)
+    - 수수료: 시장가/즉시 체결은 taker_fee, 대기 후 체결은 maker_fee (체결 금액 대비 비율)
+    """
+
+    def __init__(self, data: TickData, symbol: str, initial_balance: float = 10000.0,
+                 latency_ms: int = 50, taker_fee: float = 0.0004, maker_fee: float = 0.0002,
+                 logger=None):
+        self.data = data
+        self.symbol = symbol
+        self.latency_ms = int(latency_ms)
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+        self.now = int(data.ts[0]) if len(data) else 0
+        self.book_row = -1
+
+        self.balance = float(initial_balance)
+        self.position = 0.0
+        self.entry_price = 0.0
+        self.realized_pnl = 0.0
+        self.fees = 0.0
+
+        self._ids = itertools.count(1)
+        self._orders = {}            # orderId -> 주문 dict (응답 형식)
+        self._pending = []           # 도달 전 지정가 주문
+        self._resting = []           # 호가에 대기 중인 지정가 주문
+        self.has_resting = False     # 이벤트 루프에서 빠르게 확인하기 위한 플래그
+        self.next_activation = None
+        self.fills = []              # (시각, orderId, side, qty, price, fee, is_maker)
+
+    # ------------------------------------------------------------
+    # 바이낸스 API 호환 메서드
+    # ------------------------------------------------------------
+    def get_account_balance(self) -> list:
+        return [{"asset": "USDT", "balance": str(self.balance), "crossUnPnl": str(self.unrealized_pnl())}]
+
+    def place_order(self, symbol: str, side: str, order_type: str, quantity: float, price: float = None,
+                    time_in_force: str = "GTC") -> dict:
+        order_id = next(self._ids)
+        order = {
+            "orderId": order_id, "symbol": symbol, "side": side.upper(), "type": order_type.upper(),
+            "timeInForce": time_in_force, "price": str(price or 0), "origQty": str(quantity),
+            "executedQty": "0", "avgPrice": "0", "status": "NEW",
+            "_qty": float(quantity), "_filled": 0.0, "_cost": 0.0, "_queue_ahead": 0.0,
+            "_arrival": self.now + self.latency_ms, "_price": float(price or 0),
+        }
+        self._orders[order_id] = order
+
+        if order["type"] == "MARKET":
+            # 지연 후 도달 시점의 호가 스냅샷을 따라 즉시 체결
+            row = self._row_at(order["_arrival"])
+            self._take(order, row, limit_price=None)
+            order["status"] = "FILLED" if order["_filled"] > 0 else "EXPIRED"
+        else:
+            self._pending.append(order)
+            if self.next_activation is None or order["_arrival"] < self.next_activation:
+                self.next_activation = order["_arrival"]
+        return self._response(order)
+
+    def place_batch_orders(self, orders: list) -> list:
+        return [
+            self.place_order(o["symbol"], o["side"], o.get("order_type", "LIMIT"), o["quantity"],
+                             o.get("price"), o.get("time_in_force", "GTC"))
+            for o in orders
+        ]
+
+    def cancel_order(self, symbol: str, order_id: int) -> dict:
+        order = self._orders.get(order_id)
+        if order is None:
+            return {"code": -2011, "msg": "Unknown order sent."}
+        if order["status"] in ("NEW", "PARTIALLY_FILLED"):
+            order["status"] = "CANCELED"
+            if order in self._pending:
+                self._pending.remove(order)
+            if order in self._resting:
+                self._resting.remove(order)
+                self.has_resting = bool(self._resting)
+        return self._response(order)
+
+    def get_order(self, symbol: str, order_id: int) -> dict:
+        order = self._orders.get(order_id)
+        if order is None:
+            return {"code": -2013, "msg": "Order does not exist."}
+        return self._response(order)
+
+    def get_open_orders(self, symbol: str) -> list:
+        return [self._response(o) for o in self._pending + self._resting if o["symbol"] == symbol]
+
+    # ------------------------------------------------------------
+    # 이벤트 처리 (TickBacktester 이벤트 루프에서 호출)
+    # ------------------------------------------------------------
+    def activate_pending(self):
+        """
+        도달 시각이 지난 지정가 주문을 호가에 등록 (교차하면 taker로 체결, GTX는 거부)
+        """
+        still_pending = []
+        for order in self._pending:
+            if order["_arrival"] > self.now:
+                still_pending.append(order)
+                continue
+            row = self.book_row
+            if self._crosses(order, row):
+                if order["timeInForce"] == "GTX":
+                    order["status"] = "EXPIRED"
+                    continue
+                self._take(order, row, limit_price=order["_price"])
+                if order["_filled"] >= order["_qty"] or order["timeInForce"] in ("IOC", "FOK"):
+                    order["status"] = "FILLED" if order["_filled"] >= order["_qty"] else "EXPIRED"
+                    continue
+            order["_queue_ahead"] = self._level_qty(order, row)
+            self._resting.append(order)
+        self._pending = still_pending
+        self.next_activation = min((o["_arrival"] for o in still_pending), default=None)
+        self.has_resting = bool(self._resting)
+
+    def on_depth(self, row: int):
+        """
+        호가 잔량이 앞 대기량보다 작아지면 앞 대기량을 줄임 (앞쪽 주문 취소로 간주)
+        """
+        for order in self._resting:
+            level = self._level_qty(order, row)
+            if level < order["_queue_ahead"]:
+                order["_queue_ahead"] = level
+
+    def on_trade(self, price: float, quantity: float, buyer_is_maker: bool):
+        filled_any = False
+        for order in self._resting:
+            limit = order["_price"]
+            if order["side"] == "BUY":
+                through = price < limit
+                at_level = price == limit and buyer_is_maker
+            else:
+                through = price > limit
+                at_level = price == limit and not buyer_is_maker
+            if through:
+                self._fill(order, order["_qty"] - order["_filled"], limit, is_maker=True)
+            elif at_level:
+                ahead = order["_queue_ahead"] - quantity
+                if ahead < 0:
+                    self._fill(order, min(-ahead, order["_qty"] - order["_filled"]), limit, is_maker=True)
+                    ahead = 0.0
+                order["_queue_ahead"] = ahead
+            else:
+                continue
+            filled_any = True
+        if filled_any:
+            self._resting = [o for o in self._resting if o["status"] not in ("FILLED", "CANCELED")]
+            self.has_resting = bool(self._resting)
+
+    # ------------------------------------------------------------
+    # 계좌
+    # ------------------------------------------------------------
+    def mid_price(self, row: int = None) -> Optional[float]:
+        row = self.book_row if row is None else row
+        if row < 0:
+            return None
+        return (self.data.bid_px[row, 0] + self.data.ask_px[row, 0]) / 2
+
+    def unrealized_pnl(self) -> float:
+        mid = self.mid_price()
+        if not self.position or mid is None:
+            return 0.0
+        return self.position * (mid - self.entry_price)
+
+    def equity(self) -> float:
+        return self.balance + self.unrealized_pnl()
+
+    # ------------------------------------------------------------
+    # 내부 헬퍼
+    # ------------------------------------------------------------
+    def _row_at(self, ts: int) -> int:
+        row = int(np.searchsorted(self.data.depth_ts, ts, side="right")) - 1
+        return max(row, self.book_row)
+
+    def _crosses(self, order: dict, row: int) -> bool:
+        if row < 0:
+            return False
+        if order["side"] == "BUY":
+            best_ask = self.data.ask_px[row, 0]
+            return best_ask == best_ask and order["_price"] >= best_ask
+        best_bid = self.data.bid_px[row, 0]
+        return best_bid == best_bid and order["_price"] <= best_bid
+
+    def _level_qty(self, order: dict, row: int) -> float:
+        """
+        주문 가격과 같은 쪽 호가의 해당 가격 잔량 (없으면 0)
+        """
+        if row < 0:
+            return 0.0
+        if order["side"] == "BUY":
+            px, qty = self.data.bid_px[row], self.data.bid_qty[row]
+        else:
+            px, qty = self.data.ask_px[row], self.data.ask_qty[row]
+        hit = np.flatnonzero(px == order["_price"])
+        return float(qty[hit[0]]) if len(hit) else 0.0
+
+    def _take(self, order: dict, row: int, limit_price: Optional[float]):
+        """
+        반대편 호가를 따라 체결 (스냅샷 잔량을 넘는 나머지는 마지막 레벨 가격으로 체결 가정)
+        """
+        if row < 0:
+            return
+        if order["side"] == "BUY":
+            px, qty = self.data.ask_px[row], self.data.ask_qty[row]
+        else:
+            px, qty = self.data.bid_px[row], self.data.bid_qty[row]
+        remaining = order["_qty"] - order["_filled"]
+        last_price = None
+        for level in range(len(px)):
+            price = px[level]
+            if remaining <= 0 or price != price:
+                break
+            if limit_price is not None and (
+                (order["side"] == "BUY" and price > limit_price) or (order["side"] == "SELL" and price < limit_price)
+            ):
+                return
+            take = min(remaining, qty[level])
+            if take > 0:
+                self._fill(order, take, float(price), is_maker=False)
+                remaining -= take
+            last_price = float(price)
+        if remaining > 0 and last_price is not None and limit_price is None:
+            self._fill(order, remaining, last_price, is_maker=False)
+
+    def _fill(self, order: dict, qty: float, price: float, is_maker: bool):
+        if qty <= 0:
+            return
+        fee = qty * price * (self.maker_fee if is_maker else self.taker_fee)
+        order["_filled"] += qty
+        order["_cost"] += qty * price
+        order["status"] = "FILLED" if order["_filled"] >= order["_qty"] - 1e-12 else "PARTIALLY_FILLED"
+        self.fees += fee
+        self.balance -= fee
+        self._update_position(qty if order["side"] == "BUY" else -qty, price)
+        self.fills.append((self.now, order["orderId"], order["side"], qty, price, fee, is_maker))
+
+    def _update_position(self, signed_qty: float, price: float):
+        old = self.position
+        new = old + signed_qty
+        if old == 0 or (old > 0) == (signed_qty > 0):
+            self.entry_price = (self.entry_price * abs(old) + price * abs(signed_qty)) / abs(new)
+        else:
+            closed = min(abs(old), abs(signed_qty))
+            pnl = (price - self.entry_price) * closed * (1.0 if old > 0 else -1.0)
+            self.realized_pnl += pnl
+            self.balance += pnl
+            if abs(signed_qty) > abs(old):
+                self.entry_price = price
+            elif abs(new) < 1e-12:
+                new, self.entry_price = 0.0, 0.0
+        self.position = new
+
+    @staticmethod
+    def _response(order: dict) -> dict:
+        response = {k: v for k, v in order.items() if not k.startswith("_")}
+        response["executedQty"] = str(order["_filled"])
+        response["avgPrice"] = str(order["_cost"] / order["_filled"]) if order["_filled"] else "0"
+        return response
+
+
+class TickBacktester:
+    """
+    L2 호가/체결 이벤트 기반 백테스트 엔진
+    - 기록된 이벤트를 시각 순서대로 재생하며 실거래와 같은 SignalManager(분석 모듈) → TradeExecutor
+      (PositionSizing, RiskManager, PortfolioRiskEngine, StopTriggerEngine) 경로를 그대로 실행
+    - 체결은 BacktestExchange가 이벤트 시각 기준 지연/대기열 위치/수수료로 시뮬레이션
+    - 이벤트 루프는 블록 단위로 미리 꺼낸 파이썬 리스트를 순회하고, 호가 이벤트는 현재 스냅샷 행 번호만 갱신
+      (이벤트마다 dict/객체를 만들지 않음). 분석 모듈은 signal_interval_ms마다 한 번 호출
+    """
+
+    BLOCK_SIZE = 65536
+
+    def __init__(
+        self,
+        symbol: str,
+        initial_balance: float = 10000.0,
+        signal_manager: SignalManager = None,
+        latency_ms: int = 50,
+        taker_fee: float = 0.0004,
+        maker_fee: float = 0.0002,
+        signal_interval_ms: int = 1000,
+        trade_window: int = 500,
+        stop_loss_pct: float = 0.005,
+        trail_pct: float = None,
+        symbol_filter=None,
+        logger=None
+    ):
+        """
+        :param signal_interval_ms: 분석 모듈 호출 간격 (이벤트 시각 기준)
+        :param trade_window: 분석 모듈에 넘길 최근 체결 개수
+        :param stop_loss_pct: 진입 신호의 손절가 (진입가 대비 비율, 포지션 사이징에 사용)
+        :param trail_pct: 트레일링 스탑 비율 (None이면 사용 안 함)
+        :param symbol_filter: 거래소 심볼 필터 (SymbolFilter, 수량/가격 단위 적용)
+        """
+        self.symbol = symbol
+        self.initial_balance = initial_balance
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.signal_manager = signal_manager or SignalManager(logger=self.logger)
+        self.latency_ms = latency_ms
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.signal_interval_ms = signal_interval_ms
+        self.trade_window = trade_window
+        self.stop_loss_pct = stop_loss_pct
+        self.trail_pct = trail_pct
+        self.symbol_filter = symbol_filter
+
+    def _make_signal(self, recommendation: str, position: float, best_bid: float, best_ask: float) -> list:
+        """
+        최종 추천을 TradeExecutor 신호로 변환 (반대 포지션은 먼저 청산 후 진입)
+        """
+        signals = []
+        if recommendation == "BUY" and position <= 0:
+            if position < 0:
+                signals.append({"action": "BUY", "symbol": self.symbol, "price": best_ask,
+                                "quantity": -position, "signal_type": "EXIT"})
+            entry = {"action": "BUY", "symbol": self.symbol, "price": best_ask,
+                     "stop_loss": best_ask * (1 - self.stop_loss_pct), "signal_type": "ENTRY"}
+        elif recommendation == "SELL" and position >= 0:
+            if position > 0:
+                signals.append({"action": "SELL", "symbol": self.symbol, "price": best_bid,
+                                "quantity": position, "signal_type": "EXIT"})
+            entry = {"action": "SELL", "symbol": self.symbol, "price": best_bid,
+                     "stop_loss": best_bid * (1 + self.stop_loss_pct), "signal_type": "ENTRY"}
+        else:
+            return signals
+        if self.trail_pct:
+            entry["trail_pct"] = self.trail_pct
+        signals.append(entry)
+        return signals
+
+    def run(self, data: TickData) -> dict:
+        """
+        :return: {
+          "events", "elapsed", "events_per_sec",
+          "final_equity", "realized_pnl", "fees", "num_fills", "signals",
+          "fills": 체결 내역 DataFrame, "equity": 신호 평가 시점별 자산 Series
+        }
+        """
+        exchange = BacktestExchange(
+            data, self.symbol, initial_balance=self.initial_balance, latency_ms=self.latency_ms,
+            taker_fee=self.taker_fee, maker_fee=self.maker_fee, logger=self.logger
+        )
+        executor = TradeExecutor(exchange_api=exchange, initial_balance=self.initial_balance,
+                                 num_workers=1, max_signal_age=0, logger=self.logger)
+        if self.symbol_filter is not None:
+            executor.symbol_filters.set(self.symbol_filter)
+        signal_manager = self.signal_manager
+        symbol = self.symbol
+
+        n = len(data)
+        if n == 0:
+            return {"events": 0}
+        span = int(data.ts[-1] - data.ts[0])
+        equity_ts = np.empty(span // max(1, self.signal_interval_ms) + 2, dtype=np.int64)
+        equity_values = np.empty(len(equity_ts))
+        num_samples = 0
+        num_signals = 0
+
+        # 분석 모듈 입력 (객체는 한 번만 만들고 신호 평가 시점에 내용만 교체)
+        order_book_data = {"symbol": symbol, "bids": None, "asks": None}
+        trade_records = np.rec.fromarrays(
+            [data.trade_ts, data.trade_px, data.trade_qty, data.trade_buyer_maker],
+            names="time,price,quantity,is_buyer_maker"
+        )
+        bids_view = np.stack((data.bid_px, data.bid_qty), axis=2)
+        asks_view = np.stack((data.ask_px, data.ask_qty), axis=2)
+
+        on_trade = executor.on_trade
+        process_pending = executor.process_pending
+        interval = self.signal_interval_ms
+        next_signal_ts = int(data.ts[0]) + interval
+        book_row = -1
+        trade_row = -1
+        in_position = False
+
+        started = time.perf_counter()
+        for block_start in range(0, n, self.BLOCK_SIZE):
+            block_end = min(n, block_start + self.BLOCK_SIZE)
+            # 블록 단위로 파이썬 객체로 변환 (루프 안에서 NumPy 스칼라를 만들지 않도록)
+            ts_list = data.ts[block_start:block_end].tolist()
+            kind_list = data.kinds[block_start:block_end].tolist()
+            row_list = data.rows[block_start:block_end].tolist()
+            rows = np.asarray(data.rows[block_start:block_end])
+            trade_mask = data.kinds[block_start:block_end] == EVENT_TRADE
+            px_list = np.zeros(block_end - block_start)
+            qty_list = np.zeros(block_end - block_start)
+            maker_list = np.zeros(block_end - block_start, dtype=bool)
+            px_list[trade_mask] = data.trade_px[rows[trade_mask]]
+            qty_list[trade_mask] = data.trade_qty[rows[trade_mask]]
+            maker_list[trade_mask] = data.trade_buyer_maker[rows[trade_mask]]
+            px_list, qty_list, maker_list = px_list.tolist(), qty_list.tolist(), maker_list.tolist()
+
+            for i in range(block_end - block_start):
+                ts = ts_list[i]
+                if kind_list[i] == EVENT_DEPTH:
+                    book_row = row_list[i]
+                    exchange.book_row = book_row
+                    if exchange.has_resting:
+                        exchange.now = ts
+                        exchange.on_depth(book_row)
+                else:
+                    trade_row = row_list[i]
+                    if exchange.has_resting:
+                        exchange.now = ts
+                        exchange.on_trade(px_list[i], qty_list[i], maker_list[i])
+                    if in_position:
+                        # 포지션이 있을 때만 시가평가/손절 확인 (스탑 발동 시 신호가 큐에 들어감)
+                        exchange.now = ts
+                        if on_trade(symbol, px_list[i], qty_list[i]):
+                            process_pending()
+                            in_position = self._after_execution(exchange, executor)
+
+                if exchange.next_activation is not None and ts >= exchange.next_activation:
+                    exchange.now = ts
+                    exchange.activate_pending()
+
+                if ts >= next_signal_ts and book_row >= 0:
+                    exchange.now = ts
+                    next_signal_ts = ts - (ts - next_signal_ts) % interval + interval
+                    order_book_data["bids"] = bids_view[book_row]
+                    order_book_data["asks"] = asks_view[book_row]
+                    executor.update_order_book(symbol, order_book_data)
+                    trade_data = trade_records[max(0, trade_row - self.trade_window + 1):trade_row + 1]
+                    result = signal_manager.generate_signals(order_book_data, trade_data)
+                    signals = self._make_signal(
+                        result.get("final_recommendation", "HOLD"), exchange.position,
+                        float(data.bid_px[book_row, 0]), float(data.ask_px[book_row, 0])
+                    )
+                    if signals:
+                        num_signals += len(signals)
+                        if not in_position:
+                            # 진입 전 현재가 반영 (포트폴리오 리스크 엔진 시가평가 기준)
+                            executor.portfolio_risk.on_trade(symbol, exchange.mid_price())
+                        for signal in signals:
+                            executor.add_signal(signal)
+                        process_pending()
+                        in_position = self._after_execution(exchange, executor)
+                    equity_ts[num_samples] = ts
+                    equity_values[num_samples] = exchange.equity()
+                    num_samples += 1
+        elapsed = time.perf_counter() - started
+
+        fills = pd.DataFrame(exchange.fills, columns=["time", "order_id", "side", "quantity", "price", "fee", "is_maker"])
+        fills["time"] = pd.to_datetime(fills["time"], unit="ms")
+        equity = pd.Series(
+            equity_values[:num_samples], index=pd.to_datetime(equity_ts[:num_samples], unit="ms"), name="equity"
+        )
+        report = {
+            "events": n,
+            "elapsed": elapsed,
+            "events_per_sec": n / elapsed if elapsed > 0 else float("inf"),
+            "final_equity": exchange.equity(),
+            "realized_pnl": exchange.realized_pnl,
+            "fees": exchange.fees,
+            "num_fills": len(exchange.fills),
+            "signals": num_signals,
+            "fills": fills,
+            "equity": equity,
+        }
+        self.logger.info(
+            f"Tick backtest: {n} events in {elapsed:.2f}s ({report['events_per_sec']:.0f} events/s), "
+            f"final equity {report['final_equity']:.2f}"
+        )
+        return report
+
+    def _after_execution(self, exchange: BacktestExchange, executor: TradeExecutor) -> bool:
+        """
+        주문 실행 후 포지션 상태 반환 (포지션이 없어졌으면 남은 손절/트레일링 스탑 취소)
+        """
+        if abs(exchange.position) > 1e-12:
+            return True
+        for stop in executor.stop_engine.active_stops(self.symbol):
+            executor.stop_engine.cancel(stop["stop_id"])
+        return False
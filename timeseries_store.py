@@ -0,0 +1,321 @@
+# notification/timeseries_store.py
+
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 롤업 해상도 기본값: (이름, 버킷 길이(초), 보관 개수)
+DEFAULT_ROLLUPS = (("1s", 1.0, 86_400), ("1m", 60.0, 10_080))
+
+
+class _Ring:
+    """
+    미리 할당한 고정 크기 열(column) 링 버퍼 (시간 오름차순으로 추가된다고 가정)
+    """
+
+    def __init__(self, capacity: int, columns: Sequence[str]):
+        self.capacity = int(capacity)
+        self.columns = tuple(columns)
+        self.time = np.zeros(self.capacity, dtype=np.float64)
+        self.data = {name: np.zeros(self.capacity, dtype=np.float64) for name in self.columns}
+        self.start = 0
+        self.size = 0
+
+    def nbytes(self) -> int:
+        return self.time.nbytes + sum(column.nbytes for column in self.data.values())
+
+    def append(self, t: float, *values: float):
+        if self.size < self.capacity:
+            index = (self.start + self.size) % self.capacity
+            self.size += 1
+        else:
+            index = self.start
+            self.start = (self.start + 1) % self.capacity
+        self.time[index] = t
+        for name, value in zip(self.columns, values):
+            self.data[name][index] = value
+
+    def oldest(self) -> Optional[float]:
+        return self.time[self.start] if self.size else None
+
+    def _segments(self) -> List[Tuple[int, int]]:
+        """
+        논리 순서대로의 물리 구간 [(시작, 끝), ...] (최대 2개)
+        """
+        end = self.start + self.size
+        if end <= self.capacity:
+            return [(self.start, end)]
+        return [(self.start, self.capacity), (0, end - self.capacity)]
+
+    def _bounds(self, t0: float, t1: float) -> List[Tuple[int, int]]:
+        """
+        [t0, t1] 구간에 해당하는 물리 구간들 (구간마다 이진 탐색)
+        """
+        bounds = []
+        for lo, hi in self._segments():
+            times = self.time[lo:hi]
+            i = lo + int(np.searchsorted(times, t0, side="left"))
+            j = lo + int(np.searchsorted(times, t1, side="right"))
+            if j > i:
+                bounds.append((i, j))
+        return bounds
+
+    def count(self, t0: float, t1: float) -> int:
+        return sum(j - i for i, j in self._bounds(t0, t1))
+
+    def range(self, t0: float, t1: float) -> Dict[str, np.ndarray]:
+        bounds = self._bounds(t0, t1)
+        out = {"time": np.concatenate([self.time[i:j] for i, j in bounds]) if bounds else np.empty(0)}
+        for name in self.columns:
+            column = self.data[name]
+            out[name] = np.concatenate([column[i:j] for i, j in bounds]) if bounds else np.empty(0)
+        return out
+
+
+class _Bucket:
+    """
+    진행 중인 롤업 버킷 (아직 링에 기록되지 않은 현재 구간의 합계/최소/최대/마지막 값)
+    """
+
+    __slots__ = ("start", "total", "count", "low", "high", "last")
+
+    def __init__(self):
+        self.start = None
+
+    def reset(self, start: float):
+        self.start = start
+        self.total = 0.0
+        self.count = 0
+        self.low = np.inf
+        self.high = -np.inf
+        self.last = np.nan
+
+    def add(self, total: float, count: int, low: float, high: float, last: float):
+        self.total += total
+        self.count += count
+        self.low = min(self.low, low)
+        self.high = max(self.high, high)
+        self.last = last
+
+    def row(self) -> Tuple[float, float, float, float, float]:
+        return self.total / self.count, self.low, self.high, self.last, self.count
+
+
+class _Series:
+    """
+    지표 하나의 raw 링 + 해상도별 롤업 링
+    """
+
+    ROLLUP_COLUMNS = ("mean", "min", "max", "last", "count")
+
+    def __init__(self, raw_capacity: int, rollups: Sequence[Tuple[str, float, int]]):
+        self.lock = threading.Lock()
+        self.raw = _Ring(raw_capacity, ("value",))
+        self.levels = [(name, float(width), _Ring(capacity, self.ROLLUP_COLUMNS), _Bucket())
+                       for name, width, capacity in rollups]
+        self.last_time = -np.inf
+
+    def append(self, t: float, value: float):
+        # 시각이 거꾸로 들어오면 마지막 시각으로 맞춤 (링의 이진 탐색 전제 유지)
+        t = max(t, self.last_time)
+        self.last_time = t
+        self.raw.append(t, value)
+        self._roll(0, t, value, 1, value, value, value)
+
+    def _roll(self, level: int, t: float, total: float, count: int, low: float, high: float, last: float):
+        """
+        level 해상도 버킷에 값을 더하고, 버킷이 바뀌면 이전 버킷을 링에 기록한 뒤 다음 해상도로 전달
+        """
+        if level >= len(self.levels):
+            return
+        _, width, ring, bucket = self.levels[level]
+        start = t - t % width
+        if bucket.start is not None and start != bucket.start:
+            mean, b_low, b_high, b_last, b_count = bucket.row()
+            ring.append(bucket.start, mean, b_low, b_high, b_last, b_count)
+            self._roll(level + 1, bucket.start, bucket.total, bucket.count, b_low, b_high, b_last)
+            bucket.start = None
+        if bucket.start is None:
+            bucket.reset(start)
+        bucket.add(total, count, low, high, last)
+
+    def pending(self, level: int) -> List[Tuple[float, float, float, float]]:
+        """
+        level 해상도로 본 아직 링에 기록되지 않은 버킷들 [(시작, mean, min, max), ...]
+        - 하위 해상도의 진행 중인 버킷은 상위로 아직 전달되지 않았으므로 함께 합침 (최대 2개)
+        """
+        width = self.levels[level][1]
+        merged = {}
+        for _, _, _, bucket in reversed(self.levels[:level + 1]):
+            if bucket.start is None:
+                continue
+            start = bucket.start - bucket.start % width
+            row = merged.setdefault(start, _Bucket())
+            if row.start is None:
+                row.reset(start)
+            row.add(bucket.total, bucket.count, bucket.low, bucket.high, bucket.last)
+        return [(start, *merged[start].row()[:3]) for start in sorted(merged)]
+
+    def nbytes(self) -> int:
+        return self.raw.nbytes() + sum(ring.nbytes() for _, _, ring, _ in self.levels)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링
+    - 양 끝점은 유지하고, 나머지를 n_out - 2개 구간으로 나눠 구간마다 (이전 선택점, 다음 구간 평균)과
+      가장 큰 삼각형을 이루는 점 하나를 선택 → 급등/급락 같은 시각적 특징이 남음
+    :return: 선택된 인덱스 배열
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # 구간 k = [edges[k], edges[k+1]), 마지막 "다음 구간"은 끝점 하나
+    starts = np.append(edges[:-1], n - 1)
+    counts = np.diff(np.append(starts, n))
+    avg_x = np.add.reduceat(x, starts) / counts
+    avg_y = np.add.reduceat(y, starts) / counts
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for k in range(n_out - 2):
+        lo, hi = starts[k], starts[k + 1]
+        px, py = x[previous], y[previous]
+        area = np.abs((px - avg_x[k + 1]) * (y[lo:hi] - py) - (px - x[lo:hi]) * (avg_y[k + 1] - py))
+        previous = lo + int(area.argmax())
+        selected[k + 1] = previous
+    return selected
+
+
+class TimeSeriesStore:
+    """
+    대시보드 차트용 프로세스 내 시계열 저장소 (지표별 고정 크기 링 버퍼)
+    - raw: 틱 단위 원본 최근 raw_capacity개
+    - 롤업(기본 1s / 1m): 버킷별 mean / min / max / last / count, 추가 시 자동 집계
+      (1s 버킷이 닫히면 1m 버킷으로 전달 → 원본을 다시 훑지 않음)
+    - 메모리는 생성 시 할당한 크기로 고정 (지표당 memory_per_metric 바이트, 최대 max_metrics개)
+    - query는 요청 구간을 덮으면서 점 수가 max_points * oversample 이하인 가장 세밀한 해상도를 골라
+      LTTB로 max_points개까지 줄임 → 보관 기간과 무관하게 읽는 점 수가 제한됨
+    """
+
+    def __init__(self, raw_capacity: int = 200_000, rollups: Sequence[Tuple[str, float, int]] = DEFAULT_ROLLUPS,
+                 max_metrics: int = 32, oversample: int = 4):
+        """
+        :param raw_capacity: 지표당 보관할 원본 틱 수
+        :param rollups: [(이름, 버킷 길이(초), 보관 개수), ...] 세밀한 것부터
+        :param max_metrics: 최대 지표 수 (메모리 상한)
+        :param oversample: 해상도 선택 시 허용할 점 수 배율 (max_points * oversample)
+        """
+        self.raw_capacity = raw_capacity
+        self.rollups = tuple(sorted(rollups, key=lambda level: level[1]))
+        self.max_metrics = max_metrics
+        self.oversample = max(1, oversample)
+        self._series: Dict[str, _Series] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def memory_per_metric(self) -> int:
+        columns = len(_Series.ROLLUP_COLUMNS) + 1
+        return self.raw_capacity * 16 + sum(capacity * 8 * columns for _, _, capacity in self.rollups)
+
+    def memory_bytes(self) -> int:
+        """
+        현재 할당된 버퍼 크기 합계
+        """
+        return sum(series.nbytes() for series in list(self._series.values()))
+
+    def metrics(self) -> List[str]:
+        return sorted(self._series)
+
+    def _get(self, metric: str) -> _Series:
+        series = self._series.get(metric)
+        if series is None:
+            with self._lock:
+                series = self._series.get(metric)
+                if series is None:
+                    if len(self._series) >= self.max_metrics:
+                        raise ValueError(f"TimeSeriesStore is full ({self.max_metrics} metrics): {metric}")
+                    series = _Series(self.raw_capacity, self.rollups)
+                    self._series[metric] = series
+        return series
+
+    def append(self, metric: str, value: float, timestamp: float = None):
+        """
+        값 하나 추가
+        :param timestamp: 초 단위 epoch 시각 (기본: 현재 시각)
+        """
+        series = self._get(metric)
+        t = time.time() if timestamp is None else float(timestamp)
+        with series.lock:
+            series.append(t, float(value))
+
+    def append_many(self, metric: str, timestamps: Sequence[float], values: Sequence[float]):
+        series = self._get(metric)
+        with series.lock:
+            for t, value in zip(np.asarray(timestamps, dtype=np.float64).tolist(),
+                                np.asarray(values, dtype=np.float64).tolist()):
+                series.append(t, value)
+
+    def query(self, metric: str, start: float = None, end: float = None, max_points: int = 500,
+              resolution: str = None) -> dict:
+        """
+        구간 조회 (차트용)
+        :param start, end: 초 단위 epoch 시각 (기본: 보관된 전체 구간)
+        :param max_points: 반환할 최대 점 수 (LTTB 다운샘플링)
+        :param resolution: "raw" 또는 롤업 이름으로 고정 (기본: 자동 선택)
+        :return: {"metric", "resolution", "t": [...], "v": [...]} + 롤업이면 "min"/"max" (진행 중인 버킷 포함)
+        """
+        series = self._series.get(metric)
+        if series is None:
+            raise KeyError(metric)
+        end = np.inf if end is None else float(end)
+        start = -np.inf if start is None else float(start)
+        budget = max(max_points, 3) * self.oversample
+
+        with series.lock:
+            candidates = [("raw", None, series.raw, None)] + list(series.levels)
+            if resolution is not None:
+                candidates = [c for c in candidates if c[0] == resolution]
+                if not candidates:
+                    raise ValueError(f"Unknown resolution: {resolution}")
+            # 구간을 덮는 가장 세밀한 해상도 중 점 수가 budget 이하인 것
+            # (그 해상도가 max_points보다 적은 점만 주면 한 단계 세밀한 해상도를 다운샘플링해 사용)
+            chosen = len(candidates) - 1
+            finer = None
+            for index, (_, _, ring, _) in enumerate(candidates):
+                oldest = ring.oldest()
+                if not (ring.size < ring.capacity or (oldest is not None and oldest <= start)):
+                    continue
+                count = ring.count(start, end)
+                if count <= budget:
+                    chosen = finer if count < max_points and finer is not None else index
+                    break
+                finer = index
+
+            name = candidates[chosen][0]
+            rows = candidates[chosen][2].range(start, end)
+            if name == "raw":
+                t, v, low, high = rows["time"], rows["value"], None, None
+            else:
+                t, v, low, high = rows["time"], rows["mean"], rows["min"], rows["max"]
+                level = next(i for i, candidate in enumerate(series.levels) if candidate[0] == name)
+                tail = [row for row in series.pending(level) if start <= row[0] <= end]
+                if tail:
+                    t_tail, v_tail, low_tail, high_tail = (np.array(column) for column in zip(*tail))
+                    t, v = np.concatenate([t, t_tail]), np.concatenate([v, v_tail])
+                    low, high = np.concatenate([low, low_tail]), np.concatenate([high, high_tail])
+
+        if len(t) > max_points:
+            index = lttb(t, v, max_points)
+            t, v = t[index], v[index]
+            if low is not None:
+                low, high = low[index], high[index]
+        result = {"metric": metric, "resolution": name, "t": t.tolist(), "v": v.tolist()}
+        if low is not None:
+            result["min"] = low.tolist()
+            result["max"] = high.tolist()
+        return result
@@ -6,7 +6,7 @@ from .websocket_manager import WebSocketManager
 
 class BinanceTradeWS(WebSocketManager):
     """
-    바이낸스 선물 LTCUSDT 체결 데이터(Trade) 실시간 수집 클래스
+    바이낸스 선물 체결 데이터(Trade) 실시간 수집 클래스 (기본: LTCUSDT)
     """
 
     def __init__(
@@ -15,20 +15,30 @@ class BinanceTradeWS(WebSocketManager):
         max_retries=5,
         base_retry_delay=1.0,
         logger: logging.Logger = None,
+        trade_handlers: list = None,
+        symbols=("LTCUSDT",),
     ):
+        """
+        :param trade_handlers: 체결마다 handler(symbol, price, quantity)로 호출할 콜백 목록
+               (예: TradeExecutor.on_trade → 스탑 발동/리스크 평가)
+        :param symbols: 구독할 심볼 목록
+        """
         super().__init__(uri, max_retries, base_retry_delay, logger)
+        self.symbols = [s.upper() for s in symbols]
+        self.trade_handlers = list(trade_handlers or [])
+
+    def add_trade_handler(self, handler):
+        self.trade_handlers.append(handler)
 
     async def on_connect(self):
         """
         웹소켓 연결된 후, 체결 데이터 구독 요청
         """
-        self.logger.info("Connected. Subscribing to LTCUSDT Trade stream.")
+        self.logger.info(f"Connected. Subscribing to {', '.join(self.symbols)} Trade stream.")
 
         subscribe_payload = {
             "method": "SUBSCRIBE",
-            "params": [
-                "ltcusdt@trade",
-            ],
+            "params": [f"{symbol.lower()}@trade" for symbol in self.symbols],
             "id": 201
         }
         await self.send_message(subscribe_payload)
@@ -73,13 +83,20 @@ class BinanceTradeWS(WebSocketManager):
           "R": true         // Is this trade the best match?
         }
         """
+        symbol = data.get("s", "")
         price = float(data.get("p", 0))
         quantity = float(data.get("q", 0))
         maker_side = "maker" if data.get("m") else "taker"
 
         self.logger.debug(
-            f"[TRADE] Symbol={data.get('s')} Price={price} "
+            f"[TRADE] Symbol={symbol} Price={price} "
             f"Qty={quantity} Side={maker_side}"
         )
+
+        for handler in self.trade_handlers:
+            try:
+                handler(symbol, price, quantity)
+            except Exception as e:
+                self.logger.exception(f"Trade handler error: {e}")
         # TODO: 실시간 체결 기록, 백테스트, 전략 분석, 주문 연계 등
 
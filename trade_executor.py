@@ -1,5 +1,7 @@
 # order_execution/trade_executor.py
 
+import heapq
+import itertools
 import logging
 import threading
 import time
@@ -7,16 +9,43 @@ import time
 from .position_sizing import PositionSizing
 from .risk_management import RiskManager
 from .order_manager import OrderManager
+from .execution_algorithms import TWAPAlgorithm, ParticipationRateAlgorithm, LayeredLimitAlgorithm
+from .portfolio_risk import PortfolioRiskEngine
+from .stop_trigger_engine import StopTriggerEngine
+from .symbol_filters import SymbolFilterRegistry
 
 class TradeExecutor:
     """
     매매 신호를 받아 주문을 실행하고, 주문 체결까지 관리하는 총괄 클래스
-    멀티스레딩 예시 - 하나의 Thread에서 신호를 모니터링, 다른 Thread에서 실행 가능
+    - 여러 Worker 스레드가 우선순위 큐에서 신호를 꺼내 병렬로 실행
+    - 같은 심볼의 신호는 한 번에 하나씩만 실행(심볼 단위 직렬화)
+    - 청산/손절 신호가 신규 진입 신호보다 먼저 처리됨
     """
 
-    def __init__(self, exchange_api, initial_balance: float, logger=None):
+    # 신호 우선순위 (숫자가 작을수록 먼저 실행)
+    PRIORITY_STOP_LOSS = 0
+    PRIORITY_EXIT = 1
+    PRIORITY_ENTRY = 2
+
+    SIGNAL_PRIORITIES = {
+        "STOP_LOSS": PRIORITY_STOP_LOSS,
+        "TRAILING_STOP": PRIORITY_STOP_LOSS,
+        "EXIT": PRIORITY_EXIT,
+        "ENTRY": PRIORITY_ENTRY,
+    }
+
+    def __init__(self, exchange_api, initial_balance: float, num_workers: int = 4,
+                 max_signal_age: float = 5.0, logger=None):
+        """
+        :param exchange_api: 거래소 API 객체 (ex: BinanceFuturesAPI)
+        :param initial_balance: 리스크 매니저 초기 잔고
+        :param num_workers: 동시에 주문을 처리할 Worker 스레드 수
+        :param max_signal_age: 큐에서 이 시간(초) 이상 대기한 진입 신호는 실행하지 않고 폐기 (손절/청산 신호는 항상 실행)
+        """
         self.exchange_api = exchange_api
         self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.num_workers = max(1, num_workers)
+        self.max_signal_age = max_signal_age
 
         # 하위 모듈
         self.position_sizing = PositionSizing(logger=self.logger)
@@ -26,81 +55,309 @@ class TradeExecutor:
         # 리스크 매니저 초기 잔고 세팅
         self.risk_manager.update_initial_balance(initial_balance)
 
-        # 멀티스레딩을 위한 신호 큐
-        self.signal_queue = []
+        # 거래소 심볼 필터 캐시 (start 시 로드, 이후 백그라운드 갱신)
+        self.symbol_filters = SymbolFilterRegistry(exchange_api=self.exchange_api, logger=self.logger)
+
+        # 체결 틱마다 포트폴리오를 평가하는 스트리밍 리스크 엔진 (킬스위치 발동 시 신규 진입 차단)
+        self.portfolio_risk = PortfolioRiskEngine(
+            initial_balance=initial_balance,
+            max_drawdown=self.risk_manager.max_drawdown,
+            logger=self.logger
+        )
+        self.portfolio_risk.add_kill_callback(self._on_kill_switch)
+
+        # 체결 스트림으로 구동되는 손절/트레일링 스탑 (발동 시 청산 신호가 우선순위 큐로 바로 들어감)
+        self.stop_engine = StopTriggerEngine(on_trigger=self.add_signal, logger=self.logger)
+
+        # 집행 알고리즘이 참고할 실시간 호가 / 누적 체결량 (데이터 피드에서 갱신)
+        self._order_books = {}
+        self._traded_volume = {}
+
+        # 집행 알고리즘 (신호의 "algo" 값으로 선택, 없으면 단일 MARKET 주문)
+        algo_kwargs = dict(
+            exchange_api=self.exchange_api,
+            order_manager=self.order_manager,
+            depth_provider=self.get_order_book,
+            symbol_filters=self.symbol_filters,
+            logger=self.logger,
+        )
+        self.execution_algorithms = {
+            "TWAP": TWAPAlgorithm(**algo_kwargs),
+            "POV": ParticipationRateAlgorithm(volume_provider=self.get_traded_volume, **algo_kwargs),
+            "LAYERED": LayeredLimitAlgorithm(**algo_kwargs),
+        }
+
+        # 심볼별 신호 힙: symbol -> [(priority, seq, enqueued_at, signal), ...]
+        self._symbol_queues = {}
+        # 실행 가능한 심볼 힙: [(priority, seq, symbol), ...]
+        # (심볼 힙의 top이 바뀌면 새 항목을 넣고, 오래된 항목은 꺼낼 때 무시)
+        self._ready = []
+        # 현재 Worker가 처리 중인 심볼
+        self._busy_symbols = set()
+        self._seq = itertools.count()
+
         self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
         self.running = True
+        self.execution_threads = []
 
     def start(self):
         """
-        시작: 별도의 스레드에서 _execution_loop 동작
+        시작: num_workers개의 스레드에서 _execution_loop 동작
         """
-        self.execution_thread = threading.Thread(target=self._execution_loop, daemon=True)
-        self.execution_thread.start()
+        self.running = True
+        self.symbol_filters.start()
+        for i in range(self.num_workers):
+            t = threading.Thread(target=self._execution_loop, name=f"TradeExecutor-{i}", daemon=True)
+            t.start()
+            self.execution_threads.append(t)
 
     def stop(self):
         """
         스레드 중지
+        - 대기 중인 신규 진입 신호는 폐기하고, 청산/손절 신호(와 실행 중인 신호)만 마친 뒤 종료
         """
-        self.running = False
-        self.execution_thread.join()
+        with self._cond:
+            self.running = False
+            dropped = self._drop_entry_signals()
+            self._cond.notify_all()
+        if dropped:
+            self.logger.warning(f"Stopping: dropped {dropped} pending entry signals.")
+        for t in self.execution_threads:
+            t.join()
+        self.execution_threads = []
+        self.symbol_filters.stop()
 
     def add_signal(self, signal: dict):
         """
         외부에서 매매 신호 (예: {"action":"BUY", "price":100.0, "stop_loss":95.0, ...})를 추가
+        - signal_type: "ENTRY"(기본), "EXIT", "STOP_LOSS", "TRAILING_STOP"
+        """
+        priority = self._signal_priority(signal)
+        symbol = signal.get("symbol", "LTCUSDT")
+
+        with self._cond:
+            seq = next(self._seq)
+            queue = self._symbol_queues.setdefault(symbol, [])
+            heapq.heappush(queue, (priority, seq, time.monotonic(), signal))
+
+            # 새 신호가 심볼의 최우선 신호가 되었고, 심볼이 처리 중이 아니면 실행 대기열에 등록
+            if queue[0][1] == seq and symbol not in self._busy_symbols:
+                heapq.heappush(self._ready, (priority, seq, symbol))
+                self._cond.notify()
+
+    def update_order_book(self, symbol: str, order_book: dict):
+        """
+        최신 오더북 갱신 ({"bids": [[price, qty], ...], "asks": [...]})
+        """
+        self._order_books[symbol] = order_book
+
+    def get_order_book(self, symbol: str):
+        return self._order_books.get(symbol)
+
+    def on_trade(self, symbol: str, price: float, quantity: float):
+        """
+        체결 데이터 수신 시 누적 체결량 갱신 (참여율 알고리즘에서 사용), 포트폴리오 시가평가,
+        손절/트레일링 스탑 발동 확인
+        :return: 이번 체결로 발동된 스탑 청산 신호 리스트 (이미 신호 큐에 추가됨)
+        """
+        self.portfolio_risk.on_trade(symbol, price)
+        fired = self.stop_engine.on_trade(symbol, price, quantity)
+        self._traded_volume[symbol] = self._traded_volume.get(symbol, 0.0) + quantity
+        return fired
+
+    def get_traded_volume(self, symbol: str) -> float:
+        return self._traded_volume.get(symbol, 0.0)
+
+    def pending_signals(self) -> int:
+        """
+        큐에 대기 중인 신호 개수
         """
         with self._lock:
-            self.signal_queue.append(signal)
+            return sum(len(q) for q in self._symbol_queues.values())
+
+    def _signal_priority(self, signal: dict) -> int:
+        signal_type = str(signal.get("signal_type", "ENTRY")).upper()
+        return self.SIGNAL_PRIORITIES.get(signal_type, self.PRIORITY_ENTRY)
+
+    def _on_kill_switch(self, reason: str):
+        """
+        킬스위치 발동 시 대기 중인 신규 진입 신호 폐기 (청산/손절 신호는 유지)
+        """
+        with self._cond:
+            dropped = self._drop_entry_signals()
+        self.logger.critical(f"Kill switch triggered ({reason}). Dropped {dropped} pending entry signals.")
+
+    def _drop_entry_signals(self) -> int:
+        """
+        대기 중인 신규 진입 신호 폐기 후 남은 신호의 심볼을 실행 대기열에 다시 등록 (락을 잡은 상태에서 호출)
+        :return: 폐기한 신호 수
+        """
+        dropped = 0
+        for symbol in list(self._symbol_queues):
+            queue = self._symbol_queues[symbol]
+            kept = [item for item in queue if item[0] != self.PRIORITY_ENTRY]
+            dropped += len(queue) - len(kept)
+            if kept:
+                heapq.heapify(kept)
+                self._symbol_queues[symbol] = kept
+                if symbol not in self._busy_symbols:
+                    heapq.heappush(self._ready, (kept[0][0], kept[0][1], symbol))
+                    self._cond.notify()
+            else:
+                del self._symbol_queues[symbol]
+        return dropped
+
+    def _next_signal(self):
+        """
+        실행할 다음 신호를 꺼냄 (락을 잡은 상태에서 호출)
+        - 처리 중이 아닌 심볼 중 우선순위가 가장 높은 신호 반환
+        - 실행할 신호가 없으면 None
+        """
+        while self._ready:
+            _, seq, symbol = heapq.heappop(self._ready)
+            queue = self._symbol_queues.get(symbol)
+            # 이미 다른 Worker가 가져갔거나, 더 높은 우선순위 신호가 들어와 무효화된 항목
+            if symbol in self._busy_symbols or not queue or queue[0][1] != seq:
+                continue
+
+            _, _, enqueued_at, signal = heapq.heappop(queue)
+            if not queue:
+                del self._symbol_queues[symbol]
+            self._busy_symbols.add(symbol)
+            return symbol, enqueued_at, signal
+        return None
+
+    def _release_symbol(self, symbol: str):
+        """
+        심볼 처리 완료 표시 후, 남은 신호가 있으면 다시 실행 대기열에 등록 (락을 잡은 상태에서 호출)
+        """
+        self._busy_symbols.discard(symbol)
+        queue = self._symbol_queues.get(symbol)
+        if queue:
+            priority, seq, _, _ = queue[0]
+            heapq.heappush(self._ready, (priority, seq, symbol))
+            self._cond.notify()
 
     def _execution_loop(self):
         """
-        주기적으로 신호 큐를 확인하고, 매매 실행
+        신호 큐에 신호가 들어올 때까지 대기(Condition)하고, 매매 실행
+        """
+        while True:
+            with self._cond:
+                item = self._next_signal()
+                while item is None and self.running:
+                    self._cond.wait()
+                    item = self._next_signal()
+                if item is None:
+                    return
+
+            symbol, enqueued_at, signal = item
+            try:
+                age = time.monotonic() - enqueued_at
+                if not self.running and self._signal_priority(signal) == self.PRIORITY_ENTRY:
+                    # stop() 이후에 들어온 신규 진입 신호는 실행하지 않음
+                    self.logger.warning(f"Dropping entry signal after stop: {signal}")
+                # 손절/청산 신호는 늦어도 실행 (스탑은 발동 시 이미 해제되어 버리면 포지션이 무방비가 됨)
+                elif (self.max_signal_age and age > self.max_signal_age
+                        and self._signal_priority(signal) == self.PRIORITY_ENTRY):
+                    self.logger.warning(f"Dropping stale signal ({age:.2f}s old): {signal}")
+                else:
+                    self._execute_trade(signal)
+            except Exception as e:
+                self.logger.exception(f"Error executing signal {signal}: {e}")
+            finally:
+                with self._cond:
+                    self._release_symbol(symbol)
+
+    def process_pending(self) -> int:
+        """
+        대기 중인 신호를 호출한 스레드에서 우선순위 순서대로 바로 실행 (Worker 스레드 없이 사용, 예: 틱 백테스트)
+        - 실행 중 새로 들어온 신호(스탑 발동 등)도 이어서 처리
+        - 신호 나이(max_signal_age) 검사는 하지 않음 (백테스트는 이벤트 시각 기준으로 호출)
+        :return: 실행한 신호 수
         """
-        while self.running:
-            signal = None
-            with self._lock:
-                if self.signal_queue:
-                    signal = self.signal_queue.pop(0)
+        executed = 0
+        while True:
+            with self._cond:
+                item = self._next_signal()
+            if item is None:
+                return executed
 
-            if signal:
+            symbol, _, signal = item
+            try:
                 self._execute_trade(signal)
-            else:
-                time.sleep(0.5)
+            except Exception as e:
+                self.logger.exception(f"Error executing signal {signal}: {e}")
+            finally:
+                with self._cond:
+                    self._release_symbol(symbol)
+            executed += 1
 
     def _execute_trade(self, signal: dict):
         """
         실제 매매 로직: 포지션 크기 계산 → 주문 → 체결 모니터링
+        - 청산/손절 신호("quantity" 포함)는 잔고·낙폭 체크와 포지션 사이징 없이 바로 주문
+        - 신규 진입이 체결되면 stop_loss / trail_pct / trail_amount로 스탑 등록
         """
         self.logger.info(f"Executing trade signal: {signal}")
         action = signal.get("action")  # BUY or SELL
         symbol = signal.get("symbol", "LTCUSDT")
         entry_price = float(signal.get("price", 0))
         stop_loss_price = float(signal.get("stop_loss", 0))
+        is_entry = self._signal_priority(signal) == self.PRIORITY_ENTRY
 
-        # 1) 현재 계좌잔고 조회
-        balance_info = self.exchange_api.get_account_balance()
-        # 예) 선물 계정에서 "USDT" 자산 찾기
-        usdt_balance = 0
-        for b in balance_info:
-            if b.get("asset") == "USDT":
-                usdt_balance = float(b.get("balance", 0))
-
-        # 2) 리스크 초과 체크
-        if self.risk_manager.check_drawdown(usdt_balance):
-            self.logger.warning("Max drawdown exceeded. Skipping trade.")
-            return
+        if not is_entry and signal.get("quantity"):
+            position_size = self.symbol_filters.quantize_qty(symbol, float(signal["quantity"]))
+        else:
+            # 1) 현재 계좌잔고 조회
+            balance_info = self.exchange_api.get_account_balance()
+            # 예) 선물 계정에서 "USDT" 자산 찾기
+            usdt_balance = 0
+            for b in balance_info:
+                if b.get("asset") == "USDT":
+                    usdt_balance = float(b.get("balance", 0))
 
-        # 3) 포지션 사이징
-        position_size = self.position_sizing.calculate_position_size(
-            account_balance=usdt_balance,
-            entry_price=entry_price,
-            stop_loss_price=stop_loss_price
-        )
+            # 2) 리스크 초과 체크
+            if self.risk_manager.check_drawdown(usdt_balance):
+                self.logger.warning("Max drawdown exceeded. Skipping trade.")
+                return
+
+            # 3) 포지션 사이징
+            position_size = self.position_sizing.calculate_position_size(
+                account_balance=usdt_balance,
+                entry_price=entry_price,
+                stop_loss_price=stop_loss_price,
+                symbol_filter=self.symbol_filters.get(symbol)
+            )
         if position_size <= 0:
             self.logger.warning("Position size is 0. Skipping trade.")
             return
 
-        # 4) 주문 실행 (Market 주문 예시)
+        # 3-1) 신규 진입은 주문 전 사전 점검 (킬스위치, 주문 금액, 익스포저, 레버리지)
+        if is_entry:
+            allowed, reason = self.portfolio_risk.check_order(symbol, action, position_size, entry_price)
+            if not allowed:
+                self.logger.warning(f"Pre-trade check failed: {reason}. Skipping trade.")
+                return
+
+        # 4-1) 집행 알고리즘 지정 시 자식 주문으로 나눠서 집행
+        #      예: {"algo": "TWAP", "algo_params": {"duration": 60, "num_slices": 10}}
+        algo_name = signal.get("algo")
+        if algo_name:
+            algo = self.execution_algorithms.get(str(algo_name).upper())
+            if algo is None:
+                self.logger.error(f"Unknown execution algorithm: {algo_name}")
+                return
+            report = algo.execute(symbol, action, position_size, **signal.get("algo_params", {}))
+            self.logger.info(f"Execution report: {report}")
+            if report.get("filled_qty"):
+                self.portfolio_risk.on_fill(symbol, action, report["filled_qty"], report["avg_price"])
+                if is_entry:
+                    self._register_stops(signal, report["filled_qty"], report["avg_price"])
+            return report
+
+        # 4-2) 주문 실행 (Market 주문 예시)
         order_response = self.exchange_api.place_order(
             symbol=symbol,
             side=action,
@@ -117,5 +374,41 @@ class TradeExecutor:
                 # 체결되지 않으면 주문 취소 예시
                 self.logger.info("Not filled. Canceling order.")
                 self.order_manager.cancel_order(symbol, order_id)
+            executed_qty, avg_price = self._record_fill(symbol, action, order_id, order_response)
+            if is_entry and executed_qty > 0:
+                self._register_stops(signal, executed_qty, avg_price)
         else:
             self.logger.error("No orderId in response. Possibly an error.")
+
+    def _record_fill(self, symbol: str, side: str, order_id: int, order_response: dict) -> tuple:
+        """
+        주문 체결 수량/평균가를 포트폴리오 리스크 엔진에 반영
+        :return: (체결 수량, 평균 체결가)
+        """
+        if order_response.get("status") != "FILLED":
+            order_response = self.exchange_api.get_order(symbol, order_id)
+        executed_qty = float(order_response.get("executedQty", 0) or 0)
+        avg_price = float(order_response.get("avgPrice", 0) or 0)
+        if executed_qty > 0 and avg_price > 0:
+            self.portfolio_risk.on_fill(symbol, side, executed_qty, avg_price)
+        return executed_qty, avg_price
+
+    def _register_stops(self, signal: dict, quantity: float, fill_price: float):
+        """
+        진입 체결 수량만큼 손절/트레일링 스탑 등록 (같은 group → 하나가 발동하면 나머지 취소)
+        """
+        symbol = signal.get("symbol", "LTCUSDT")
+        exit_side = "SELL" if signal.get("action") == "BUY" else "BUY"
+        group = f"{symbol}-{next(self._seq)}"
+
+        stop_loss_price = float(signal.get("stop_loss", 0) or 0)
+        if stop_loss_price > 0:
+            self.stop_engine.add_stop(symbol, exit_side, quantity, stop_loss_price, group=group)
+        if signal.get("trail_pct") or signal.get("trail_amount"):
+            self.stop_engine.add_trailing_stop(
+                symbol, exit_side, quantity,
+                trail_amount=signal.get("trail_amount"),
+                trail_pct=signal.get("trail_pct") if not signal.get("trail_amount") else None,
+                anchor_price=fill_price,
+                group=group
+            )
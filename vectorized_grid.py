@@ -0,0 +1,115 @@
+# backtesting/vectorized_grid.py
+
+import itertools
+import logging
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+class VectorizedGridBacktester:
+    """
+    example_strategy(이동평균 교차)의 모든 (short_window, long_window) 조합을 한 번에 백테스트
+    - 필요한 이동평균은 윈도우별로 한 번만 계산해 2D 배열(시점 × 윈도우)로 보관
+    - 조합들의 포지션/수익률/지표는 조합 묶음(batch) 단위 배열 연산으로 계산
+    - 결과는 조합별로 PerformanceMetrics.calculate_metrics와 같은 값
+      (StrategyOptimizer.grid_search 결과와 같은 형태의 DataFrame)
+    """
+
+    def __init__(self, periods_per_year: int = 252, batch_size: int = 256, logger=None):
+        """
+        :param periods_per_year: 샤프 비율 연율화 기간 (calculate_metrics와 동일하게 252)
+        :param batch_size: 한 번에 계산할 조합 수 (메모리 = 행 수 × batch_size × 8바이트 × 몇 배)
+        """
+        self.periods_per_year = periods_per_year
+        self.batch_size = batch_size
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+    def rolling_means(self, close: pd.Series, windows: List[int]) -> np.ndarray:
+        """
+        윈도우별 이동평균을 한 번씩만 계산해 (윈도우 수 × 행 수) 배열로 반환
+        (example_strategy와 같은 pandas rolling 결과를 사용해 값이 정확히 일치,
+         윈도우별 시계열이 메모리상 연속이 되도록 행=윈도우 배치)
+        """
+        ma = np.empty((len(windows), len(close)))
+        for j, window in enumerate(windows):
+            ma[j] = close.rolling(window=window).mean().to_numpy()
+        return ma
+
+    def run(self, price_data: pd.DataFrame, param_grid: Dict[str, List[int]]) -> pd.DataFrame:
+        """
+        param_grid 예시: {"short_window": [5, 10, 20], "long_window": [20, 50]}
+        """
+        short_windows = list(param_grid.get("short_window", [5]))
+        long_windows = list(param_grid.get("long_window", [20]))
+        combos = list(itertools.product(short_windows, long_windows))
+        self.logger.info(f"Starting vectorized grid backtest with {len(combos)} combinations...")
+
+        close = price_data["close"].astype(float)
+        windows = sorted(set(short_windows) | set(long_windows))
+        column = {w: j for j, w in enumerate(windows)}
+        ma = self.rolling_means(close, windows)
+
+        returns = close.pct_change().to_numpy()
+        # calculate_metrics의 dropna 대상: 수익률이 NaN인 행 (첫 행 등)
+        valid = ~np.isnan(returns)
+        valid_returns = returns[valid]
+
+        rows = []
+        for start in range(0, len(combos), self.batch_size):
+            batch = combos[start:start + self.batch_size]
+            short_idx = [column[s] for s, _ in batch]
+            long_idx = [column[l] for _, l in batch]
+
+            ma_short = ma[short_idx]
+            ma_long = ma[long_idx]
+
+            # 포지션: 다음 봉 진입 (shift(1), 첫 행 0)
+            # 신호: 단기 > 장기 → 1, 단기 < 장기 → -1, 그 외(NaN 비교 포함) 0
+            position = np.zeros(ma_short.shape)
+            np.greater(ma_short[:, :-1], ma_long[:, :-1], out=position[:, 1:])
+            position[:, 1:] -= np.less(ma_short[:, :-1], ma_long[:, :-1])
+
+            strategy_returns = position[:, valid]
+            strategy_returns *= valid_returns
+            metrics = self._metrics(strategy_returns)
+            for k, (s, l) in enumerate(batch):
+                rows.append({
+                    "short_window": s,
+                    "long_window": l,
+                    **{name: values[k] for name, values in metrics.items()},
+                })
+
+        return pd.DataFrame(rows)
+
+    def _metrics(self, strategy_returns: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        (조합 수 × 행 수) 전략 수익률에서 calculate_metrics와 같은 지표를 조합(행) 단위로 계산
+        """
+        n = strategy_returns.shape[1]
+        if n < 2:
+            self.logger.warning("Insufficient data for performance metrics.")
+            return {}
+
+        win_trades = (strategy_returns > 0).sum(axis=1)
+        total_trades = (strategy_returns != 0).sum(axis=1)
+        win_rate = np.divide(win_trades, total_trades, out=np.zeros(strategy_returns.shape[0]),
+                             where=total_trades > 0)
+
+        mean = strategy_returns.mean(axis=1)
+        std = strategy_returns.std(axis=1, ddof=1)
+        sharpe = np.divide(mean, std, out=np.zeros_like(mean), where=std != 0) * np.sqrt(self.periods_per_year)
+
+        # 누적수익률/낙폭은 같은 버퍼를 재사용해 메모리 할당을 줄임
+        cum_returns = strategy_returns + 1
+        np.cumprod(cum_returns, axis=1, out=cum_returns)
+        rolling_max = np.maximum.accumulate(cum_returns, axis=1)
+        cum_returns -= rolling_max
+        cum_returns /= rolling_max
+        max_drawdown = cum_returns.min(axis=1)
+
+        return {
+            "win_rate": win_rate,
+            "sharpe_ratio": sharpe,
+            "max_drawdown": max_drawdown,
+        }